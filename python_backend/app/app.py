@@ -1,76 +1,210 @@
+import asyncio
+import contextlib
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated
 
-from app.main import scrape_job_listing
-from clients.node_client import delete_all_jobs_from_node
-from fastapi import BackgroundTasks, Depends, FastAPI, Request
+from app.main import scrape_job_listing, scrape_job_listings
+from app.workers import ScrapeWorkerSupervisor, get_scrape_worker_count
+from clients.node_client import close_node_client, delete_all_jobs_from_node, open_node_client
+from concurrency.job_runner import termination_stats
+from concurrency.scrape_queue import ScrapeQueue, get_scrape_queue_path
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jobs.parser import json_block_stats
+from llm.parser import close_llm_client, llm_cache, open_llm_client, scheduler
 from logging_config import setup_logging
+from pages.browser_pool import browser_pool, is_warm_browser_pool_enabled
+from pages.http_fetch import get_fetch_mode, http_fetch_stats
+from pages.listing_parser import listing_parse_stats
+from pages.pool import page_pool_averages, page_pool_stats
+from pages.request_filter import request_filter_averages, request_filter_stats
 from utils.auth import get_validated_token
-from utils.constants import DAY_RANGE_LIMIT
+from utils.constants import DAY_RANGE_LIMIT, HTTP_STATUS_BAD_REQUEST, HTTP_STATUS_NOT_FOUND
+from utils.context import ScrapeQuery
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def scrape_workers(app: FastAPI) -> AsyncIterator[None]:
+    # With SCRAPE_WORKERS unset scrapes stay in-process; otherwise they are queued and survive restarts
+    app.state.scrape_queue = None
+    app.state.scrape_supervisor = None
+    worker_count = get_scrape_worker_count()
+    if worker_count <= 0:
+        # Scrapes run in this process, so this process keeps the warm browser
+        if is_warm_browser_pool_enabled():
+            await browser_pool.start()
+        try:
+            yield
+        finally:
+            await browser_pool.close()
+        return
+
+    with ScrapeQueue(get_scrape_queue_path()) as scrape_queue:
+        supervisor = ScrapeWorkerSupervisor(scrape_queue.path, worker_count)
+        supervisor.start()
+        monitor = asyncio.create_task(supervisor.monitor())
+        app.state.scrape_queue = scrape_queue
+        app.state.scrape_supervisor = supervisor
+        try:
+            yield
+        finally:
+            monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await monitor
+            await asyncio.to_thread(supervisor.stop)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await open_node_client()
+    await open_llm_client()
+    try:
+        async with scrape_workers(app):
+            yield
+    finally:
+        await close_llm_client()
+        await close_node_client()
+
+app = FastAPI(lifespan=lifespan)
 security = HTTPBearer()
 
+def parse_scrape_query(data: dict) -> ScrapeQuery:
+    max_pages = data.get("max_pages")
+    day_range_limit = data.get("day_range_limit")
+    fetch_mode = data.get("fetch_mode")
+    return ScrapeQuery(
+        job_title=data.get("job_title", "software engineer"),
+        location=data.get("location", "sydney"),
+        max_pages=int(max_pages) if max_pages is not None else None,
+        day_range_limit=int(day_range_limit) if day_range_limit is not None else DAY_RANGE_LIMIT,
+        fetch_mode=get_fetch_mode(fetch_mode) if fetch_mode is not None else None
+    )
+
+def schedule_scrape(request: Request, background_tasks: BackgroundTasks, queries: list) -> dict:
+    scrape_queue = getattr(request.app.state, "scrape_queue", None)
+    if scrape_queue is not None:
+        return {"task_id": scrape_queue.enqueue(queries)}
+
+    if len(queries) == 1:
+        query = queries[0]
+        background_tasks.add_task(
+            scrape_job_listing,
+            query.base_url,
+            query.location,
+            max_pages=query.max_pages,
+            day_range_limit=query.day_range_limit,
+            fetch_mode=query.fetch_mode
+        )
+    else:
+        background_tasks.add_task(scrape_job_listings, queries)
+    return {}
+
+def get_scrape_queue(request: Request) -> ScrapeQueue:
+    scrape_queue = getattr(request.app.state, "scrape_queue", None)
+    if scrape_queue is None:
+        raise HTTPException(status_code=HTTP_STATUS_NOT_FOUND, detail="Scrape queue is disabled (SCRAPE_WORKERS=0)")
+    return scrape_queue
+
 @app.get("/")
 def root() -> dict:
     return {"message": "Python backend is running!"}
 
+@app.get("/llm-stats")
+def llm_stats() -> dict:
+    page_pool = page_pool_stats.counters()
+    request_filter = request_filter_stats.counters()
+    return {
+        "scheduler": scheduler.stats(),
+        "cache": llm_cache.stats(),
+        "json_blocks": json_block_stats.counters(),
+        "browser_pool": browser_pool.counters(),
+        "page_pool": {**page_pool, **page_pool_averages(page_pool)},
+        "request_filter": {**request_filter, **request_filter_averages(request_filter)},
+        "http_fetch": http_fetch_stats.counters(),
+        "listing_parser": listing_parse_stats.counters(),
+        "early_termination": termination_stats.counters(),
+    }
+
 @app.get("/cron-daily-scrape")
 async def cron_daily_scrape(
+    request: Request,
     background_tasks: BackgroundTasks,
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
 ) -> JSONResponse:
     get_validated_token(credentials)
-    job_title = "junior software engineer"
-    location = "sydney"
-    max_pages = 1
-
-    base_url = f"https://www.seek.com.au/jobs?keywords={job_title}&where={location}&sortmode=ListedDate"
+    query = ScrapeQuery(job_title="junior software engineer", location="sydney", max_pages=1)
 
     try:
         await delete_all_jobs_from_node()
     except Exception:
         logger.exception("Failed to clear existing jobs before scrape.")
 
-    background_tasks.add_task(
-        scrape_job_listing,
-        base_url,
-        location,
-        max_pages=max_pages,
-        day_range_limit=DAY_RANGE_LIMIT
-    )
+    scheduled = schedule_scrape(request, background_tasks, [query])
 
-    return JSONResponse(content={"status": "Scheduled daily scrape"}, status_code=202)
+    return JSONResponse(content={"status": "Scheduled daily scrape", **scheduled}, status_code=202)
 
 # Manual scraping trigger
 @app.post("/start-scraping")
 async def start_scraping(request: Request, background_tasks: BackgroundTasks) -> JSONResponse:
     try:
-        data = await request.json()
-        job_title = data.get("job_title", "software engineer")
-        location = data.get("location", "sydney")
-        max_pages = data.get("max_pages")
-        day_range_limit = data.get("day_range_limit")
-        base_url = f"https://www.seek.com.au/jobs?keywords={job_title}&where={location}&sortmode=ListedDate"
+        query = parse_scrape_query(await request.json())
 
-        background_tasks.add_task(
-            scrape_job_listing,
-            base_url,
-            location,
-            max_pages=int(max_pages) if max_pages is not None else None,
-            day_range_limit=int(day_range_limit) if day_range_limit is not None else DAY_RANGE_LIMIT
-        )
+        scheduled = schedule_scrape(request, background_tasks, [query])
 
-        return JSONResponse(content={"status": "Manual scraping started"}, status_code=202)
+        return JSONResponse(content={"status": "Manual scraping started", **scheduled}, status_code=202)
 
     except Exception as e:
         logger.exception("Error triggering scraping.")
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
+# Several searches through one browser, crawler and worker pool; jobs listed by more than one query are parsed once
+@app.post("/start-batch-scraping")
+async def start_batch_scraping(request: Request, background_tasks: BackgroundTasks) -> JSONResponse:
+    try:
+        data = await request.json()
+        queries = [parse_scrape_query(query) for query in data.get("queries") or []]
+        if not queries:
+            return JSONResponse(content={"error": "No queries provided"}, status_code=HTTP_STATUS_BAD_REQUEST)
+
+        scheduled = schedule_scrape(request, background_tasks, queries)
 
+        return JSONResponse(
+            content={"status": f"Batch scraping started for {len(queries)} queries", **scheduled}, status_code=202
+        )
+
+    except Exception as e:
+        logger.exception("Error triggering batch scraping.")
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+@app.get("/scrape-queue")
+def scrape_queue_status(request: Request) -> dict:
+    scrape_queue = get_scrape_queue(request)
+    return {
+        "tasks": scrape_queue.counts(),
+        "recent": [task.to_dict() for task in scrape_queue.recent()],
+        "workers": request.app.state.scrape_supervisor.status(),
+    }
+
+@app.get("/scrape-queue/{task_id}")
+def scrape_task_status(request: Request, task_id: int) -> dict:
+    task = get_scrape_queue(request).get(task_id)
+    if task is None:
+        raise HTTPException(status_code=HTTP_STATUS_NOT_FOUND, detail=f"No scrape task {task_id}")
+    return task.to_dict()
+
+@app.post("/scrape-workers")
+async def scale_scrape_workers(
+    request: Request,
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+) -> dict:
+    get_validated_token(credentials)
+    get_scrape_queue(request)
+    data = await request.json()
+    supervisor = request.app.state.scrape_supervisor
+    supervisor.scale(int(data["workers"]))
+    return supervisor.status()
 
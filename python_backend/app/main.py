@@ -1,71 +1,156 @@
 import asyncio
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from functools import wraps
 
 from clients.node_client import send_scrape_summary_to_node
-from crawl4ai import AsyncWebCrawler
-from markdown.fetcher import fetch_page_markdown
-from pages.context import setup_scraping_context, teardown_scraping_context
-from pages.listing_handler import scrape_pages
-from utils.constants import CONCURRENT_JOBS_NUM, DAY_RANGE_LIMIT, TOTAL_JOBS_PER_PAGE
-from utils.context import ScrapeContext
+from concurrency.job_runner import termination_stats
+from jobs.classifier import rule_engine_stats, rule_hit_rate
+from jobs.parser import json_block_stats
+from jobs.store import SeenJobStore, get_job_store_path
+from llm.parser import llm_cache, scheduler
+from markdown.trimmer import markdown_trim_stats
+from pages.browser_pool import BrowserFallback, browser_pool
+from pages.http_fetch import create_page_http_client, get_fetch_mode, http_fetch_stats
+from pages.listing_handler import fetch_listing_page, scrape_pages
+from pages.listing_parser import listing_parse_stats
+from pages.pool import page_pool_averages, page_pool_stats
+from pages.request_filter import request_filter_averages, request_filter_stats
+from utils.constants import (
+    CONCURRENT_JOBS_NUM,
+    DAY_RANGE_LIMIT,
+    FETCH_MODE_BROWSER,
+    FETCH_MODE_HTTP,
+    MAX_QUERIES_IN_FLIGHT,
+    TOTAL_JOBS_PER_PAGE,
+)
+from utils.context import JobClaims, ScrapeContext, ScrapeQuery
+from utils.load_sampler import load_sampler
 from utils.sentry import sentry_sdk
-from utils.utils import get_total_job_count, get_total_pages
+from utils.utils import get_total_pages
 
 logger = logging.getLogger(__name__)
 
-async def scrape_job_listing(
+# Run summaries are the difference between two snapshots of process-wide counters, so two scrapes running at
+# once in one process would count each other's work; runs in the same process take turns instead
+_run_lock: asyncio.Lock | None = None
+_run_lock_loop: asyncio.AbstractEventLoop | None = None
+
+def get_run_lock() -> asyncio.Lock:
+    global _run_lock, _run_lock_loop  # noqa: PLW0603
+    loop = asyncio.get_running_loop()
+    if _run_lock is None or _run_lock_loop is not loop:
+        _run_lock = asyncio.Lock()
+        _run_lock_loop = loop
+    return _run_lock
+
+def one_run_per_process(scrape: Callable[..., Awaitable[dict]]) -> Callable[..., Awaitable[dict]]:
+    @wraps(scrape)
+    async def run_exclusively(*args: object, **kwargs: object) -> dict:
+        run_lock = get_run_lock()
+        if run_lock.locked():
+            logger.info("Another scrape is running in this process, %s waits for it to finish", scrape.__name__)
+        async with run_lock:
+            return await scrape(*args, **kwargs)
+    return run_exclusively
+
+def counters_since(before: dict, after: dict) -> dict:
+    return {name: round(after[name] - before[name], 3) for name in before}
+
+def snapshot_run_counters() -> dict:
+    return {
+        "llm_cache": llm_cache.stats(),
+        "llm_scheduler": scheduler.counters(),
+        "markdown_trimmer": markdown_trim_stats.counters(),
+        "json_blocks": json_block_stats.counters(),
+        "rule_engine": rule_engine_stats.counters(),
+        "browser_pool": browser_pool.counters(),
+        "page_pool": page_pool_stats.counters(),
+        "request_filter": request_filter_stats.counters(),
+        "http_fetch": http_fetch_stats.counters(),
+        "listing_parser": listing_parse_stats.counters(),
+        "early_termination": termination_stats.counters(),
+    }
+
+def summarize_run_counters(before: dict, job_store: SeenJobStore) -> dict:
+    after = snapshot_run_counters()
+    summary = {"job_store": job_store.stats()}
+    for name, counters in before.items():
+        summary[name] = counters_since(counters, after[name])
+    summary["rule_engine"]["hit_rate"] = rule_hit_rate(summary["rule_engine"])
+    summary["page_pool"].update(page_pool_averages(summary["page_pool"]))
+    summary["request_filter"].update(
+        request_filter_averages(summary["request_filter"])
+    )
+    return summary
+
+@asynccontextmanager
+async def fetch_backend(fetch_mode: str) -> AsyncIterator[dict]:
+    """Yield the ScrapeContext fields that fetch pages for a run in the given fetch mode."""
+    if fetch_mode == FETCH_MODE_BROWSER:
+        async with browser_pool.lease() as resources:
+            yield {"crawler": resources.crawler, "page_pool": resources.page_pool}
+        return
+
+    browser_fallback = BrowserFallback(browser_pool)
+    try:
+        async with create_page_http_client() as http_client:
+            yield {"crawler": None, "page_pool": None, "http_client": http_client, "browser_fallback": browser_fallback}
+    finally:
+        await browser_fallback.close()
+
+async def scrape_search(base_url: str, ctx: ScrapeContext, pagesize: int, max_pages: int | None) -> tuple[dict, bool]:
+    """Scrape one search, returning its summary and whether any listing pages were scraped."""
+    listing = await fetch_listing_page(base_url, ctx, 1)
+    if not listing:
+        return {"message": "No job search markdown found. Scraped 0 jobs.", "terminated_early": False}, False
+
+    total_jobs = listing.total_count
+    if total_jobs == 0:
+        return {"message": "No jobs found. Scraped 0 jobs.", "terminated_early": False}, False
+
+    total_pages = get_total_pages(total_jobs, pagesize, max_pages)
+    logger.info("Detected %s jobs — scraping %s pages.", total_jobs, total_pages)
+
+    return await scrape_pages(base_url, ctx, total_pages), True
+
+@one_run_per_process
+async def scrape_job_listing(  # noqa: PLR0913
         base_url: str,
         location_search: str,
         pagesize: int = TOTAL_JOBS_PER_PAGE,
         max_pages: int | None = None,
-        day_range_limit: int = DAY_RANGE_LIMIT
+        day_range_limit: int = DAY_RANGE_LIMIT,
+        fetch_mode: str | None = None
     ) -> dict:
     async def return_and_report(summary: dict):
         await send_scrape_summary_to_node(summary)
         return summary
 
-    try:
-        async with AsyncWebCrawler() as crawler:
-            logger.info("AsyncWebCrawler initialized successfully!")
-            playwright, browser, page_pool = await setup_scraping_context()
-
-            try:
-                markdown = await fetch_page_markdown(base_url, crawler, 1)
-                if not markdown:
-                    return await return_and_report({
-                        "message": "No job search markdown found. Scraped 0 jobs.",
-                        "terminated_early": False
-                    })
-
-                total_jobs = get_total_job_count(markdown)
-                if total_jobs == 0:
-                    return await return_and_report({
-                        "message": "No jobs found. Scraped 0 jobs.",
-                        "terminated_early": False
-                    })
-
-                total_pages = get_total_pages(total_jobs, pagesize, max_pages)
-                logger.info("Detected %s jobs — scraping %s pages.", total_jobs, total_pages)
-
-                terminate_event = asyncio.Event()
-                semaphore = asyncio.Semaphore(CONCURRENT_JOBS_NUM)
+    run_counters = snapshot_run_counters()
 
+    try:
+        fetch_mode = get_fetch_mode(fetch_mode)
+        with SeenJobStore(get_job_store_path()) as job_store:
+            async with load_sampler, fetch_backend(fetch_mode) as fetchers:
                 ctx = ScrapeContext(
-                    crawler=crawler,
-                    page_pool=page_pool,
+                    **fetchers,
                     location_search=location_search,
-                    terminate_event=terminate_event,
-                    semaphore=semaphore,
-                    day_range_limit=day_range_limit
+                    terminate_event=asyncio.Event(),
+                    semaphore=asyncio.Semaphore(CONCURRENT_JOBS_NUM),
+                    day_range_limit=day_range_limit,
+                    job_store=job_store,
+                    # Listings shift as new jobs are posted, so the same job can show up on two pages of one search
+                    job_claims=JobClaims()
                 )
-
-                scrape_summary = await scrape_pages(base_url, ctx, total_pages)
+                scrape_summary, scraped = await scrape_search(base_url, ctx, pagesize, max_pages)
+                if scraped:
+                    scrape_summary.update(fetch_mode=fetch_mode, **summarize_run_counters(run_counters, job_store))
 
                 return await return_and_report(scrape_summary)
 
-            finally:
-                await teardown_scraping_context(playwright, browser, page_pool)
-
     except Exception as e:
         sentry_sdk.set_tag("component", "scrape_job_listing")
         sentry_sdk.set_extra("base_url", base_url)
@@ -74,15 +159,87 @@ async def scrape_job_listing(
 
         return await return_and_report({
             "message": f"Fatal error during job scrape: {type(e).__name__}: {e}",
-            "terminated_early": False
+            "terminated_early": False,
+            "error": f"{type(e).__name__}: {e}",
         })
 
+async def scrape_batch_query(
+    query: ScrapeQuery,
+    shared_ctx: ScrapeContext,
+    query_slots: asyncio.Semaphore,
+    pagesize: int,
+) -> dict:
+    # Crawler, pages, worker slots and job claims are shared; day range termination stays per query
+    ctx = replace(
+        shared_ctx,
+        location_search=query.location,
+        terminate_event=asyncio.Event(),
+        job_tasks={},
+        day_range_limit=query.day_range_limit,
+    )
+    async with query_slots:
+        try:
+            summary, _ = await scrape_search(query.base_url, ctx, pagesize, query.max_pages)
+        except Exception as e:
+            logger.exception("Batch query %r in %r failed.", query.job_title, query.location)
+            with sentry_sdk.push_scope() as scope:
+                scope.set_tag("component", "scrape_batch_query")
+                scope.set_extra("base_url", query.base_url)
+                sentry_sdk.capture_exception(e)
+            summary = {"message": f"Query failed: {type(e).__name__}: {e}", "terminated_early": False}
+
+    return {"job_title": query.job_title, "location": query.location, **summary}
+
+@one_run_per_process
+async def scrape_job_listings(queries: list, pagesize: int = TOTAL_JOBS_PER_PAGE) -> dict:
+    """Scrape several searches through one crawler, browser and worker pool.
+
+    Jobs listed by more than one query are fetched and parsed once, by whichever query reaches them first.
+    """
+    async def return_and_report(summary: dict):
+        await send_scrape_summary_to_node(summary)
+        return summary
 
+    run_counters = snapshot_run_counters()
 
+    try:
+        # The run shares one fetch backend, so it skips the browser only when every query asks for HTTP
+        fetch_modes = {get_fetch_mode(query.fetch_mode) for query in queries}
+        fetch_mode = FETCH_MODE_HTTP if fetch_modes == {FETCH_MODE_HTTP} else FETCH_MODE_BROWSER
+        with SeenJobStore(get_job_store_path()) as job_store:
+            async with load_sampler, fetch_backend(fetch_mode) as fetchers:
+                job_claims = JobClaims()
+                shared_ctx = ScrapeContext(
+                    **fetchers,
+                    location_search="",
+                    terminate_event=asyncio.Event(),
+                    semaphore=asyncio.Semaphore(CONCURRENT_JOBS_NUM),
+                    day_range_limit=DAY_RANGE_LIMIT,
+                    job_store=job_store,
+                    job_claims=job_claims,
+                )
+                query_slots = asyncio.Semaphore(MAX_QUERIES_IN_FLIGHT)
+                query_summaries = await asyncio.gather(*(
+                    scrape_batch_query(query, shared_ctx, query_slots, pagesize) for query in queries
+                ))
+
+                return await return_and_report({
+                    "message": f"Scraped {len(queries)} queries, skipping {job_claims.duplicates} duplicate jobs.",
+                    "terminated_early": any(summary["terminated_early"] for summary in query_summaries),
+                    "queries": query_summaries,
+                    "job_claims": job_claims.counters(),
+                    "fetch_mode": fetch_mode,
+                    **summarize_run_counters(run_counters, job_store),
+                })
 
+    except Exception as e:
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "scrape_job_listings")
+            scope.set_extra("query_count", len(queries))
+            sentry_sdk.capture_exception(e)
 
-
-
-
-
-
+        return await return_and_report({
+            "message": f"Fatal error during batch job scrape: {type(e).__name__}: {e}",
+            "terminated_early": False,
+            "error": f"{type(e).__name__}: {e}",
+        })
@@ -0,0 +1,249 @@
+"""Scrape worker processes fed from the SQLite scrape queue.
+
+Run standalone from python_backend/:
+    python -m app.workers --workers 2
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing.context import SpawnProcess
+from multiprocessing.synchronize import Event
+
+from app.main import scrape_job_listing, scrape_job_listings
+from clients.node_client import close_node_client, open_node_client
+from concurrency.scrape_queue import ScrapeQueue, ScrapeTask, get_scrape_queue_path
+from llm.parser import close_llm_client, open_llm_client
+from logging_config import setup_logging
+from pages.browser_pool import browser_pool, is_warm_browser_pool_enabled
+from utils.constants import (
+    SCRAPE_QUEUE_POLL_INTERVAL,
+    SCRAPE_WORKER_MONITOR_INTERVAL,
+    SCRAPE_WORKER_STOP_TIMEOUT,
+    SCRAPE_WORKERS,
+)
+from utils.sentry import sentry_sdk
+
+logger = logging.getLogger(__name__)
+
+
+def get_scrape_worker_count() -> int:
+    return int(os.getenv("SCRAPE_WORKERS", str(SCRAPE_WORKERS)))
+
+async def run_scrape_task(task: ScrapeTask) -> dict:
+    if len(task.queries) == 1:
+        query = task.queries[0]
+        return await scrape_job_listing(
+            query.base_url,
+            query.location,
+            max_pages=query.max_pages,
+            day_range_limit=query.day_range_limit,
+            fetch_mode=query.fetch_mode
+        )
+    return await scrape_job_listings(task.queries)
+
+async def renew_lease(scrape_queue: ScrapeQueue, task: ScrapeTask, worker_id: str, scrape: asyncio.Task) -> None:
+    while True:
+        await asyncio.sleep(scrape_queue.lease_seconds / 3)
+        if not scrape_queue.heartbeat(task.task_id, worker_id):
+            # Another worker has reclaimed the task, so carrying on would only scrape the same search twice
+            logger.warning("Worker %s lost the lease on scrape task %s, stopping it", worker_id, task.task_id)
+            scrape.cancel()
+            return
+
+def record_outcome(scrape_queue: ScrapeQueue, task: ScrapeTask, worker_id: str, summary: dict) -> None:
+    # Fatal scrape errors are caught and reported as a summary, which carries the error for the queue
+    if summary.get("error"):
+        recorded = scrape_queue.fail(task.task_id, worker_id, summary["error"])
+    else:
+        recorded = scrape_queue.complete(task.task_id, worker_id, summary)
+    if not recorded:
+        logger.warning("Worker %s no longer owns scrape task %s, outcome discarded", worker_id, task.task_id)
+
+async def run_claimed_task(scrape_queue: ScrapeQueue, task: ScrapeTask, worker_id: str) -> None:
+    logger.info("Worker %s running scrape task %s", worker_id, task.task_id)
+    scrape = asyncio.create_task(run_scrape_task(task))
+    heartbeat = asyncio.create_task(renew_lease(scrape_queue, task, worker_id, scrape))
+    try:
+        summary = await scrape
+    except asyncio.CancelledError:
+        if not heartbeat.done() or heartbeat.cancelled():
+            raise
+        logger.info("Scrape task %s abandoned by %s after losing its lease", task.task_id, worker_id)
+    except Exception as e:
+        logger.exception("Scrape task %s failed", task.task_id)
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "run_claimed_task")
+            scope.set_extra("task_id", task.task_id)
+            scope.set_extra("worker_id", worker_id)
+            sentry_sdk.capture_exception(e)
+        record_outcome(scrape_queue, task, worker_id, {"error": f"{type(e).__name__}: {e}"})
+    else:
+        record_outcome(scrape_queue, task, worker_id, summary)
+    finally:
+        scrape.cancel()
+        heartbeat.cancel()
+        await asyncio.gather(scrape, heartbeat, return_exceptions=True)
+
+async def worker_loop(
+    worker_id: str,
+    queue_path: str,
+    stop_event: Event,
+    poll_interval: float = SCRAPE_QUEUE_POLL_INTERVAL,
+) -> None:
+    # Each worker owns its event loop, node and LLM clients and browser; the stop event is only checked between tasks
+    await open_node_client()
+    await open_llm_client()
+    if is_warm_browser_pool_enabled():
+        await browser_pool.start()
+    try:
+        with ScrapeQueue(queue_path) as scrape_queue:
+            while not stop_event.is_set():
+                task = scrape_queue.claim(worker_id)
+                if task is None:
+                    await asyncio.sleep(poll_interval)
+                    continue
+                await run_claimed_task(scrape_queue, task, worker_id)
+    finally:
+        await browser_pool.close()
+        await close_llm_client()
+        await close_node_client()
+
+def run_worker(worker_id: str, queue_path: str, stop_event: Event) -> None:
+    setup_logging()
+    logger.info("Scrape worker %s started (pid %s)", worker_id, os.getpid())
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(worker_loop(worker_id, queue_path, stop_event))
+    logger.info("Scrape worker %s stopped", worker_id)
+
+
+@dataclass
+class WorkerHandle:
+    worker_id: str
+    process: SpawnProcess
+    stop_event: Event
+    started_at: float
+
+
+class ScrapeWorkerSupervisor:
+    def __init__(self, queue_path: str, worker_count: int = SCRAPE_WORKERS) -> None:
+        """Initialize a ScrapeWorkerSupervisor instance.
+
+        Args:
+            queue_path (str): SQLite scrape queue shared with whoever enqueues tasks.
+            worker_count (int): Worker processes to keep running; change it later with scale().
+
+        """
+        self.queue_path = queue_path
+        self.worker_count = worker_count
+        # Spawned rather than forked so no worker inherits the parent's event loop or open sockets
+        self.mp = multiprocessing.get_context("spawn")
+        self.workers: dict = {}
+        self.retiring: dict = {}
+        self.spawned = 0
+        self.restarts = 0
+
+    def start(self) -> None:
+        self.scale(self.worker_count)
+
+    def spawn_worker(self) -> WorkerHandle:
+        self.spawned += 1
+        worker_id = f"worker-{self.spawned}"
+        stop_event = self.mp.Event()
+        process = self.mp.Process(
+            target=run_worker, args=(worker_id, self.queue_path, stop_event), name=worker_id, daemon=True
+        )
+        process.start()
+        handle = WorkerHandle(worker_id, process, stop_event, time.time())
+        self.workers[worker_id] = handle
+        return handle
+
+    def scale(self, worker_count: int) -> None:
+        self.worker_count = max(worker_count, 0)
+        while len(self.workers) < self.worker_count:
+            self.spawn_worker()
+        # Newest workers retire first; they finish their current task before exiting
+        for worker_id in sorted(self.workers, key=lambda w: self.workers[w].started_at)[self.worker_count:]:
+            handle = self.workers.pop(worker_id)
+            handle.stop_event.set()
+            self.retiring[worker_id] = handle
+        logger.info("Scrape workers scaled to %s", self.worker_count)
+
+    def reap(self) -> int:
+        for worker_id, handle in list(self.retiring.items()):
+            if not handle.process.is_alive():
+                handle.process.join()
+                del self.retiring[worker_id]
+
+        restarted = 0
+        for worker_id, handle in list(self.workers.items()):
+            if handle.process.is_alive():
+                continue
+            logger.warning("Scrape worker %s exited with code %s, restarting", worker_id, handle.process.exitcode)
+            handle.process.join()
+            del self.workers[worker_id]
+            self.spawn_worker()
+            restarted += 1
+        self.restarts += restarted
+        return restarted
+
+    async def monitor(self, interval: float = SCRAPE_WORKER_MONITOR_INTERVAL) -> None:
+        while True:
+            self.reap()
+            await asyncio.sleep(interval)
+
+    def stop(self, timeout: float = SCRAPE_WORKER_STOP_TIMEOUT) -> None:
+        handles = [*self.workers.values(), *self.retiring.values()]
+        for handle in handles:
+            handle.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for handle in handles:
+            handle.process.join(max(deadline - time.monotonic(), 0))
+            if handle.process.is_alive():
+                # The queue lease expires and another worker picks the task up again
+                logger.warning("Scrape worker %s did not stop in time, terminating", handle.worker_id)
+                handle.process.terminate()
+                handle.process.join()
+        self.workers.clear()
+        self.retiring.clear()
+
+    def status(self) -> dict:
+        return {
+            "target": self.worker_count,
+            "restarts": self.restarts,
+            "workers": [
+                {
+                    "worker_id": handle.worker_id,
+                    "pid": handle.process.pid,
+                    "alive": handle.process.is_alive(),
+                    "retiring": worker_id in self.retiring,
+                }
+                for worker_id, handle in [*self.workers.items(), *self.retiring.items()]
+            ],
+        }
+
+
+async def supervise(worker_count: int) -> None:
+    supervisor = ScrapeWorkerSupervisor(get_scrape_queue_path(), worker_count)
+    supervisor.start()
+    try:
+        await supervisor.monitor()
+    finally:
+        supervisor.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run scrape worker processes against the SQLite scrape queue.")
+    parser.add_argument("--workers", type=int, default=max(get_scrape_worker_count(), 1))
+    args = parser.parse_args()
+
+    setup_logging()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(supervise(args.workers))
+
+
+if __name__ == "__main__":
+    main()
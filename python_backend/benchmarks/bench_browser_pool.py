@@ -0,0 +1,51 @@
+"""Compare the time a scrape waits for its browser, page pool and crawler: launched per scrape against leased warm.
+
+Run from python_backend/:
+    python -m benchmarks.bench_browser_pool
+"""
+import asyncio
+import logging
+import time
+
+from pages.browser_pool import BrowserPool
+
+logger = logging.getLogger(__name__)
+
+ROUNDS = 3
+
+
+async def time_leases(pool: BrowserPool) -> list:
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        async with pool.lease():
+            timings.append(time.perf_counter() - started)
+    return timings
+
+async def run() -> None:
+    cold = await time_leases(BrowserPool())
+
+    warm_pool = BrowserPool()
+    await warm_pool.start()
+    await warm_pool.warming
+    try:
+        warm = await time_leases(warm_pool)
+    finally:
+        await warm_pool.close()
+
+    for label, timings in (("per scrape", cold), ("warm lease", warm)):
+        logger.info(
+            "%-10s %s ms (mean %.1f ms)",
+            label,
+            ", ".join(f"{timing * 1000:.1f}" for timing in timings),
+            sum(timings) / len(timings) * 1000,
+        )
+    logger.info("Pool counters: %s", warm_pool.counters())
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,85 @@
+"""Compare JSON block extraction from LLM responses: the old non-greedy regex against the brace scanner.
+
+Run from python_backend/:
+    python -m benchmarks.bench_json_blocks
+"""
+import json
+import logging
+import re
+import time
+from collections.abc import Callable
+
+from jobs.parser import clean_repair_parse_json, json_block_stats, parse_json_block_from_text
+from tests.data.sample_job_json_strings import MALFORMED_JSON_STRING, VALID_JSON_STRING
+
+logger = logging.getLogger(__name__)
+
+ROUNDS = 200
+
+# Response shapes seen from the parse prompt, built around the sample strings
+NESTED_JSON_STRING = VALID_JSON_STRING.replace(
+    '"work_model": "On-site",', '"work_model": "On-site",\n    "salary": {"min": 90000, "max": 110000},'
+)
+RESPONSES = {
+    "valid": VALID_JSON_STRING,
+    "wrapped in prose": f"Here is the extracted job posting data:\n{VALID_JSON_STRING}\nLet me know if you need more.",
+    "code fence": f"```json\n{VALID_JSON_STRING}\n```",
+    "nested object": NESTED_JSON_STRING,
+    "brace in string": VALID_JSON_STRING.replace("Must have Australian", "Must have {Australian}"),
+    "truncated": VALID_JSON_STRING[:-40],
+    "malformed": MALFORMED_JSON_STRING,
+}
+
+
+def close_missing_brace(response: str) -> str:
+    return response + "}" if response.count("{") > response.count("}") else response
+
+def legacy_parse(response: str) -> tuple[dict | None, bool]:
+    # The previous implementation: first "{" to the first "}", repaired whenever json.loads fails
+    match = re.search(r"\{.*?\}", response, re.DOTALL)
+    if not match:
+        match = re.search(r"\{.*?\}", close_missing_brace(response), re.DOTALL)
+    if not match:
+        return None, False
+    try:
+        return json.loads(match.group(0)), False
+    except json.JSONDecodeError:
+        return clean_repair_parse_json(match.group(0)), True
+
+def time_per_response(parse: Callable[[str], object], response: str) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse(response)
+    return (time.perf_counter() - started) / ROUNDS
+
+def main() -> None:
+    legacy_repairs = 0
+    scanner_repairs = 0
+    for name, response in RESPONSES.items():
+        legacy_result, legacy_repaired = legacy_parse(response)
+        legacy_repairs += legacy_repaired
+
+        repaired_before = json_block_stats.repaired
+        scanner_result = parse_json_block_from_text(response)
+        scanner_repaired = json_block_stats.repaired > repaired_before
+        scanner_repairs += scanner_repaired
+
+        logger.info(
+            "%-16s legacy %7.3f ms %-8s %2s keys | scanner %7.3f ms %-8s %2s keys",
+            name,
+            time_per_response(legacy_parse, response) * 1000,
+            "repaired" if legacy_repaired else "decoded",
+            len(legacy_result) if isinstance(legacy_result, dict) else 0,
+            time_per_response(parse_json_block_from_text, response) * 1000,
+            "repaired" if scanner_repaired else "decoded",
+            len(scanner_result) if isinstance(scanner_result, dict) else 0,
+        )
+
+    logger.info(
+        "Repair rate: legacy %s/%s, scanner %s/%s", legacy_repairs, len(RESPONSES), scanner_repairs, len(RESPONSES)
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
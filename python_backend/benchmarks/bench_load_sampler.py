@@ -0,0 +1,59 @@
+"""Measure how long backoff_if_high_cpu stalls the event loop.
+
+Run from python_backend/:
+    python -m benchmarks.bench_load_sampler
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import psutil
+from utils.load_sampler import load_sampler
+from utils.utils import backoff_if_high_cpu
+
+logger = logging.getLogger(__name__)
+
+CALLS = 20
+TICK_SECONDS = 0.001
+
+
+async def blocking_backoff() -> None:
+    # The previous implementation: psutil sleeps inside the call, freezing every coroutine
+    psutil.cpu_percent(interval=0.1)
+
+async def measure_loop_stall(backoff: Callable[[], Awaitable[None]]) -> tuple[float, float]:
+    worst_lag = 0.0
+    stop = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal worst_lag
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            worst_lag = max(worst_lag, time.perf_counter() - started - TICK_SECONDS)
+
+    ticker_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        await backoff()
+        await asyncio.sleep(TICK_SECONDS)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker_task
+    return elapsed, worst_lag
+
+async def main() -> None:
+    blocking_elapsed, blocking_lag = await measure_loop_stall(blocking_backoff)
+    async with load_sampler:
+        sampled_elapsed, sampled_lag = await measure_loop_stall(
+            lambda: backoff_if_high_cpu(soft_limit=101, hard_limit=101, rss_limit_mb=float("inf"))
+        )
+
+    logger.info("%s backoff checks", CALLS)
+    logger.info("blocking psutil:   total %.3fs, worst loop stall %.1f ms", blocking_elapsed, blocking_lag * 1000)
+    logger.info("background sampler: total %.3fs, worst loop stall %.1f ms", sampled_elapsed, sampled_lag * 1000)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(main())
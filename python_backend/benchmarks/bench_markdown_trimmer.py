@@ -0,0 +1,54 @@
+"""Report the prompt tokens markdown trimming saves on the labelled job postings.
+
+Run from python_backend/:
+    python -m benchmarks.bench_markdown_trimmer
+"""
+import logging
+import time
+from pathlib import Path
+
+import yaml
+from markdown.trimmer import MarkdownTrimStats, trim_job_markdown
+from utils.constants import MARKDOWN_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_PATH = Path(__file__).parent.parent / "tests" / "data" / "test_groq_job_data.yaml"
+TOKEN_BUDGETS = [MARKDOWN_TOKEN_BUDGET, 1000, 500]
+ROUNDS = 200
+
+
+def load_labelled_jobs() -> list:
+    with FIXTURE_PATH.open(encoding="utf-8") as f:
+        return yaml.safe_load(f)["tests"]
+
+def main() -> None:
+    cases = load_labelled_jobs()
+
+    for case in cases:
+        result = trim_job_markdown(case["markdown"])
+        logger.info(
+            "%-45s %5s -> %5s tokens", case["expected"].get("title", ""), result.original_tokens, result.trimmed_tokens
+        )
+
+    for token_budget in TOKEN_BUDGETS:
+        stats = MarkdownTrimStats()
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            for case in cases:
+                trim_job_markdown(case["markdown"], token_budget=token_budget)
+        per_job = (time.perf_counter() - started) / (ROUNDS * len(cases))
+
+        for case in cases:
+            stats.record(trim_job_markdown(case["markdown"], token_budget=token_budget))
+        counters = stats.counters()
+        logger.info(
+            "Budget %5s: saved %s of %s tokens (%.0f%%), %.3f ms per job",
+            token_budget, counters["tokens_saved"], counters["tokens_in"],
+            counters["tokens_saved"] / counters["tokens_in"] * 100, per_job * 1000,
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,56 @@
+"""Compare per-call and shared Node clients when inserting page batches.
+
+Run from python_backend/:
+    python -m benchmarks.bench_node_client
+"""
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+from clients.node_client import close_node_client, open_node_client, send_page_jobs_to_node
+from tests.stubs.node_stub_server import NodeStubServer
+
+logger = logging.getLogger(__name__)
+
+BATCHES = 50
+JOBS_PER_BATCH = [{"title": f"job {i}", "description": "x" * 500} for i in range(22)]
+
+
+async def time_batches() -> list[float]:
+    latencies = []
+    for _ in range(BATCHES):
+        started = time.perf_counter()
+        await send_page_jobs_to_node(JOBS_PER_BATCH)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def describe(latencies: list[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"median {statistics.median(ordered) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms"
+
+async def main() -> None:
+    with NodeStubServer() as stub:
+        os.environ["NODE_BACKEND_URL"] = stub.base_url
+
+        per_call = await time_batches()
+        per_call_connections = len(stub.connections)
+        stub.connections.clear()
+
+        await open_node_client()
+        try:
+            shared = await time_batches()
+        finally:
+            await close_node_client()
+        shared_connections = len(stub.connections)
+
+    logger.info("%s page batches of %s jobs", BATCHES, len(JOBS_PER_BATCH))
+    logger.info("client per call: %s, %s connections", describe(per_call), per_call_connections)
+    logger.info("shared client:   %s, %s connections", describe(shared), shared_connections)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    asyncio.run(main())
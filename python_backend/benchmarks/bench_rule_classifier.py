@@ -0,0 +1,57 @@
+"""Measure how many labelled jobs the work model / experience level rules settle without the LLM.
+
+Run from python_backend/:
+    python -m benchmarks.bench_rule_classifier
+"""
+import logging
+import time
+from pathlib import Path
+
+import yaml
+from jobs.classifier import RuleEngineStats, classify_experience_level, classify_work_model, rule_hit_rate
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_PATH = Path(__file__).parent.parent / "tests" / "data" / "test_groq_job_data.yaml"
+ROUNDS = 200
+
+
+def load_labelled_jobs() -> list:
+    with FIXTURE_PATH.open(encoding="utf-8") as f:
+        return yaml.safe_load(f)["tests"]
+
+def main() -> None:
+    cases = load_labelled_jobs()
+    stats = RuleEngineStats()
+    correct = {"work_model": 0, "experience_level": 0}
+
+    for case in cases:
+        expected = case["expected"]
+        title = expected.get("title", "")
+        for field, classification, expected_value in (
+            ("work_model", classify_work_model(title, case["markdown"]), expected["work_model"].lower()),
+            ("experience_level", classify_experience_level(title, case["markdown"]), expected["experience_level"]),
+        ):
+            stats.record(field, classification)
+            if classification.is_confident and classification.value.lower() == expected_value:
+                correct[field] += 1
+            logger.info("%-45s %-16s %-14s %s", title, field, classification.value, classification.confidence)
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for case in cases:
+            title = case["expected"].get("title", "")
+            classify_work_model(title, case["markdown"])
+            classify_experience_level(title, case["markdown"])
+    per_job = (time.perf_counter() - started) / (ROUNDS * len(cases))
+
+    counters = stats.counters()
+    for field, correct_count in correct.items():
+        hits = counters[f"{field}_hits"]
+        logger.info("%s: %s/%s settled by rules, %s/%s correct", field, hits, len(cases), correct_count, hits)
+    logger.info("Hit rate %.0f%%, %.3f ms per job for both fields", rule_hit_rate(counters) * 100, per_job * 1000)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
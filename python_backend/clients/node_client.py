@@ -1,10 +1,18 @@
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import httpx
 import sentry_sdk
 from dotenv import load_dotenv
+from utils.constants import (
+    NODE_KEEPALIVE_EXPIRY,
+    NODE_MAX_CONNECTIONS,
+    NODE_MAX_KEEPALIVE_CONNECTIONS,
+    NODE_REQUEST_TIMEOUT,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +20,52 @@ if os.environ.get("FLY_REGION") is None:
     file_path = Path(__file__).parent.parent.parent / ".env"
     load_dotenv(file_path)
 
+# Shared across every scrape running in this process; opened and closed by the FastAPI lifespan
+_shared_client: httpx.AsyncClient | None = None
+
 def get_node_backend_url() -> str:
     return os.getenv("NODE_BACKEND_URL", "http://localhost:3000/api")
 
+def create_node_http_client() -> httpx.AsyncClient:
+    # HTTP/2 is negotiated via ALPN on TLS connections; plain http:// stays on keep-alive HTTP/1.1
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("NODE_MAX_CONNECTIONS", str(NODE_MAX_CONNECTIONS))),
+            max_keepalive_connections=int(
+                os.getenv("NODE_MAX_KEEPALIVE_CONNECTIONS", str(NODE_MAX_KEEPALIVE_CONNECTIONS))
+            ),
+            keepalive_expiry=NODE_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(NODE_REQUEST_TIMEOUT),
+    )
+
+async def open_node_client() -> httpx.AsyncClient:
+    global _shared_client  # noqa: PLW0603
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = create_node_http_client()
+    return _shared_client
+
+async def close_node_client() -> None:
+    global _shared_client  # noqa: PLW0603
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+@asynccontextmanager
+async def node_http_client() -> AsyncIterator[httpx.AsyncClient]:
+    if _shared_client is not None and not _shared_client.is_closed:
+        yield _shared_client
+        return
+
+    # Outside the app lifespan (scripts, one-off runs) fall back to a short-lived client
+    async with create_node_http_client() as client:
+        yield client
+
 async def send_page_jobs_to_node(jobs: dict) -> None:
     url = get_node_backend_url()
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(15.0)) as client:
+        async with node_http_client() as client:
             response = await client.post(
                 f"{url}/jobs/page-batch",
                 json={"jobs": jobs}
@@ -46,7 +93,7 @@ async def send_page_jobs_to_node(jobs: dict) -> None:
 async def delete_all_jobs_from_node() -> None:
     url = get_node_backend_url()
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(15.0)) as client:
+        async with node_http_client() as client:
             response = await client.delete(f"{url}/jobs")
             response.raise_for_status()
 
@@ -80,7 +127,7 @@ async def delete_all_jobs_from_node() -> None:
 async def send_scrape_summary_to_node(summary: dict) -> None:
     url = get_node_backend_url()
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(15.0)) as client:
+        async with node_http_client() as client:
             response = await client.post(
                 f"{url}/jobs/scrape-summary",
                 json=summary
@@ -1,7 +1,7 @@
 import asyncio
 
 import sentry_sdk
-from concurrency.job_runner import process_job_with_semaphore
+from concurrency.job_runner import process_job_with_semaphore, termination_stats
 from utils.constants import SKIPPED, SUCCESS, TERMINATE
 from utils.context import ScrapeContext
 from utils.utils import backoff_if_high_cpu, pause_briefly
@@ -25,18 +25,44 @@ def aggregate_job_results(job_results: list) -> tuple:
 
     return final_jobs, early_termination, n_skipped, n_terminated
 
+async def gather_job_results(tasks: list) -> list:
+    """Wait for every job task; jobs cancelled because an earlier job was stale count as terminated."""
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    job_results = []
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            job_results.append({"status": TERMINATE, "job": None})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            job_results.append(result)
+    return job_results
+
 async def process_jobs_concurrently(job_urls: list, ctx: ScrapeContext, page_num: int) -> tuple:
     tasks = []
+    n_not_started = 0
 
-    for idx, job_url in enumerate(job_urls):
-        await backoff_if_high_cpu()
-        task = asyncio.create_task(
-            process_job_with_semaphore(job_url, idx, ctx)
-        )
-        tasks.append(task)
-        await pause_briefly(0.05, 0.25)
+    try:
+        for idx, job_url in enumerate(job_urls):
+            if ctx.is_terminated(page_num, idx):
+                n_not_started = len(job_urls) - idx
+                termination_stats.not_started += n_not_started
+                break
+            await backoff_if_high_cpu()
+            task = asyncio.create_task(
+                process_job_with_semaphore(job_url, idx, ctx, page_num)
+            )
+            # Registered so a stale job can cancel the ones listed after it, here or on a later page
+            ctx.job_tasks[(page_num, idx)] = task
+            tasks.append(task)
+            await pause_briefly(0.05, 0.25)
 
-    job_results = await asyncio.gather(*tasks)
+        job_results = await gather_job_results(tasks)
+    finally:
+        for idx in range(len(tasks)):
+            ctx.job_tasks.pop((page_num, idx), None)
+    job_results += [{"status": TERMINATE, "job": None}] * n_not_started
 
     final_jobs, early_termination, n_skipped, n_terminated = aggregate_job_results(job_results)
     n_success = len(final_jobs)
@@ -48,6 +74,7 @@ async def process_jobs_concurrently(job_urls: list, ctx: ScrapeContext, page_num
         scope.set_extra("jobs_successful", n_success)
         scope.set_extra("jobs_skipped", n_skipped)
         scope.set_extra("jobs_terminated_early", n_terminated)
+        scope.set_extra("jobs_not_started", n_not_started)
         scope.set_extra("early_termination", early_termination)
         sentry_sdk.capture_message("Scraping job batch completed", level="info")
 
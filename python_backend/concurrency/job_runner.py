@@ -1,15 +1,61 @@
 
-from jobs.enricher import enrich_job
+import asyncio
+import logging
+
+from jobs.enricher import enrich_job, refresh_stored_job
 from jobs.extractor import extract_job_data
-from utils.constants import SUCCESS, TERMINATE
+from utils.constants import SKIPPED, SUCCESS, TERMINATE
 from utils.context import ScrapeContext
-from utils.utils import backoff_if_high_cpu, pause_briefly
+from utils.utils import backoff_if_high_cpu, extract_job_id, is_recent_job, pause_briefly
+
+logger = logging.getLogger(__name__)
+
+
+class TerminationStats:
+    def __init__(self) -> None:
+        """Initialize a TerminationStats instance counting job work skipped once a page proved the rest stale."""
+        self.not_started = 0
+        self.dropped_queued = 0
+        self.cancelled_in_flight = 0
+
+    def counters(self) -> dict:
+        return {
+            "jobs_not_started": self.not_started,
+            "jobs_dropped_queued": self.dropped_queued,
+            "jobs_cancelled_in_flight": self.cancelled_in_flight,
+            "jobs_avoided": self.not_started + self.dropped_queued + self.cancelled_in_flight,
+        }
+
+
+termination_stats = TerminationStats()
 
 
+def reuse_stored_job(job_url: str, ctx: ScrapeContext) -> dict | None:
+    if ctx.job_store is None:
+        return None
+
+    job_id = extract_job_id(job_url)
+    stored_job = ctx.job_store.get(job_id) if job_id else None
+    if stored_job is None or not ctx.job_store.is_fresh(stored_job):
+        return None
+
+    if not is_recent_job(stored_job.record, ctx.day_range_limit):
+        return {"status": TERMINATE, "job": None}
+
+    logger.info("Job %s was parsed recently, re-emitting stored record", job_id)
+    ctx.job_store.mark_reused()
+    return {"status": SUCCESS, "job": refresh_stored_job(stored_job.record, ctx.location_search)}
+
 async def process_job_with_retries(job_url: str, count: int, ctx: ScrapeContext) -> dict:
+    stored_result = reuse_stored_job(job_url, ctx)
+    if stored_result is not None:
+        return stored_result
 
     await backoff_if_high_cpu()
     job_extraction = await extract_job_data(job_url, ctx, count)
+    # Returns before pausing, so jobs listed after a stale one are cut off as soon as it is found
+    if job_extraction["status"] == TERMINATE:
+        return job_extraction
     await pause_briefly(0.05, 0.25)
 
     if job_extraction["status"] != SUCCESS:
@@ -19,11 +65,39 @@ async def process_job_with_retries(job_url: str, count: int, ctx: ScrapeContext)
     await pause_briefly(0.05, 0.25)
     return {"status": SUCCESS, "job": job_data}
 
-async def process_job_with_semaphore(job_url: str, count: int, ctx: ScrapeContext) -> dict:
-    if ctx.terminate_event.is_set():
+async def process_job_with_semaphore(job_url: str, count: int, ctx: ScrapeContext, page_num: int) -> dict:
+    if ctx.is_terminated(page_num, count):
+        termination_stats.dropped_queued += 1
         return {"status": TERMINATE, "job": None}
 
-    async with ctx.semaphore:
-        await backoff_if_high_cpu()
-        await pause_briefly(0.05, 0.25)
-        return await process_job_with_retries(job_url, count, ctx)
+    started = False
+    job_result = None
+    try:
+        async with ctx.semaphore:
+            # Pages are pipelined, so a job may have queued on the semaphore before an earlier page terminated
+            if ctx.is_terminated(page_num, count):
+                termination_stats.dropped_queued += 1
+                return {"status": TERMINATE, "job": None}
+            # Batch queries overlap; whichever query reaches a job first fetches and parses it
+            if ctx.job_claims is not None and not ctx.job_claims.claim(job_url):
+                logger.info("Job %s already claimed by another query in this batch", job_url)
+                return {"status": SKIPPED, "job": None}
+            started = True
+            await backoff_if_high_cpu()
+            await pause_briefly(0.05, 0.25)
+            job_result = await process_job_with_retries(job_url, count, ctx)
+            if job_result["status"] == TERMINATE:
+                ctx.terminate(page_num, count)
+            return job_result
+    except asyncio.CancelledError:
+        if ctx.is_terminated(page_num, count):
+            if started:
+                termination_stats.cancelled_in_flight += 1
+            else:
+                termination_stats.dropped_queued += 1
+        raise
+    finally:
+        # A job that was stale for this query's day range, failed or was cancelled goes back to the batch,
+        # since another query may still want it
+        if started and ctx.job_claims is not None and (job_result is None or job_result["status"] != SUCCESS):
+            ctx.job_claims.release(job_url)
@@ -0,0 +1,221 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from utils.constants import SCRAPE_QUEUE_LEASE_SECONDS, SCRAPE_QUEUE_MAX_ATTEMPTS
+from utils.context import ScrapeQuery
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TASK_STATUSES = [QUEUED, RUNNING, DONE, FAILED]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queries TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    summary TEXT,
+    error TEXT
+)
+"""
+STATUS_INDEX = "CREATE INDEX IF NOT EXISTS scrape_tasks_status ON scrape_tasks (status, task_id)"
+TASK_COLUMNS = (
+    "task_id, queries, status, attempts, worker_id, lease_expires, created_at, started_at, finished_at, summary, error"
+)
+
+
+@dataclass
+class ScrapeTask:
+    task_id: int
+    queries: list
+    status: str
+    attempts: int
+    worker_id: str | None
+    lease_expires: float | None
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+    summary: dict | None
+    error: str | None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "queries": [asdict(query) for query in self.queries]}
+
+
+def get_scrape_queue_path() -> str:
+    return os.getenv("SCRAPE_QUEUE_PATH", str(Path(__file__).parent.parent / "data" / "scrape_queue.sqlite3"))
+
+def row_to_task(row: tuple) -> ScrapeTask:
+    return ScrapeTask(
+        task_id=row[0],
+        queries=[ScrapeQuery(**query) for query in json.loads(row[1])],
+        status=row[2],
+        attempts=row[3],
+        worker_id=row[4],
+        lease_expires=row[5],
+        created_at=row[6],
+        started_at=row[7],
+        finished_at=row[8],
+        summary=json.loads(row[9]) if row[9] is not None else None,
+        error=row[10],
+    )
+
+
+class ScrapeQueue:
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = SCRAPE_QUEUE_LEASE_SECONDS,
+        max_attempts: int = SCRAPE_QUEUE_MAX_ATTEMPTS,
+    ) -> None:
+        """Initialize a ScrapeQueue instance.
+
+        The API process enqueues and the worker processes claim from the same SQLite file. A claimed task holds a
+        lease that its worker renews while scraping; a task whose lease ran out belonged to a worker that crashed
+        or was redeployed, and is handed to the next worker that asks.
+
+        Args:
+            path (str): SQLite database file (``:memory:`` for a queue that lasts only as long as the process).
+            lease_seconds (float): How long a claim stays valid without a heartbeat.
+            max_attempts (int): Claims allowed per task before it is marked failed.
+
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn: sqlite3.Connection | None = None
+
+    def __enter__(self) -> "ScrapeQueue":
+        """Open the database."""
+        self.open()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Close the database."""
+        self.close()
+
+    def open(self) -> None:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly so a claim can take the write lock before it reads
+        self.conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.conn.execute(STATUS_INDEX)
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def enqueue(self, queries: list) -> int:
+        payload = json.dumps([asdict(query) for query in queries])
+        cursor = self.conn.execute(
+            "INSERT INTO scrape_tasks (queries, status, created_at) VALUES (?, ?, ?)",
+            (payload, QUEUED, time.time())
+        )
+        logger.info("Queued scrape task %s with %s queries", cursor.lastrowid, len(queries))
+        return cursor.lastrowid
+
+    def claim(self, worker_id: str) -> ScrapeTask | None:
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.fail_exhausted_leases(now)
+            row = self.conn.execute(
+                f"""
+                UPDATE scrape_tasks
+                SET status = ?, worker_id = ?, attempts = attempts + 1, lease_expires = ?, started_at = ?
+                WHERE task_id = (
+                    SELECT task_id FROM scrape_tasks
+                    WHERE status = ? OR (status = ? AND lease_expires < ?)
+                    ORDER BY task_id LIMIT 1
+                )
+                RETURNING {TASK_COLUMNS}
+                """,
+                (RUNNING, worker_id, now + self.lease_seconds, now, QUEUED, RUNNING, now)
+            ).fetchone()
+            self.conn.execute("COMMIT")
+        except sqlite3.Error:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        task = row_to_task(row)
+        if task.attempts > 1:
+            logger.warning("Scrape task %s reclaimed by %s (attempt %s)", task.task_id, worker_id, task.attempts)
+        return task
+
+    def fail_exhausted_leases(self, now: float) -> None:
+        # A task that keeps killing its worker would otherwise be retried forever
+        self.conn.execute(
+            """
+            UPDATE scrape_tasks SET status = ?, finished_at = ?, error = ?
+            WHERE status = ? AND lease_expires < ? AND attempts >= ?
+            """,
+            (FAILED, now, "Worker lease expired on every attempt", RUNNING, now, self.max_attempts)
+        )
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        updated = self.conn.execute(
+            "UPDATE scrape_tasks SET lease_expires = ? WHERE task_id = ? AND status = ? AND worker_id = ?",
+            (time.time() + self.lease_seconds, task_id, RUNNING, worker_id)
+        ).rowcount
+        return updated == 1
+
+    def complete(self, task_id: int, worker_id: str, summary: dict) -> bool:
+        # Only the worker still holding the claim may record the outcome; a reclaimed task belongs to its new worker
+        updated = self.conn.execute(
+            """
+            UPDATE scrape_tasks SET status = ?, finished_at = ?, summary = ?, lease_expires = NULL
+            WHERE task_id = ? AND worker_id = ? AND status = ?
+            """,
+            (DONE, time.time(), json.dumps(summary), task_id, worker_id, RUNNING)
+        ).rowcount
+        return updated == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> bool:
+        # Failures inside a scrape are already retried at the page and job level, so they are final here
+        updated = self.conn.execute(
+            """
+            UPDATE scrape_tasks SET status = ?, finished_at = ?, error = ?, lease_expires = NULL
+            WHERE task_id = ? AND worker_id = ? AND status = ?
+            """,
+            (FAILED, time.time(), error, task_id, worker_id, RUNNING)
+        ).rowcount
+        return updated == 1
+
+    def get(self, task_id: int) -> ScrapeTask | None:
+        row = self.conn.execute(
+            f"SELECT {TASK_COLUMNS} FROM scrape_tasks WHERE task_id = ?",
+            (task_id,)
+        ).fetchone()
+        return row_to_task(row) if row is not None else None
+
+    def recent(self, limit: int = 20) -> list:
+        rows = self.conn.execute(
+            f"SELECT {TASK_COLUMNS} FROM scrape_tasks ORDER BY task_id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [row_to_task(row) for row in rows]
+
+    def counts(self) -> dict:
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        counts.update(self.conn.execute("SELECT status, COUNT(*) FROM scrape_tasks GROUP BY status").fetchall())
+        return counts
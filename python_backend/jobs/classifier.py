@@ -0,0 +1,191 @@
+import re
+from dataclasses import dataclass
+
+from jobs.enricher import infer_experience_level_from_title
+from markdown.sections import extract_section_text
+from utils.constants import MID_OR_SENIOR_TITLES, RULE_CONFIDENCE_THRESHOLD
+
+TITLE_RULE_WEIGHT = 0.95
+
+# (value, weight, pattern): weights are how strongly one phrase on its own implies the value
+WORK_MODEL_RULES = [
+    ("Remote", 1.0, r"\b(?:fully|100%|completely|permanently)\s+remote\b"),
+    ("Remote", 0.9, r"\bremote[- ]first\b"),
+    ("Remote", 0.9, r"\bwork(?:ing)?\s+(?:fully\s+)?remotely\b"),
+    ("Remote", 0.9, r"\bwork\s+from\s+anywhere\b"),
+    ("Remote", 0.9, r"\bremote\s+(?:role|position|opportunity|job|across|within|based)\b"),
+    ("Remote", 0.9, r"\(remote\b"),
+    ("Remote", 0.5, r"\bremote\b"),
+    ("Hybrid", 0.9, r"\bhybrid\b(?!\s+(?:cloud|apps?|mobile|infrastructure|architecture|solutions?|environments?))"),
+    # Five days in the office is On-site, so only one to four days count towards Hybrid
+    (
+        "Hybrid",
+        0.9,
+        r"\b(?:[1-4]|one|two|three|four)\s*days?\s+(?:a\s+|per\s+)?(?:week\s+)?(?:in|from|at)\s+"
+        r"(?:the\s+|our\s+)?office\b",
+    ),
+    ("Hybrid", 0.8, r"\bsplit\s+(?:your\s+time\s+)?between\s+(?:home|the\s+office)\b"),
+    ("Hybrid", 0.8, r"\b(?:half|part|some)\s+(?:of\s+)?(?:their|your|the)\s+(?:time|week)\b[^.]{0,40}\boffice\b"),
+    ("Hybrid", 0.6, r"\bwork(?:ing)?[- ]from[- ]home\b"),
+    ("Hybrid", 0.6, r"\bwfh\b"),
+    ("Hybrid", 0.5, r"\bflexible\s+work(?:ing)?\s+arrangements?\b"),
+    ("On-site", 1.0, r"\b(?:5|five)\s+days\s+(?:(?:a|per)\s+week\s+)?(?:in|at)\s+(?:the\s+|our\s+)?office\b"),
+    ("On-site", 1.0, r"\bfully\s+(?:office[- ]based|on[- ]?site)\b"),
+    ("On-site", 0.8, r"\boffice[- ]based\b"),
+    ("On-site", 0.8, r"\b(?:on[- ]?site|onsite)\s+(?:role|position|only)\b"),
+]
+
+EXPERIENCE_LEVEL_RULES = [
+    ("intern", 0.9, r"\binternship\b"),
+    ("intern", 0.9, r"\bstudent\s+placement\b"),
+    ("intern", 0.8, r"\bpenultimate[- ]year\b"),
+    ("intern", 0.7, r"\bintern\b"),
+    ("junior", 0.9, r"\bgraduate\s+(?:program|programme|role|position|intake|developer|engineer)\b"),
+    ("junior", 0.9, r"\bentry[- ]level\b"),
+    ("junior", 0.7, r"\brecent\s+graduates?\b"),
+    ("junior", 0.8, r"\bno\s+(?:prior\s+)?(?:commercial\s+)?experience\s+(?:is\s+)?(?:required|necessary)\b"),
+    ("lead+", 0.9, r"\bdirect\s+reports\b"),
+    ("lead+", 0.9, r"\bpeople\s+(?:leadership|management)\b"),
+    ("lead+", 0.8, r"\bline\s+management\b"),
+    ("lead+", 0.8, r"\b(?:manage|managing|lead|leading)\s+(?:a\s+)?(?:team|teams|group)\s+of\b"),
+]
+
+# "not a remote role", "no direct reports", "non-remote": a negation up to two words before the phrase voids it
+NEGATION = re.compile(r"\b(?:not|no|never|non|isn['\u2019]t)(?:[\s-]+[\w'\u2019]+){0,2}[\s-]*$", re.IGNORECASE)
+NEGATION_WINDOW = 30
+
+YEARS_OF_EXPERIENCE = re.compile(
+    r"\b(\d{1,2})\s*(?:\+|plus)?\s*(?:(?:-|\u2013|to)\s*\d{1,2}\s*)?\+?\s*years?(?:['\u2019]s?)?\s+"
+    r"(?:of\s+)?(?:[\w/+#.-]+\s+){0,4}?experience",
+    re.IGNORECASE,
+)
+# Outside the requirements section, a year count only reads as a requirement when the sentence asks for it;
+# "over 20 years of experience delivering software" describes the company, not the candidate
+REQUIREMENT_CONTEXT = re.compile(
+    r"\b(?:you(?:['\u2019]ll|\s+will|\s+should|\s+must)?\s+(?:have|bring|need|possess)|required|requires?|"
+    r"minimum(?:\s+of)?|at\s+least|must\s+have|looking\s+for|ideally|candidates?\s+(?:with|have))\b[^.\n]*$",
+    re.IGNORECASE,
+)
+REQUIRED_AFTER = re.compile(r"^[^.\n]{0,40}\b(?:is\s+)?(?:required|essential|a\s+must)\b", re.IGNORECASE)
+REQUIREMENT_CONTEXT_WINDOW = 80
+JUNIOR_MAX_YEARS = 2
+SENIOR_MIN_YEARS = 3
+
+
+def compile_rules(rules: list) -> list:
+    return [(value, weight, re.compile(pattern, re.IGNORECASE)) for value, weight, pattern in rules]
+
+
+COMPILED_WORK_MODEL_RULES = compile_rules(WORK_MODEL_RULES)
+COMPILED_EXPERIENCE_LEVEL_RULES = compile_rules(EXPERIENCE_LEVEL_RULES)
+
+
+@dataclass(frozen=True)
+class Classification:
+    value: str | None
+    confidence: float
+    evidence: str | None = None
+
+    @property
+    def is_confident(self) -> bool:
+        return self.value is not None and self.confidence >= RULE_CONFIDENCE_THRESHOLD
+
+
+def is_negated(text: str, start: int) -> bool:
+    return bool(NEGATION.search(text[max(start - NEGATION_WINDOW, 0):start]))
+
+def score_rules(text: str, compiled_rules: list, scores: dict, evidence: dict) -> None:
+    for value, weight, pattern in compiled_rules:
+        match = next((match for match in pattern.finditer(text) if not is_negated(text, match.start())), None)
+        if match:
+            scores[value] = scores.get(value, 0.0) + weight
+            evidence.setdefault(value, match.group(0))
+
+def pick_classification(scores: dict, evidence: dict) -> Classification:
+    if not scores:
+        return Classification(None, 0.0)
+
+    value, top_score = max(scores.items(), key=lambda item: item[1])
+    # Strong on its own, and not contradicted by signals for other values
+    confidence = min(1.0, top_score) * top_score / sum(scores.values())
+    return Classification(value, round(confidence, 3), evidence.get(value))
+
+def classify_work_model(title: str, text: str) -> Classification:
+    scores: dict = {}
+    evidence: dict = {}
+    score_rules(f"{title}\n{text}", COMPILED_WORK_MODEL_RULES, scores, evidence)
+    return pick_classification(scores, evidence)
+
+def is_requirement_context(text: str, match: re.Match) -> bool:
+    before = text[max(match.start() - REQUIREMENT_CONTEXT_WINDOW, 0):match.start()]
+    return bool(REQUIREMENT_CONTEXT.search(before) or REQUIRED_AFTER.search(text[match.end():]))
+
+def score_years_of_experience(text: str, requirements: str, scores: dict, evidence: dict) -> None:
+    # The most demanding requirement sets the level, e.g. "5+ years" outweighs "2 years with React"
+    matches = [(int(match.group(1)), match.group(0)) for match in YEARS_OF_EXPERIENCE.finditer(requirements)]
+    matches += [
+        (int(match.group(1)), match.group(0))
+        for match in YEARS_OF_EXPERIENCE.finditer(text)
+        if is_requirement_context(text, match)
+    ]
+    if not matches:
+        return
+
+    years, phrase = max(matches)
+    if years < JUNIOR_MAX_YEARS:
+        value, weight = "junior", 0.7
+    elif years < SENIOR_MIN_YEARS:
+        value, weight = "mid_or_senior", 0.6
+    else:
+        value, weight = "mid_or_senior", 0.8
+    scores[value] = scores.get(value, 0.0) + weight
+    evidence.setdefault(value, phrase)
+
+def classify_experience_level(title: str, text: str, requirements: str | None = None) -> Classification:
+    """Classify from the title, then phrase rules and required years of experience in the text.
+
+    ``requirements`` is the job's requirements text; when omitted, it is read from the requirements section
+    of ``text`` if that is markdown.
+    """
+    title_level = infer_experience_level_from_title(title) if title else ""
+    if title_level:
+        return Classification(title_level, TITLE_RULE_WEIGHT, title)
+
+    scores: dict = {}
+    evidence: dict = {}
+    if title and any(term in title.lower() for term in MID_OR_SENIOR_TITLES):
+        scores["mid_or_senior"] = 0.9
+        evidence["mid_or_senior"] = title
+    score_rules(text, COMPILED_EXPERIENCE_LEVEL_RULES, scores, evidence)
+    if requirements is None:
+        requirements = extract_section_text(text, "requirements")
+    score_years_of_experience(text, requirements, scores, evidence)
+    return pick_classification(scores, evidence)
+
+
+class RuleEngineStats:
+    def __init__(self) -> None:
+        """Initialize a RuleEngineStats instance counting rule decisions versus LLM fallbacks per field."""
+        self.hits: dict = {"work_model": 0, "experience_level": 0}
+        self.misses: dict = {"work_model": 0, "experience_level": 0}
+
+    def record(self, field: str, classification: Classification) -> None:
+        if classification.is_confident:
+            self.hits[field] += 1
+        else:
+            self.misses[field] += 1
+
+    def counters(self) -> dict:
+        return {
+            **{f"{field}_hits": count for field, count in self.hits.items()},
+            **{f"{field}_misses": count for field, count in self.misses.items()},
+        }
+
+
+def rule_hit_rate(counters: dict) -> float:
+    hits = sum(count for name, count in counters.items() if name.endswith("_hits"))
+    attempts = sum(counters.values())
+    return round(hits / attempts, 3) if attempts else 0.0
+
+
+rule_engine_stats = RuleEngineStats()
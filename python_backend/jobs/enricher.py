@@ -90,4 +90,8 @@ def enrich_job(job_data: dict, job_url: str, location_search: str, job_metadata:
     job_url, quick_apply_url = get_job_urls(job_url)
     return enrich_job_data(job_data, location_search, job_url, quick_apply_url, job_metadata)
 
-
+def refresh_stored_job(record: dict, location_search: str) -> dict:
+    job_data = dict(record)
+    job_data["location_search"] = location_search
+    job_data["posted_within"] = get_relative_posted_time(job_data)
+    return job_data
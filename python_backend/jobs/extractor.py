@@ -1,10 +1,15 @@
+import asyncio
 import logging
 import re
 
+import httpx
 import sentry_sdk
 from crawl4ai import AsyncWebCrawler
+from jobs.html_metadata import collect_page_data_from_html
 from jobs.parser import parse_job_data_from_markdown
-from markdown.fetcher import fetch_job_markdown
+from jobs.store import SeenJobStore, hash_job_content
+from markdown.fetcher import fetch_job_page_over_http, render_job_markdown
+from pages.http_fetch import http_fetch_stats
 from pages.pool import PagePool
 from playwright.async_api import Page
 from utils.constants import (
@@ -15,69 +20,105 @@ from utils.constants import (
     NO_MATCHING_TEXT,
     POSTED_DATE_SELECTOR,
     SKIPPED,
+    STATIC_HTML_METADATA,
     SUCCESS,
     TERMINATE,
 )
 from utils.context import ScrapeContext
 from utils.retry import retry_with_backoff
-from utils.utils import backoff_if_high_cpu, get_posted_date, is_recent_job, pause_briefly
+from utils.utils import backoff_if_high_cpu, extract_job_id, get_posted_date, is_recent_job, pause_briefly
 
 logger = logging.getLogger(__name__)
 
-async def extract_logo_src(page: Page) -> str:
-    await pause_briefly()
-    logo_element = await page.query_selector(LOGO_SELECTOR)
-    await backoff_if_high_cpu()
-    if logo_element:
-        logo_src = await logo_element.get_attribute("src")
+# Collects every metadata field, the logo and the posted-date candidates in one round-trip to the browser
+EXTRACT_METADATA_SCRIPT = """({fields, logoSelector, postedDateSelector}) => {
+    const results = {};
+    const fieldErrors = {};
+    for (const [key, selectors] of Object.entries(fields)) {
+        for (const selector of selectors) {
+            try {
+                const elem = document.querySelector(`[data-automation="${selector}"]`);
+                if (elem) {
+                    results[key] = elem.innerText.trim();
+                    break;
+                }
+            } catch (e) {
+                fieldErrors[key] = String(e);
+            }
+        }
+    }
+
+    let logoSrc = null;
+    let logoError = null;
+    try {
+        const logo = document.querySelector(logoSelector);
+        logoSrc = logo ? logo.getAttribute("src") : null;
+    } catch (e) {
+        logoError = String(e);
+    }
+
+    let postedDateTexts = [];
+    let postedDateError = null;
+    try {
+        postedDateTexts = Array.from(document.querySelectorAll(postedDateSelector), (elem) => elem.innerText.trim());
+    } catch (e) {
+        postedDateError = String(e);
+    }
+
+    return {fields: results, fieldErrors, logoSrc, logoError, postedDateTexts, postedDateError};
+}"""
+
+def get_posted_date_selector(class_name: str) -> str:
+    return f'span.{class_name.replace(" ", ".")}'
+
+async def evaluate_page_metadata(page: Page, job_metadata_fields: dict) -> dict:
+    return await page.evaluate(EXTRACT_METADATA_SCRIPT, {
+        "fields": job_metadata_fields,
+        "logoSelector": LOGO_SELECTOR,
+        "postedDateSelector": get_posted_date_selector(POSTED_DATE_SELECTOR),
+    })
+
+def extract_logo_src(page_data: dict) -> str:
+    if page_data.get("logoError"):
+        raise RuntimeError(page_data["logoError"])
+
+    logo_src = page_data.get("logoSrc")
+    if logo_src:
         logger.debug("Logo found with src: %s", logo_src)
         return logo_src
     logger.warning("Logo element not found.")
     return ""
 
-async def extract_job_metadata_fields(page: Page, job_metadata_fields: dict) -> tuple:
+def extract_job_metadata_fields(page_data: dict, job_metadata_fields: dict) -> tuple:
+    found = page_data.get("fields") or {}
     results = {}
-    field_errors = {}
+    field_errors = dict(page_data.get("fieldErrors") or {})
 
-    for key, selectors in job_metadata_fields.items():
-        await backoff_if_high_cpu()
-        value_found = False
-        for selector in selectors:
-            try:
-                elem = await page.query_selector(f'[data-automation="{selector}"]')
-                if elem:
-                    text = (await elem.inner_text()).strip()
-                    results[key] = text
-                    value_found = True
-                    break
-
-            except Exception as e:
-                logger.exception("Error extracting %s with selector '%s'", key, selector)
-                field_errors[key] = str(e)
-
-        if not value_found:
-            results[key] = ""
-            logger.warning("No valid element found for job field '%s'", key)
-            if key not in field_errors:
-                field_errors[key] = "Element not found"
-
-        await pause_briefly()
+    for key in job_metadata_fields:
+        if key in found:
+            results[key] = found[key]
+            field_errors.pop(key, None)
+            continue
 
-    return results, field_errors
+        results[key] = ""
+        logger.warning("No valid element found for job field '%s'", key)
+        if key in field_errors:
+            logger.error("Error extracting %s: %s", key, field_errors[key])
+        else:
+            field_errors[key] = "Element not found"
 
-async def extract_posted_date_by_class(page: Page, class_name: str) -> dict:
-    await pause_briefly()
+    return results, field_errors
 
-    selector = f'span.{class_name.replace(" ", ".")}'
-    elements = await page.query_selector_all(selector)
+def extract_posted_date_by_class(page_data: dict) -> dict:
+    if page_data.get("postedDateError"):
+        raise RuntimeError(page_data["postedDateError"])
 
-    if not elements:
+    texts = page_data.get("postedDateTexts") or []
+    if not texts:
         logger.warning("No elements found for posted date selector.")
         return {"posted_date": None, "error": NO_ELEMENTS}
 
-    for elem in elements:
-        await backoff_if_high_cpu()
-        text = (await elem.inner_text()).strip()
+    for text in texts:
         logger.debug("Found element text: %s", text)
 
         match = re.search(r"Posted (\d+)([dhm]) ago", text)
@@ -90,9 +131,9 @@ async def extract_posted_date_by_class(page: Page, class_name: str) -> dict:
 
     return {"posted_date": None, "error": NO_MATCHING_TEXT}
 
-async def safe_extract_logo_src(page: Page, job_url: str) -> str:
+def safe_extract_logo_src(page_data: dict, job_url: str) -> str:
     try:
-        return await extract_logo_src(page)
+        return extract_logo_src(page_data)
     except Exception as e:
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "extract_logo_src")
@@ -100,9 +141,9 @@ async def safe_extract_logo_src(page: Page, job_url: str) -> str:
             sentry_sdk.capture_exception(e)
         return ""
 
-async def safe_extract_job_metadata_fields(page: Page, fields: dict, job_url: str) -> dict:
+def safe_extract_job_metadata_fields(page_data: dict, fields: dict, job_url: str) -> dict:
     try:
-        results, field_errors = await extract_job_metadata_fields(page, fields)
+        results, field_errors = extract_job_metadata_fields(page_data, fields)
 
         for key, error in field_errors.items():
             with sentry_sdk.push_scope() as scope:
@@ -125,9 +166,9 @@ async def safe_extract_job_metadata_fields(page: Page, fields: dict, job_url: st
     else:
         return results
 
-async def safe_extract_posted_date_by_class(page: Page, class_name: str, job_url: str) -> str | None:
+def safe_extract_posted_date_by_class(page_data: dict, job_url: str) -> str | None:
     try:
-        result = await extract_posted_date_by_class(page, class_name)
+        result = extract_posted_date_by_class(page_data)
         error = result.get("error")
         if error in {NO_ELEMENTS, NO_MATCHING_TEXT}:
             error_messages = {
@@ -155,47 +196,122 @@ async def safe_extract_posted_date_by_class(page: Page, class_name: str, job_url
             sentry_sdk.capture_exception(e)
         return None
 
-
-async def extract_metadata_from_page(page: Page, job_url: str, fields: dict) -> dict:
-    logo_src = await safe_extract_logo_src(page, job_url)
-    job_metadata = await safe_extract_job_metadata_fields(page, fields, job_url)
-    posted_date = await safe_extract_posted_date_by_class(page, POSTED_DATE_SELECTOR, job_url)
+def build_job_metadata(page_data: dict, job_url: str, fields: dict) -> dict:
+    logo_src = safe_extract_logo_src(page_data, job_url)
+    job_metadata = safe_extract_job_metadata_fields(page_data, fields, job_url)
+    posted_date = safe_extract_posted_date_by_class(page_data, job_url)
     return {
         "logo_src": logo_src,
         "posted_date": posted_date,
         **job_metadata
     }
 
-async def navigate_to_page(page: Page, job_url: str) -> None:
-    async def go() -> None:
+def page_data_from_error(error: Exception, fields: dict) -> dict:
+    # Surface the failure through each section so Sentry reports it per field, logo and posted date as before
+    message = f"{type(error).__name__}: {error}"
+    return {"fieldErrors": dict.fromkeys(fields, message), "logoError": message, "postedDateError": message}
+
+async def extract_metadata_from_page(page: Page, job_url: str, fields: dict) -> dict:
+    await backoff_if_high_cpu()
+    try:
+        page_data = await evaluate_page_metadata(page, fields)
+    except Exception as e:
+        logger.exception("Failed to evaluate job metadata for %s", job_url)
+        page_data = page_data_from_error(e, fields)
+
+    return build_job_metadata(page_data, job_url, fields)
+
+async def extract_metadata_from_html(html: str, job_url: str, fields: dict) -> dict:
+    await backoff_if_high_cpu()
+    try:
+        page_data = await asyncio.to_thread(
+            collect_page_data_from_html,
+            html,
+            fields,
+            LOGO_SELECTOR,
+            get_posted_date_selector(POSTED_DATE_SELECTOR),
+        )
+    except Exception as e:
+        logger.exception("Failed to parse job metadata HTML for %s", job_url)
+        page_data = page_data_from_error(e, fields)
+
+    return build_job_metadata(page_data, job_url, fields)
+
+async def navigate_to_page(page: Page, job_url: str) -> bool | None:
+    async def go() -> bool:
         await backoff_if_high_cpu()
         await page.goto(job_url, timeout=60000, wait_until="domcontentloaded")
         await pause_briefly(0.05, 0.25)
+        return True
 
     return await retry_with_backoff(
         go, max_retries=MAX_RETRIES, base_delay=1.0, label=f"page.goto({job_url})"
     )
 
 
-async def extract_job_metadata(job_url: str, job_metadata_fields: dict, page_pool: PagePool) -> dict:
+async def extract_job_metadata(
+    job_url: str,
+    job_metadata_fields: dict,
+    page_pool: PagePool,
+    *,
+    from_static_html: bool = STATIC_HTML_METADATA
+) -> tuple:
     page = await page_pool.acquire()
     try:
-        await navigate_to_page(page, job_url)
-        metadata = await extract_metadata_from_page(page, job_url, job_metadata_fields)
+        if not await navigate_to_page(page, job_url):
+            # A pooled page still holds the previous job's DOM, so never read from it after a failed goto
+            return {}, None
+        if not from_static_html:
+            metadata = await extract_metadata_from_page(page, job_url, job_metadata_fields)
+        html = await page.content()
 
     finally:
         await page_pool.release(page)
         await pause_briefly(0.05, 0.25)
-    return metadata
+
+    if from_static_html:
+        # JavaScript is disabled in the browser context, so the served HTML already holds every field
+        metadata = await extract_metadata_from_html(html, job_url, job_metadata_fields)
+    return metadata, html
 
 async def scrape_job_details(job_url: str, crawler: AsyncWebCrawler, page_pool: PagePool) -> tuple:
-    markdown = await fetch_job_markdown(job_url, crawler)
-    job_metadata = await extract_job_metadata(job_url, JOB_METADATA_FIELDS, page_pool)
+    job_metadata, job_html = await extract_job_metadata(job_url, JOB_METADATA_FIELDS, page_pool)
+    markdown = await render_job_markdown(job_url, job_html, crawler) if job_html else None
     await pause_briefly(0.05, 0.25)
     return markdown, job_metadata
 
+async def scrape_job_details_over_http(job_url: str, client: httpx.AsyncClient) -> tuple | None:
+    job_page = await fetch_job_page_over_http(job_url, client)
+    if job_page is None:
+        return None
+    markdown, html = job_page
+    return markdown, await extract_metadata_from_html(html, job_url, JOB_METADATA_FIELDS)
+
+async def fetch_job_details(job_url: str, ctx: ScrapeContext) -> tuple:
+    if ctx.http_client is not None:
+        job_details = await scrape_job_details_over_http(job_url, ctx.http_client)
+        if job_details is not None:
+            return job_details
+        http_fetch_stats.fallbacks += 1
+    crawler, page_pool = await ctx.browser()
+    return await scrape_job_details(job_url, crawler, page_pool)
+
+def find_unchanged_stored_job(job_url: str, job_markdown: str, job_store: SeenJobStore) -> dict | None:
+    content_hash = hash_job_content(job_markdown)
+    job_id = extract_job_id(job_url)
+    stored_job = job_store.get(job_id) if job_id else None
+
+    if stored_job is not None and stored_job.content_hash == content_hash:
+        logger.info("Job %s is unchanged since it was last parsed, reusing stored record", job_id)
+        job_store.mark_reused()
+        job_store.stage_content_hash(job_url, content_hash, reparsed=False)
+        return dict(stored_job.record)
+
+    job_store.stage_content_hash(job_url, content_hash)
+    return None
+
 async def extract_job_data(job_url : str, ctx: ScrapeContext, count: int) -> dict:
-    job_markdown, job_metadata = await scrape_job_details(job_url, ctx.crawler, ctx.page_pool)
+    job_markdown, job_metadata = await fetch_job_details(job_url, ctx)
     if not job_metadata:
         return {"status": SKIPPED, "job": None, "job_metadata": None}
 
@@ -203,9 +319,13 @@ async def extract_job_data(job_url : str, ctx: ScrapeContext, count: int) -> dic
         return {"status": SKIPPED, "job": None, "job_metadata": job_metadata}
 
     if not is_recent_job(job_metadata, ctx.day_range_limit):
-        ctx.terminate_event.set()
         return {"status": TERMINATE, "job": None, "job_metadata": job_metadata}
 
+    if ctx.job_store is not None:
+        stored_job = find_unchanged_stored_job(job_url, job_markdown, ctx.job_store)
+        if stored_job is not None:
+            return {"status": SUCCESS, "job": stored_job, "job_metadata": job_metadata}
+
     job_data = await parse_job_data_from_markdown(job_markdown, count)
     if not job_data:
         return {"status": SKIPPED, "job": None, "job_metadata": job_metadata}
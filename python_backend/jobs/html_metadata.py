@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from lxml.etree import ParserError
+
+
+@lru_cache(maxsize=64)
+def compile_selector(selector: str) -> CSSSelector:
+    return CSSSelector(selector)
+
+def element_text(elem: lxml_html.HtmlElement) -> str:
+    # Approximates innerText for the short, single-line metadata elements we read
+    return " ".join(elem.text_content().split())
+
+def select_first(document: lxml_html.HtmlElement, selector: str) -> lxml_html.HtmlElement | None:
+    matches = compile_selector(selector)(document)
+    return matches[0] if matches else None
+
+def collect_page_data_from_html(
+    html: str,
+    job_metadata_fields: dict,
+    logo_selector: str,
+    posted_date_selector: str
+) -> dict:
+    """Apply the in-page metadata script's rules to raw HTML and return the same shape it does."""
+    try:
+        document = lxml_html.document_fromstring(html)
+    except (ParserError, ValueError) as e:
+        error = f"{type(e).__name__}: {e}"
+        return {
+            "fields": {},
+            "fieldErrors": dict.fromkeys(job_metadata_fields, error),
+            "logoSrc": None,
+            "logoError": error,
+            "postedDateTexts": [],
+            "postedDateError": error,
+        }
+
+    results = {}
+    field_errors = {}
+    for key, selectors in job_metadata_fields.items():
+        for selector in selectors:
+            try:
+                elem = select_first(document, f'[data-automation="{selector}"]')
+            except Exception as e:
+                field_errors[key] = str(e)
+                continue
+            if elem is not None:
+                results[key] = element_text(elem)
+                break
+
+    logo_src = None
+    logo_error = None
+    try:
+        logo = select_first(document, logo_selector)
+        logo_src = logo.get("src") if logo is not None else None
+    except Exception as e:
+        logo_error = str(e)
+
+    posted_date_texts = []
+    posted_date_error = None
+    try:
+        posted_date_texts = [element_text(elem) for elem in compile_selector(posted_date_selector)(document)]
+    except Exception as e:
+        posted_date_error = str(e)
+
+    return {
+        "fields": results,
+        "fieldErrors": field_errors,
+        "logoSrc": logo_src,
+        "logoError": logo_error,
+        "postedDateTexts": posted_date_texts,
+        "postedDateError": posted_date_error,
+    }
@@ -1,14 +1,42 @@
 import json
 import logging
 import re
+from functools import partial
 
 import sentry_sdk
 from json_repair import repair_json
-from llm.parser import parse_job_posting
-from utils.utils import clean_string, normalize_keys, try_fix_missing_closing_brace
+from llm.parser import parse_job_posting, requested_job_posting_fields
+from llm.schema import build_job_posting_schema, validate_job_posting
+from markdown.sections import extract_list_fields
+from markdown.trimmer import markdown_trim_stats, trim_job_markdown
+from utils.constants import LIST_FIELDS
+from utils.utils import clean_string, normalize_keys
 
 logger = logging.getLogger(__name__)
 
+JSON_STRUCTURE = re.compile(r'[{}\[\]"\\]')
+
+
+
+class JsonBlockStats:
+    def __init__(self) -> None:
+        """Initialize a JsonBlockStats instance counting which path turned each LLM response into job data."""
+        self.structured = 0
+        self.decoded = 0
+        self.repaired = 0
+        self.failed = 0
+
+    def counters(self) -> dict:
+        return {
+            "structured": self.structured,
+            "decoded": self.decoded,
+            "repaired": self.repaired,
+            "failed": self.failed,
+        }
+
+
+json_block_stats = JsonBlockStats()
+
 def clean_repair_parse_json(json_block: str) -> dict | None:
     try:
         if isinstance(json_block, str):
@@ -31,23 +59,78 @@ def clean_repair_parse_json(json_block: str) -> dict | None:
     else:
         return job_data
 
-def parse_json_block_from_text(response: str) -> dict | str:
-    def extract_json_block(text: str) -> str | None:
-        match = re.search(r"\{.*?\}", text, re.DOTALL)
-        return match.group(0) if match else None
+def close_json_object(stack: list, position: int, spans: list) -> None:
+    # A stray "[" left open inside the object is dropped rather than failing the whole block
+    while stack and stack[-1][0] != "{":
+        stack.pop()
+    if stack:
+        _, start = stack.pop()
+        parent = next((open_position for open_char, open_position in reversed(stack) if open_char == "{"), None)
+        spans.append((start, position + 1, parent))
+
+def scan_json_blocks(text: str) -> tuple[list, str]:
+    """Find balanced ``{...}`` spans in one pass, ignoring braces inside JSON strings.
+
+    Returns the spans as ``(start, end, parent_start)`` tuples, with ``parent_start`` None for top-level spans,
+    and the characters that would close whatever is still open at the end of the text.
+    """
+    spans = []
+    stack: list = []
+    in_string = False
+    skip_to = -1
+    for match in JSON_STRUCTURE.finditer(text):
+        position = match.start()
+        if position < skip_to:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                skip_to = position + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append((char, position))
+        elif char == "}":
+            close_json_object(stack, position, spans)
+        elif stack and stack[-1][0] == "[":
+            stack.pop()
+
+    closing = ('"' if in_string else "") + "".join("}" if char == "{" else "]" for char, _ in reversed(stack))
+    return spans, closing
+
+def find_json_blocks(text: str) -> tuple[list, list]:
+    spans, closing = scan_json_blocks(text)
+    if not spans and closing:
+        # Truncated output: close whatever is still open and scan again
+        text += closing
+        spans, _ = scan_json_blocks(text)
+
+    spans.sort()
+    top_level = [text[start:end] for start, end, parent in spans if parent is None]
+    # Nested objects are only candidates when their parent brace wraps prose rather than JSON keys,
+    # e.g. "{ Here is the data: {...} }", so a nested value is never mistaken for the whole response
+    nested = [text[start:end] for start, end, parent in spans if parent is not None and '"' not in text[parent:start]]
+    return top_level, nested
 
+def parse_json_block_from_text(response: str) -> dict | str:
     try:
-        json_str = extract_json_block(response)
-        if not json_str:
-            fixed_response = try_fix_missing_closing_brace(response)
-            json_str = extract_json_block(fixed_response)
-
-        if json_str:
+        top_level, nested = find_json_blocks(response)
+        for json_str in top_level + nested:
             try:
-                return json.loads(json_str)
+                job_data = json.loads(json_str)
             except json.JSONDecodeError:
-                return clean_repair_parse_json(json_str)
+                continue
+            json_block_stats.decoded += 1
+            return job_data
+
+        if top_level:
+            # Last resort: repair the largest block, which is the most likely to hold the whole object
+            json_block_stats.repaired += 1
+            return clean_repair_parse_json(max(top_level, key=len))
 
+        json_block_stats.failed += 1
         logger.error("Full LLM response:\n%s", response)
         error_msg = "No JSON block found in response."
         raise ValueError(error_msg)  # noqa: TRY301
@@ -59,23 +142,72 @@ def parse_json_block_from_text(response: str) -> dict | str:
             sentry_sdk.capture_exception(e)
     return response
 
+def decode_job_posting(response: str) -> object:
+    # Same decode order as parse_json_block_from_text, minus repair, stats and error reporting
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        pass
+    top_level, nested = find_json_blocks(response)
+    for json_str in top_level + nested:
+        try:
+            return json.loads(json_str)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def is_cacheable_job_posting(response: str, schema: dict) -> bool:
+    # Only responses that decode without repair and match the schema are worth replaying from the cache
+    return not validate_job_posting(decode_job_posting(response), schema)
+
+def parse_structured_job_posting(response: str | None, schema: dict) -> dict | str:
+    # JSON mode returns a bare object, so one decode and one schema check replace block scanning and repair
+    try:
+        job_data = json.loads(response)
+    except (TypeError, json.JSONDecodeError):
+        job_data = None
+
+    errors = validate_job_posting(job_data, schema)
+    if not errors:
+        json_block_stats.structured += 1
+        return job_data
+
+    logger.debug("Structured response did not match the job schema (%s), using the repair path", "; ".join(errors))
+    return parse_json_block_from_text(response)
+
 async def parse_job_data_from_markdown(job_markdown: str, count: int) -> dict | None:
     try:
-        raw_llm_output  = await parse_job_posting(job_markdown, count)
-        job_data = parse_json_block_from_text(raw_llm_output)
+        trimmed = trim_job_markdown(job_markdown)
+        markdown_trim_stats.record(trimmed)
+        logger.debug(
+            "Job %s markdown trimmed from %s to %s tokens", count, trimmed.original_tokens, trimmed.trimmed_tokens
+        )
+
+        # Lists that already sit under recognisable headings are taken verbatim instead of asking the LLM
+        extracted_lists = extract_list_fields(trimmed.markdown)
+        llm_list_fields = [field for field in LIST_FIELDS if field not in extracted_lists]
+
+        schema = build_job_posting_schema(requested_job_posting_fields(llm_list_fields))
+        raw_llm_output  = await parse_job_posting(
+            trimmed.markdown, llm_list_fields, is_cacheable=partial(is_cacheable_job_posting, schema=schema)
+        )
+        job_data = parse_structured_job_posting(raw_llm_output, schema)
 
         if not isinstance(job_data, dict):
             with sentry_sdk.push_scope() as scope:
                 scope.set_tag("component", "parse_job_data_from_markdown")
+                scope.set_extra("job_index", count)
                 scope.set_extra("input_markdown", job_markdown[:1000])
                 scope.capture_message("Parsed job data is empty after JSON repair", level="warning")
             return None
 
         job_data = normalize_keys(job_data)
+        job_data.update(extracted_lists)
 
     except Exception as e:
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "parse_job_data_from_markdown")
+            scope.set_extra("job_index", count)
             scope.set_extra("input_markdown", job_markdown[:1000])
             sentry_sdk.capture_exception(e)
         return None
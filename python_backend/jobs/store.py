@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import sentry_sdk
+from utils.constants import JOB_STORE_REFRESH_DAYS, JOB_STORE_RETENTION_DAYS
+from utils.utils import extract_job_id
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_jobs (
+    job_id TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_parsed REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class StoredJob:
+    job_id: str
+    record: dict
+    content_hash: str
+    last_seen: float
+    last_parsed: float
+
+
+def get_job_store_path() -> str:
+    return os.getenv("JOB_STORE_PATH", str(Path(__file__).parent.parent / "data" / "seen_jobs.sqlite3"))
+
+def hash_job_content(job_markdown: str) -> str:
+    return hashlib.sha256(job_markdown.encode("utf-8")).hexdigest()
+
+
+class SeenJobStore:
+    def __init__(
+        self,
+        path: str,
+        refresh_days: float = JOB_STORE_REFRESH_DAYS,
+        retention_days: float = JOB_STORE_RETENTION_DAYS,
+    ) -> None:
+        """Initialize a SeenJobStore instance.
+
+        Args:
+            path (str): SQLite database file (``:memory:`` for a throwaway store).
+            refresh_days (float): Age after which a stored job is fetched again and its content hash compared.
+            retention_days (float): Jobs not seen for this long are dropped when the store is opened.
+
+        """
+        self.path = path
+        self.refresh_seconds = refresh_days * SECONDS_PER_DAY
+        self.retention_seconds = retention_days * SECONDS_PER_DAY
+        self.conn: sqlite3.Connection | None = None
+        self.pending_hashes: dict = {}
+        self.reused = 0
+        self.parsed = 0
+
+    def __enter__(self) -> "SeenJobStore":
+        """Open the database and drop jobs past the retention window."""
+        self.open()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Close the database."""
+        self.close()
+
+    def open(self) -> None:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.prune()
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def prune(self) -> None:
+        with self.conn:
+            deleted = self.conn.execute(
+                "DELETE FROM seen_jobs WHERE last_seen < ?", (time.time() - self.retention_seconds,)
+            ).rowcount
+        if deleted:
+            logger.info("Pruned %s jobs not seen in %s days", deleted, self.retention_seconds / SECONDS_PER_DAY)
+
+    def get(self, job_id: str) -> StoredJob | None:
+        row = self.conn.execute(
+            "SELECT job_id, record, content_hash, last_seen, last_parsed FROM seen_jobs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return StoredJob(row[0], json.loads(row[1]), row[2], row[3], row[4])
+
+    def is_fresh(self, stored_job: StoredJob) -> bool:
+        return time.time() - stored_job.last_parsed < self.refresh_seconds
+
+    def stage_content_hash(self, job_url: str, content_hash: str, *, reparsed: bool = True) -> None:
+        # The parsed record is only final after validation, so the hash waits until save_jobs
+        self.pending_hashes[extract_job_id(job_url)] = content_hash
+        if reparsed:
+            self.parsed += 1
+
+    def discard_pending(self, job_urls: list) -> None:
+        # Saved jobs have already popped their hash; whatever is left failed parsing, validation or insertion
+        for job_url in job_urls:
+            self.pending_hashes.pop(extract_job_id(job_url), None)
+
+    def mark_reused(self) -> None:
+        self.reused += 1
+
+    def save_jobs(self, jobs: list) -> None:
+        now = time.time()
+        try:
+            with self.conn:
+                for job in jobs:
+                    job_id = extract_job_id(job.get("job_url", ""))
+                    if not job_id:
+                        continue
+                    record = json.dumps(job)
+                    content_hash = self.pending_hashes.pop(job_id, None)
+                    if content_hash is None:
+                        # Re-emitted from the store: refresh the record, keep the hash and parse time
+                        self.conn.execute(
+                            "UPDATE seen_jobs SET record = ?, last_seen = ? WHERE job_id = ?",
+                            (record, now, job_id)
+                        )
+                    else:
+                        self.conn.execute(
+                            """
+                            INSERT INTO seen_jobs (job_id, record, content_hash, first_seen, last_seen, last_parsed)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                            ON CONFLICT(job_id) DO UPDATE SET
+                                record = excluded.record,
+                                content_hash = excluded.content_hash,
+                                last_seen = excluded.last_seen,
+                                last_parsed = excluded.last_parsed
+                            """,
+                            (job_id, record, content_hash, now, now, now)
+                        )
+        except sqlite3.Error as e:
+            logger.exception("Failed to save %s jobs to the seen-jobs store", len(jobs))
+            with sentry_sdk.push_scope() as scope:
+                scope.set_tag("component", "save_jobs")
+                scope.set_extra("job_count", len(jobs))
+                scope.set_extra("path", self.path)
+                sentry_sdk.capture_exception(e)
+
+    def stats(self) -> dict:
+        return {"reused": self.reused, "parsed": self.parsed}
@@ -1,8 +1,10 @@
+import asyncio
 from datetime import datetime
 from urllib.parse import urlparse
 
 import sentry_sdk
-from llm.parser import infer_experience_level, infer_work_model
+from jobs.classifier import Classification, classify_experience_level, classify_work_model, rule_engine_stats
+from llm.parser import infer_experience_level, infer_work_model, infer_work_model_and_experience_level
 from tzlocal import get_localzone
 from utils.constants import (
     ALLOWED_EXPERIENCE_LEVEL_VALUES,
@@ -14,23 +16,44 @@ from utils.constants import (
     NON_REQUIRED_FIELDS,
     REQUIRED_FIELDS,
     URL_FIELDS,
+    VALIDATE_JOBS_CONCURRENCY,
 )
 from utils.utils import flatten_field
 
 
+def build_job_text(job: dict) -> str:
+    return "\n".join([
+        job.get("description", ""),
+        flatten_field(job.get("responsibilities", "")),
+        flatten_field(job.get("requirements", ""))
+    ])
+
+def is_valid_work_model(job: dict) -> bool:
+    return job.get("work_model") in ALLOWED_WORK_MODEL_VALUES
+
+def is_valid_experience_level(job: dict) -> bool:
+    exp = job.get("experience_level")
+    return bool(exp) and exp in ALLOWED_EXPERIENCE_LEVEL_VALUES
+
+def apply_rule_classification(job: dict, field: str, classification: Classification) -> bool:
+    # Only confident rule matches are trusted; anything weaker is left for the LLM
+    rule_engine_stats.record(field, classification)
+    if classification.is_confident:
+        job[field] = classification.value
+        return True
+    return False
+
 async def validate_work_model(job: dict, job_url: str) -> None:
-    if job.get("work_model") not in ALLOWED_WORK_MODEL_VALUES:
+    if not is_valid_work_model(job):
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "validate_job")
             scope.set_extra("job_url", job_url)
             scope.set_extra("field", "work_model")
             scope.capture_message("Invalid or missing 'work_model', attempting inference", level="warning")
 
-        job_text = "\n".join([
-            job.get("description", ""),
-            flatten_field(job.get("responsibilities", "")),
-            flatten_field(job.get("requirements", ""))
-        ])
+        job_text = build_job_text(job)
+        if apply_rule_classification(job, "work_model", classify_work_model(job.get("title", ""), job_text)):
+            return
         inferred_work_model = await infer_work_model(job_text)
         job["work_model"] = inferred_work_model or FALLBACK_WORK_MODEL
 
@@ -69,22 +92,59 @@ def validate_url_fields(job: dict, job_url: str) -> None:
 
 async def validate_experience_level(job: dict, job_url: str) -> None:
     exp = job.get("experience_level")
-    if not exp or exp not in ALLOWED_EXPERIENCE_LEVEL_VALUES:
+    if not is_valid_experience_level(job):
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "validate_job")
             scope.set_extra("job_url", job_url)
             scope.set_extra("field", "experience_level")
             scope.capture_message(f"Invalid or missing 'experience_level': {exp}", level="warning")
 
-        job_text = "\n".join([
-            job.get("description", ""),
-            flatten_field(job.get("responsibilities", "")),
-            flatten_field(job.get("requirements", ""))
-        ])
-        inferred_exp = await infer_experience_level(job.get("title", ""), job_text)
+        title = job.get("title", "")
+        job_text = build_job_text(job)
+        requirements = flatten_field(job.get("requirements", ""))
+        if apply_rule_classification(job, "experience_level", classify_experience_level(title, job_text, requirements)):
+            return
+        inferred_exp = await infer_experience_level(title, job_text)
         job["experience_level"] = inferred_exp or FALLBACK_EXPERIENCE_LEVEL
 
 
+async def validate_work_model_and_experience_level(job: dict, job_url: str) -> None:
+    if is_valid_work_model(job) or is_valid_experience_level(job):
+        await validate_work_model(job, job_url)
+        await validate_experience_level(job, job_url)
+        return
+
+    # Both need inference: the rules settle what they can and the rest goes to the LLM in a single round-trip
+    with sentry_sdk.push_scope() as scope:
+        scope.set_tag("component", "validate_job")
+        scope.set_extra("job_url", job_url)
+        scope.set_extra("field", "work_model, experience_level")
+        scope.capture_message(
+            f"Invalid or missing 'work_model' and 'experience_level': {job.get('experience_level')}, "
+            "attempting combined inference",
+            level="warning"
+        )
+
+    title = job.get("title", "")
+    job_text = build_job_text(job)
+    requirements = flatten_field(job.get("requirements", ""))
+    has_work_model = apply_rule_classification(job, "work_model", classify_work_model(title, job_text))
+    has_experience_level = apply_rule_classification(
+        job, "experience_level", classify_experience_level(title, job_text, requirements)
+    )
+
+    if has_work_model and has_experience_level:
+        return
+    if has_work_model:
+        job["experience_level"] = await infer_experience_level(title, job_text) or FALLBACK_EXPERIENCE_LEVEL
+    elif has_experience_level:
+        job["work_model"] = await infer_work_model(job_text) or FALLBACK_WORK_MODEL
+    else:
+        inferred = await infer_work_model_and_experience_level(title, job_text)
+        job["work_model"] = inferred["work_model"] or FALLBACK_WORK_MODEL
+        job["experience_level"] = inferred["experience_level"] or FALLBACK_EXPERIENCE_LEVEL
+
+
 def normalize_string_fields(job: dict, job_url: str) -> None:
     for field in REQUIRED_FIELDS + NON_REQUIRED_FIELDS:
         val = job.get(field)
@@ -149,11 +209,9 @@ def normalize_salary_field(job: dict) -> None:
 async def validate_job(job: dict) -> dict:
     job_url = job.get("job_url", "Unknown URL")
 
-    await validate_work_model(job, job_url)
+    await validate_work_model_and_experience_level(job, job_url)
     apply_required_field_fallbacks(job, job_url)
     validate_url_fields(job, job_url)
-
-    await validate_experience_level(job, job_url)
     normalize_string_fields(job, job_url)
     normalize_list_fields(job, job_url)
     normalize_salary_field(job)
@@ -161,8 +219,10 @@ async def validate_job(job: dict) -> dict:
     return job
 
 async def validate_jobs(page_job_data: list) -> list:
-    cleaned_jobs = []
-    for job in page_job_data:
-        cleaned_job = await validate_job(job)
-        cleaned_jobs.append(cleaned_job)
-    return cleaned_jobs
+    semaphore = asyncio.Semaphore(VALIDATE_JOBS_CONCURRENCY)
+
+    async def validate_with_limit(job: dict) -> dict:
+        async with semaphore:
+            return await validate_job(job)
+
+    return list(await asyncio.gather(*(validate_with_limit(job) for job in page_job_data)))
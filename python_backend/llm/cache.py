@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import sentry_sdk
+from utils.constants import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_DAYS
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def get_llm_cache_path() -> str:
+    return os.getenv("LLM_CACHE_PATH", str(Path(__file__).parent.parent / "data" / "llm_cache.sqlite3"))
+
+def make_cache_key(prompt_version: str, model: str, messages: list) -> str:
+    # The messages embed the job markdown and the full prompt, so any edit to either changes the key
+    payload = json.dumps([prompt_version, model, messages], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl_days: float = LLM_CACHE_TTL_DAYS,
+    ) -> None:
+        """Initialize an LLMResponseCache instance.
+
+        The SQLite database is opened on first use so importing the parser does not touch the disk.
+
+        Args:
+            path (str): SQLite database file (``:memory:`` for a cache that lasts only as long as the process).
+            max_entries (int): Least recently used responses are evicted beyond this many entries.
+            ttl_days (float): Responses older than this are treated as misses and deleted.
+
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_days * SECONDS_PER_DAY
+        self.conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(SCHEMA)
+            with self.conn:
+                self.conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        return self.conn
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        try:
+            conn = self.connect()
+            row = conn.execute("SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] >= self.ttl_seconds:
+                with conn:
+                    conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                with conn:
+                    conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            self.report_error(e, "get")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        now = time.time()
+        try:
+            conn = self.connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, response, now, now)
+                )
+                conn.execute(
+                    """
+                    DELETE FROM llm_responses WHERE key IN (
+                        SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self.report_error(e, "set")
+
+    def report_error(self, error: Exception, operation: str) -> None:
+        # A broken cache must never fail a scrape; it just stops saving LLM calls
+        logger.exception("LLM response cache %s failed", operation)
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "llm_response_cache")
+            scope.set_extra("operation", operation)
+            scope.set_extra("path", self.path)
+            sentry_sdk.capture_exception(error)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+
+import httpx
+from groq import AsyncGroq
+from groq.types.chat import ChatCompletion
+from utils.constants import LLM_MAX_CONNECTIONS, LLM_MAX_IN_FLIGHT, LLM_MAX_RETRIES, LLM_REQUEST_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class LLMClient:
+    def __init__(  # noqa: PLR0913
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        max_in_flight: int = LLM_MAX_IN_FLIGHT,
+        timeout: float = LLM_REQUEST_TIMEOUT,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        max_retries: int = LLM_MAX_RETRIES,
+    ) -> None:
+        """Initialize an LLMClient instance.
+
+        Args:
+            api_key (str): Groq API key.
+            base_url (str | None): Override for the Groq API host (defaults to GROQ_BASE_URL or api.groq.com).
+            max_in_flight (int): Maximum number of chat completions awaiting a response at once.
+            timeout (float): Default per-call timeout in seconds.
+            max_connections (int): Size of the shared keep-alive connection pool.
+            max_retries (int): Retries the Groq SDK performs on connection errors, 429s and 5xx responses.
+
+        """
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout),
+        )
+        self.groq = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=max_retries,
+            http_client=self.http_client,
+        )
+        # The scheduler re-routes 429s and transient errors itself instead of retrying on the same model
+        self.groq_without_retries = self.groq.with_options(max_retries=0)
+
+    async def chat_completion(
+        self,
+        messages: list,
+        model: str,
+        timeout: float | None = None,
+        **kwargs: object
+    ) -> ChatCompletion:
+        async with self.semaphore:
+            logger.debug("Requesting chat completion from %s", model)
+            return await self.groq.chat.completions.create(
+                messages=messages,
+                model=model,
+                timeout=timeout if timeout is not None else self.timeout,
+                **kwargs,
+            )
+
+    async def chat_completion_with_headers(
+        self,
+        messages: list,
+        model: str,
+        timeout: float | None = None,
+        **kwargs: object
+    ) -> tuple[ChatCompletion, httpx.Headers]:
+        async with self.semaphore:
+            logger.debug("Requesting chat completion from %s", model)
+            response = await self.groq_without_retries.chat.completions.with_raw_response.create(
+                messages=messages,
+                model=model,
+                timeout=timeout if timeout is not None else self.timeout,
+                **kwargs,
+            )
+            return await response.parse(), response.headers
+
+    async def aclose(self) -> None:
+        await self.groq.close()
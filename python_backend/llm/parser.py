@@ -1,11 +1,26 @@
+import json
 import logging
 import os
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 
 import sentry_sdk
 from dotenv import load_dotenv
-from groq import Groq
-from utils.constants import ALLOWED_EXPERIENCE_LEVEL_VALUES, ALLOWED_WORK_MODEL_VALUES
+from groq import BadRequestError
+from llm.cache import LLMResponseCache, get_llm_cache_path, make_cache_key
+from llm.client import LLMClient
+from llm.scheduler import LLMScheduler
+from llm.schema import build_job_posting_schema, build_response_format, validate_job_posting
+from utils.constants import (
+    ALLOWED_EXPERIENCE_LEVEL_VALUES,
+    ALLOWED_WORK_MODEL_VALUES,
+    INFERENCE_MODELS,
+    LIST_FIELDS,
+    LLM_PROMPT_VERSIONS,
+    LLM_STRUCTURED_OUTPUT_ERROR_MARKERS,
+    PARSE_JOB_MODELS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,135 +28,259 @@ if os.environ.get("FLY_REGION") is None:
     file_path = Path(__file__).parent.parent.parent / ".env"
     load_dotenv(file_path)
 
-def get_groq_client() -> Groq:
+def get_groq_client() -> LLMClient:
     api_key = os.environ.get("GROQ_API_KEY")
     if not api_key:
         error_msg = "Missing GROQ_API_KEY environment variable"
         raise RuntimeError(error_msg)
-    return Groq(api_key=api_key)
+    return LLMClient(api_key=api_key)
 
-client = get_groq_client()
+# Created on first use rather than at import, so its semaphore and connection pool belong to the loop that runs
+# the scrapes; closed by the FastAPI lifespan and by each worker process
+_shared_client: LLMClient | None = None
+
+def get_llm_client() -> LLMClient:
+    global _shared_client  # noqa: PLW0603
+    if _shared_client is None:
+        _shared_client = get_groq_client()
+    return _shared_client
+
+async def open_llm_client() -> LLMClient:
+    return get_llm_client()
+
+async def close_llm_client() -> None:
+    global _shared_client  # noqa: PLW0603
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+scheduler = LLMScheduler(get_llm_client)
+llm_cache = LLMResponseCache(get_llm_cache_path())
+structured_output_unsupported: set = set()
+
+async def cached_chat_completion(
+    prompt_name: str,
+    messages: list,
+    models: list,
+    is_cacheable: Callable[[str], bool] = lambda response: bool(response.strip()),
+    **kwargs: object,
+) -> str | None:
+    # The scheduler picks the model per request, so responses are keyed by the pool they may come from
+    key = make_cache_key(LLM_PROMPT_VERSIONS[prompt_name], "|".join(models), messages)
+    cached_response = llm_cache.get(key)
+    if cached_response is not None:
+        logger.debug("LLM cache hit for %s", prompt_name)
+        return cached_response
+
+    chat_completion = await scheduler.chat_completion(messages=messages, models=models, **kwargs)
+    response = chat_completion.choices[0].message.content
+    if isinstance(response, str) and is_cacheable(response):
+        llm_cache.set(key, response)
+    return response
+
+JOB_POSTING_FIELD_RULES = {
+    "description": (
+        "- 'description': Extract up to 3 full sentences from the job posting that clearly describe the "
+        "**role's mission, purpose, or high-level objectives**. Return them as a **single string** (not a "
+        "list). These sentences must explain **why the role exists** and how it **contributes to the "
+        "company's goals, impact, or innovation**.\n"
+        "Include only sentences that meet **all** of the following criteria:\n"
+        "  - Must be **verbatim** from the job posting (no paraphrasing or summarising).\n"
+        "  - Must describe **what the role enables, delivers, improves**, or its **business purpose**, "
+        "not general company background or a list of tasks\n"
+        "  - Must appear in one of these places: the **first 3 paragraphs**, or under headings like "
+        "'About the Role', 'Role Overview', or similar (prioritize these first).\n"
+        "  - Can include hiring intent if tied to business purpose, e.g., 'We are proud to be working "
+        "with...', 'We are seeking X to help...'.\n"
+        "Do **not** include:\n"
+        "  - Bullet points or technical task lists or list of specific responsibilities (that is left "
+        "for the 'responsibilities' field).\n"
+        "  - Company background, culture, benefits, perks, eligibility criteria, diversity encouragements "
+        "or unrelated HR information unless they directly explain the role's purpose.\n"
+        "  - Generic filler phrases like 'great opportunity', 'fast-paced environment', or unrelated fluff.\n"
+        "  - Content under headings like 'Responsibilities' or 'Requirements'"
+        "If multiple candidate sentences qualify, select those that appear **earliest**. If no qualifying "
+        "sentence exists, return an **empty string**.\n\n"
+    ),
+    "responsibilities": (
+        "- 'responsibilities': Extract all content that describes what the candidate will do in the role."
+        "Include every task-related bullet point or action-oriented sentence that outlines responsibilities, "
+        "duties, or deliverables. Only include actions, not skills, qualifications, experience levels, or "
+        "technologies unless they are part of an action. Return full sentences exactly as written in the "
+        "original text. Do not include section headings, requirement-related content, or summaries\n"
+    ),
+    "requirements": (
+        "- 'requirements': Extract all technical skills, technologies, years of experience, cloud platforms, "
+        "frontend/backend stacks, architecture knowledge, tools, frameworks, databases, testing "
+        "tools/methodologies, and certifications — even if mentioned outside the 'Requirements' section."
+        "Return exact phrasing as in the text, not keywords or tags. Return these an array of strings (one "
+        "per distinct requirement) and **no extra quotation marks** inside the strings.\n"
+    ),
+    "experience_level": (
+        "- 'experience_level': Choose one of: 'intern', 'junior', 'mid_or_senior', or 'lead+'. Infer from "
+        "the job title first; if unclear, infer from level of responsibility and the depth/breadth of "
+        "required experience. Return 'junior' if the role requires less than 2 years of experience and "
+        "appears entry-level. Return 'mid_or_senior' if the role is technical and requires significant "
+        "experience but no clear indication of leadership. Return 'lead+' only if the role clearly "
+        "involves leadership, strategic ownership, or team management. Always return one of the four "
+        "exact strings. Never return None.\n"
+    ),
+    "work_model": (
+        "- 'work_model': You must classify the `work_model` field strictly as one of: 'Remote', 'Hybrid', "
+        "or 'On-site'.\n"
+        "- Return 'Remote' ONLY if the job post explicitly states that remote work is allowed, using exact "
+        "phrases like: 'remote', 'work remotely', 'fully remote', or 'can work from anywhere'. These words "
+        "**must be clearly stated** and **refer to the job itself**, not company culture or benefits.\n"
+        "- Return 'Hybrid' ONLY if the job post clearly mentions a split between home and office, using "
+        "exact phrases like: 'work from home part of the week', 'hybrid', 'X days in office', 'flexible "
+        "work arrangement', or 'WFH'.\n"
+        "- Otherwise, default to 'On-site', even if flexibility or modern culture is implied.\n"
+        "- Do NOT assume remote or hybrid based on flexibility, benefits, perks, company culture, or "
+        "modern tech stack.\n"
+        "- Be strict. If the post is ambiguous or does not directly mention remote/hybrid, choose 'On-site'.\n"
+        "- Never return None.\n"
+    ),
+    "other": (
+        "- 'other': Include a list of additional job-relevant details not already captured above. This must "
+        "be a **list of bullet points**, each as a **string** and **no extra quotation marks** inside the "
+        "strings. Do not include technologies, tools, or experience level here.\n"
+    ),
+}
+PARSE_JOB_FIELD_COUNTS = {3: "three", 4: "four", 5: "five", 6: "six"}
+
+
+def describe_array_fields(fields: list) -> str:
+    quoted = [f"'{field}'" for field in fields]
+    if len(quoted) == 1:
+        return f"{quoted[0]} must be an array of strings."
+    if len(quoted) == 2:  # noqa: PLR2004
+        return f"{quoted[0]} and {quoted[1]} must be arrays of strings."
+    return f"{', '.join(quoted[:-1])}, and {quoted[-1]} must be arrays of strings."
+
+def requested_job_posting_fields(list_fields: list) -> list:
+    # List fields already extracted from the markdown are left out of both the rules and the expected keys
+    return [field for field in JOB_POSTING_FIELD_RULES if field not in LIST_FIELDS or field in list_fields]
+
+def build_parse_job_prompt(markdown: str, list_fields: list) -> str:
+    fields = requested_job_posting_fields(list_fields)
+    requested_lists = [field for field in fields if field in LIST_FIELDS]
+    array_rule = (
+        f"- {describe_array_fields(requested_lists)} (Remove bullet point formatting)\n" if requested_lists else ""
+    )
+
+    return (
+        "You are a strict JSON data extraction tool. Extract job posting data into a valid JSON object, "
+        "strictly following these rules.\n"
+        + "".join(JOB_POSTING_FIELD_RULES[field] for field in fields)
+        + f"Return a single JSON object with exactly the following {PARSE_JOB_FIELD_COUNTS[len(fields)]} keys and "
+        "no others in this exact order:\n"
+        + "".join(f"- {field}\n" for field in fields)
+        + "\n"
+        "**Rules:**\n"
+        "- Ensure the entire response is enclosed in a single set of curly braces `{ ... }`.\n"
+        "- Always return a single valid **JSON object** — not a string.\n"
+        + array_rule
+        + "- All keys MUST be double-quoted (strictly one set of double quotes), as "
+        "per strict JSON format.\n"
+        "- Do NOT wrap the entire output in quotes. Do NOT stringify the JSON.\n"
+        "- All string values (including those inside lists) MUST be properly closed with quotes and "
+        "strictly one set of quotes (not two sets of quotes).\n"
+        "- The first key must be 'description'.\n"
+        "- Arrays must use square brackets [] with double-quoted string values.\n"
+        "- Do not include markdown, backticks, or code blocks.\n"
+        "- No newline (`\\n`) or backslash (`\\`) characters in keys or values.\n"
+        "- No explanations, comments, or extra text — only the raw JSON output.\n\n"
+        f"Job Posting Text:\n{markdown}"
+    )
+
+def get_failed_generation(error: BadRequestError) -> str | None:
+    # Groq rejects JSON mode output that does not parse, but returns what the model generated
+    body = error.body if isinstance(error.body, dict) else {}
+    body = body.get("error", body) if isinstance(body.get("error"), dict) else body
+    failed_generation = body.get("failed_generation")
+    return failed_generation if isinstance(failed_generation, str) and failed_generation.strip() else None
+
+def is_structured_output_unsupported(error: BadRequestError) -> bool:
+    body = error.body if isinstance(error.body, dict) else {}
+    body = body.get("error", body) if isinstance(body.get("error"), dict) else body
+    details = " ".join([error.message, *(str(body.get(key) or "") for key in ("code", "param", "message"))]).lower()
+    return any(marker in details for marker in LLM_STRUCTURED_OUTPUT_ERROR_MARKERS)
+
+async def structured_chat_completion(
+    prompt_name: str,
+    messages: list,
+    models: list,
+    schema: dict,
+    is_cacheable: Callable[[str], bool],
+) -> str | None:
+    """Ask the model pool for output matching ``schema``, or for free text once it has rejected response_format."""
+    models_key = "|".join(models)
+    if models_key in structured_output_unsupported:
+        return await cached_chat_completion(prompt_name, messages=messages, models=models, is_cacheable=is_cacheable)
 
-async def parse_job_posting(markdown: str, count: int) -> str | None:
     try:
-        model = (
-            "llama-3.1-8b-instant" if count % 3 == 0 else
-            "llama3-70b-8192" if count % 3 == 1 else
-            "llama3-8b-8192"
-        )
-        prompt = (
-            "You are a strict JSON data extraction tool. Extract job posting data into a valid JSON object, "
-            "strictly following these rules.\n"
-
-            "- 'description': Extract up to 3 full sentences from the job posting that clearly describe the "
-            "**role's mission, purpose, or high-level objectives**. Return them as a **single string** (not a "
-            "list). These sentences must explain **why the role exists** and how it **contributes to the "
-            "company's goals, impact, or innovation**.\n"
-            "Include only sentences that meet **all** of the following criteria:\n"
-            "  - Must be **verbatim** from the job posting (no paraphrasing or summarising).\n"
-            "  - Must describe **what the role enables, delivers, improves**, or its **business purpose**, "
-            "not general company background or a list of tasks\n"
-            "  - Must appear in one of these places: the **first 3 paragraphs**, or under headings like "
-            "'About the Role', 'Role Overview', or similar (prioritize these first).\n"
-            "  - Can include hiring intent if tied to business purpose, e.g., 'We are proud to be working "
-            "with...', 'We are seeking X to help...'.\n"
-            "Do **not** include:\n"
-            "  - Bullet points or technical task lists or list of specific responsibilities (that is left "
-            "for the 'responsibilities' field).\n"
-            "  - Company background, culture, benefits, perks, eligibility criteria, diversity encouragements "
-            "or unrelated HR information unless they directly explain the role's purpose.\n"
-            "  - Generic filler phrases like 'great opportunity', 'fast-paced environment', or unrelated fluff.\n"
-            "  - Content under headings like 'Responsibilities' or 'Requirements'"
-            "If multiple candidate sentences qualify, select those that appear **earliest**. If no qualifying "
-            "sentence exists, return an **empty string**.\n\n"
-
-            "- 'responsibilities': Extract all content that describes what the candidate will do in the role."
-            "Include every task-related bullet point or action-oriented sentence that outlines responsibilities, "
-            "duties, or deliverables. Only include actions, not skills, qualifications, experience levels, or "
-            "technologies unless they are part of an action. Return full sentences exactly as written in the "
-            "original text. Do not include section headings, requirement-related content, or summaries\n"
-
-            "- 'requirements': Extract all technical skills, technologies, years of experience, cloud platforms, "
-            "frontend/backend stacks, architecture knowledge, tools, frameworks, databases, testing "
-            "tools/methodologies, and certifications — even if mentioned outside the 'Requirements' section."
-            "Return exact phrasing as in the text, not keywords or tags. Return these an array of strings (one "
-            "per distinct requirement) and **no extra quotation marks** inside the strings.\n"
-
-            "- 'experience_level': Choose one of: 'intern', 'junior', 'mid_or_senior', or 'lead+'. Infer from "
-            "the job title first; if unclear, infer from level of responsibility and the depth/breadth of "
-            "required experience. Return 'junior' if the role requires less than 2 years of experience and "
-            "appears entry-level. Return 'mid_or_senior' if the role is technical and requires significant "
-            "experience but no clear indication of leadership. Return 'lead+' only if the role clearly "
-            "involves leadership, strategic ownership, or team management. Always return one of the four "
-            "exact strings. Never return None.\n"
-
-            "- 'work_model': You must classify the `work_model` field strictly as one of: 'Remote', 'Hybrid', "
-            "or 'On-site'.\n"
-            "- Return 'Remote' ONLY if the job post explicitly states that remote work is allowed, using exact "
-            "phrases like: 'remote', 'work remotely', 'fully remote', or 'can work from anywhere'. These words "
-            "**must be clearly stated** and **refer to the job itself**, not company culture or benefits.\n"
-            "- Return 'Hybrid' ONLY if the job post clearly mentions a split between home and office, using "
-            "exact phrases like: 'work from home part of the week', 'hybrid', 'X days in office', 'flexible "
-            "work arrangement', or 'WFH'.\n"
-            "- Otherwise, default to 'On-site', even if flexibility or modern culture is implied.\n"
-            "- Do NOT assume remote or hybrid based on flexibility, benefits, perks, company culture, or "
-            "modern tech stack.\n"
-            "- Be strict. If the post is ambiguous or does not directly mention remote/hybrid, choose 'On-site'.\n"
-            "- Never return None.\n"
-
-            "- 'other': Include a list of additional job-relevant details not already captured above. This must "
-            "be a **list of bullet points**, each as a **string** and **no extra quotation marks** inside the "
-            "strings. Do not include technologies, tools, or experience level here.\n"
-
-            "Return a single JSON object with exactly the following six keys and no others in this exact order:\n"
-            "- description\n- responsibilities\n- requirements\n- experience_level\n- work_model\n- other\n\n"
-
-            "**Rules:**\n"
-            "- Ensure the entire response is enclosed in a single set of curly braces `{ ... }`.\n"
-            "- Always return a single valid **JSON object** — not a string.\n"
-            "- 'responsibilities', 'requirements', and 'other' must be arrays of strings. (Remove bullet "
-            "point formatting)\n"
-            "- All keys MUST be double-quoted (strictly one set of double quotes), as "
-            "per strict JSON format.\n"
-            "- Do NOT wrap the entire output in quotes. Do NOT stringify the JSON.\n"
-            "- All string values (including those inside lists) MUST be properly closed with quotes and "
-            "strictly one set of quotes (not two sets of quotes).\n"
-            "- The first key must be 'description'.\n"
-            "- Arrays must use square brackets [] with double-quoted string values.\n"
-            "- Do not include markdown, backticks, or code blocks.\n"
-            "- No newline (`\\n`) or backslash (`\\`) characters in keys or values.\n"
-            "- No explanations, comments, or extra text — only the raw JSON output.\n\n"
-
-            f"Job Posting Text:\n{markdown}"
+        return await cached_chat_completion(
+            prompt_name,
+            messages=messages,
+            models=models,
+            is_cacheable=is_cacheable,
+            response_format=build_response_format(models, schema),
         )
+    except BadRequestError as e:
+        failed_generation = get_failed_generation(e)
+        if failed_generation is not None:
+            logger.warning("Structured output for %s failed validation, falling back to JSON repair", prompt_name)
+            return failed_generation
+        if not is_structured_output_unsupported(e):
+            raise
+        # The backend does not accept response_format for these models: stop asking and use free text
+        logger.warning("Structured output rejected for %s, falling back to free-text parsing", models_key)
+        structured_output_unsupported.add(models_key)
+        return await cached_chat_completion(prompt_name, messages=messages, models=models, is_cacheable=is_cacheable)
 
-        chat_completion = client.chat.completions.create(
-            messages= [
-                {
-                    "role": "system",
-                    "content": "You extract structured job data from markdown."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model=model,
+def is_valid_job_posting_response(response: str, schema: dict) -> bool:
+    try:
+        job_data = json.loads(response)
+    except json.JSONDecodeError:
+        return False
+    return not validate_job_posting(job_data, schema)
+
+async def parse_job_posting(
+    markdown: str,
+    list_fields: list = LIST_FIELDS,
+    is_cacheable: Callable[[str], bool] | None = None,
+) -> str | None:
+    try:
+        prompt = build_parse_job_prompt(markdown, list_fields)
+        messages = [
+            {
+                "role": "system",
+                "content": "You extract structured job data from markdown."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        schema = build_job_posting_schema(requested_job_posting_fields(list_fields))
+        # A malformed response would otherwise be replayed from the cache until it expires
+        is_cacheable = is_cacheable or partial(is_valid_job_posting_response, schema=schema)
+
+        return await structured_chat_completion(
+            "parse_job_posting", messages, PARSE_JOB_MODELS, schema, is_cacheable=is_cacheable
         )
-        return chat_completion.choices[0].message.content
 
     except Exception as e:
         logger.exception("Error calling Groq API (parse job posting)")
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "parse_job_posting")
-            scope.set_extra("model", model)
+            scope.set_extra("models", PARSE_JOB_MODELS)
             scope.set_extra("input_excerpt", markdown[:500])
             sentry_sdk.capture_exception(e)
         return None
 
 async def infer_work_model(job_text: str) -> str | None:
     try:
-        model = "llama-3.3-70b-versatile"
         prompt = (
             "You are tasked with determining the 'work_model' (Hybrid, On-site, Remote) for a job posting. "
             "The 'work_model' should be inferred from the information in the job description, responsibilities, "
@@ -149,7 +288,8 @@ async def infer_work_model(job_text: str) -> str | None:
             "string, either 'Hybrid', 'On-site', or 'Remote'.\n\n"
             "Job Posting Text:\n{job_text}"
         )
-        chat_completion = client.chat.completions.create(
+        response = await cached_chat_completion(
+            "infer_work_model",
             messages= [
                 {
                     "role": "system",
@@ -160,15 +300,16 @@ async def infer_work_model(job_text: str) -> str | None:
                     "content": prompt.format(job_text=job_text)
                 }
             ],
-            model=model,
+            models=INFERENCE_MODELS,
+            is_cacheable=lambda response: response.strip() in ALLOWED_WORK_MODEL_VALUES,
         )
-        inferred_work_model = chat_completion.choices[0].message.content.strip()
+        inferred_work_model = response.strip()
 
     except Exception as e:
         logger.exception("Error calling Groq API (work_model):")
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "infer_work_model")
-            scope.set_extra("model", model)
+            scope.set_extra("models", INFERENCE_MODELS)
             scope.set_extra("input_excerpt", job_text[:500])
             sentry_sdk.capture_exception(e)
         return None
@@ -178,7 +319,6 @@ async def infer_work_model(job_text: str) -> str | None:
 
 async def infer_experience_level(job_title: str, job_text: str) -> str | None:
     try:
-        model = "llama-3.3-70b-versatile"
         prompt = (
             "You are a strict classification model. Your task is to determine the 'experience_level'"
             "for a job posting.\n\n"
@@ -204,7 +344,8 @@ async def infer_experience_level(job_title: str, job_text: str) -> str | None:
             "Job Title: {job_title}\n\n"
             "Job Posting Text:\n{job_text}"
         )
-        chat_completion = client.chat.completions.create(
+        response = await cached_chat_completion(
+            "infer_experience_level",
             messages=[
                 {
                     "role": "system",
@@ -215,18 +356,91 @@ async def infer_experience_level(job_title: str, job_text: str) -> str | None:
                     "content": prompt.format(job_title=job_title, job_text=job_text)
                 }
             ],
-            model=model,
+            models=INFERENCE_MODELS,
+            is_cacheable=lambda response: response.strip().lower() in ALLOWED_EXPERIENCE_LEVEL_VALUES,
         )
-        inferred_experience = chat_completion.choices[0].message.content.strip().lower()
+        inferred_experience = response.strip().lower()
 
     except Exception as e:
         logger.exception("Error calling Groq API (experience_level)")
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "infer_experience_level")
-            scope.set_extra("model", model)
+            scope.set_extra("models", INFERENCE_MODELS)
             scope.set_extra("input_excerpt", job_text[:500])
             sentry_sdk.capture_exception(e)
         return None
 
     else:
         return inferred_experience if inferred_experience in ALLOWED_EXPERIENCE_LEVEL_VALUES else None
+
+CLASSIFICATION_SCHEMA = build_job_posting_schema(["work_model", "experience_level"])
+
+def parse_classification_response(response: str) -> dict:
+    try:
+        data = json.loads(response.strip())
+    except json.JSONDecodeError:
+        return {"work_model": None, "experience_level": None}
+    if not isinstance(data, dict):
+        return {"work_model": None, "experience_level": None}
+
+    work_model = str(data.get("work_model", "")).strip()
+    experience_level = str(data.get("experience_level", "")).strip().lower()
+    return {
+        "work_model": work_model if work_model in ALLOWED_WORK_MODEL_VALUES else None,
+        "experience_level": experience_level if experience_level in ALLOWED_EXPERIENCE_LEVEL_VALUES else None,
+    }
+
+async def infer_work_model_and_experience_level(job_title: str, job_text: str) -> dict:
+    try:
+        prompt = (
+            "You are a strict classification model. Determine both the 'work_model' and the 'experience_level' "
+            "for a job posting.\n\n"
+
+            "'work_model' must be one of: 'Hybrid', 'On-site', 'Remote'. Infer it from the job description, "
+            "responsibilities, and any mention of work environment, flexibility, or location.\n\n"
+
+            "'experience_level' must be one of: 'intern', 'junior', 'mid_or_senior', 'lead+'.\n"
+            "  - 'intern' if the role is clearly an internship or student placement.\n"
+            "  - 'junior' if the job is entry-level or requires less than 2 years of experience.\n"
+            "  - 'mid_or_senior' if the job is technical and expects substantial experience (but not "
+            "leadership).\n"
+            "  - 'lead+' only if the job clearly involves managing others, leading teams, or setting strategy.\n"
+            "Do not rely on the job title alone for 'experience_level'.\n\n"
+
+            "Return only a JSON object with exactly these two keys, for example "
+            '{{"work_model": "On-site", "experience_level": "junior"}}. '
+            "Do not explain your answer. Do not return anything else.\n\n"
+
+            "Job Title: {job_title}\n\n"
+            "Job Posting Text:\n{job_text}"
+        )
+        response = await structured_chat_completion(
+            "infer_work_model_and_experience_level",
+            [
+                {
+                    "role": "system",
+                    "content": "You are an assistant that classifies the work model and experience level of a job "
+                    "posting."
+                },
+                {
+                    "role": "user",
+                    "content": prompt.format(job_title=job_title, job_text=job_text)
+                }
+            ],
+            INFERENCE_MODELS,
+            CLASSIFICATION_SCHEMA,
+            is_cacheable=lambda response: all(parse_classification_response(response).values()),
+        )
+        inferred = parse_classification_response(response)
+
+    except Exception as e:
+        logger.exception("Error calling Groq API (work_model and experience_level)")
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "infer_work_model_and_experience_level")
+            scope.set_extra("models", INFERENCE_MODELS)
+            scope.set_extra("input_excerpt", job_text[:500])
+            sentry_sdk.capture_exception(e)
+        return {"work_model": None, "experience_level": None}
+
+    else:
+        return inferred
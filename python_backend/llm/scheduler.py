@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import httpx
+from groq import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from groq.types.chat import ChatCompletion
+from llm.client import LLMClient
+from utils.constants import (
+    LLM_CHARS_PER_TOKEN,
+    LLM_COMPLETION_TOKEN_ESTIMATE,
+    LLM_DEFAULT_RATE_LIMIT_COOLDOWN,
+    LLM_LATENCY_SMOOTHING_FACTOR,
+    LLM_MAX_RETRIES,
+    LLM_MAX_SCHEDULER_SLEEP,
+    LLM_MODEL_LIMITS,
+)
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_MINUTE = 60.0
+DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    # Groq reports resets as Go-style durations, e.g. "2m59.56s" or "120ms"
+    if not value:
+        return None
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+def parse_header_number(headers: httpx.Headers, name: str) -> float | None:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def estimate_tokens(messages: list) -> int:
+    prompt_chars = sum(len(str(message.get("content", ""))) for message in messages)
+    return prompt_chars // LLM_CHARS_PER_TOKEN + LLM_COMPLETION_TOKEN_ESTIMATE
+
+
+@dataclass
+class TokenBucket:
+    capacity: float
+    refill_per_second: float
+    tokens: float = field(init=False)
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        """Start with a full bucket."""
+        self.tokens = self.capacity
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self.refill(now)
+        # Requests larger than the whole bucket are let through once it is full rather than blocking forever
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float, now: float) -> None:
+        self.refill(now)
+        self.tokens -= amount
+
+    def sync(self, remaining: float, now: float, limit: float | None = None) -> None:
+        if limit is not None and limit > 0:
+            self.capacity = limit
+            self.refill_per_second = limit / SECONDS_PER_MINUTE
+        self.tokens = min(remaining, self.capacity)
+        self.updated_at = now
+
+
+@dataclass
+class ModelState:
+    name: str
+    requests: TokenBucket
+    tokens: TokenBucket
+    cooldown_until: float = 0.0
+    latency: float | None = None
+
+    def wait_time(self, estimated_tokens: int, now: float) -> float:
+        return max(
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(estimated_tokens, now),
+            self.cooldown_until - now,
+        )
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        get_client: Callable[[], LLMClient],
+        model_limits: dict = LLM_MODEL_LIMITS,
+        max_retries: int = LLM_MAX_RETRIES,
+    ) -> None:
+        """Initialize an LLMScheduler instance.
+
+        Args:
+            get_client (Callable[[], LLMClient]): Returns the client that sends the routed requests; called per
+                request so the client can be created lazily on the loop that uses it.
+            model_limits (dict): Configured ``{"rpm": ..., "tpm": ...}`` per model; response headers refine them.
+            max_retries (int): Times a request is re-routed after a 429, timeout, connection error or 5xx.
+
+        """
+        self.get_client = get_client
+        self.max_retries = max_retries
+        self.models = {
+            name: ModelState(
+                name=name,
+                requests=TokenBucket(limits["rpm"], limits["rpm"] / SECONDS_PER_MINUTE),
+                tokens=TokenBucket(limits["tpm"], limits["tpm"] / SECONDS_PER_MINUTE),
+            )
+            for name, limits in model_limits.items()
+        }
+        # One lock per model pool, created on the loop that uses it rather than wherever the scheduler was built
+        self.locks: dict = {}
+        self.locks_loop: asyncio.AbstractEventLoop | None = None
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.routed: dict = dict.fromkeys(self.models, 0)
+        self.rate_limited = 0
+        self.cancelled = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def soonest_model(self, models: list, estimated_tokens: int, now: float) -> tuple[str, float]:
+        # Ties (usually several idle models) go to the lowest observed latency, then to list order
+        candidates = [
+            (
+                self.models[name].wait_time(estimated_tokens, now),
+                self.models[name].latency if self.models[name].latency is not None else 0.0,
+                index,
+                name,
+            )
+            for index, name in enumerate(models)
+        ]
+        wait, _latency, _index, name = min(candidates)
+        return name, max(wait, 0.0)
+
+    def pool_lock(self, models: list) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if loop is not self.locks_loop:
+            self.locks = {}
+            self.locks_loop = loop
+        return self.locks.setdefault("|".join(models), asyncio.Lock())
+
+    async def acquire(self, models: list, estimated_tokens: int) -> str:
+        started = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            # The pool's lock keeps its waiters in arrival order while the head sleeps until a model frees up;
+            # other pools queue on their own lock, so a saturated pool never holds up requests routed elsewhere
+            async with self.pool_lock(models):
+                while True:
+                    now = time.monotonic()
+                    name, wait = self.soonest_model(models, estimated_tokens, now)
+                    if wait <= 0:
+                        state = self.models[name]
+                        state.requests.consume(1, now)
+                        state.tokens.consume(estimated_tokens, now)
+                        break
+                    await asyncio.sleep(min(wait, LLM_MAX_SCHEDULER_SLEEP))
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.routed[name] += 1
+        return name
+
+    def record_response(self, model: str, headers: httpx.Headers, latency: float | None = None) -> None:
+        state = self.models[model]
+        now = time.monotonic()
+
+        remaining_tokens = parse_header_number(headers, "x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            state.tokens.sync(remaining_tokens, now, parse_header_number(headers, "x-ratelimit-limit-tokens"))
+
+        # Groq's request headers describe the daily quota, so an exhausted one pauses the model until it resets
+        remaining_requests = parse_header_number(headers, "x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests < 1:
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            state.cooldown_until = max(state.cooldown_until, now + (reset or LLM_DEFAULT_RATE_LIMIT_COOLDOWN))
+
+        if latency is not None:
+            state.latency = latency if state.latency is None else (
+                LLM_LATENCY_SMOOTHING_FACTOR * latency + (1 - LLM_LATENCY_SMOOTHING_FACTOR) * state.latency
+            )
+
+    def record_rate_limited(self, model: str, headers: httpx.Headers) -> None:
+        self.rate_limited += 1
+        self.record_response(model, headers)
+        retry_after = (
+            parse_reset_duration(headers.get("retry-after"))
+            or parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+            or LLM_DEFAULT_RATE_LIMIT_COOLDOWN
+        )
+        state = self.models[model]
+        state.cooldown_until = max(state.cooldown_until, time.monotonic() + retry_after)
+        logger.warning("Model %s rate limited, cooling down for %.2fs", model, retry_after)
+
+    async def chat_completion(self, messages: list, models: list, **kwargs: object) -> ChatCompletion:
+        estimated_tokens = estimate_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            model = await self.acquire(models, estimated_tokens)
+            started = time.monotonic()
+            try:
+                completion, headers = await self.get_client().chat_completion_with_headers(
+                    messages=messages, model=model, **kwargs
+                )
+            except asyncio.CancelledError:
+                # The caller gave up (e.g. its scrape terminated early); the request is aborted mid-flight
+                self.cancelled += 1
+                raise
+            except RateLimitError as e:
+                self.record_rate_limited(model, e.response.headers)
+                if attempt == self.max_retries:
+                    raise
+            except RETRYABLE_ERRORS:
+                logger.warning("Retrying chat completion after a transient error from %s", model)
+                if attempt == self.max_retries:
+                    raise
+            else:
+                self.record_response(model, headers, time.monotonic() - started)
+                return completion
+
+        error_msg = "Chat completion retries exhausted"
+        raise RuntimeError(error_msg)
+
+    def counters(self) -> dict:
+        return {
+            "requests": sum(self.routed.values()),
+            "rate_limited": self.rate_limited,
+            "cancelled": self.cancelled,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": sum(self.routed.values()),
+            "rate_limited": self.rate_limited,
+            "cancelled": self.cancelled,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "routed": dict(self.routed),
+        }
@@ -0,0 +1,54 @@
+from utils.constants import (
+    ALLOWED_EXPERIENCE_LEVEL_VALUES,
+    ALLOWED_WORK_MODEL_VALUES,
+    LIST_FIELDS,
+    LLM_JSON_SCHEMA_MODELS,
+    NON_REQUIRED_FIELDS,
+    REQUIRED_FIELDS,
+)
+
+FIELD_ENUMS = {
+    "work_model": sorted(ALLOWED_WORK_MODEL_VALUES),
+    "experience_level": ALLOWED_EXPERIENCE_LEVEL_VALUES,
+}
+
+
+def build_job_posting_schema(fields: list) -> dict:
+    properties = {}
+    for field in fields:
+        if field in LIST_FIELDS:
+            properties[field] = {"type": "array", "items": {"type": "string"}}
+        elif field in REQUIRED_FIELDS or field in NON_REQUIRED_FIELDS:
+            properties[field] = {"type": "string"}
+            if field in FIELD_ENUMS:
+                properties[field]["enum"] = FIELD_ENUMS[field]
+        else:
+            error_msg = f"Unknown job field '{field}'"
+            raise ValueError(error_msg)
+
+    return {"type": "object", "properties": properties, "required": list(fields), "additionalProperties": False}
+
+def validate_job_posting(data: object, schema: dict) -> list:
+    # Covers exactly what build_job_posting_schema can declare, so one pass needs no schema library
+    if not isinstance(data, dict):
+        return ["response is not a JSON object"]
+
+    errors = [f"missing '{field}'" for field in schema["required"] if field not in data]
+    for field, value in data.items():
+        rules = schema["properties"].get(field)
+        if rules is None:
+            errors.append(f"unexpected '{field}'")
+        elif rules["type"] == "array":
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                errors.append(f"'{field}' is not a list of strings")
+        elif not isinstance(value, str):
+            errors.append(f"'{field}' is not a string")
+        elif "enum" in rules and value not in rules["enum"]:
+            errors.append(f"'{field}' is not one of {rules['enum']}")
+    return errors
+
+def build_response_format(models: list, schema: dict) -> dict:
+    # The scheduler may route to any model in the pool, so the schema is only enforced when all of them can
+    if all(model in LLM_JSON_SCHEMA_MODELS for model in models):
+        return {"type": "json_schema", "json_schema": {"name": "job_posting", "schema": schema}}
+    return {"type": "json_object"}
@@ -1,24 +1,30 @@
+import asyncio
 import logging
 
+import httpx
 import sentry_sdk
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 from crawl4ai.content_filter_strategy import PruningContentFilter
-from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
-from utils.constants import MAX_RETRIES
-from utils.retry import retry_with_backoff
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator, MarkdownGenerationResult
+from pages.http_fetch import fetch_html
+from utils.constants import JOB_PAGE_MARKER
 from utils.utils import backoff_if_high_cpu, pause_briefly
 
 logger = logging.getLogger(__name__)
 
-async def fetch_page_markdown(base_url: str, crawler: AsyncWebCrawler, page_num: int) -> str | None:
-    page_url = f"{base_url}&page={page_num}"
+def get_page_url(base_url: str, page_num: int) -> str:
+    return f"{base_url}&page={page_num}"
+
+async def fetch_page_content(base_url: str, crawler: AsyncWebCrawler, page_num: int) -> tuple | None:
+    """Crawl a listing page, returning its markdown and the HTML it was rendered from."""
+    page_url = get_page_url(base_url, page_num)
     await pause_briefly(1.0, 2.5)
 
     try:
         result = await crawler.arun(page_url)
     except Exception as e:
         with sentry_sdk.push_scope() as scope:
-            scope.set_tag("component", "fetch_page_markdown")
+            scope.set_tag("component", "fetch_page_content")
             scope.set_tag("page_num", page_num)
             scope.set_extra("page_url", page_url)
             sentry_sdk.capture_exception(e)
@@ -28,7 +34,7 @@ async def fetch_page_markdown(base_url: str, crawler: AsyncWebCrawler, page_num:
 
     if not result.success:
         with sentry_sdk.push_scope() as scope:
-            scope.set_tag("component", "fetch_page_markdown")
+            scope.set_tag("component", "fetch_page_content")
             scope.set_tag("page_num", page_num)
             scope.set_extra("page_url", page_url)
             scope.set_extra("status_code", result.status_code)
@@ -40,7 +46,7 @@ async def fetch_page_markdown(base_url: str, crawler: AsyncWebCrawler, page_num:
 
     if not result.markdown:
         with sentry_sdk.push_scope() as scope:
-            scope.set_tag("component", "fetch_page_markdown")
+            scope.set_tag("component", "fetch_page_content")
             scope.set_tag("page_num", page_num)
             scope.set_extra("page_url", page_url)
             sentry_sdk.capture_message(
@@ -49,36 +55,72 @@ async def fetch_page_markdown(base_url: str, crawler: AsyncWebCrawler, page_num:
             )
         return None
 
-    return result.markdown
-
-async def fetch_job_markdown(job_url: str, crawler: AsyncWebCrawler) -> str | None:
-    async def crawl():
-        prune_filter = PruningContentFilter(threshold=0.5, threshold_type="fixed")
-        md_generator = DefaultMarkdownGenerator(
-            content_filter=prune_filter,
-            options={"ignore_links": True, "ignore_images": True}
-        )
-        config = CrawlerRunConfig(markdown_generator=md_generator)
-
-        logger.debug("Starting crawl for job URL: %s", job_url)
-        result = await crawler.arun(job_url, config=config)
-        await pause_briefly(0.05, 0.25)
-        await backoff_if_high_cpu()
-
-        if not result.success:
-            with sentry_sdk.push_scope() as scope:
-                scope.set_tag("component", "fetch_job_markdown")
-                scope.set_extra("job_url", job_url)
-                scope.set_extra("crawler_error", result.error_message)
-                sentry_sdk.capture_message("Crawler failed to fetch markdown", level="error")
-            return None
-
-        return result.markdown.fit_markdown
-
-    return await retry_with_backoff(
-        crawl,
-        max_retries=MAX_RETRIES,
-        base_delay=1.0,
-        label=f"fetch_job_markdown: {job_url}"
+    return result.markdown, result.html
+
+def build_job_markdown_config() -> CrawlerRunConfig:
+    prune_filter = PruningContentFilter(threshold=0.5, threshold_type="fixed")
+    md_generator = DefaultMarkdownGenerator(
+        content_filter=prune_filter,
+        options={"ignore_links": True, "ignore_images": True}
     )
+    return CrawlerRunConfig(markdown_generator=md_generator)
+
+# Converts HTML that was already loaded elsewhere, so crawl4ai never makes a network request
+async def render_job_markdown(job_url: str, html: str, crawler: AsyncWebCrawler) -> str | None:
+    try:
+        result = await crawler.arun(f"raw:{html}", config=build_job_markdown_config())
+    except Exception as e:
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "render_job_markdown")
+            scope.set_extra("job_url", job_url)
+            sentry_sdk.capture_exception(e)
+        return None
+
+    await backoff_if_high_cpu()
+
+    if not result.success:
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "render_job_markdown")
+            scope.set_extra("job_url", job_url)
+            scope.set_extra("crawler_error", result.error_message)
+            sentry_sdk.capture_message("Crawler failed to render markdown from page HTML", level="error")
+        return None
 
+    return result.markdown.fit_markdown
+
+def html_to_markdown(url: str, html: str, config: CrawlerRunConfig) -> MarkdownGenerationResult:
+    """Run crawl4ai's scraping and markdown steps on HTML fetched elsewhere, without a crawler or browser."""
+    params = config.__dict__.copy()
+    params.pop("url", None)
+    scraped = config.scraping_strategy.scrap(url, html, **params)
+    markdown_generator = config.markdown_generator or DefaultMarkdownGenerator()
+    return markdown_generator.generate_markdown(input_html=scraped.cleaned_html, base_url=url)
+
+async def convert_html_to_markdown(url: str, html: str, config: CrawlerRunConfig) -> MarkdownGenerationResult | None:
+    try:
+        return await asyncio.to_thread(html_to_markdown, url, html, config)
+    except Exception as e:
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "convert_html_to_markdown")
+            scope.set_extra("url", url)
+            sentry_sdk.capture_exception(e)
+        return None
+
+async def fetch_page_content_over_http(base_url: str, client: httpx.AsyncClient, page_num: int) -> tuple | None:
+    page_url = get_page_url(base_url, page_num)
+    await pause_briefly(1.0, 2.5)
+
+    html = await fetch_html(page_url, client)
+    result = await convert_html_to_markdown(page_url, html, CrawlerRunConfig()) if html else None
+    if result is None:
+        return None
+    return result.raw_markdown, html
+
+async def fetch_job_page_over_http(job_url: str, client: httpx.AsyncClient) -> tuple | None:
+    """Fetch a job page's HTML and pruned markdown over HTTP, or None when the browser should load it instead."""
+    html = await fetch_html(job_url, client, required_marker=JOB_PAGE_MARKER)
+    result = await convert_html_to_markdown(job_url, html, build_job_markdown_config()) if html else None
+    if result is None or not result.fit_markdown:
+        return None
+    await pause_briefly(0.05, 0.25)
+    return result.fit_markdown, html
@@ -0,0 +1,73 @@
+import re
+
+from markdown.trimmer import BULLET, split_blocks
+from utils.constants import MIN_SECTION_BULLETS
+
+# A heading matching more than one field (e.g. "What you'll do and need") is mixed and left to the LLM
+SECTION_HEADINGS = [
+    ("responsibilities", re.compile(
+        r"responsibilit|duties|accountabilit|what you(?:'|\u2019)?ll (?:do|be doing)|what you will (?:do|be doing)|"
+        r"day[- ]to[- ]day|your role|in this role|the role involves|your impact",
+        re.IGNORECASE,
+    )),
+    ("requirements", re.compile(
+        r"requirement|qualification|skills|experience|about you|you(?:'|\u2019)?ll (?:have|bring|need)|"
+        r"you have|you bring|who you are|\bneed\b|looking for|tech stack|must[- ]haves?|nice[- ]to[- ]haves?|"
+        r"ideal candidate|what we(?:'|\u2019)?re after|selection criteria",
+        re.IGNORECASE,
+    )),
+    ("other", re.compile(
+        r"benefits|perks|what we offer|\bwhy\b|in return|what(?:'|\u2019)?s in it for you|about us|"
+        r"about the (?:company|team|business)|who we are|our (?:company|team|story|mission)",
+        re.IGNORECASE,
+    )),
+]
+# The LLM's 'other' also gathers details from the prose, so bullets under 'other' headings only count as placed
+LLM_ONLY_FIELDS = {"other"}
+# Job board chrome (screening questions, report links) whose bullets belong to no field
+IGNORED_HEADINGS = re.compile(r"your application will include|report this job", re.IGNORECASE)
+INLINE_EMPHASIS = re.compile(r"(?<!\w)(\*\*|__|\*|_)(?=\S)(.+?)(?<=\S)\1(?!\w)")
+
+
+def classify_heading(heading: str) -> str | None:
+    fields = [field for field, pattern in SECTION_HEADINGS if pattern.search(heading)]
+    return fields[0] if len(fields) == 1 else None
+
+def clean_bullet(line: str) -> str:
+    text = INLINE_EMPHASIS.sub(r"\2", BULLET.sub("", line, count=1))
+    return re.sub(r"\s+", " ", text).strip()
+
+def extract_list_fields(markdown: str) -> dict:
+    """Collect bullet lists that sit directly under recognised section headings.
+
+    Only responsibilities and requirements with at least MIN_SECTION_BULLETS bullets are returned; anything else,
+    including requirements when some list sits under an unrecognised heading, is left to the LLM.
+    """
+    sections: dict = {}
+    has_unplaced_list = False
+    for block in split_blocks(markdown.splitlines()):
+        if not block.is_list or IGNORED_HEADINGS.search(block.heading):
+            continue
+        field = classify_heading(block.heading)
+        if field is None:
+            has_unplaced_list = True
+            continue
+        bullets = [clean_bullet(line) for line in block.text.splitlines()]
+        sections.setdefault(field, []).extend(bullet for bullet in bullets if bullet)
+
+    # Unplaced bullets are often requirements, which the LLM also collects from anywhere in the advert
+    if has_unplaced_list:
+        sections.pop("requirements", None)
+    return {
+        field: bullets
+        for field, bullets in sections.items()
+        if field not in LLM_ONLY_FIELDS and len(bullets) >= MIN_SECTION_BULLETS
+    }
+
+def extract_section_text(markdown: str, field: str) -> str:
+    """Join every block, list or paragraph, that sits under a heading recognised as ``field``."""
+    return "\n".join(
+        block.text
+        for block in split_blocks(markdown.splitlines())
+        if not block.is_heading and classify_heading(block.heading) == field
+    )
@@ -0,0 +1,174 @@
+import re
+from dataclasses import dataclass
+
+from utils.constants import LLM_CHARS_PER_TOKEN, MARKDOWN_LEADING_PARAGRAPHS, MARKDOWN_TOKEN_BUDGET
+
+HEADING = re.compile(r"^\s*(#{1,6})\s+(.*)$")
+BOLD_HEADING = re.compile(r"^\s*\*\*([^*]{1,80})\*\*")
+LABEL_HEADING = re.compile(r"^\s*([A-Z][^.!?:]{0,60}):\s*$")
+BULLET = re.compile(r"^\s*(?:[*+\u2022-]|\d+[.)])\s+")
+SENTENCE_END = re.compile(r"[.!?]")
+
+# Job board chrome that follows every advert; never useful to the parser
+NOISE_SECTIONS = re.compile(
+    r"how do your skills match|report this job|similar jobs|career advice|company profile|more jobs",
+    re.IGNORECASE,
+)
+# Sections the prompt extracts responsibilities, requirements and the description from
+KEEP_SECTIONS = re.compile(
+    r"responsibilit|duties|what you(?:'|\u2019)?ll do|what you will do|day[- ]to[- ]day|the role|role overview|"
+    r"about the job|requirement|qualification|skills|experience|about you|you have|you bring|who you are|looking for|"
+    r"tech stack|interested in hearing|the opportunity",
+    re.IGNORECASE,
+)
+# Phrases the work model and experience level rules depend on
+SIGNAL_TERMS = re.compile(
+    r"remote|hybrid|office|wfh|work from home|on[- ]?site|flexib|\byears?\b|graduate|intern|lead|manag",
+    re.IGNORECASE,
+)
+BOILERPLATE_TERMS = re.compile(
+    r"\bapply\b|application|equal opportunit|diversity|diverse|inclusi|underrepresented|aboriginal|"
+    r"torres strait|privacy|recruitment agenc|sponsorship|police check|background check|shortlisted|"
+    r"we encourage|click",
+    re.IGNORECASE,
+)
+PARAGRAPH_MIN_CHARS = 60
+
+
+@dataclass
+class MarkdownBlock:
+    text: str
+    heading: str
+    position: int
+    is_heading: bool = False
+    is_list: bool = False
+    protected: bool = False
+    score: float = 0.0
+
+
+@dataclass(frozen=True)
+class TrimResult:
+    markdown: str
+    original_tokens: int
+    trimmed_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.trimmed_tokens
+
+
+def estimate_markdown_tokens(markdown: str) -> int:
+    return len(markdown) // LLM_CHARS_PER_TOKEN
+
+def drop_noise_sections(lines: list) -> list:
+    kept = []
+    noise_level = None
+    for line in lines:
+        heading = HEADING.match(line)
+        if heading:
+            level = len(heading.group(1))
+            if noise_level is not None and level <= noise_level:
+                noise_level = None
+            if noise_level is None and NOISE_SECTIONS.search(heading.group(2)):
+                noise_level = level
+        if noise_level is None:
+            kept.append(line)
+    return kept
+
+def split_blocks(lines: list) -> list:
+    blocks: list = []
+    heading = ""
+    for line in lines:
+        if not line.strip():
+            continue
+        match = HEADING.match(line) or BOLD_HEADING.match(line) or LABEL_HEADING.match(line)
+        if match:
+            heading = match.group(match.lastindex).strip("* :")
+            blocks.append(MarkdownBlock(line, heading, len(blocks), is_heading=True))
+        elif BULLET.match(line) and blocks and blocks[-1].is_list and blocks[-1].heading == heading:
+            blocks[-1].text += f"\n{line}"
+        else:
+            blocks.append(MarkdownBlock(line, heading, len(blocks), is_list=bool(BULLET.match(line))))
+    return blocks
+
+def is_paragraph(text: str) -> bool:
+    # Job board metadata lines (locations, categories, salary) are long but are not prose
+    return len(text.strip()) >= PARAGRAPH_MIN_CHARS and bool(SENTENCE_END.search(text))
+
+def score_blocks(blocks: list, leading_paragraphs: int) -> None:
+    # Everything up to the Nth real paragraph stays: the prompt takes the description from the opening text
+    paragraphs_seen = 0
+    section_list_ended = False
+    for block in blocks:
+        if block.is_heading:
+            section_list_ended = False
+        if paragraphs_seen < leading_paragraphs:
+            block.protected = True
+            if not block.is_heading and not block.is_list and is_paragraph(block.text):
+                paragraphs_seen += 1
+        elif block.is_list:
+            block.protected = True
+            section_list_ended = True
+        # Prose after a section's list is usually sign-off text rather than more of that section
+        elif KEEP_SECTIONS.search(block.heading) and not section_list_ended:
+            block.protected = True
+
+        signal = 1.0 if SIGNAL_TERMS.search(block.text) else 0.0
+        boilerplate = min(len(BOILERPLATE_TERMS.findall(block.text)), 2) * 0.5
+        block.score = 1.0 + signal - boilerplate
+
+def drop_orphan_headings(blocks: list) -> list:
+    kept = []
+    for index, block in enumerate(blocks):
+        next_block = blocks[index + 1] if index + 1 < len(blocks) else None
+        if block.is_heading and not block.protected and (next_block is None or next_block.heading != block.heading):
+            continue
+        kept.append(block)
+    return kept
+
+def trim_job_markdown(
+    markdown: str,
+    token_budget: int = MARKDOWN_TOKEN_BUDGET,
+    leading_paragraphs: int = MARKDOWN_LEADING_PARAGRAPHS,
+) -> TrimResult:
+    original_tokens = estimate_markdown_tokens(markdown)
+    lines = drop_noise_sections(markdown.splitlines())
+    trimmed = "\n".join(lines)
+
+    if estimate_markdown_tokens(trimmed) > token_budget:
+        blocks = split_blocks(lines)
+        score_blocks(blocks, leading_paragraphs)
+
+        tokens = estimate_markdown_tokens(trimmed)
+        dropped = set()
+        # Least relevant first; among equals, the later block goes first
+        for block in sorted((b for b in blocks if not b.protected), key=lambda b: (b.score, -b.position)):
+            if tokens <= token_budget:
+                break
+            dropped.add(block.position)
+            tokens -= estimate_markdown_tokens(block.text) + 1
+
+        trimmed = "\n".join(
+            block.text for block in drop_orphan_headings([b for b in blocks if b.position not in dropped])
+        )
+
+    return TrimResult(trimmed, original_tokens, estimate_markdown_tokens(trimmed))
+
+
+class MarkdownTrimStats:
+    def __init__(self) -> None:
+        """Initialize a MarkdownTrimStats instance totalling the prompt tokens trimming saved."""
+        self.jobs = 0
+        self.tokens_in = 0
+        self.tokens_saved = 0
+
+    def record(self, result: TrimResult) -> None:
+        self.jobs += 1
+        self.tokens_in += result.original_tokens
+        self.tokens_saved += result.tokens_saved
+
+    def counters(self) -> dict:
+        return {"jobs": self.jobs, "tokens_in": self.tokens_in, "tokens_saved": self.tokens_saved}
+
+
+markdown_trim_stats = MarkdownTrimStats()
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+
+import sentry_sdk
+from crawl4ai import AsyncWebCrawler
+from pages.context import setup_scraping_context, teardown_scraping_context
+from pages.pool import PagePool
+from playwright.async_api import Browser, Playwright
+from utils.constants import BROWSER_RECYCLE_NAVIGATIONS, BROWSER_RECYCLE_RSS_MB, WARM_BROWSER_POOL
+from utils.load_sampler import process_tree_rss_mb
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrowserResources:
+    crawler: AsyncWebCrawler
+    playwright: Playwright | None
+    browser: Browser | None
+    page_pool: PagePool | None
+    leases: int = 0
+
+    @property
+    def navigations(self) -> int:
+        return self.page_pool.acquisitions if self.page_pool is not None else 0
+
+
+def is_warm_browser_pool_enabled() -> bool:
+    return os.getenv("WARM_BROWSER_POOL", str(WARM_BROWSER_POOL)).lower() in {"1", "true", "yes"}
+
+async def open_browser_resources() -> BrowserResources:
+    crawler = AsyncWebCrawler()
+    await crawler.start()
+    logger.info("AsyncWebCrawler initialized successfully!")
+    try:
+        playwright, browser, page_pool = await setup_scraping_context()
+    except BaseException:
+        await crawler.close()
+        raise
+    return BrowserResources(crawler, playwright, browser, page_pool)
+
+async def close_browser_resources(resources: BrowserResources) -> None:
+    await teardown_scraping_context(resources.playwright, resources.browser, resources.page_pool)
+
+    try:
+        await resources.crawler.close()
+    except Exception as e:
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "close_browser_resources")
+            scope.set_extra("stage", "crawler.close")
+            sentry_sdk.capture_exception(e)
+
+def is_healthy(resources: BrowserResources) -> bool:
+    if resources.browser is None or resources.page_pool is None or not resources.crawler.ready:
+        return False
+    if not resources.browser.is_connected():
+        return False
+    return not any(page.is_closed() for page in resources.page_pool.all_pages)
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        max_navigations: int = BROWSER_RECYCLE_NAVIGATIONS,
+        rss_limit_mb: float = BROWSER_RECYCLE_RSS_MB,
+    ) -> None:
+        """Initialize a BrowserPool instance holding one warm browser, page pool and crawler between scrapes.
+
+        Until start() is called, and while the warm set is leased to another scrape, lease() falls back to
+        launching a throwaway set for the caller, exactly as every scrape did before the pool existed.
+
+        Args:
+            max_navigations (int): Job page navigations after which the warm set is replaced.
+            rss_limit_mb (float): Process-tree RSS (this process plus its browsers) that also triggers a recycle.
+
+        """
+        self.max_navigations = max_navigations
+        self.rss_limit_mb = rss_limit_mb
+        self.resources: BrowserResources | None = None
+        self.warming: asyncio.Task | None = None
+        self.started = False
+        self.leased = False
+        self.warm_leases = 0
+        self.cold_leases = 0
+        self.recycles = 0
+        self.health_failures = 0
+
+    async def start(self) -> None:
+        # Warming runs in the background so startup is not held up by Chromium; the first lease waits for it
+        self.started = True
+        self.warming = asyncio.create_task(self.warm())
+
+    async def warm(self) -> None:
+        try:
+            self.resources = await open_browser_resources()
+            logger.info("Warm browser pool ready")
+        except Exception as e:
+            self.resources = None
+            logger.exception("Failed to warm the browser pool")
+            with sentry_sdk.push_scope() as scope:
+                scope.set_tag("component", "browser_pool")
+                scope.set_extra("stage", "warm")
+                sentry_sdk.capture_exception(e)
+
+    async def recycle(self, resources: BrowserResources) -> None:
+        await close_browser_resources(resources)
+        if self.started:
+            await self.warm()
+
+    def recycle_reason(self, resources: BrowserResources) -> str | None:
+        if not is_healthy(resources):
+            self.health_failures += 1
+            return "failed health check"
+        if resources.navigations >= self.max_navigations:
+            return f"{resources.navigations} navigations"
+        rss_mb = process_tree_rss_mb()
+        if rss_mb >= self.rss_limit_mb:
+            return f"{rss_mb:.0f} MB RSS"
+        return None
+
+    async def take_warm(self) -> BrowserResources | None:
+        if not self.started or self.leased:
+            return None
+
+        self.leased = True
+        try:
+            if self.warming is not None:
+                await asyncio.shield(self.warming)
+                self.warming = None
+
+            resources, self.resources = self.resources, None
+            if resources is not None and not is_healthy(resources):
+                logger.warning("Warm browser failed its health check, relaunching")
+                self.health_failures += 1
+                await close_browser_resources(resources)
+                resources = None
+            if resources is None:
+                resources = await open_browser_resources()
+        except BaseException:
+            self.leased = False
+            raise
+        return resources
+
+    def give_back(self, resources: BrowserResources) -> None:
+        resources.leases += 1
+        reason = self.recycle_reason(resources)
+        if reason is None and self.started:
+            self.resources = resources
+        else:
+            logger.info("Recycling warm browser after %s leases: %s", resources.leases, reason or "pool closed")
+            self.recycles += reason is not None
+            self.warming = asyncio.create_task(self.recycle(resources))
+        self.leased = False
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserResources]:
+        resources = await self.take_warm()
+        if resources is None:
+            self.cold_leases += 1
+            resources = await open_browser_resources()
+            try:
+                yield resources
+            finally:
+                await close_browser_resources(resources)
+            return
+
+        self.warm_leases += 1
+        try:
+            yield resources
+        finally:
+            self.give_back(resources)
+
+    async def close(self) -> None:
+        self.started = False
+        if self.warming is not None:
+            await self.warming
+            self.warming = None
+        if self.resources is not None:
+            resources, self.resources = self.resources, None
+            await close_browser_resources(resources)
+
+    def counters(self) -> dict:
+        return {
+            "warm_leases": self.warm_leases,
+            "cold_leases": self.cold_leases,
+            "recycles": self.recycles,
+            "health_failures": self.health_failures,
+        }
+
+
+browser_pool = BrowserPool()
+
+
+class BrowserFallback:
+    def __init__(self, pool: BrowserPool = browser_pool) -> None:
+        """Initialize a BrowserFallback instance that leases a browser only once a run first needs one.
+
+        HTTP fetch mode scrapes without Chromium; the first fetch that has to fall back to the browser leases it
+        from the pool and every later fallback in the run reuses that lease until close().
+        """
+        self.pool = pool
+        self.resources: BrowserResources | None = None
+        self.lock = asyncio.Lock()
+        self.stack = AsyncExitStack()
+
+    async def lease(self) -> BrowserResources:
+        async with self.lock:
+            if self.resources is None:
+                logger.info("Leasing a browser for fetches that HTTP could not serve")
+                self.resources = await self.stack.enter_async_context(self.pool.lease())
+        return self.resources
+
+    async def close(self) -> None:
+        self.resources = None
+        await self.stack.aclose()
@@ -1,26 +1,32 @@
 import asyncio
 import logging
+import os
 
 import sentry_sdk
 from pages.pool import PagePool
+from pages.request_filter import get_request_filter
+from pages.shards import BrowserGroup, ShardedPagePool, split_evenly
 from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
-from utils.constants import BROWSER_USER_AGENT, CONCURRENT_JOBS_NUM
+from utils.constants import (
+    BROWSER_SHARDS,
+    BROWSER_USER_AGENT,
+    CONCURRENT_JOBS_NUM,
+    CONTEXTS_PER_BROWSER,
+    PAGE_ASSIGNMENT,
+    PAGE_POOL_MIN_PAGES,
+)
 from utils.retry import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
-async def create_browser_context() -> tuple[Playwright, Browser, BrowserContext]:
-    playwright = await async_playwright().start()
-    browser = await playwright.chromium.launch(
-        headless=True,
-        args=[
-            "--no-sandbox",
-            "--disable-setuid-sandbox",
-            "--disable-dev-shm-usage",
-            "--single-process",
-            "--no-zygote"
-        ],
-    )
+async def launch_browser(playwright: Playwright, *, single_process: bool = True) -> Browser:
+    args = ["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"]
+    if single_process:
+        # Keeps the unsharded browser to one process; its contexts then share a single renderer
+        args += ["--single-process", "--no-zygote"]
+    return await playwright.chromium.launch(headless=True, args=args)
+
+async def create_context(browser: Browser) -> BrowserContext:
     context = await browser.new_context(
         viewport={"width": 1280, "height": 720},
         locale="en-US",
@@ -36,16 +42,74 @@ async def create_browser_context() -> tuple[Playwright, Browser, BrowserContext]
         }"""
     )
 
-    await context.route("**/*", lambda route, request: asyncio.create_task(
-        route.abort() if request.resource_type in ["image", "font", "stylesheet"] else route.continue_()
-    ))
+    await get_request_filter().attach(context)
+
+    return context
 
+async def create_browser_context() -> tuple[Playwright, Browser, BrowserContext]:
+    playwright = await async_playwright().start()
+    browser = await launch_browser(playwright)
+    context = await create_context(browser)
     return playwright, browser, context
 
+def get_browser_shard_layout() -> tuple[int, int]:
+    return (
+        int(os.getenv("BROWSER_SHARDS", str(BROWSER_SHARDS))),
+        int(os.getenv("CONTEXTS_PER_BROWSER", str(CONTEXTS_PER_BROWSER))),
+    )
+
+async def launch_browsers(playwright: Playwright, count: int, *, single_process: bool = True) -> list:
+    launched = await asyncio.gather(
+        *(launch_browser(playwright, single_process=single_process) for _ in range(count)),
+        return_exceptions=True,
+    )
+    browsers = [browser for browser in launched if not isinstance(browser, BaseException)]
+    errors = [error for error in launched if isinstance(error, BaseException)]
+    if errors:
+        await asyncio.gather(*(browser.close() for browser in browsers), return_exceptions=True)
+        raise errors[0]
+    return browsers
+
+async def create_sharded_page_pool(
+    browser_count: int,
+    contexts_per_browser: int,
+) -> tuple[Playwright, BrowserGroup, ShardedPagePool]:
+    # A --single-process Chromium renders every context in one process, so contexts only add renderer processes
+    # (and cores) when the browsers they share are launched multi-process
+    shard_count = min(browser_count * contexts_per_browser, CONCURRENT_JOBS_NUM)
+    browser_count = min(browser_count, shard_count)
+    playwright = await async_playwright().start()
+    browsers = []
+    try:
+        browsers = await launch_browsers(playwright, browser_count, single_process=contexts_per_browser == 1)
+        contexts = [await create_context(browsers[index % browser_count]) for index in range(shard_count)]
+        shards = [
+            PagePool(context, max_pages=max_pages, min_pages=min_pages)
+            for context, max_pages, min_pages in zip(
+                contexts,
+                split_evenly(CONCURRENT_JOBS_NUM, shard_count),
+                split_evenly(PAGE_POOL_MIN_PAGES, shard_count),
+                strict=True,
+            )
+        ]
+        page_pool = ShardedPagePool(shards, assignment=PAGE_ASSIGNMENT)
+        await page_pool.init_pages()
+    except BaseException:
+        await asyncio.gather(*(browser.close() for browser in browsers), return_exceptions=True)
+        await playwright.stop()
+        raise
+
+    logger.info("Sharded %s pages over %s browsers and %s contexts", page_pool.max_pages, browser_count, shard_count)
+    return playwright, BrowserGroup(browsers), page_pool
+
 async def setup_scraping_context() -> tuple[Playwright | None, Browser | None, PagePool | None]:
+    browser_count, contexts_per_browser = get_browser_shard_layout()
+
     async def create_context_wrapper():
+        if browser_count * contexts_per_browser > 1:
+            return await create_sharded_page_pool(browser_count, contexts_per_browser)
         playwright, browser, context = await create_browser_context()
-        page_pool = PagePool(context, max_pages=CONCURRENT_JOBS_NUM)
+        page_pool = PagePool(context, max_pages=CONCURRENT_JOBS_NUM, min_pages=PAGE_POOL_MIN_PAGES)
         await page_pool.init_pages()
         return playwright, browser, page_pool
 
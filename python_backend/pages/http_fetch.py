@@ -0,0 +1,116 @@
+import logging
+import os
+import time
+
+import httpx
+import sentry_sdk
+from utils.constants import (
+    BROWSER_USER_AGENT,
+    FETCH_MODE,
+    FETCH_MODE_BROWSER,
+    FETCH_MODE_HTTP,
+    HTTP_FETCH_BLOCKED_MARKERS,
+    HTTP_FETCH_MAX_CONNECTIONS,
+    HTTP_FETCH_MIN_HTML_BYTES,
+    HTTP_FETCH_TIMEOUT,
+    HTTP_STATUS_OK,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HttpFetchStats:
+    def __init__(self) -> None:
+        """Initialize an HttpFetchStats instance counting plain HTTP page fetches and the ones left to the browser."""
+        self.fetched = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.blocked = 0
+        self.incomplete = 0
+        self.errors = 0
+        self.fallbacks = 0
+
+    def counters(self) -> dict:
+        return {
+            "fetched": self.fetched,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "blocked": self.blocked,
+            "incomplete": self.incomplete,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+        }
+
+
+http_fetch_stats = HttpFetchStats()
+
+
+def get_fetch_mode(fetch_mode: str | None = None) -> str:
+    fetch_mode = (fetch_mode or os.getenv("FETCH_MODE", FETCH_MODE)).lower()
+    if fetch_mode not in {FETCH_MODE_BROWSER, FETCH_MODE_HTTP}:
+        msg = f"Unknown fetch mode {fetch_mode!r}"
+        raise ValueError(msg)
+    return fetch_mode
+
+def create_page_http_client() -> httpx.AsyncClient:
+    # Cookies set by the first response (session, region) are sent on every later fetch, as a browser would
+    return httpx.AsyncClient(
+        http2=True,
+        headers={
+            **BROWSER_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-AU,en;q=0.9",
+        },
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("HTTP_FETCH_MAX_CONNECTIONS", str(HTTP_FETCH_MAX_CONNECTIONS))),
+            max_keepalive_connections=int(os.getenv("HTTP_FETCH_MAX_CONNECTIONS", str(HTTP_FETCH_MAX_CONNECTIONS))),
+        ),
+        timeout=httpx.Timeout(HTTP_FETCH_TIMEOUT),
+    )
+
+def blocked_reason(response: httpx.Response) -> str | None:
+    if response.status_code != HTTP_STATUS_OK:
+        return f"status {response.status_code}"
+    if "html" not in response.headers.get("content-type", ""):
+        return f"content type {response.headers.get('content-type')!r}"
+    if len(response.content) < HTTP_FETCH_MIN_HTML_BYTES:
+        return f"{len(response.content)} byte body"
+    text = response.text
+    for marker in HTTP_FETCH_BLOCKED_MARKERS:
+        if marker in text:
+            return f"challenge marker {marker!r}"
+    return None
+
+async def fetch_html(url: str, client: httpx.AsyncClient, required_marker: str | None = None) -> str | None:
+    """Fetch a page over plain HTTP, returning None when the browser should load it instead."""
+    started = time.monotonic()
+    try:
+        response = await client.get(url)
+    except httpx.HTTPError as e:
+        http_fetch_stats.errors += 1
+        logger.warning("HTTP fetch of %s failed: %s: %s", url, type(e).__name__, e)
+        return None
+    finally:
+        http_fetch_stats.seconds += time.monotonic() - started
+
+    http_fetch_stats.fetched += 1
+    http_fetch_stats.bytes += len(response.content)
+
+    reason = blocked_reason(response)
+    if reason is not None:
+        http_fetch_stats.blocked += 1
+        logger.warning("HTTP fetch of %s looks blocked (%s), falling back to the browser", url, reason)
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "fetch_html")
+            scope.set_extra("url", url)
+            scope.set_extra("reason", reason)
+            sentry_sdk.capture_message("HTTP fetch looks blocked", level="warning")
+        return None
+
+    html = response.text
+    if required_marker is not None and required_marker not in html:
+        http_fetch_stats.incomplete += 1
+        logger.info("HTTP fetch of %s is missing %r, falling back to the browser", url, required_marker)
+        return None
+    return html
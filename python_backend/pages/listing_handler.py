@@ -1,46 +1,94 @@
+import asyncio
 import logging
 
 import sentry_sdk
 from concurrency.batch_runner import process_jobs_concurrently
 from jobs.inserter import insert_jobs_into_database
 from jobs.validator import validate_jobs
-from markdown.fetcher import fetch_page_markdown
+from markdown.fetcher import fetch_page_content, fetch_page_content_over_http
+from pages.http_fetch import http_fetch_stats
+from pages.listing_parser import ListingPage, is_recent_listing, listing_parse_stats, parse_listing_page
+from utils.constants import MAX_PAGES_IN_FLIGHT, PAGE_PREFETCH_WINDOW
 from utils.context import ScrapeContext
-from utils.utils import backoff_if_high_cpu, extract_job_urls, pause_briefly
+from utils.utils import backoff_if_high_cpu, pause_briefly
 
 logger = logging.getLogger(__name__)
 
-def extract_job_urls_from_markdown(markdown: str) -> list | None:
-    job_urls = extract_job_urls(markdown)
-    if not job_urls:
-        logger.warning("No job urls extracted from page markdown")
+async def read_listing_page(content: tuple | None) -> ListingPage | None:
+    if content is None:
         return None
-    for url in job_urls:
-        logger.info("Scraping: %s", url)
-    return job_urls
+    markdown, html = content
+    return await asyncio.to_thread(parse_listing_page, html, markdown)
 
-async def process_job_listing_page(base_url: str, ctx: ScrapeContext, page_num: int, job_count: int) -> dict:
-    markdown = await fetch_page_markdown(base_url, ctx.crawler, page_num)
-    if not markdown:
-        return {"job_count": job_count, "terminated_early": False}
+async def fetch_listing_page(base_url: str, ctx: ScrapeContext, page_num: int) -> ListingPage | None:
+    if ctx.http_client is not None:
+        listing = await read_listing_page(await fetch_page_content_over_http(base_url, ctx.http_client, page_num))
+        if listing is not None and listing.jobs:
+            return listing
+        if listing is not None:
+            # Listings are rendered server side; a page without jobs was cut short or served to a bot
+            http_fetch_stats.incomplete += 1
+        http_fetch_stats.fallbacks += 1
+    crawler, _ = await ctx.browser()
+    return await read_listing_page(await fetch_page_content(base_url, crawler, page_num))
 
-    job_urls = extract_job_urls_from_markdown(markdown)
-    if not job_urls:
+def select_listing_jobs(listing: ListingPage, ctx: ScrapeContext) -> tuple[list, bool]:
+    """Pick the listed jobs worth opening, and whether the listing has reached jobs past the day range."""
+    job_urls = []
+    reached_stale = False
+    for job in listing.jobs:
+        if not is_recent_listing(job, ctx.day_range_limit):
+            listing_parse_stats.stale_skipped += 1
+            # Promoted cards are pinned above newer jobs, so only an organic stale job ends the search
+            reached_stale = reached_stale or not job.promoted
+            continue
+        if ctx.job_claims is not None and ctx.job_claims.is_claimed(job.job_url):
+            listing_parse_stats.duplicates_skipped += 1
+            continue
+        logger.info("Scraping: %s", job.job_url)
+        job_urls.append(job.job_url)
+    return job_urls, reached_stale
+
+async def process_job_listing_page(
+    base_url: str,
+    ctx: ScrapeContext,
+    page_num: int,
+    listing: ListingPage | None,
+) -> dict:
+    if not listing:
+        return {"job_count": 0, "terminated_early": False}
+
+    if not listing.jobs:
+        logger.warning("No job urls extracted from listing page %s", page_num)
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("component", "process_job_listing_page")
             scope.set_tag("page_num", page_num)
             scope.set_extra("base_url", base_url)
-            scope.set_extra("markdown_preview", markdown[:500] if markdown else "N/A")
+            scope.set_extra("markdown_preview", listing.markdown[:500] if listing.markdown else "N/A")
             sentry_sdk.capture_message(
                 f"No job urls found in markdown on page {page_num}", level="warning"
             )
-        return {"job_count": job_count, "terminated_early": False}
+        return {"job_count": 0, "terminated_early": False}
 
-    page_job_data, terminated_early = await process_jobs_concurrently(job_urls, ctx, page_num)
+    job_urls, reached_stale = select_listing_jobs(listing, ctx)
+    try:
+        page_job_data, terminated_early = (
+            await process_jobs_concurrently(job_urls, ctx, page_num) if job_urls else ([], False)
+        )
+        if reached_stale:
+            # Jobs kept from this page are still in range; only the pages after it are past the stale listing
+            ctx.terminate(page_num, len(listing.jobs))
+        terminated_early = terminated_early or reached_stale
 
-    if page_job_data:
-        cleaned_jobs = await validate_jobs(page_job_data)
-        job_count = await insert_jobs_into_database(cleaned_jobs, page_num, job_count)
+        job_count = 0
+        if page_job_data:
+            cleaned_jobs = await validate_jobs(page_job_data)
+            job_count = await insert_jobs_into_database(cleaned_jobs, page_num, job_count)
+            if ctx.job_store is not None:
+                ctx.job_store.save_jobs(cleaned_jobs)
+    finally:
+        if ctx.job_store is not None:
+            ctx.job_store.discard_pending(job_urls)
 
     await pause_briefly(0.05, 0.25)
     await backoff_if_high_cpu()
@@ -50,29 +98,73 @@ async def process_job_listing_page(base_url: str, ctx: ScrapeContext, page_num:
         "terminated_early": terminated_early
     }
 
+def prefetch_listing_pages(
+    base_url: str,
+    ctx: ScrapeContext,
+    listing_tasks: dict,
+    page_num: int,
+    total_pages: int
+) -> None:
+    last_page_num = min(page_num + PAGE_PREFETCH_WINDOW, total_pages)
+    for next_page_num in range(page_num, last_page_num + 1):
+        if next_page_num not in listing_tasks:
+            listing_tasks[next_page_num] = asyncio.create_task(
+                fetch_listing_page(base_url, ctx, next_page_num)
+            )
+
+async def collect_finished_pages(page_tasks: dict, page_results: dict, *, wait_all: bool = False) -> None:
+    if not page_tasks:
+        return
+
+    return_when = asyncio.ALL_COMPLETED if wait_all else asyncio.FIRST_COMPLETED
+    done, _ = await asyncio.wait(page_tasks.values(), return_when=return_when)
+
+    for page_num, task in list(page_tasks.items()):
+        if task in done:
+            page_results[page_num] = task.result()
+            del page_tasks[page_num]
+
+def should_stop_scheduling(ctx: ScrapeContext, page_results: dict, page_num: int) -> bool:
+    if ctx.is_terminated(page_num):
+        return True
+    return any(result.get("terminated_early") for result in page_results.values())
+
 async def scrape_pages(base_url: str, ctx: ScrapeContext, total_pages: int) -> dict:
-    job_count = 0
-    terminated_early = False
-    terminated_page_num = None
-
-    for page_num in range(1, total_pages + 1):
-        result = await process_job_listing_page(
-            base_url,
-            ctx,
-            page_num,
-            job_count,
-        )
-        job_count = result["job_count"]
+    listing_tasks = {}
+    page_tasks = {}
+    page_results = {}
+
+    try:
+        for page_num in range(1, total_pages + 1):
+            if should_stop_scheduling(ctx, page_results, page_num):
+                break
+
+            prefetch_listing_pages(base_url, ctx, listing_tasks, page_num, total_pages)
+            listing = await listing_tasks.pop(page_num)
+
+            page_tasks[page_num] = asyncio.create_task(
+                process_job_listing_page(base_url, ctx, page_num, listing)
+            )
+
+            while len(page_tasks) >= MAX_PAGES_IN_FLIGHT:
+                await collect_finished_pages(page_tasks, page_results)
+
+        await collect_finished_pages(page_tasks, page_results, wait_all=True)
+
+    finally:
+        leftover_tasks = [*listing_tasks.values(), *page_tasks.values()]
+        for task in leftover_tasks:
+            task.cancel()
+        await asyncio.gather(*leftover_tasks, return_exceptions=True)
 
-        if result.get("terminated_early"):
-            terminated_early = True
-            terminated_page_num = page_num
-            break
+    job_count = sum(result["job_count"] for result in page_results.values())
+    terminated_pages = [page_num for page_num, result in page_results.items() if result.get("terminated_early")]
+    terminated_early = bool(terminated_pages)
 
     message = f"Scraped and inserted {job_count} jobs."
     if terminated_early:
         message += (
-            f" Early termination triggered on page {terminated_page_num} "
+            f" Early termination triggered on page {min(terminated_pages)} "
             f"due to day range limit of {ctx.day_range_limit} days."
         )
 
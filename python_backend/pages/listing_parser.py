@@ -0,0 +1,167 @@
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from tzlocal import get_localzone
+from utils.constants import LISTING_STATE_MARKER
+from utils.utils import extract_job_id, extract_job_urls, get_total_job_count
+
+logger = logging.getLogger(__name__)
+
+LISTING_SOURCE_EMBEDDED = "embedded"
+LISTING_SOURCE_MARKDOWN = "markdown"
+
+
+@dataclass
+class ListingJob:
+    job_id: str
+    job_url: str
+    title: str | None = None
+    advertiser: str | None = None
+    listing_date: datetime | None = None
+    location: str | None = None
+    salary: str | None = None
+    promoted: bool = False
+
+
+@dataclass
+class ListingPage:
+    jobs: list
+    total_count: int
+    source: str
+    markdown: str = ""
+
+
+class ListingParseStats:
+    def __init__(self) -> None:
+        """Initialize a ListingParseStats instance counting how listing pages were read and what they let us skip."""
+        self.embedded = 0
+        self.markdown = 0
+        # Pages that came with HTML but no usable search state; a rise means the page layout or schema moved
+        self.state_missing = 0
+        self.state_misses = 0
+        self.jobs_unparsed = 0
+        self.jobs_listed = 0
+        self.stale_skipped = 0
+        self.duplicates_skipped = 0
+
+    def counters(self) -> dict:
+        return {
+            "embedded": self.embedded,
+            "markdown": self.markdown,
+            "state_missing": self.state_missing,
+            "state_misses": self.state_misses,
+            "jobs_unparsed": self.jobs_unparsed,
+            "jobs_listed": self.jobs_listed,
+            "stale_skipped": self.stale_skipped,
+            "duplicates_skipped": self.duplicates_skipped,
+        }
+
+
+listing_parse_stats = ListingParseStats()
+
+
+def extract_search_state(html: str) -> dict | None:
+    # The state is a JS assignment among others in one script tag, so decode exactly one JSON value from the brace
+    start = html.find(LISTING_STATE_MARKER)
+    if start == -1:
+        return None
+    brace = html.find("{", start + len(LISTING_STATE_MARKER))
+    if brace == -1:
+        return None
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html, brace)
+    except json.JSONDecodeError:
+        logger.warning("Embedded search state is not valid JSON")
+        return None
+    return state if isinstance(state, dict) else None
+
+def parse_listing_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+def build_job_url(job_id: str, display_type: str) -> str:
+    # Same shape as the card title links in the listing markdown
+    return f"https://www.seek.com.au/job/{job_id}?type={display_type}&ref=search-standalone&origin=cardTitle"
+
+def parse_listing_job(job: dict) -> ListingJob | None:
+    job_id = str(job.get("id") or "").strip()
+    if not job_id.isdigit():
+        return None
+
+    advertiser = job.get("advertiser") or {}
+    locations = job.get("locations") or []
+    display_type = job.get("displayType") or "standard"
+    return ListingJob(
+        job_id=job_id,
+        job_url=build_job_url(job_id, display_type),
+        title=job.get("title"),
+        advertiser=advertiser.get("description") or job.get("companyName"),
+        listing_date=parse_listing_date(job.get("listingDate")),
+        location=job.get("location") or (locations[0].get("label") if locations else None),
+        salary=job.get("salary") or job.get("salaryLabel") or None,
+        promoted=display_type == "promoted" or bool(job.get("isPremium")),
+    )
+
+def parse_search_state(state: dict) -> tuple[list, int] | None:
+    results = (state.get("results") or {}).get("results") or {}
+    raw_jobs = results.get("jobs")
+    if not isinstance(raw_jobs, list):
+        logger.warning("Embedded search state has no results.results.jobs list (top-level keys: %s)", sorted(state))
+        return None
+
+    jobs = []
+    seen = set()
+    for raw_job in raw_jobs:
+        job = parse_listing_job(raw_job) if isinstance(raw_job, dict) else None
+        if job is None:
+            listing_parse_stats.jobs_unparsed += 1
+            continue
+        if job.job_id in seen:
+            continue
+        seen.add(job.job_id)
+        jobs.append(job)
+    if raw_jobs and not jobs:
+        logger.warning("None of the %s embedded listing jobs could be read", len(raw_jobs))
+    return jobs, int(results.get("totalCount") or 0)
+
+def parse_listing_markdown(markdown: str) -> ListingPage:
+    jobs = []
+    seen = set()
+    for job_url in extract_job_urls(markdown):
+        job_id = extract_job_id(job_url)
+        if job_id and job_id not in seen:
+            seen.add(job_id)
+            jobs.append(ListingJob(job_id=job_id, job_url=job_url))
+    return ListingPage(jobs, get_total_job_count(markdown), LISTING_SOURCE_MARKDOWN, markdown)
+
+def parse_listing_page(html: str | None, markdown: str) -> ListingPage:
+    """Read a listing page from its embedded search state, or from the markdown links when that is missing."""
+    state = extract_search_state(html) if html else None
+    parsed = parse_search_state(state) if state is not None else None
+    if html and state is None:
+        listing_parse_stats.state_missing += 1
+    elif state is not None and (parsed is None or not parsed[0]):
+        listing_parse_stats.state_misses += 1
+    if parsed is None or not parsed[0]:
+        listing = parse_listing_markdown(markdown)
+        listing_parse_stats.markdown += 1
+    else:
+        jobs, total_count = parsed
+        listing = ListingPage(jobs, total_count or get_total_job_count(markdown), LISTING_SOURCE_EMBEDDED, markdown)
+        listing_parse_stats.embedded += 1
+    listing_parse_stats.jobs_listed += len(listing.jobs)
+    return listing
+
+def is_recent_listing(job: ListingJob, within_days: int, now: datetime | None = None) -> bool:
+    # Same calendar-day rule as is_recent_job; jobs without a listing date are decided on their job page
+    if job.listing_date is None:
+        return True
+    local_tz = get_localzone()
+    now = now or datetime.now(local_tz)
+    return (now.astimezone(local_tz).date() - job.listing_date.astimezone(local_tz).date()).days <= within_days
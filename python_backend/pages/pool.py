@@ -1,38 +1,249 @@
 import asyncio
+import contextlib
+import logging
+import time
 
+import sentry_sdk
 from playwright.async_api import BrowserContext, Page
+from utils.constants import PAGE_OPEN_ATTEMPTS, PAGE_OPEN_RETRY_DELAY, PAGE_POOL_IDLE_SECONDS, PAGE_RESET_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of a page when a slot frees up without one: the waiter that gets it opens a page itself
+FREE_SLOT = None
+
+
+class PagePoolStats:
+    def __init__(self) -> None:
+        """Initialize a PagePoolStats instance totalling acquire waits, hold times and page churn across pools."""
+        self.acquisitions = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.hold_seconds = 0.0
+        self.replaced = 0
+        self.grown = 0
+        self.shrunk = 0
+
+    def counters(self) -> dict:
+        return {
+            "acquisitions": self.acquisitions,
+            "waited": self.waited,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "hold_seconds": round(self.hold_seconds, 3),
+            "replaced": self.replaced,
+            "grown": self.grown,
+            "shrunk": self.shrunk,
+        }
+
+
+def page_pool_averages(counters: dict) -> dict:
+    acquisitions = counters.get("acquisitions", 0)
+    if not acquisitions:
+        return {"avg_wait_ms": 0.0, "avg_hold_ms": 0.0}
+    return {
+        "avg_wait_ms": round(counters["wait_seconds"] / acquisitions * 1000, 1),
+        "avg_hold_ms": round(counters["hold_seconds"] / acquisitions * 1000, 1),
+    }
+
+
+page_pool_stats = PagePoolStats()
 
 
 class PagePool:
-    def __init__(self, context: BrowserContext, max_pages: int) -> None:
+    def __init__(
+        self,
+        context: BrowserContext,
+        max_pages: int,
+        min_pages: int | None = None,
+        idle_seconds: float = PAGE_POOL_IDLE_SECONDS,
+    ) -> None:
         """Initialize a PagePool instance.
 
+        Pages are reset to about:blank on release and replaced if they crashed or hung. The pool opens pages on
+        demand up to max_pages and closes pages left idle for idle_seconds down to min_pages.
+
         Args:
             context: The browser context or environment to manage pages in.
             max_pages (int): The maximum number of pages to keep in the pool.
+            min_pages (int | None): Pages opened up front and never closed for being idle; defaults to max_pages.
+            idle_seconds (float): How long a page above min_pages may sit idle before it is closed.
 
         """
         self.context = context
         self.max_pages = max_pages
-        self.semaphore = asyncio.Semaphore(max_pages)
+        self.min_pages = max_pages if min_pages is None else min(min_pages, max_pages)
+        self.idle_seconds = idle_seconds
         self.pages = asyncio.Queue()
+        self.all_pages: list = []
+        self.checked_out: dict = {}
+        self.idle_since: dict = {}
+        self.opening = 0
+        self.waiting = 0
+        self.acquisitions = 0
+        self.closed = False
         self._initialized = False
 
-    async def init_pages(self) -> None:
-        for _ in range(self.max_pages):
+    @property
+    def size(self) -> int:
+        return len(self.all_pages) + self.opening
+
+    @property
+    def in_use(self) -> int:
+        return len(self.checked_out) + self.waiting
+
+    async def open_page(self) -> Page:
+        # Counted while opening so concurrent acquires never overshoot max_pages
+        self.opening += 1
+        try:
             page = await self.context.new_page()
-            await self.pages.put(page)
+        finally:
+            self.opening -= 1
+        self.all_pages.append(page)
+        return page
+
+    async def put_idle(self, page: Page) -> None:
+        self.idle_since[page] = time.monotonic()
+        await self.pages.put(page)
+
+    async def init_pages(self) -> None:
+        for _ in range(self.min_pages):
+            await self.put_idle(await self.open_page())
         self._initialized = True
 
+    async def discard_page(self, page: Page) -> None:
+        if page in self.all_pages:
+            self.all_pages.remove(page)
+        self.idle_since.pop(page, None)
+        with contextlib.suppress(Exception):
+            await page.close()
+
+    async def take_idle_page(self) -> Page | None:
+        while not self.pages.empty():
+            page = self.pages.get_nowait()
+            if page is FREE_SLOT:
+                # The caller is below max_pages now and opens a page itself
+                continue
+            if not page.is_closed():
+                return page
+            # Crashed while idle; drop it and let the caller open a fresh one if there is room
+            page_pool_stats.replaced += 1
+            await self.discard_page(page)
+        return None
+
+    def report_open_failure(self, error: Exception, stage: str) -> None:
+        logger.warning("Page pool failed to open a page (%s): %s", stage, error)
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("component", "page_pool")
+            scope.set_extra("stage", stage)
+            sentry_sdk.capture_exception(error)
+
+    def free_slot(self) -> None:
+        # Without this, a waiter blocked on an empty queue would never learn the pool dropped below max_pages
+        if self.waiting:
+            self.pages.put_nowait(FREE_SLOT)
+
+    async def open_free_slot(self) -> Page:
+        for attempt in range(1, PAGE_OPEN_ATTEMPTS + 1):
+            try:
+                return await self.open_page()
+            except Exception as e:
+                self.report_open_failure(e, "acquire")
+                if attempt == PAGE_OPEN_ATTEMPTS:
+                    # Hand the slot on so the pool keeps its capacity for whoever waits next
+                    self.free_slot()
+                    raise
+            await asyncio.sleep(PAGE_OPEN_RETRY_DELAY * attempt)
+        error_msg = "Page pool could not open a page"
+        raise RuntimeError(error_msg)
+
+    async def wait_for_page(self) -> Page:
+        page_pool_stats.waited += 1
+        self.waiting += 1
+        try:
+            page = await self.pages.get()
+        finally:
+            self.waiting -= 1
+
+        if self.closed:
+            error_msg = "Page pool closed while waiting for a page"
+            raise RuntimeError(error_msg)
+        if page is not FREE_SLOT and not page.is_closed():
+            return page
+        if page is not FREE_SLOT:
+            page_pool_stats.replaced += 1
+            await self.discard_page(page)
+        return await self.open_free_slot()
+
     async def acquire(self) -> Page:
-        await self.semaphore.acquire()
-        return await self.pages.get()
+        started = time.monotonic()
+        page = await self.take_idle_page()
+        if page is None and self.size < self.max_pages:
+            page = await self.open_page()
+            page_pool_stats.grown += 1
+        if page is None:
+            page = await self.wait_for_page()
+
+        now = time.monotonic()
+        self.idle_since.pop(page, None)
+        self.checked_out[page] = now
+        self.acquisitions += 1
+        page_pool_stats.acquisitions += 1
+        page_pool_stats.wait_seconds += now - started
+        return page
+
+    async def reset_page(self, page: Page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            # Also aborts a navigation still in flight after a timed-out goto
+            await asyncio.wait_for(page.goto("about:blank"), timeout=PAGE_RESET_TIMEOUT)
+        except Exception:
+            logger.warning("Pooled page failed to reset, replacing it")
+            return False
+        return True
 
     async def release(self, page: Page) -> None:
-        await self.pages.put(page)
-        self.semaphore.release()
+        checked_out_at = self.checked_out.pop(page, None)
+        if checked_out_at is not None:
+            page_pool_stats.hold_seconds += time.monotonic() - checked_out_at
+
+        if self.closed:
+            await self.discard_page(page)
+            return
+
+        if not await self.reset_page(page):
+            page_pool_stats.replaced += 1
+            await self.discard_page(page)
+            try:
+                page = await self.open_page()
+            except Exception as e:
+                # The pool shrinks by one; the next acquire, or a waiter handed the free slot, opens a page again
+                self.report_open_failure(e, "replace_page")
+                self.free_slot()
+                return
+
+        await self.put_idle(page)
+        await self.shrink_idle()
+
+    async def shrink_idle(self) -> None:
+        # idle_since keeps put order, so its first entry is the page at the head of the queue
+        now = time.monotonic()
+        while len(self.all_pages) > self.min_pages and self.idle_since:
+            if now - next(iter(self.idle_since.values())) < self.idle_seconds:
+                return
+            page = self.pages.get_nowait()
+            if page is FREE_SLOT:
+                continue
+            await self.discard_page(page)
+            page_pool_stats.shrunk += 1
 
     async def close_all(self) -> None:
+        self.closed = True
         while not self.pages.empty():
-            page = await self.pages.get()
-            await page.close()
+            self.pages.get_nowait()
+        # Every blocked acquire wakes up and sees the pool is closed
+        for _ in range(self.waiting):
+            self.pages.put_nowait(FREE_SLOT)
+        # Checked-out pages are closed too; their release then just drops them
+        for page in list(self.all_pages):
+            await self.discard_page(page)
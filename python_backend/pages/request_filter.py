@@ -0,0 +1,154 @@
+import os
+import re
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Response, Route
+from utils.constants import (
+    REQUEST_FILTER_ALLOWED_HOSTS,
+    REQUEST_FILTER_BLOCKED_HOSTS,
+    REQUEST_FILTER_BLOCKED_RESOURCE_TYPES,
+    REQUEST_FILTER_BLOCKED_URL_PATTERNS,
+    REQUEST_FILTER_THIRD_PARTY_RESOURCE_TYPES,
+)
+
+BLOCKED_RESOURCE_TYPE = "resource_type"
+BLOCKED_HOST = "host"
+BLOCKED_PATTERN = "pattern"
+BLOCKED_THIRD_PARTY = "third_party"
+BLOCK_REASONS = [BLOCKED_RESOURCE_TYPE, BLOCKED_HOST, BLOCKED_PATTERN, BLOCKED_THIRD_PARTY]
+
+
+class RequestFilterStats:
+    def __init__(self) -> None:
+        """Initialize a RequestFilterStats instance counting requests allowed and blocked across browser contexts."""
+        self.allowed = 0
+        self.allowed_bytes = 0
+        self.navigations = 0
+        self.blocked = dict.fromkeys(BLOCK_REASONS, 0)
+
+    async def record_response(self, response: Response) -> None:
+        # The declared length saves a protocol round trip; chunked and compressed responses, most HTML and XHR,
+        # have none, so their transferred body size is asked for once the response has finished
+        length = response.headers.get("content-length", "")
+        if length.isdigit():
+            self.allowed_bytes += int(length)
+            return
+        try:
+            sizes = await response.request.sizes()
+        except Exception:
+            # The page or context closed before the body finished; the response is left uncounted
+            return
+        self.allowed_bytes += max(sizes.get("responseBodySize", 0), 0)
+
+    def counters(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "blocked": sum(self.blocked.values()),
+            "allowed_bytes": self.allowed_bytes,
+            "navigations": self.navigations,
+            **{f"blocked_{reason}": count for reason, count in self.blocked.items()},
+        }
+
+
+def request_filter_averages(counters: dict) -> dict:
+    # Per page navigated, not per page-pool acquisition: a job page may be left without navigating
+    pages = counters.get("navigations", 0)
+    if not pages:
+        return {"allowed_per_page": 0.0, "blocked_per_page": 0.0, "kb_per_page": 0.0}
+    return {
+        "allowed_per_page": round(counters["allowed"] / pages, 1),
+        "blocked_per_page": round(counters["blocked"] / pages, 1),
+        "kb_per_page": round(counters["allowed_bytes"] / pages / 1024, 1),
+    }
+
+
+request_filter_stats = RequestFilterStats()
+
+
+def host_in(host: str, hosts: set) -> bool:
+    # Walks the host's parent domains, so "seek.com.au" also covers "www.seek.com.au"
+    labels = host.split(".")
+    return any(".".join(labels[index:]) in hosts for index in range(len(labels)))
+
+
+class RequestFilter:
+    def __init__(
+        self,
+        blocked_resource_types: set = REQUEST_FILTER_BLOCKED_RESOURCE_TYPES,
+        third_party_resource_types: set = REQUEST_FILTER_THIRD_PARTY_RESOURCE_TYPES,
+        allowed_hosts: set = REQUEST_FILTER_ALLOWED_HOSTS,
+        blocked_hosts: set = REQUEST_FILTER_BLOCKED_HOSTS,
+        blocked_url_patterns: list = REQUEST_FILTER_BLOCKED_URL_PATTERNS,
+    ) -> None:
+        """Initialize a RequestFilter instance deciding which requests a browser context may load.
+
+        Rules are checked cheapest first: resource type, then host, then URL pattern. Hosts match themselves and
+        their subdomains.
+
+        Args:
+            blocked_resource_types (set): Playwright resource types that are always aborted.
+            third_party_resource_types (set): Resource types aborted unless they come from an allowed host.
+            allowed_hosts (set): Hosts exempt from the host, pattern and third-party rules.
+            blocked_hosts (set): Tracking, analytics and ad hosts that are always aborted.
+            blocked_url_patterns (list): Regular expressions searched for in the URL.
+
+        """
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.third_party_resource_types = set(third_party_resource_types)
+        self.allowed_hosts = set(allowed_hosts)
+        self.blocked_hosts = set(blocked_hosts)
+        # One alternation is a single scan of the URL instead of one per pattern
+        self.blocked_url_pattern = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in blocked_url_patterns), re.IGNORECASE)
+            if blocked_url_patterns else None
+        )
+        self.stats = request_filter_stats
+
+    def block_reason(self, url: str, resource_type: str) -> str | None:
+        if resource_type in self.blocked_resource_types:
+            return BLOCKED_RESOURCE_TYPE
+        host = (urlsplit(url).hostname or "").lower()
+        if not host or host_in(host, self.allowed_hosts):
+            return None
+        if host_in(host, self.blocked_hosts):
+            return BLOCKED_HOST
+        if self.blocked_url_pattern is not None and self.blocked_url_pattern.search(url):
+            return BLOCKED_PATTERN
+        if resource_type in self.third_party_resource_types:
+            return BLOCKED_THIRD_PARTY
+        return None
+
+    async def handle(self, route: Route) -> None:
+        # Awaited by Playwright's own route dispatch, so no extra task is created per request
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            self.stats.allowed += 1
+            if request.resource_type == "document" and request.is_navigation_request():
+                self.stats.navigations += 1
+            await route.continue_()
+            return
+        self.stats.blocked[reason] += 1
+        await route.abort("blockedbyclient")
+
+    async def attach(self, context: BrowserContext) -> None:
+        await context.route("**/*", self.handle)
+        context.on("response", self.stats.record_response)
+
+
+def env_set(name: str, default: set) -> set:
+    value = os.getenv(name)
+    if value is None:
+        return set(default)
+    return {item.strip().lower() for item in value.split(",") if item.strip()}
+
+def get_request_filter() -> RequestFilter:
+    # Comma-separated overrides, e.g. REQUEST_FILTER_ALLOWED_HOSTS="seek.com.au,seekcdn.com,cloudflare.com"
+    return RequestFilter(
+        blocked_resource_types=env_set("REQUEST_FILTER_BLOCKED_RESOURCE_TYPES", REQUEST_FILTER_BLOCKED_RESOURCE_TYPES),
+        third_party_resource_types=env_set(
+            "REQUEST_FILTER_THIRD_PARTY_RESOURCE_TYPES", REQUEST_FILTER_THIRD_PARTY_RESOURCE_TYPES
+        ),
+        allowed_hosts=env_set("REQUEST_FILTER_ALLOWED_HOSTS", REQUEST_FILTER_ALLOWED_HOSTS),
+        blocked_hosts=env_set("REQUEST_FILTER_BLOCKED_HOSTS", REQUEST_FILTER_BLOCKED_HOSTS),
+    )
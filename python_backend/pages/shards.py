@@ -0,0 +1,83 @@
+import asyncio
+
+from pages.pool import PagePool
+from playwright.async_api import Page
+from utils.constants import PAGE_ASSIGNMENT_LEAST_LOAD, PAGE_ASSIGNMENT_ROUND_ROBIN
+
+
+def split_evenly(total: int, parts: int) -> list:
+    return [total // parts + (index < total % parts) for index in range(parts)]
+
+
+class BrowserGroup:
+    def __init__(self, browsers: list) -> None:
+        """Initialize a BrowserGroup instance so several Chromium processes tear down like one Browser."""
+        self.browsers = browsers
+
+    def is_connected(self) -> bool:
+        return all(browser.is_connected() for browser in self.browsers)
+
+    async def close(self) -> None:
+        results = await asyncio.gather(*(browser.close() for browser in self.browsers), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            raise errors[0]
+
+
+class ShardedPagePool:
+    def __init__(self, shards: list, assignment: str = PAGE_ASSIGNMENT_LEAST_LOAD) -> None:
+        """Initialize a ShardedPagePool instance spreading pages over one PagePool per browser context.
+
+        It has the PagePool interface, so extractors acquire and release pages without knowing which context or
+        Chromium process they came from.
+
+        Args:
+            shards (list): A PagePool per browser context.
+            assignment (str): ``least_load`` picks the shard with the smallest share of pages in use;
+                ``round_robin`` rotates through the shards. Either way a shard with a free page is preferred.
+
+        """
+        if assignment not in {PAGE_ASSIGNMENT_LEAST_LOAD, PAGE_ASSIGNMENT_ROUND_ROBIN}:
+            msg = f"Unknown page assignment {assignment!r}"
+            raise ValueError(msg)
+        self.shards = shards
+        self.assignment = assignment
+        self.next_shard = 0
+        self.owners: dict = {}
+
+    @property
+    def max_pages(self) -> int:
+        return sum(shard.max_pages for shard in self.shards)
+
+    @property
+    def all_pages(self) -> list:
+        return [page for shard in self.shards for page in shard.all_pages]
+
+    @property
+    def acquisitions(self) -> int:
+        return sum(shard.acquisitions for shard in self.shards)
+
+    async def init_pages(self) -> None:
+        for shard in self.shards:
+            await shard.init_pages()
+
+    def pick_shard(self) -> PagePool:
+        available = [shard for shard in self.shards if shard.in_use < shard.max_pages] or self.shards
+        if self.assignment == PAGE_ASSIGNMENT_ROUND_ROBIN:
+            shard = available[self.next_shard % len(available)]
+            self.next_shard += 1
+            return shard
+        return min(available, key=lambda shard: shard.in_use / shard.max_pages)
+
+    async def acquire(self) -> Page:
+        shard = self.pick_shard()
+        page = await shard.acquire()
+        self.owners[page] = shard
+        return page
+
+    async def release(self, page: Page) -> None:
+        await self.owners.pop(page).release(page)
+
+    async def close_all(self) -> None:
+        for shard in self.shards:
+            await shard.close_all()
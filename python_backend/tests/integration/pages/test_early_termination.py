@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from app.app import app
 from httpx import ASGITransport, AsyncClient
+from pages.listing_parser import LISTING_SOURCE_MARKDOWN, ListingPage
 from tzlocal import get_localzone
 from utils.constants import HTTP_STATUS_ACCEPTED
 from utils.context import ScrapeContext
@@ -21,20 +22,18 @@ metadata_global = {
 @pytest.mark.asyncio
 @patch("app.main.scrape_pages", new_callable=AsyncMock)
 @patch("app.main.get_total_pages", return_value=1)
-@patch("app.main.get_total_job_count", return_value=10)
-@patch("app.main.fetch_page_markdown", new_callable=AsyncMock)
-@patch("app.main.AsyncWebCrawler.__aenter__", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler.start", new_callable=AsyncMock)
 async def test_start_scraping_early_termination(
     mock_aenter: AsyncMock,
-    mock_fetch_markdown: AsyncMock,
-    mock_get_total_job_count: MagicMock, # noqa: ARG001
+    mock_fetch_listing: AsyncMock,
     mock_get_total_pages: MagicMock, # noqa: ARG001
     mock_scrape_pages: AsyncMock
 ) -> None:
     jobs_received = []
 
     mock_aenter.return_value = MagicMock()
-    mock_fetch_markdown.return_value = "mock markdown"
+    mock_fetch_listing.return_value = ListingPage([], total_count=10, source=LISTING_SOURCE_MARKDOWN)
 
     async def mock_scrape_pages_func(_base_url: str, ctx: ScrapeContext, _total_pages: int) -> dict:
         job_urls = list(metadata_global.items())
@@ -8,7 +8,7 @@ from utils.constants import HTTP_STATUS_ACCEPTED
 
 
 @pytest.mark.asyncio
-@patch("app.main.AsyncWebCrawler.__aenter__", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler.start", new_callable=AsyncMock)
 async def test_start_scraping_crawler_arun_crash(mock_aenter: AsyncMock) -> None:
     """Integration test that ensures AsyncWebCrawler.arun errors do not crash the scraping endpoint.
 
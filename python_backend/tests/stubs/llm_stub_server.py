@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+
+class LLMStubServer:
+    def __init__(self, reply: Callable[[dict], str] | None = None, delay: float = 0.0) -> None:
+        """Initialize a local OpenAI-compatible chat completions server.
+
+        Point an LLMClient at ``base_url`` to exercise real HTTP, pooling and timeouts without calling Groq.
+
+        Args:
+            reply: Builds the assistant message content from the decoded request body.
+            delay (float): Seconds to wait before answering each request.
+
+        """
+        self.reply = reply or (lambda _body: "{}")
+        self.delay = delay
+        self.status_code = 200
+        self.status_by_model: dict = {}
+        self.headers: dict = {}
+        self.requests: list = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections: set = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "LLMStubServer":
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Stop the server and release its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args: object) -> None:
+                pass
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:  # noqa: SLF001
+                    stub.requests.append(body)
+                    stub.connections.add(self.client_address)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    self._respond(body)
+                finally:
+                    with stub._lock:  # noqa: SLF001
+                        stub.in_flight -= 1
+
+            def _respond(self, body: dict) -> None:
+                if self.path != CHAT_COMPLETIONS_PATH:
+                    payload = json.dumps({"error": {"message": "not found"}}).encode()
+                    status_code = 404
+                elif stub.status_by_model.get(body.get("model"), stub.status_code) != 200:  # noqa: PLR2004
+                    payload = json.dumps({"error": {"message": "stub error"}}).encode()
+                    status_code = stub.status_by_model.get(body.get("model"), stub.status_code)
+                else:
+                    payload = json.dumps({
+                        "id": f"chatcmpl-{len(stub.requests)}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model", ""),
+                        "choices": [{
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": stub.reply(body)},
+                        }],
+                    }).encode()
+                    status_code = 200
+
+                try:
+                    self.send_response(status_code)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    for name, value in stub.headers.items():
+                        self.send_header(name, str(value))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (e.g. per-call timeout) before the stub replied
+                    pass
+
+        return Handler
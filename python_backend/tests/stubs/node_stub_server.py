@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_PREFIX = "/api"
+
+
+class NodeStubServer:
+    def __init__(self, delay: float = 0.0) -> None:
+        """Initialize a local stand-in for the Node backend's job endpoints.
+
+        Point NODE_BACKEND_URL at ``base_url`` to exercise the real client, pooling and keep-alive.
+
+        Args:
+            delay (float): Seconds to wait before answering each request.
+
+        """
+        self.delay = delay
+        self.status_code = 200
+        self.requests: list = []
+        self.connections: set = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def __enter__(self) -> "NodeStubServer":
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Stop the server and release its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed ACKs dominate keep-alive timings
+            disable_nagle_algorithm = True
+
+            def log_message(self, *_args: object) -> None:
+                pass
+
+            def do_POST(self) -> None:  # noqa: N802
+                self._handle()
+
+            def do_DELETE(self) -> None:  # noqa: N802
+                self._handle()
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length)) if length else None
+                with stub._lock:  # noqa: SLF001
+                    stub.requests.append((self.command, self.path, body))
+                    stub.connections.add(self.client_address)
+                time.sleep(stub.delay)
+
+                if stub.status_code != 200:  # noqa: PLR2004
+                    payload = b"stub error"
+                elif self.command == "DELETE":
+                    payload = json.dumps({"deleted": len(stub.requests)}).encode()
+                else:
+                    payload = json.dumps({"ok": True}).encode()
+
+                self.send_response(stub.status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
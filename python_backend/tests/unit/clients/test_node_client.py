@@ -1,8 +1,15 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from clients.node_client import delete_all_jobs_from_node, send_page_jobs_to_node
+from clients.node_client import (
+    close_node_client,
+    delete_all_jobs_from_node,
+    open_node_client,
+    send_page_jobs_to_node,
+    send_scrape_summary_to_node,
+)
 from httpx import HTTPStatusError, Request, Response
+from tests.stubs.node_stub_server import NodeStubServer
 
 
 @pytest.mark.asyncio
@@ -62,3 +69,41 @@ async def test_delete_all_jobs_from_node_http_error(mock_delete: AsyncMock) -> N
 
     assert "Failed to delete jobs: 404 - Not Found" in str(exc_info.value)
 
+
+@pytest.mark.asyncio
+async def test_shared_client_reuses_one_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    with NodeStubServer() as stub:
+        monkeypatch.setenv("NODE_BACKEND_URL", stub.base_url)
+        await open_node_client()
+        try:
+            for i in range(3):
+                await send_page_jobs_to_node([{"title": f"job {i}"}])
+            await send_scrape_summary_to_node({"message": "done"})
+        finally:
+            await close_node_client()
+
+    assert [path for _method, path, _body in stub.requests] == [
+        "/api/jobs/page-batch", "/api/jobs/page-batch", "/api/jobs/page-batch", "/api/jobs/scrape-summary"
+    ]
+    assert len(stub.connections) == 1
+
+@pytest.mark.asyncio
+async def test_without_shared_client_each_call_opens_a_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    with NodeStubServer() as stub:
+        monkeypatch.setenv("NODE_BACKEND_URL", stub.base_url)
+        await send_page_jobs_to_node([{"title": "job"}])
+        await delete_all_jobs_from_node()
+
+    assert [method for method, _path, _body in stub.requests] == ["POST", "DELETE"]
+    assert len(stub.connections) == 2 # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_open_node_client_is_idempotent() -> None:
+    first = await open_node_client()
+    try:
+        assert await open_node_client() is first
+    finally:
+        await close_node_client()
+
+    assert first.is_closed
+    await close_node_client()
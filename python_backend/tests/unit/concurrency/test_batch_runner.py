@@ -2,7 +2,8 @@ import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from concurrency.batch_runner import aggregate_job_results, process_jobs_concurrently
+from concurrency.batch_runner import aggregate_job_results, gather_job_results, process_jobs_concurrently
+from concurrency.job_runner import TerminationStats
 from utils.constants import SKIPPED, SUCCESS, TERMINATE
 from utils.context import ScrapeContext
 
@@ -94,3 +95,150 @@ async def test_process_jobs_concurrently_mixed_results(
 
     # Ensure capture message was sent
     mock_capture_message.assert_called_once_with("Scraping job batch completed", level="info")
+
+def make_ctx(semaphore_size: int = 2) -> ScrapeContext:
+    return ScrapeContext(
+        crawler=AsyncMock(),
+        page_pool=AsyncMock(),
+        location_search="Sydney",
+        terminate_event=asyncio.Event(),
+        semaphore=asyncio.Semaphore(semaphore_size),
+        day_range_limit=3,
+    )
+
+async def fake_listing_jobs(job_url: str, _count: int, ctx: ScrapeContext) -> dict:
+    # "stale" jobs end the listing, "hang" jobs never finish on their own, the rest finish once one is stale
+    if "stale" in job_url:
+        await asyncio.sleep(0)
+        return {"status": TERMINATE, "job": None}
+    if "hang" in job_url:
+        await asyncio.Event().wait()
+    await ctx.terminate_event.wait()
+    return {"status": SUCCESS, "job": {"title": job_url.rsplit("/", 1)[-1]}}
+
+@pytest.mark.asyncio
+@patch("sentry_sdk.capture_message")
+@patch("concurrency.job_runner.process_job_with_retries", side_effect=fake_listing_jobs)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("concurrency.batch_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.batch_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_process_jobs_concurrently_cancels_only_jobs_after_the_stale_one(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_job_backoff: AsyncMock, # noqa: ARG001
+    mock_job_pause: AsyncMock, # noqa: ARG001
+    mock_process_job: AsyncMock,
+    mock_capture_message: MagicMock, # noqa: ARG001
+) -> None:
+    ctx = make_ctx(semaphore_size=3)
+    stats = TerminationStats()
+    job_urls = [f"https://seek.com.au/job/{name}" for name in ("newer", "stale", "hang", "queued", "queued")]
+
+    with patch("concurrency.job_runner.termination_stats", stats):
+        final_jobs, early_termination = await asyncio.wait_for(process_jobs_concurrently(job_urls, ctx, 1), 1)
+
+    # The job listed before the stale one was still running when termination fired, and it completes
+    assert final_jobs == [{"title": "newer"}]
+    assert early_termination is True
+    assert mock_process_job.await_count == 3  # noqa: PLR2004
+    assert ctx.job_tasks == {}
+    assert stats.counters() == {
+        "jobs_not_started": 0,
+        "jobs_dropped_queued": 2,
+        "jobs_cancelled_in_flight": 1,
+        "jobs_avoided": 3,
+    }
+
+@pytest.mark.asyncio
+@patch("sentry_sdk.capture_message")
+@patch("concurrency.job_runner.process_job_with_retries", side_effect=fake_listing_jobs)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("concurrency.batch_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.batch_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_stale_job_on_later_page_leaves_earlier_page_running(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_job_backoff: AsyncMock, # noqa: ARG001
+    mock_job_pause: AsyncMock, # noqa: ARG001
+    mock_process_job: AsyncMock, # noqa: ARG001
+    mock_capture_message: MagicMock, # noqa: ARG001
+) -> None:
+    ctx = make_ctx(semaphore_size=4)
+
+    first_page, second_page = await asyncio.wait_for(asyncio.gather(
+        process_jobs_concurrently(["https://seek.com.au/job/a", "https://seek.com.au/job/b"], ctx, 1),
+        process_jobs_concurrently(["https://seek.com.au/job/stale", "https://seek.com.au/job/hang"], ctx, 2),
+    ), 1)
+
+    assert first_page == ([{"title": "a"}, {"title": "b"}], False)
+    assert second_page == ([], True)
+    assert ctx.terminated_at == (2, 0)
+
+@pytest.mark.asyncio
+@patch("sentry_sdk.capture_message")
+@patch("concurrency.job_runner.process_job_with_retries", side_effect=fake_listing_jobs)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("concurrency.batch_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.batch_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_stale_job_on_earlier_page_cancels_later_page(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_job_backoff: AsyncMock, # noqa: ARG001
+    mock_job_pause: AsyncMock, # noqa: ARG001
+    mock_process_job: AsyncMock, # noqa: ARG001
+    mock_capture_message: MagicMock, # noqa: ARG001
+) -> None:
+    ctx = make_ctx(semaphore_size=4)
+
+    first_page, second_page = await asyncio.wait_for(asyncio.gather(
+        process_jobs_concurrently(["https://seek.com.au/job/a", "https://seek.com.au/job/stale"], ctx, 1),
+        process_jobs_concurrently(["https://seek.com.au/job/hang", "https://seek.com.au/job/hang"], ctx, 2),
+    ), 1)
+
+    assert first_page == ([{"title": "a"}], True)
+    assert second_page == ([], True)
+
+@pytest.mark.asyncio
+@patch("concurrency.batch_runner.process_job_with_semaphore", new_callable=AsyncMock)
+@patch("sentry_sdk.capture_message")
+@patch("concurrency.batch_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.batch_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_process_jobs_concurrently_stops_scheduling_once_terminated(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock,
+    mock_capture_message: MagicMock, # noqa: ARG001
+    mock_process_job: AsyncMock,
+) -> None:
+    ctx = make_ctx()
+    stats = TerminationStats()
+
+    async def fake_process_job(_job_url: str, count: int, ctx: ScrapeContext, page_num: int) -> dict:
+        ctx.terminate(page_num, count)
+        return {"status": TERMINATE, "job": None}
+
+    async def yield_to_jobs(*_args: float) -> None:
+        await asyncio.sleep(0)
+
+    mock_process_job.side_effect = fake_process_job
+    job_urls = [f"https://seek.com.au/job/{job_id}" for job_id in range(1, 5)]
+    with patch("concurrency.batch_runner.termination_stats", stats):
+        # The stagger pause is mocked, so run the first job before the loop schedules the next one
+        mock_pause.side_effect = yield_to_jobs
+        final_jobs, early_termination = await process_jobs_concurrently(job_urls, ctx, 1)
+
+    assert final_jobs == []
+    assert early_termination is True
+    mock_process_job.assert_awaited_once()
+    assert stats.counters()["jobs_not_started"] == 3  # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_gather_job_results_reraises_job_errors() -> None:
+    async def fail() -> dict:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await gather_job_results([asyncio.create_task(fail())])
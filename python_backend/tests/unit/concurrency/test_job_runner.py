@@ -1,10 +1,13 @@
 import asyncio
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from concurrency.job_runner import process_job_with_retries, process_job_with_semaphore
+from concurrency.job_runner import TerminationStats, process_job_with_retries, process_job_with_semaphore
+from jobs.store import SeenJobStore
+from tzlocal import get_localzone
 from utils.constants import SKIPPED, SUCCESS, TERMINATE
-from utils.context import ScrapeContext
+from utils.context import JobClaims, ScrapeContext
 
 EXPECTED_PAUSE_CALLS = 2
 
@@ -128,7 +131,7 @@ async def test_process_job_terminate(
     assert result["job"] is None
 
     assert mock_backoff.await_count == 1
-    assert mock_pause.await_count == 1
+    mock_pause.assert_not_awaited()
 
 @pytest.mark.asyncio
 @patch("concurrency.job_runner.process_job_with_retries", new_callable=AsyncMock)
@@ -153,7 +156,7 @@ async def test_process_job_with_semaphore_early_terminate(
         day_range_limit=3,
     )
 
-    result = await process_job_with_semaphore(job_url, count, ctx)
+    result = await process_job_with_semaphore(job_url, count, ctx, 1)
 
     assert result == {"status": TERMINATE, "job": None}
     mock_backoff.assert_not_called()
@@ -187,10 +190,272 @@ async def test_process_job_with_semaphore_success(
         day_range_limit=3,
     )
 
-    result = await process_job_with_semaphore(job_url, count, ctx)
+    result = await process_job_with_semaphore(job_url, count, ctx, 1)
 
     assert result["status"] == SUCCESS
     assert result["job"]["title"] == "Dev"
     mock_backoff.assert_awaited_once()
     mock_pause.assert_awaited_once()
     mock_process_job_with_retries.assert_awaited_once()
+
+@pytest.mark.asyncio
+@patch("concurrency.job_runner.process_job_with_retries", new_callable=AsyncMock)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_process_job_with_semaphore_terminated_while_queued(
+    mock_backoff: AsyncMock,
+    mock_pause: AsyncMock,
+    mock_process_job_with_retries: AsyncMock
+) -> None:
+    semaphore = asyncio.Semaphore(1)
+    ctx = ScrapeContext(
+        crawler=AsyncMock(),
+        page_pool=AsyncMock(),
+        location_search="Sydney",
+        terminate_event=asyncio.Event(),
+        semaphore=semaphore,
+        day_range_limit=3,
+    )
+
+    await semaphore.acquire()
+    task = asyncio.create_task(process_job_with_semaphore("https://seek.com.au/job/123", 1, ctx, 2))
+    await asyncio.sleep(0)
+    ctx.terminate(1, 5)
+    semaphore.release()
+
+    result = await task
+
+    assert result == {"status": TERMINATE, "job": None}
+    mock_backoff.assert_not_called()
+    mock_pause.assert_not_called()
+    mock_process_job_with_retries.assert_not_called()
+
+@pytest.mark.asyncio
+@patch("concurrency.job_runner.process_job_with_retries", new_callable=AsyncMock)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_process_job_with_semaphore_skips_job_claimed_by_another_query(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_process_job_with_retries: AsyncMock
+) -> None:
+    mock_process_job_with_retries.return_value = {"status": SUCCESS, "job": {"title": "Dev"}}
+    job_claims = JobClaims()
+    semaphore = asyncio.Semaphore(2)
+    sydney_ctx, melbourne_ctx = (
+        ScrapeContext(
+            crawler=AsyncMock(),
+            page_pool=AsyncMock(),
+            location_search=location,
+            terminate_event=asyncio.Event(),
+            semaphore=semaphore,
+            day_range_limit=3,
+            job_claims=job_claims,
+        )
+        for location in ("Sydney", "Melbourne")
+    )
+
+    first = await process_job_with_semaphore("https://www.seek.com.au/job/123?type=standard", 0, sydney_ctx, 1)
+    second = await process_job_with_semaphore("https://www.seek.com.au/job/123?type=promoted", 4, melbourne_ctx, 1)
+
+    assert first["status"] == SUCCESS
+    assert second == {"status": SKIPPED, "job": None}
+    mock_process_job_with_retries.assert_awaited_once()
+    assert job_claims.counters() == {"claimed": 1, "duplicates": 1}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [TERMINATE, SKIPPED])
+@patch("concurrency.job_runner.process_job_with_retries", new_callable=AsyncMock)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_stale_or_failed_job_is_released_for_other_queries(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_process_job_with_retries: AsyncMock,
+    status: str,
+) -> None:
+    # Sydney only wants jobs from the last day; Melbourne looks back a week and should still get the job
+    mock_process_job_with_retries.side_effect = [{"status": status, "job": None}, {"status": SUCCESS, "job": {}}]
+    job_claims = JobClaims()
+    semaphore = asyncio.Semaphore(2)
+    sydney_ctx, melbourne_ctx = (
+        ScrapeContext(
+            crawler=AsyncMock(),
+            page_pool=AsyncMock(),
+            location_search=location,
+            terminate_event=asyncio.Event(),
+            semaphore=semaphore,
+            day_range_limit=day_range_limit,
+            job_claims=job_claims,
+        )
+        for location, day_range_limit in (("Sydney", 1), ("Melbourne", 7))
+    )
+    job_url = "https://www.seek.com.au/job/123"
+
+    first = await process_job_with_semaphore(job_url, 0, sydney_ctx, 1)
+    assert not job_claims.is_claimed(job_url)
+    second = await process_job_with_semaphore(job_url, 0, melbourne_ctx, 1)
+
+    assert first["status"] == status
+    assert second["status"] == SUCCESS
+    assert job_claims.is_claimed(job_url)
+    assert job_claims.counters() == {"claimed": 1, "duplicates": 0}
+
+@pytest.mark.asyncio
+@patch("concurrency.job_runner.process_job_with_retries", new_callable=AsyncMock)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_process_job_with_semaphore_cancelled_in_flight_releases_claim(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_process_job_with_retries: AsyncMock
+) -> None:
+    running = asyncio.Event()
+
+    async def hang(*_args: object) -> dict:
+        running.set()
+        await asyncio.Event().wait()
+
+    mock_process_job_with_retries.side_effect = hang
+    job_url = "https://www.seek.com.au/job/123"
+    job_claims = JobClaims()
+    stats = TerminationStats()
+    ctx = ScrapeContext(
+        crawler=AsyncMock(),
+        page_pool=AsyncMock(),
+        location_search="Sydney",
+        terminate_event=asyncio.Event(),
+        semaphore=asyncio.Semaphore(1),
+        day_range_limit=3,
+        job_claims=job_claims,
+    )
+
+    with patch("concurrency.job_runner.termination_stats", stats):
+        task = asyncio.create_task(process_job_with_semaphore(job_url, 0, ctx, 2))
+        await running.wait()
+        ctx.terminate(1, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert not job_claims.is_claimed(job_url)
+    assert stats.counters()["jobs_cancelled_in_flight"] == 1
+    assert not ctx.semaphore.locked()
+
+@pytest.mark.asyncio
+@patch("concurrency.job_runner.extract_job_data", new_callable=AsyncMock)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_process_job_reuses_recently_parsed_job(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_extract_job_data: AsyncMock
+) -> None:
+    posted_date = datetime.now(get_localzone()).strftime("%d/%m/%Y")
+    with SeenJobStore(":memory:") as job_store:
+        job_store.stage_content_hash("https://www.seek.com.au/job/123", "abc")
+        job_store.save_jobs([{
+            "job_url": "https://www.seek.com.au/job/123",
+            "title": "Engineer",
+            "posted_date": posted_date,
+            "location_search": "Melbourne",
+        }])
+        ctx = ScrapeContext(
+            crawler=AsyncMock(),
+            page_pool=AsyncMock(),
+            location_search="Sydney",
+            terminate_event=asyncio.Event(),
+            semaphore=asyncio.Semaphore(1),
+            day_range_limit=3,
+            job_store=job_store,
+        )
+
+        result = await process_job_with_retries("https://www.seek.com.au/job/123?origin=cardTitle", 1, ctx)
+
+    assert result["status"] == SUCCESS
+    assert result["job"]["title"] == "Engineer"
+    assert result["job"]["location_search"] == "Sydney"
+    assert result["job"]["posted_within"] == "Today"
+    assert job_store.stats() == {"reused": 1, "parsed": 1}
+    mock_extract_job_data.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("concurrency.job_runner.extract_job_data", new_callable=AsyncMock)
+async def test_process_job_stored_job_outside_day_range_terminates(mock_extract_job_data: AsyncMock) -> None:
+    with SeenJobStore(":memory:") as job_store:
+        job_store.stage_content_hash("https://www.seek.com.au/job/123", "abc")
+        job_store.save_jobs([{"job_url": "https://www.seek.com.au/job/123", "posted_date": "05/05/2024"}])
+        ctx = ScrapeContext(
+            crawler=AsyncMock(),
+            page_pool=AsyncMock(),
+            location_search="Sydney",
+            terminate_event=asyncio.Event(),
+            semaphore=asyncio.Semaphore(1),
+            day_range_limit=3,
+            job_store=job_store,
+        )
+
+        result = await process_job_with_retries("https://www.seek.com.au/job/123", 1, ctx)
+
+    assert result == {"status": TERMINATE, "job": None}
+    mock_extract_job_data.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("concurrency.job_runner.process_job_with_retries", new_callable=AsyncMock)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_stale_job_only_terminates_jobs_listed_after_it(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_process_job_with_retries: AsyncMock
+) -> None:
+    mock_process_job_with_retries.return_value = {"status": TERMINATE, "job": None}
+    ctx = ScrapeContext(
+        crawler=AsyncMock(),
+        page_pool=AsyncMock(),
+        location_search="Sydney",
+        terminate_event=asyncio.Event(),
+        semaphore=asyncio.Semaphore(1),
+        day_range_limit=3,
+    )
+
+    result = await process_job_with_semaphore("https://www.seek.com.au/job/123", 4, ctx, 2)
+
+    assert result == {"status": TERMINATE, "job": None}
+    assert ctx.terminated_at == (2, 4)
+    assert not ctx.is_terminated(1)
+    assert not ctx.is_terminated(2, 3)
+    assert ctx.is_terminated(2, 5)
+    assert ctx.is_terminated(3)
+
+@pytest.mark.asyncio
+@patch("concurrency.job_runner.process_job_with_retries", new_callable=AsyncMock)
+@patch("concurrency.job_runner.pause_briefly", new_callable=AsyncMock)
+@patch("concurrency.job_runner.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_queued_job_on_earlier_page_runs_after_later_page_terminates(
+    mock_backoff: AsyncMock, # noqa: ARG001
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_process_job_with_retries: AsyncMock
+) -> None:
+    mock_process_job_with_retries.return_value = {"status": SUCCESS, "job": {"title": "Dev"}}
+    semaphore = asyncio.Semaphore(1)
+    ctx = ScrapeContext(
+        crawler=AsyncMock(),
+        page_pool=AsyncMock(),
+        location_search="Sydney",
+        terminate_event=asyncio.Event(),
+        semaphore=semaphore,
+        day_range_limit=3,
+    )
+
+    await semaphore.acquire()
+    task = asyncio.create_task(process_job_with_semaphore("https://seek.com.au/job/123", 7, ctx, 1))
+    await asyncio.sleep(0)
+    # Pages are pipelined; a stale job on the next page says nothing about this newer one
+    ctx.terminate(2, 0)
+    semaphore.release()
+
+    result = await task
+
+    assert result == {"status": SUCCESS, "job": {"title": "Dev"}}
+    mock_process_job_with_retries.assert_awaited_once()
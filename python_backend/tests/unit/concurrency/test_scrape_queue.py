@@ -0,0 +1,80 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from concurrency.scrape_queue import DONE, FAILED, QUEUED, RUNNING, ScrapeQueue
+from utils.context import ScrapeQuery
+
+QUERIES = [ScrapeQuery("software engineer", "sydney", max_pages=1), ScrapeQuery("data engineer", "melbourne")]
+
+
+@pytest.fixture
+def scrape_queue() -> ScrapeQueue:
+    with ScrapeQueue(":memory:", lease_seconds=60, max_attempts=2) as scrape_queue:
+        yield scrape_queue
+
+def test_claim_returns_oldest_queued_task(scrape_queue: ScrapeQueue) -> None:
+    first_id = scrape_queue.enqueue(QUERIES[:1])
+    second_id = scrape_queue.enqueue(QUERIES)
+
+    first = scrape_queue.claim("worker-1")
+    second = scrape_queue.claim("worker-2")
+
+    assert (first.task_id, second.task_id) == (first_id, second_id)
+    assert first.queries == QUERIES[:1]
+    assert second.queries == QUERIES
+    assert (first.status, first.worker_id, first.attempts) == (RUNNING, "worker-1", 1)
+    assert scrape_queue.claim("worker-3") is None
+
+def test_complete_and_fail_record_outcome(scrape_queue: ScrapeQueue) -> None:
+    done_id = scrape_queue.enqueue(QUERIES[:1])
+    failed_id = scrape_queue.enqueue(QUERIES[:1])
+    scrape_queue.claim("worker-1")
+    scrape_queue.claim("worker-1")
+
+    assert scrape_queue.complete(done_id, "worker-1", {"message": "Scraped and inserted 3 jobs."})
+    assert scrape_queue.fail(failed_id, "worker-1", "RuntimeError: browser crashed")
+
+    assert scrape_queue.get(done_id).summary == {"message": "Scraped and inserted 3 jobs."}
+    assert scrape_queue.get(failed_id).error == "RuntimeError: browser crashed"
+    assert scrape_queue.counts() == {QUEUED: 0, RUNNING: 0, DONE: 1, FAILED: 1}
+    assert [task.task_id for task in scrape_queue.recent()] == [failed_id, done_id]
+    assert scrape_queue.get(999) is None
+
+def test_only_the_claiming_worker_records_the_outcome(scrape_queue: ScrapeQueue) -> None:
+    task_id = scrape_queue.enqueue(QUERIES[:1])
+    scrape_queue.claim("worker-1")
+    with patch("concurrency.scrape_queue.time.time", return_value=time.time() + 61):
+        scrape_queue.claim("worker-2")
+
+    assert not scrape_queue.complete(task_id, "worker-1", {"message": "Scraped and inserted 3 jobs."})
+    assert not scrape_queue.fail(task_id, "worker-1", "RuntimeError: browser crashed")
+    assert scrape_queue.get(task_id).status == RUNNING
+
+    assert scrape_queue.complete(task_id, "worker-2", {"message": "Scraped and inserted 3 jobs."})
+    assert not scrape_queue.fail(task_id, "worker-2", "RuntimeError: browser crashed")
+    assert scrape_queue.get(task_id).status == DONE
+
+def test_expired_lease_is_reclaimed_then_failed(scrape_queue: ScrapeQueue) -> None:
+    task_id = scrape_queue.enqueue(QUERIES[:1])
+    scrape_queue.claim("worker-1")
+    later = time.time() + 61
+
+    with patch("concurrency.scrape_queue.time.time", return_value=later):
+        reclaimed = scrape_queue.claim("worker-2")
+    assert (reclaimed.task_id, reclaimed.attempts, reclaimed.worker_id) == (task_id, 2, "worker-2")
+    assert not scrape_queue.heartbeat(task_id, "worker-1")
+
+    with patch("concurrency.scrape_queue.time.time", return_value=later + 61):
+        assert scrape_queue.claim("worker-3") is None
+    assert scrape_queue.get(task_id).status == FAILED
+
+def test_heartbeat_extends_lease(scrape_queue: ScrapeQueue) -> None:
+    task_id = scrape_queue.enqueue(QUERIES[:1])
+    scrape_queue.claim("worker-1")
+    claimed_lease = scrape_queue.get(task_id).lease_expires
+
+    with patch("concurrency.scrape_queue.time.time", return_value=time.time() + 30):
+        assert scrape_queue.heartbeat(task_id, "worker-1")
+
+    assert scrape_queue.get(task_id).lease_expires > claimed_lease
@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import pytest
+import yaml
+from jobs.classifier import RuleEngineStats, classify_experience_level, classify_work_model, rule_hit_rate
+
+FIXTURE_PATH = Path(__file__).parent.parent.parent / "data" / "test_groq_job_data.yaml"
+
+
+def load_labelled_jobs() -> list:
+    with FIXTURE_PATH.open(encoding="utf-8") as f:
+        return yaml.safe_load(f)["tests"]
+
+@pytest.mark.parametrize(("text", "expected"), [
+    ("This is a hybrid role based in Sydney.", "Hybrid"),
+    ("You'll spend 3 days per week in the office.", "Hybrid"),
+    ("Expect two days a week in the office.", "Hybrid"),
+    ("5 days in the office.", "On-site"),
+    ("You will work 5 days a week in the office.", "On-site"),
+    ("We offer a fully remote position across Australia.", "Remote"),
+    ("This is an on-site role at our Parramatta plant.", "On-site"),
+])
+def test_classify_work_model_confident_phrases(text: str, expected: str) -> None:
+    classification = classify_work_model("Software Engineer", text)
+
+    assert classification.value == expected
+    assert classification.is_confident
+
+def test_classify_work_model_ignores_hybrid_cloud() -> None:
+    classification = classify_work_model("Cloud Engineer", "Experience with hybrid cloud platforms.")
+
+    assert classification.value is None
+    assert not classification.is_confident
+
+@pytest.mark.parametrize("text", [
+    "This is not a remote role.",
+    "Please note this is a non-remote position.",
+    "There is no hybrid or remote option.",
+    "This role isn't fully remote.",
+])
+def test_classify_work_model_negated_phrases_are_not_evidence(text: str) -> None:
+    classification = classify_work_model("Software Engineer", text)
+
+    assert classification.value is None
+    assert not classification.is_confident
+
+def test_classify_work_model_conflicting_signals_are_not_confident() -> None:
+    classification = classify_work_model("Software Engineer", "Remote friendly team. Work from home on Fridays.")
+
+    assert not classification.is_confident
+
+@pytest.mark.parametrize(("title", "text", "expected"), [
+    ("Software Engineering Intern", "", "intern"),
+    ("Team Lead", "", "lead+"),
+    ("Senior Backend Engineer", "", "mid_or_senior"),
+    ("Software Engineer", "Applications are open for our 2026 graduate program.", "junior"),
+    ("Software Engineer", "You have 5+ years of commercial experience with Go.", "mid_or_senior"),
+    ("Engineering Manager", "You will have 6 direct reports.", "lead+"),
+])
+def test_classify_experience_level_confident_phrases(title: str, text: str, expected: str) -> None:
+    classification = classify_experience_level(title, text)
+
+    assert classification.value == expected
+    assert classification.is_confident
+
+def test_classify_experience_level_two_years_defers_to_llm() -> None:
+    classification = classify_experience_level("Software Engineer", "At least 2 years of experience with React.")
+
+    assert classification.value == "mid_or_senior"
+    assert not classification.is_confident
+
+@pytest.mark.parametrize("text", [
+    "We have over 20 years of experience delivering software for banks.",
+    "Founded in 2005, the team brings 15 years of industry experience to every project.",
+])
+def test_classify_experience_level_ignores_years_outside_requirements(text: str) -> None:
+    classification = classify_experience_level("Software Engineer", text)
+
+    assert classification.value is None
+    assert not classification.is_confident
+
+def test_classify_experience_level_reads_years_from_requirements() -> None:
+    markdown = (
+        "## About us\nWe have over 20 years of experience delivering software.\n"
+        "## Requirements\n- 1 year of experience with Python\n- A degree in computer science\n"
+    )
+
+    from_section = classify_experience_level("Software Engineer", markdown)
+    from_field = classify_experience_level(
+        "Software Engineer", "We have over 20 years of experience delivering software.", "5+ years of Java experience"
+    )
+
+    assert (from_section.value, from_section.evidence) == ("junior", "1 year of experience")
+    assert (from_field.value, from_field.evidence) == ("mid_or_senior", "5+ years of Java experience")
+
+def test_confident_rules_agree_with_labelled_fixtures() -> None:
+    stats = RuleEngineStats()
+    for case in load_labelled_jobs():
+        expected = case["expected"]
+        title = expected.get("title", "")
+        work_model = classify_work_model(title, case["markdown"])
+        experience_level = classify_experience_level(title, case["markdown"])
+        stats.record("work_model", work_model)
+        stats.record("experience_level", experience_level)
+
+        if work_model.is_confident:
+            assert work_model.value.lower() == expected["work_model"].lower(), title
+        if experience_level.is_confident:
+            assert experience_level.value == expected["experience_level"], title
+
+    assert rule_hit_rate(stats.counters()) >= 0.5  # noqa: PLR2004
+
+def test_rule_engine_stats_counts_hits_and_misses() -> None:
+    stats = RuleEngineStats()
+    stats.record("work_model", classify_work_model("", "Fully remote"))
+    stats.record("experience_level", classify_experience_level("Software Engineer", ""))
+
+    assert stats.counters() == {
+        "work_model_hits": 1,
+        "experience_level_hits": 0,
+        "work_model_misses": 0,
+        "experience_level_misses": 1,
+    }
+    assert rule_hit_rate(stats.counters()) == 0.5  # noqa: PLR2004
+    assert rule_hit_rate({}) == 0.0
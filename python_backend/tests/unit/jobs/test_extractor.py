@@ -3,17 +3,23 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from jobs.extractor import (
+    EXTRACT_METADATA_SCRIPT,
     extract_job_data,
     extract_job_metadata,
     extract_job_metadata_fields,
     extract_logo_src,
     extract_metadata_from_page,
     extract_posted_date_by_class,
+    fetch_job_details,
+    get_posted_date_selector,
     safe_extract_job_metadata_fields,
     safe_extract_logo_src,
     safe_extract_posted_date_by_class,
     scrape_job_details,
+    scrape_job_details_over_http,
 )
+from jobs.store import SeenJobStore, hash_job_content
+from pages.http_fetch import HttpFetchStats
 from utils.constants import (
     JOB_METADATA_FIELDS,
     LOGO_SELECTOR,
@@ -27,46 +33,32 @@ from utils.constants import (
 from utils.context import ScrapeContext
 
 
-@pytest.mark.asyncio
-async def test_extract_logo_src_found() -> None:
-    mock_logo_element = MagicMock()
-    mock_logo_element.get_attribute = AsyncMock(return_value="https://image-service-cdn.seek.com.au/1a2b3c4d5e6f")
-    mock_page = MagicMock()
-    mock_page.query_selector = AsyncMock(return_value=mock_logo_element)
+def test_extract_logo_src_found() -> None:
+    page_data = {"logoSrc": "https://image-service-cdn.seek.com.au/1a2b3c4d5e6f"}
 
-    result = await extract_logo_src(mock_page)
+    result = extract_logo_src(page_data)
 
     assert result == "https://image-service-cdn.seek.com.au/1a2b3c4d5e6f"
-    mock_page.query_selector.assert_awaited_once_with(LOGO_SELECTOR)
-    mock_logo_element.get_attribute.assert_awaited_once_with("src")
 
-@pytest.mark.asyncio
-async def test_extract_logo_src_not_found() -> None:
-    mock_page = MagicMock()
-    mock_page.query_selector = AsyncMock(return_value=None)
-    result = await extract_logo_src(mock_page)
+def test_extract_logo_src_not_found() -> None:
+    result = extract_logo_src({"logoSrc": None})
 
     assert result == ""
-    mock_page.query_selector.assert_awaited_once_with(LOGO_SELECTOR)
 
+def test_extract_logo_src_evaluation_error() -> None:
+    with pytest.raises(RuntimeError, match="bad selector"):
+        extract_logo_src({"logoError": "bad selector"})
 
-@pytest.mark.asyncio
-async def test_extract_job_metadata_fields_success() -> None:
-    mock_page = MagicMock()
 
-    mock_elem_1 = MagicMock()
-    mock_elem_1.inner_text = AsyncMock(return_value=" Software Engineer ")
-    mock_elem_2 = MagicMock()
-    mock_elem_2.inner_text = AsyncMock(return_value=" Google ")
-
-    mock_page.query_selector = AsyncMock(side_effect=[mock_elem_1, mock_elem_2])
+def test_extract_job_metadata_fields_success() -> None:
+    page_data = {"fields": {"job_title": "Software Engineer", "company": "Google"}, "fieldErrors": {}}
 
     job_metadata_fields = {
         "job_title": ["job-detail-title"],
         "company": ["advertiser-name"]
     }
 
-    results, field_errors = await extract_job_metadata_fields(mock_page, job_metadata_fields)
+    results, field_errors = extract_job_metadata_fields(page_data, job_metadata_fields)
 
     assert results == {
         "job_title": "Software Engineer",
@@ -74,144 +66,100 @@ async def test_extract_job_metadata_fields_success() -> None:
     }
     assert field_errors == {}
 
-@pytest.mark.asyncio
-async def test_extract_job_metadata_fields_element_missing() -> None:
-    mock_page = MagicMock()
-    mock_page.query_selector = AsyncMock(return_value=None)
-
+def test_extract_job_metadata_fields_element_missing() -> None:
     job_metadata_fields = {"location": ["job-detail-location"]}
 
-    results, field_errors = await extract_job_metadata_fields(mock_page, job_metadata_fields)
+    results, field_errors = extract_job_metadata_fields({"fields": {}, "fieldErrors": {}}, job_metadata_fields)
 
     assert results == {"location": ""}
     assert field_errors == {"location": "Element not found"}
 
-@pytest.mark.asyncio
-async def test_extract_job_metadata_fields_with_exception() -> None:
-    mock_page = MagicMock()
-    mock_page.query_selector = AsyncMock(side_effect=Exception("TimeoutError"))
-
+def test_extract_job_metadata_fields_with_exception() -> None:
+    page_data = {"fields": {}, "fieldErrors": {"location": "TimeoutError"}}
     job_metadata_fields = {"location": ["job-detail-location"]}
 
-    results, field_errors = await extract_job_metadata_fields(mock_page, job_metadata_fields)
+    results, field_errors = extract_job_metadata_fields(page_data, job_metadata_fields)
 
     assert results == {"location": ""}
     assert "TimeoutError" in field_errors["location"]
 
-@pytest.mark.asyncio
-async def test_extract_job_metadata_fields_fallback_to_second_selector() -> None:
-    mock_page = MagicMock()
-
-    mock_elem = MagicMock()
-    mock_elem.inner_text = AsyncMock(return_value="Add expected salary to your profile for insights")
-    mock_page.query_selector = AsyncMock(side_effect=[None, mock_elem])
-
+def test_extract_job_metadata_fields_fallback_selector_clears_earlier_error() -> None:
+    # The script records an error for the first selector but still finds the field with the fallback
+    page_data = {
+        "fields": {"salary": "Add expected salary to your profile for insights"},
+        "fieldErrors": {"salary": "SyntaxError"}
+    }
     job_metadata_fields = {"salary": ["job-detail-salary", "job-detail-add-expected-salary"]}
 
-    results, field_errors = await extract_job_metadata_fields(mock_page, job_metadata_fields)
+    results, field_errors = extract_job_metadata_fields(page_data, job_metadata_fields)
 
     assert results == {"salary": "Add expected salary to your profile for insights"}
     assert field_errors == {}
 
-@pytest.mark.asyncio
 @patch("jobs.extractor.get_posted_date", return_value="05/05/2024")
-async def test_extract_posted_date_by_class_with_days(mock_get_posted_date: MagicMock) -> None:
-    mock_elem = AsyncMock()
-    mock_elem.inner_text = AsyncMock(return_value="Posted 3d ago")
-    page = MagicMock()
-    page.query_selector_all = AsyncMock(return_value=[mock_elem])
-
-    result = await extract_posted_date_by_class(page, "posted_date")
+def test_extract_posted_date_by_class_with_days(mock_get_posted_date: MagicMock) -> None:
+    result = extract_posted_date_by_class({"postedDateTexts": ["Posted 3d ago"]})
     assert result == {"posted_date": "05/05/2024", "error" : None}
     mock_get_posted_date.assert_called_once_with(3)
 
-@pytest.mark.asyncio
 @patch("jobs.extractor.get_posted_date", return_value="04/04/2024")
-async def test_extract_posted_date_by_class_with_hours(mock_get_posted_date: MagicMock) -> None:
-    mock_elem = AsyncMock()
-    mock_elem.inner_text = AsyncMock(return_value="Posted 5h ago")
-    page = MagicMock()
-    page.query_selector_all = AsyncMock(return_value=[mock_elem])
-
-    result = await extract_posted_date_by_class(page, "posted_date")
+def test_extract_posted_date_by_class_with_hours(mock_get_posted_date: MagicMock) -> None:
+    result = extract_posted_date_by_class({"postedDateTexts": ["Posted 5h ago"]})
     assert result == {"posted_date": "04/04/2024", "error" : None}
     mock_get_posted_date.assert_called_once_with(0)
 
-@pytest.mark.asyncio
 @patch("jobs.extractor.get_posted_date", return_value="03/03/2024")
-async def test_extract_posted_date_by_class_with_minutes(mock_get_posted_date: MagicMock) -> None:
-    mock_elem = AsyncMock()
-    mock_elem.inner_text = AsyncMock(return_value="Posted 42m ago")
-    page = MagicMock()
-    page.query_selector_all = AsyncMock(return_value=[mock_elem])
-
-    result = await extract_posted_date_by_class(page, "posted_date")
+def test_extract_posted_date_by_class_with_minutes(mock_get_posted_date: MagicMock) -> None:
+    result = extract_posted_date_by_class({"postedDateTexts": ["Sydney NSW", "Posted 42m ago"]})
     assert result == {"posted_date": "03/03/2024", "error" : None}
     mock_get_posted_date.assert_called_once_with(0)
 
-@pytest.mark.asyncio
-async def test_extract_posted_date_by_class_no_elements_found() -> None:
-    page = MagicMock()
-    page.query_selector_all = AsyncMock(return_value=[])
-
-    result = await extract_posted_date_by_class(page, "posted_date")
+def test_extract_posted_date_by_class_no_elements_found() -> None:
+    result = extract_posted_date_by_class({"postedDateTexts": []})
     assert result == {"posted_date": None, "error": NO_ELEMENTS}
 
-@pytest.mark.asyncio
-async def test_extract_posted_date_by_class_no_matching_text() -> None:
-    mock_elem = AsyncMock()
-    mock_elem.inner_text = AsyncMock(return_value="Updated yesterday")
-    page = MagicMock()
-    page.query_selector_all = AsyncMock(return_value=[mock_elem])
-
-    result = await extract_posted_date_by_class(page, "posted-time")
+def test_extract_posted_date_by_class_no_matching_text() -> None:
+    result = extract_posted_date_by_class({"postedDateTexts": ["Updated yesterday"]})
     assert result == {"posted_date": None, "error": NO_MATCHING_TEXT}
 
-@pytest.mark.asyncio
-async def test_extract_posted_date_by_class_raises_exception() -> None:
-    page = MagicMock()
-    page.query_selector_all = AsyncMock(side_effect=RuntimeError("Something went wrong"))
-
+def test_extract_posted_date_by_class_raises_exception() -> None:
     with pytest.raises(RuntimeError, match="Something went wrong"):
-        await extract_posted_date_by_class(page, "posted_date")
+        extract_posted_date_by_class({"postedDateError": "Something went wrong"})
 
-@pytest.mark.asyncio
-@patch("jobs.extractor.extract_logo_src", new_callable=AsyncMock)
-async def test_safe_extract_logo_src_success(mock_extract_logo_src: AsyncMock) -> None:
+@patch("jobs.extractor.extract_logo_src")
+def test_safe_extract_logo_src_success(mock_extract_logo_src: MagicMock) -> None:
     mock_extract_logo_src.return_value = "https://seek.com.au/logo.png"
 
-    result = await safe_extract_logo_src(page=MagicMock(), job_url="https://seek.com.au/job/123")
+    result = safe_extract_logo_src(page_data={}, job_url="https://seek.com.au/job/123")
 
     assert result == "https://seek.com.au/logo.png"
-    mock_extract_logo_src.assert_awaited_once()
+    mock_extract_logo_src.assert_called_once()
 
-@pytest.mark.asyncio
-@patch("jobs.extractor.extract_logo_src", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_logo_src")
 @patch("sentry_sdk.capture_exception")
 @patch("sentry_sdk.push_scope")
-async def test_safe_extract_logo_src_handles_exception(
+def test_safe_extract_logo_src_handles_exception(
     mock_push_scope: MagicMock,
     mock_capture_exception: MagicMock,
-    mock_extract_logo_src: AsyncMock,
+    mock_extract_logo_src: MagicMock,
 ) -> None:
     mock_extract_logo_src.side_effect = RuntimeError("logo failed")
     mock_scope_instance = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = mock_scope_instance
 
-    result = await safe_extract_logo_src(page=MagicMock(), job_url="https://seek.com.au/job/456")
+    result = safe_extract_logo_src(page_data={}, job_url="https://seek.com.au/job/456")
 
     assert result == ""
-    mock_extract_logo_src.assert_awaited_once()
+    mock_extract_logo_src.assert_called_once()
     mock_scope_instance.set_tag.assert_called_with("component", "extract_logo_src")
     mock_scope_instance.set_extra.assert_called_with("job_url", "https://seek.com.au/job/456")
     mock_capture_exception.assert_called_once()
 
-@pytest.mark.asyncio
-@patch("jobs.extractor.extract_job_metadata_fields", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_job_metadata_fields")
 @patch("sentry_sdk.capture_message")
 @patch("sentry_sdk.push_scope")
-async def test_safe_extract_job_metadata_fields_with_field_errors(
-    mock_push_scope: MagicMock, mock_capture_message: MagicMock, mock_extract_metadata: AsyncMock
+def test_safe_extract_job_metadata_fields_with_field_errors(
+    mock_push_scope: MagicMock, mock_capture_message: MagicMock, mock_extract_metadata: MagicMock
 ) -> None:
     mock_extract_metadata.return_value = (
         {"location": "", "company": "Google"},
@@ -221,11 +169,11 @@ async def test_safe_extract_job_metadata_fields_with_field_errors(
     mock_push_scope.return_value.__enter__.return_value = mock_scope_instance
 
     fields = {"location": ["job-detail-location"], "company": ["advertiser-name"]}
-    result = await safe_extract_job_metadata_fields(MagicMock(), fields, "https://seek.com.au/job/123")
+    result = safe_extract_job_metadata_fields({}, fields, "https://seek.com.au/job/123")
 
     assert result == {"location": "", "company": "Google"}
 
-    mock_extract_metadata.assert_awaited_once()
+    mock_extract_metadata.assert_called_once()
     mock_capture_message.assert_called_once_with(
         "Job metadata extraction issue for field 'location': Element not found",
         level="error"
@@ -235,69 +183,65 @@ async def test_safe_extract_job_metadata_fields_with_field_errors(
     mock_scope_instance.set_extra.assert_any_call("field", "location")
     mock_scope_instance.set_extra.assert_any_call("error_detail", "Element not found")
 
-@pytest.mark.asyncio
-@patch("jobs.extractor.extract_job_metadata_fields", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_job_metadata_fields")
 @patch("sentry_sdk.capture_exception")
 @patch("sentry_sdk.push_scope")
-async def test_safe_extract_job_metadata_fields_raises_exception(
-    mock_push_scope: MagicMock, mock_capture_exception: MagicMock, mock_extract_metadata: AsyncMock
+def test_safe_extract_job_metadata_fields_raises_exception(
+    mock_push_scope: MagicMock, mock_capture_exception: MagicMock, mock_extract_metadata: MagicMock
 ) -> None:
     mock_extract_metadata.side_effect = RuntimeError("Metadata Fail")
     mock_scope_instance = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = mock_scope_instance
 
-    result = await safe_extract_job_metadata_fields(MagicMock(), {}, "https://seek.com.au/job/456")
+    result = safe_extract_job_metadata_fields({}, {}, "https://seek.com.au/job/456")
 
     assert result == {}
-    mock_extract_metadata.assert_awaited_once()
+    mock_extract_metadata.assert_called_once()
     mock_capture_exception.assert_called_once()
     mock_scope_instance.set_tag.assert_called_with("component", "extract_job_metadata_fields")
     mock_scope_instance.set_extra.assert_called_with("job_url", "https://seek.com.au/job/456")
 
-@pytest.mark.asyncio
-@patch("jobs.extractor.extract_job_metadata_fields", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_job_metadata_fields")
 @patch("sentry_sdk.capture_message")
 @patch("sentry_sdk.push_scope")
-async def test_safe_extract_job_metadata_fields_no_errors(
-    mock_push_scope: MagicMock, mock_capture_message: MagicMock, mock_extract_metadata: AsyncMock
+def test_safe_extract_job_metadata_fields_no_errors(
+    mock_push_scope: MagicMock, mock_capture_message: MagicMock, mock_extract_metadata: MagicMock
 ) -> None:
     mock_extract_metadata.return_value = (
         {"location": "Sydney", "company": "Google"},
         {}
     )
 
-    result = await safe_extract_job_metadata_fields(MagicMock(), {
+    result = safe_extract_job_metadata_fields({}, {
         "location": ["job-detail-location"],
         "company": ["advertiser-name"]
     }, "https://seek.com.au/job/789")
 
     assert result == {"location": "Sydney", "company": "Google"}
-    mock_extract_metadata.assert_awaited_once()
+    mock_extract_metadata.assert_called_once()
     mock_capture_message.assert_not_called()
     mock_push_scope.assert_not_called()
 
-@pytest.mark.asyncio
-@patch("jobs.extractor.extract_posted_date_by_class", new_callable=AsyncMock)
-async def test_safe_extract_posted_date_by_class_success(mock_extract_posted_date: AsyncMock) -> None:
+@patch("jobs.extractor.extract_posted_date_by_class")
+def test_safe_extract_posted_date_by_class_success(mock_extract_posted_date: MagicMock) -> None:
     mock_extract_posted_date.return_value = {"posted_date": "06/01/2024", "error": None}
 
-    result = await safe_extract_posted_date_by_class(MagicMock(), "posted_date", "https://seek.com.au/job/123")
+    result = safe_extract_posted_date_by_class({}, "https://seek.com.au/job/123")
 
     assert result == "06/01/2024"
-    mock_extract_posted_date.assert_awaited_once()
+    mock_extract_posted_date.assert_called_once()
 
-@pytest.mark.asyncio
 @patch("sentry_sdk.push_scope")
-@patch("jobs.extractor.extract_posted_date_by_class", new_callable=AsyncMock)
-async def test_safe_extract_posted_date_by_class_no_elements(
-    mock_extract_posted_date: AsyncMock,
+@patch("jobs.extractor.extract_posted_date_by_class")
+def test_safe_extract_posted_date_by_class_no_elements(
+    mock_extract_posted_date: MagicMock,
     mock_push_scope: MagicMock
 ) -> None:
     mock_extract_posted_date.return_value = {"posted_date": None, "error": NO_ELEMENTS}
     mock_scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = mock_scope
 
-    result = await safe_extract_posted_date_by_class(MagicMock(), "posted_date", "https://seek.com.au/job/456")
+    result = safe_extract_posted_date_by_class({}, "https://seek.com.au/job/456")
 
     assert result is None
     mock_scope.set_tag.assert_called_with("component", "extract_posted_date_by_class")
@@ -307,18 +251,17 @@ async def test_safe_extract_posted_date_by_class_no_elements(
         level="error"
     )
 
-@pytest.mark.asyncio
 @patch("sentry_sdk.push_scope")
-@patch("jobs.extractor.extract_posted_date_by_class", new_callable=AsyncMock)
-async def test_safe_extract_posted_date_by_class_no_matching_text(
-    mock_extract_posted_date: AsyncMock,
+@patch("jobs.extractor.extract_posted_date_by_class")
+def test_safe_extract_posted_date_by_class_no_matching_text(
+    mock_extract_posted_date: MagicMock,
     mock_push_scope: MagicMock
 ) -> None:
     mock_extract_posted_date.return_value = {"posted_date": None, "error": NO_MATCHING_TEXT}
     mock_scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = mock_scope
 
-    result = await safe_extract_posted_date_by_class(MagicMock(), "posted_date", "https://seek.com.au/job/789")
+    result = safe_extract_posted_date_by_class({}, "https://seek.com.au/job/789")
 
     assert result is None
     mock_scope.set_tag.assert_called_with("component", "extract_posted_date_by_class")
@@ -328,18 +271,17 @@ async def test_safe_extract_posted_date_by_class_no_matching_text(
         level="error"
     )
 
-@pytest.mark.asyncio
 @patch("sentry_sdk.capture_exception")
 @patch("sentry_sdk.push_scope")
-@patch("jobs.extractor.extract_posted_date_by_class", new_callable=AsyncMock)
-async def test_safe_extract_posted_date_by_class_raises_exception(
-    mock_extract_posted_date: AsyncMock, mock_push_scope: MagicMock, mock_capture_exception: MagicMock
+@patch("jobs.extractor.extract_posted_date_by_class")
+def test_safe_extract_posted_date_by_class_raises_exception(
+    mock_extract_posted_date: MagicMock, mock_push_scope: MagicMock, mock_capture_exception: MagicMock
 ) -> None:
     mock_extract_posted_date.side_effect = RuntimeError("Unexpected failure")
     mock_scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = mock_scope
 
-    result = await safe_extract_posted_date_by_class(MagicMock(), "posted_date", "https://seek.com.au/job/000")
+    result = safe_extract_posted_date_by_class({}, "https://seek.com.au/job/000")
 
     assert result is None
     mock_capture_exception.assert_called_once()
@@ -347,59 +289,62 @@ async def test_safe_extract_posted_date_by_class_raises_exception(
     mock_scope.set_extra.assert_called_with("job_url", "https://seek.com.au/job/000")
 
 @pytest.mark.asyncio
-@patch("jobs.extractor.safe_extract_logo_src", new_callable=AsyncMock)
-@patch("jobs.extractor.safe_extract_job_metadata_fields", new_callable=AsyncMock)
-@patch("jobs.extractor.safe_extract_posted_date_by_class", new_callable=AsyncMock)
-async def test_extract_metadata_from_page_success(
-    mock_posted_date: AsyncMock, mock_metadata_fields: AsyncMock, mock_logo_src: AsyncMock
+@patch("jobs.extractor.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("jobs.extractor.get_posted_date", return_value="05/05/2024")
+async def test_extract_metadata_from_page_single_evaluate(
+    mock_get_posted_date: MagicMock, # noqa: ARG001
+    mock_backoff: AsyncMock # noqa: ARG001
 ) -> None:
     page = MagicMock()
+    page.evaluate = AsyncMock(return_value={
+        "fields": {"salary": "$100k - $120k", "location": "Sydney"},
+        "fieldErrors": {},
+        "logoSrc": "https://logo.url/logo.png",
+        "logoError": None,
+        "postedDateTexts": ["Posted 2d ago"],
+        "postedDateError": None,
+    })
     job_url = "https://seek.com.au/job/123"
-    fields = {"salary": ["job-detail-salary"]}
-
-    mock_logo_src.return_value = "https://logo.url/logo.png"
-    mock_metadata_fields.return_value = {"salary": "$100k - $120k"}
-    mock_posted_date.return_value = "05/05/2024"
+    fields = {"salary": ["job-detail-salary"], "location": ["job-detail-location"]}
 
     result = await extract_metadata_from_page(page, job_url, fields)
 
     assert result == {
         "logo_src": "https://logo.url/logo.png",
         "posted_date": "05/05/2024",
-        "salary": "$100k - $120k"
+        "salary": "$100k - $120k",
+        "location": "Sydney",
     }
-
-    mock_logo_src.assert_awaited_once_with(page, job_url)
-    mock_metadata_fields.assert_awaited_once_with(page, fields, job_url)
-    mock_posted_date.assert_awaited_once_with(page, POSTED_DATE_SELECTOR, job_url)
+    page.evaluate.assert_awaited_once_with(EXTRACT_METADATA_SCRIPT, {
+        "fields": fields,
+        "logoSelector": LOGO_SELECTOR,
+        "postedDateSelector": get_posted_date_selector(POSTED_DATE_SELECTOR),
+    })
 
 @pytest.mark.asyncio
-@patch("jobs.extractor.safe_extract_logo_src", new_callable=AsyncMock)
-@patch("jobs.extractor.safe_extract_job_metadata_fields", new_callable=AsyncMock)
-@patch("jobs.extractor.safe_extract_posted_date_by_class", new_callable=AsyncMock)
-async def test_extract_metadata_multiple_from_page_success(
-    mock_posted_date: AsyncMock, mock_metadata_fields: AsyncMock, mock_logo_src: AsyncMock
+@patch("jobs.extractor.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("sentry_sdk.capture_exception")
+@patch("sentry_sdk.capture_message")
+async def test_extract_metadata_from_page_evaluate_failure(
+    mock_capture_message: MagicMock,
+    mock_capture_exception: MagicMock,
+    mock_backoff: AsyncMock # noqa: ARG001
 ) -> None:
     page = MagicMock()
-    job_url = "https://seek.com.au/job/123"
+    page.evaluate = AsyncMock(side_effect=RuntimeError("Target closed"))
     fields = {"salary": ["job-detail-salary"]}
 
-    mock_logo_src.return_value = "https://logo.url/logo.png"
-    mock_metadata_fields.return_value = {"salary": "$100k - $120k", "location": "Sydney"}
-    mock_posted_date.return_value = "05/05/2024"
+    result = await extract_metadata_from_page(page, "https://seek.com.au/job/123", fields)
 
-    result = await extract_metadata_from_page(page, job_url, fields)
-
-    assert result == {
-        "logo_src": "https://logo.url/logo.png",
-        "posted_date": "05/05/2024",
-        "salary": "$100k - $120k",
-        "location": "Sydney",
-    }
+    assert result == {"logo_src": "", "posted_date": None, "salary": ""}
+    mock_capture_message.assert_called_once_with(
+        "Job metadata extraction issue for field 'salary': RuntimeError: Target closed",
+        level="error"
+    )
+    assert mock_capture_exception.call_count == 2  # noqa: PLR2004
 
-    mock_logo_src.assert_awaited_once_with(page, job_url)
-    mock_metadata_fields.assert_awaited_once_with(page, fields, job_url)
-    mock_posted_date.assert_awaited_once_with(page, POSTED_DATE_SELECTOR, job_url)
+def test_get_posted_date_selector() -> None:
+    assert get_posted_date_selector("a b c") == "span.a.b.c"
 
 
 @pytest.mark.asyncio
@@ -412,6 +357,7 @@ async def test_extract_job_metadata_success(
     job_url = "https://seek.com.au/job/1"
     job_metadata_fields = {"title": ["job-title"]}
     mock_page = MagicMock()
+    mock_page.content = AsyncMock(return_value="<html>job</html>")
 
     page_pool = MagicMock()
     page_pool.acquire = AsyncMock(return_value=mock_page)
@@ -423,13 +369,16 @@ async def test_extract_job_metadata_success(
         "title": "Senior Engineer"
     }
 
-    result = await extract_job_metadata(job_url, job_metadata_fields, page_pool)
+    result = await extract_job_metadata(job_url, job_metadata_fields, page_pool, from_static_html=False)
 
-    assert result == {
-        "logo_src": "https://logo.png",
-        "posted_date": "05/05/2024",
-        "title": "Senior Engineer"
-    }
+    assert result == (
+        {
+            "logo_src": "https://logo.png",
+            "posted_date": "05/05/2024",
+            "title": "Senior Engineer"
+        },
+        "<html>job</html>"
+    )
 
     mock_navigate.assert_awaited_once_with(mock_page, job_url)
     mock_extract_metadata.assert_awaited_once_with(mock_page, job_url, job_metadata_fields)
@@ -438,26 +387,111 @@ async def test_extract_job_metadata_success(
     mock_pause.assert_awaited_once()
 
 @pytest.mark.asyncio
-@patch("jobs.extractor.fetch_job_markdown", new_callable=AsyncMock)
+@patch("jobs.extractor.navigate_to_page", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_metadata_from_html", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_metadata_from_page", new_callable=AsyncMock)
+@patch("jobs.extractor.pause_briefly", new_callable=AsyncMock)
+async def test_extract_job_metadata_from_static_html(
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_extract_from_page: AsyncMock,
+    mock_extract_from_html: AsyncMock,
+    mock_navigate: AsyncMock # noqa: ARG001
+) -> None:
+    job_url = "https://seek.com.au/job/1"
+    fields = {"title": ["job-title"]}
+    mock_page = MagicMock()
+    mock_page.content = AsyncMock(return_value="<html>job</html>")
+    mock_extract_from_html.return_value = {"logo_src": "", "posted_date": "05/05/2024", "title": "Engineer"}
+
+    released_before_parse = []
+    page_pool = MagicMock()
+    page_pool.acquire = AsyncMock(return_value=mock_page)
+    page_pool.release = AsyncMock(side_effect=lambda _page: released_before_parse.append(
+        not mock_extract_from_html.await_count
+    ))
+
+    result = await extract_job_metadata(job_url, fields, page_pool, from_static_html=True)
+
+    assert result == ({"logo_src": "", "posted_date": "05/05/2024", "title": "Engineer"}, "<html>job</html>")
+    mock_extract_from_html.assert_awaited_once_with("<html>job</html>", job_url, fields)
+    mock_extract_from_page.assert_not_awaited()
+    assert released_before_parse == [True]
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.navigate_to_page", new_callable=AsyncMock)
+@patch("jobs.extractor.pause_briefly", new_callable=AsyncMock)
+async def test_extract_job_metadata_releases_page_when_cancelled(
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_navigate: AsyncMock
+) -> None:
+    navigating = asyncio.Event()
+
+    async def hang(_page: MagicMock, _job_url: str) -> None:
+        navigating.set()
+        await asyncio.Event().wait()
+
+    mock_navigate.side_effect = hang
+    mock_page = MagicMock()
+    page_pool = MagicMock()
+    page_pool.acquire = AsyncMock(return_value=mock_page)
+    page_pool.release = AsyncMock()
+
+    task = asyncio.create_task(extract_job_metadata("https://seek.com.au/job/1", {"title": ["job-title"]}, page_pool))
+    await navigating.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    page_pool.release.assert_awaited_once_with(mock_page)
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.navigate_to_page", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_metadata_from_page", new_callable=AsyncMock)
+@patch("jobs.extractor.pause_briefly", new_callable=AsyncMock)
+async def test_extract_job_metadata_navigation_failed(
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_extract_metadata: AsyncMock,
+    mock_navigate: AsyncMock
+) -> None:
+    mock_navigate.return_value = None
+    mock_page = MagicMock()
+    mock_page.content = AsyncMock()
+
+    page_pool = MagicMock()
+    page_pool.acquire = AsyncMock(return_value=mock_page)
+    page_pool.release = AsyncMock()
+
+    result = await extract_job_metadata("https://seek.com.au/job/1", {"title": ["job-title"]}, page_pool)
+
+    assert result == ({}, None)
+    mock_extract_metadata.assert_not_awaited()
+    mock_page.content.assert_not_awaited()
+    page_pool.release.assert_awaited_once_with(mock_page)
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.render_job_markdown", new_callable=AsyncMock)
 @patch("jobs.extractor.extract_job_metadata", new_callable=AsyncMock)
 @patch("jobs.extractor.pause_briefly", new_callable=AsyncMock)
 async def test_scrape_job_details_success(
-    mock_pause: AsyncMock, mock_extract_metadata: AsyncMock, mock_fetch_markdown: AsyncMock
+    mock_pause: AsyncMock, mock_extract_metadata: AsyncMock, mock_render_markdown: AsyncMock
 ) -> None:
     job_url = "https://seek.com.au/job/123"
     crawler = MagicMock()
     page_pool = MagicMock()
 
-    mock_fetch_markdown.return_value = "## Job Description\n- Do stuff"
-    mock_extract_metadata.return_value = {
-        "logo_src": "https://logo.png",
-        "posted_date": "06/06/2024",
-        "salary": "$100k",
-    }
+    mock_render_markdown.return_value = "## Job Description\n- Do stuff"
+    mock_extract_metadata.return_value = (
+        {
+            "logo_src": "https://logo.png",
+            "posted_date": "06/06/2024",
+            "salary": "$100k",
+        },
+        "<html>job</html>"
+    )
 
     result = await scrape_job_details(job_url, crawler, page_pool)
 
-    mock_fetch_markdown.assert_awaited_once_with(job_url, crawler)
+    mock_render_markdown.assert_awaited_once_with(job_url, "<html>job</html>", crawler)
     mock_extract_metadata.assert_awaited_once_with(job_url, JOB_METADATA_FIELDS, page_pool)
     mock_pause.assert_awaited_once_with(0.05, 0.25)
 
@@ -470,6 +504,22 @@ async def test_scrape_job_details_success(
         }
     )
 
+@pytest.mark.asyncio
+@patch("jobs.extractor.render_job_markdown", new_callable=AsyncMock)
+@patch("jobs.extractor.extract_job_metadata", new_callable=AsyncMock)
+@patch("jobs.extractor.pause_briefly", new_callable=AsyncMock)
+async def test_scrape_job_details_navigation_failed(
+    mock_pause: AsyncMock, # noqa: ARG001
+    mock_extract_metadata: AsyncMock,
+    mock_render_markdown: AsyncMock
+) -> None:
+    mock_extract_metadata.return_value = ({}, None)
+
+    result = await scrape_job_details("https://seek.com.au/job/123", MagicMock(), MagicMock())
+
+    assert result == (None, {})
+    mock_render_markdown.assert_not_awaited()
+
 @pytest.mark.asyncio
 @patch("jobs.extractor.scrape_job_details", new_callable=AsyncMock)
 @patch("jobs.extractor.is_recent_job", new_callable=MagicMock)
@@ -589,7 +639,6 @@ async def test_extract_job_data_not_recent(mock_scrape: AsyncMock) -> None:
             "salary": "$100k"
         }
     }
-    ctx.terminate_event.set.assert_called_once()
 
 @patch("jobs.extractor.is_recent_job", return_value=True)
 @patch("jobs.extractor.scrape_job_details", new_callable=AsyncMock)
@@ -637,3 +686,121 @@ async def test_extract_job_data_parsing_failed(
 
 
 
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.scrape_job_details", new_callable=AsyncMock)
+@patch("jobs.extractor.is_recent_job", return_value=True)
+@patch("jobs.extractor.parse_job_data_from_markdown", new_callable=AsyncMock)
+async def test_extract_job_data_reuses_unchanged_stored_job(
+    mock_parse: AsyncMock,
+    mock_is_recent: MagicMock, # noqa: ARG001
+    mock_scrape: AsyncMock
+) -> None:
+    job_url = "https://www.seek.com.au/job/123"
+    mock_scrape.return_value = ("## Markdown", {"logo_src": "", "posted_date": "05/05/2024"})
+
+    with SeenJobStore(":memory:") as job_store:
+        job_store.stage_content_hash(job_url, hash_job_content("## Markdown"))
+        job_store.save_jobs([{"job_url": job_url, "title": "Engineer"}])
+        ctx = ScrapeContext(
+            crawler=AsyncMock(),
+            page_pool=AsyncMock(),
+            location_search="Sydney",
+            terminate_event=MagicMock(),
+            semaphore=asyncio.Semaphore(1),
+            day_range_limit=7,
+            job_store=job_store
+        )
+
+        result = await extract_job_data(job_url, ctx, 1)
+
+    assert result["status"] == SUCCESS
+    assert result["job"] == {"job_url": job_url, "title": "Engineer"}
+    assert job_store.stats() == {"reused": 1, "parsed": 1}
+    mock_parse.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.scrape_job_details", new_callable=AsyncMock)
+@patch("jobs.extractor.is_recent_job", return_value=True)
+@patch("jobs.extractor.parse_job_data_from_markdown", new_callable=AsyncMock)
+async def test_extract_job_data_reparses_changed_stored_job(
+    mock_parse: AsyncMock,
+    mock_is_recent: MagicMock, # noqa: ARG001
+    mock_scrape: AsyncMock
+) -> None:
+    job_url = "https://www.seek.com.au/job/123"
+    mock_scrape.return_value = ("## Updated markdown", {"logo_src": "", "posted_date": "05/05/2024"})
+    mock_parse.return_value = {"title": "Senior Engineer"}
+
+    with SeenJobStore(":memory:") as job_store:
+        job_store.stage_content_hash(job_url, hash_job_content("## Markdown"))
+        job_store.save_jobs([{"job_url": job_url, "title": "Engineer"}])
+        ctx = ScrapeContext(
+            crawler=AsyncMock(),
+            page_pool=AsyncMock(),
+            location_search="Sydney",
+            terminate_event=MagicMock(),
+            semaphore=asyncio.Semaphore(1),
+            day_range_limit=7,
+            job_store=job_store
+        )
+
+        result = await extract_job_data(job_url, ctx, 1)
+
+    assert result["job"] == {"title": "Senior Engineer"}
+    assert job_store.pending_hashes == {"123": hash_job_content("## Updated markdown")}
+    mock_parse.assert_awaited_once_with("## Updated markdown", 1)
+
+def make_http_ctx() -> ScrapeContext:
+    return ScrapeContext(
+        crawler=None,
+        page_pool=None,
+        location_search="Sydney",
+        terminate_event=MagicMock(),
+        semaphore=asyncio.Semaphore(1),
+        day_range_limit=7,
+        http_client=MagicMock(),
+        browser_fallback=MagicMock(lease=AsyncMock()),
+    )
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.extract_metadata_from_html", new_callable=AsyncMock)
+@patch("jobs.extractor.fetch_job_page_over_http", new_callable=AsyncMock)
+async def test_scrape_job_details_over_http(mock_fetch_page: AsyncMock, mock_extract_metadata: AsyncMock) -> None:
+    mock_fetch_page.return_value = ("## Markdown", "<html></html>")
+    mock_extract_metadata.return_value = {"title": "Engineer"}
+
+    result = await scrape_job_details_over_http("url", MagicMock())
+
+    assert result == ("## Markdown", {"title": "Engineer"})
+    mock_extract_metadata.assert_awaited_once_with("<html></html>", "url", JOB_METADATA_FIELDS)
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.scrape_job_details", new_callable=AsyncMock)
+@patch("jobs.extractor.scrape_job_details_over_http", new_callable=AsyncMock)
+async def test_fetch_job_details_over_http_skips_browser(mock_over_http: AsyncMock, mock_scrape: AsyncMock) -> None:
+    mock_over_http.return_value = ("## Markdown", {"title": "Engineer"})
+    ctx = make_http_ctx()
+
+    result = await fetch_job_details("url", ctx)
+
+    assert result == ("## Markdown", {"title": "Engineer"})
+    mock_scrape.assert_not_awaited()
+    ctx.browser_fallback.lease.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.scrape_job_details", new_callable=AsyncMock)
+@patch("jobs.extractor.scrape_job_details_over_http", new_callable=AsyncMock)
+async def test_fetch_job_details_falls_back_to_browser(mock_over_http: AsyncMock, mock_scrape: AsyncMock) -> None:
+    mock_over_http.return_value = None
+    mock_scrape.return_value = ("## Markdown", {"title": "Engineer"})
+    ctx = make_http_ctx()
+    resources = MagicMock()
+    ctx.browser_fallback.lease.return_value = resources
+
+    with patch("jobs.extractor.http_fetch_stats", HttpFetchStats()) as stats:
+        result = await fetch_job_details("url", ctx)
+
+    assert result == ("## Markdown", {"title": "Engineer"})
+    mock_scrape.assert_awaited_once_with("url", resources.crawler, resources.page_pool)
+    assert stats.fallbacks == 1
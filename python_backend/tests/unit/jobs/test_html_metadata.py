@@ -0,0 +1,93 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from jobs.extractor import extract_metadata_from_html, get_posted_date_selector
+from jobs.html_metadata import collect_page_data_from_html
+from utils.constants import JOB_METADATA_FIELDS, LOGO_SELECTOR, POSTED_DATE_SELECTOR
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def load_fixture(name: str) -> str:
+    return (DATA_DIR / name).read_text(encoding="utf-8")
+
+def collect(html: str) -> dict:
+    return collect_page_data_from_html(
+        html, JOB_METADATA_FIELDS, LOGO_SELECTOR, get_posted_date_selector(POSTED_DATE_SELECTOR)
+    )
+
+def test_collect_page_data_from_full_fixture() -> None:
+    page_data = collect(load_fixture("sample_job_page.html"))
+
+    assert page_data["fields"] == {
+        "location": "Sydney NSW",
+        "classification": "Developers/Programmers (Information & Communication Technology)",
+        "work_type": "Full time",
+        "salary": "Add expected salary to your profile for insights",
+        "title": "Senior Backend Software Engineer (Java) - User Product (Remote across ANZ)",
+        "company": "Canva",
+    }
+    assert page_data["fieldErrors"] == {}
+    assert page_data["logoSrc"].startswith("https://image-service-cdn.seek.com.au/")
+    assert page_data["postedDateTexts"] == ["Be an early applicant", "Posted 3h ago"]
+
+def test_collect_page_data_from_fixture_with_missing_sections() -> None:
+    page_data = collect(load_fixture("sample_job_page_missing_fields.html"))
+
+    assert "work_type" not in page_data["fields"]
+    assert page_data["fields"]["salary"] == "$75,000 \u2013 $85,000 per year + super"
+    assert page_data["logoSrc"] is None
+    assert page_data["postedDateTexts"] == []
+
+def test_collect_page_data_from_empty_html() -> None:
+    page_data = collect("")
+
+    assert page_data["fields"] == {}
+    assert set(page_data["fieldErrors"]) == set(JOB_METADATA_FIELDS)
+    assert page_data["logoError"]
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("jobs.extractor.get_posted_date", return_value="05/05/2024")
+async def test_extract_metadata_from_html_matches_page_extractor_shape(
+    mock_get_posted_date: MagicMock,
+    mock_backoff: AsyncMock # noqa: ARG001
+) -> None:
+    result = await extract_metadata_from_html(
+        load_fixture("sample_job_page.html"), "https://seek.com.au/job/84110000", JOB_METADATA_FIELDS
+    )
+
+    assert result["posted_date"] == "05/05/2024"
+    assert result["company"] == "Canva"
+    assert result["work_type"] == "Full time"
+    assert result["logo_src"].startswith("https://image-service-cdn.seek.com.au/")
+    mock_get_posted_date.assert_called_once_with(0)
+
+@pytest.mark.asyncio
+@patch("jobs.extractor.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("sentry_sdk.capture_message")
+@patch("sentry_sdk.push_scope")
+async def test_extract_metadata_from_html_reports_missing_sections(
+    mock_push_scope: MagicMock,
+    mock_capture_message: MagicMock,
+    mock_backoff: AsyncMock # noqa: ARG001
+) -> None:
+    scope = MagicMock()
+    mock_push_scope.return_value.__enter__.return_value = scope
+
+    result = await extract_metadata_from_html(
+        load_fixture("sample_job_page_missing_fields.html"), "https://seek.com.au/job/1", JOB_METADATA_FIELDS
+    )
+
+    assert result["work_type"] == ""
+    assert result["logo_src"] == ""
+    assert result["posted_date"] is None
+    mock_capture_message.assert_called_once_with(
+        "Job metadata extraction issue for field 'work_type': Element not found",
+        level="error"
+    )
+    scope.capture_message.assert_called_once_with(
+        "Posted date extraction warning: 'posted_date' selector broke - no elements found",
+        level="error"
+    )
@@ -1,8 +1,16 @@
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
-from jobs.parser import clean_repair_parse_json, parse_job_data_from_markdown, parse_json_block_from_text
+from jobs.parser import (
+    clean_repair_parse_json,
+    find_json_blocks,
+    is_cacheable_job_posting,
+    parse_job_data_from_markdown,
+    parse_json_block_from_text,
+    parse_structured_job_posting,
+)
+from llm.schema import build_job_posting_schema
 from tests.data.sample_job_json_strings import MALFORMED_JSON_STRING, VALID_JSON_STRING
 
 repaired_dict = {
@@ -103,6 +111,45 @@ def test_parse_json_block_from_text_invalid_json() -> None:
     assert isinstance(result, dict)
     assert result != {}
 
+@patch("jobs.parser.clean_repair_parse_json")
+def test_parse_json_block_from_text_nested_object_skips_repair(mock_clean_repair: MagicMock) -> None:
+    response = 'Here you go: {"work_model": "Remote", "salary": {"min": 100, "max": 120}, "other": ["a}b"]} Done.'
+
+    result = parse_json_block_from_text(response)
+
+    assert result == {"work_model": "Remote", "salary": {"min": 100, "max": 120}, "other": ["a}b"]}
+    mock_clean_repair.assert_not_called()
+
+def test_find_json_blocks_ignores_braces_and_escaped_quotes_in_strings() -> None:
+    response = 'x {"a": "{not a block} \\"quoted\\" {", "b": {"c": 1}} y'
+
+    top_level, nested = find_json_blocks(response)
+
+    assert top_level == ['{"a": "{not a block} \\"quoted\\" {", "b": {"c": 1}}']
+    assert nested == []
+
+def test_find_json_blocks_unwraps_prose_braces() -> None:
+    top_level, nested = find_json_blocks('{ Here is the JSON: {"work_model": "Hybrid"} }')
+
+    assert top_level == ['{ Here is the JSON: {"work_model": "Hybrid"} }']
+    assert nested == ['{"work_model": "Hybrid"}']
+
+@patch("jobs.parser.clean_repair_parse_json")
+def test_parse_json_block_from_text_closes_truncated_output(mock_clean_repair: MagicMock) -> None:
+    result = parse_json_block_from_text('{"work_model": "Remote", "other": ["Free lunch", "Gym')
+
+    assert result == {"work_model": "Remote", "other": ["Free lunch", "Gym"]}
+    mock_clean_repair.assert_not_called()
+
+@patch("jobs.parser.clean_repair_parse_json")
+def test_parse_json_block_from_text_repairs_only_as_last_resort(mock_clean_repair: MagicMock) -> None:
+    mock_clean_repair.return_value = {"work_model": "Remote"}
+
+    result = parse_json_block_from_text("{work_model: 'Remote'} and {short: 1}")
+
+    assert result == {"work_model": "Remote"}
+    mock_clean_repair.assert_called_once_with("{work_model: 'Remote'}")
+
 @patch("jobs.parser.sentry_sdk")
 def test_parse_json_block_from_text_invalid_json_logs_to_sentry(mock_sentry: MagicMock) -> None:
     response = "This is completely non-JSON text without braces or structure."
@@ -170,3 +217,86 @@ async def test_parse_job_data_from_markdown_returns_none_if_repair_fails(
     scope.set_extra.assert_called_with("input_markdown", "markdown")
     scope.capture_message.assert_called_once_with("Parsed job data is empty after JSON repair", level="warning")
 
+
+@pytest.mark.asyncio
+@patch("jobs.parser.parse_job_posting", new_callable=AsyncMock)
+async def test_parse_job_data_from_markdown_sends_trimmed_markdown(mock_parse_posting: AsyncMock) -> None:
+    job_md = "# Engineer\nBuild things.\n## Report this job advert\nBe careful"
+    mock_parse_posting.return_value = '{"work_model": "Remote"}'
+
+    result = await parse_job_data_from_markdown(job_md, 1)
+
+    assert result == {"work_model": "Remote"}
+    mock_parse_posting.assert_awaited_once_with(
+        "# Engineer\nBuild things.", ["responsibilities", "requirements", "other"], is_cacheable=ANY
+    )
+
+@pytest.mark.asyncio
+@patch("jobs.parser.parse_job_posting", new_callable=AsyncMock)
+async def test_parse_job_data_from_markdown_takes_sectioned_lists_verbatim(mock_parse_posting: AsyncMock) -> None:
+    job_md = (
+        "# Engineer\n"
+        "## Responsibilities\n  * Build APIs.\n  * Review code.\n"
+        "## Requirements\n  * **Python** experience.\n  * AWS.\n"
+    )
+    mock_parse_posting.return_value = '{"description": "Build things.", "work_model": "Remote", "other": []}'
+
+    result = await parse_job_data_from_markdown(job_md, 1)
+
+    assert result["responsibilities"] == ["Build APIs.", "Review code."]
+    assert result["requirements"] == ["Python experience.", "AWS."]
+    assert result["other"] == []
+    mock_parse_posting.assert_awaited_once_with(job_md.strip(), ["other"], is_cacheable=ANY)
+
+@pytest.mark.asyncio
+@patch("jobs.parser.parse_job_posting", new_callable=AsyncMock)
+async def test_parse_job_data_from_markdown_asks_llm_for_requirements_it_cannot_place(
+    mock_parse_posting: AsyncMock
+) -> None:
+    job_md = (
+        "# Engineer\n"
+        "## Responsibilities\n  * Build APIs.\n  * Review code.\n"
+        "## Personal Attributes\n  * Curious.\n  * **Python** experience.\n"
+    )
+    mock_parse_posting.return_value = '{"requirements": ["Python experience."], "other": []}'
+
+    result = await parse_job_data_from_markdown(job_md, 1)
+
+    assert result["responsibilities"] == ["Build APIs.", "Review code."]
+    assert result["requirements"] == ["Python experience."]
+    mock_parse_posting.assert_awaited_once_with(job_md.strip(), ["requirements", "other"], is_cacheable=ANY)
+
+@patch("jobs.parser.parse_json_block_from_text")
+def test_parse_structured_job_posting_accepts_schema_valid_json(mock_parse_json_block: MagicMock) -> None:
+    schema = build_job_posting_schema(["description", "work_model"])
+
+    result = parse_structured_job_posting('{"description": "Build things.", "work_model": "Hybrid"}', schema)
+
+    assert result == {"description": "Build things.", "work_model": "Hybrid"}
+    mock_parse_json_block.assert_not_called()
+
+@pytest.mark.parametrize("response", [None, 'Sure! {"description": "x"}', '{"description": "x", "work_model": 3}'])
+@patch("jobs.parser.parse_json_block_from_text")
+def test_parse_structured_job_posting_falls_back_to_repair_path(
+    mock_parse_json_block: MagicMock, response: str | None
+) -> None:
+    mock_parse_json_block.return_value = {"description": "x"}
+    schema = build_job_posting_schema(["description", "work_model"])
+
+    assert parse_structured_job_posting(response, schema) == {"description": "x"}
+    mock_parse_json_block.assert_called_once_with(response)
+
+@pytest.mark.parametrize(
+    ("response", "expected"),
+    [
+        ('{"description": "Build things.", "work_model": "Hybrid"}', True),
+        ('Sure! {"description": "Build things.", "work_model": "Hybrid"}', True),
+        ('{"description": "Build things.", "work_model": "Office"}', False),
+        ('{"description": "Build things.", work_model: "Hybrid"}', False),
+        ("No JSON here", False),
+    ],
+)
+def test_is_cacheable_job_posting_requires_a_valid_unrepaired_response(response: str, expected: bool) -> None:
+    schema = build_job_posting_schema(["description", "work_model"])
+
+    assert is_cacheable_job_posting(response, schema) is expected
@@ -0,0 +1,77 @@
+import time
+from pathlib import Path
+
+from jobs.store import SECONDS_PER_DAY, SeenJobStore, hash_job_content
+
+JOB_URL = "https://www.seek.com.au/job/84110000"
+
+
+def make_job(title: str = "Software Engineer") -> dict:
+    return {"job_url": JOB_URL, "title": title, "posted_date": "05/05/2024"}
+
+def test_save_and_get_parsed_job() -> None:
+    with SeenJobStore(":memory:") as store:
+        store.stage_content_hash(JOB_URL, hash_job_content("# Software Engineer"))
+        store.save_jobs([make_job()])
+
+        stored_job = store.get("84110000")
+
+    assert stored_job.record == make_job()
+    assert stored_job.content_hash == hash_job_content("# Software Engineer")
+    assert stored_job.last_parsed == stored_job.last_seen
+    assert store.stats() == {"reused": 0, "parsed": 1}
+
+def test_get_unknown_job_returns_none() -> None:
+    with SeenJobStore(":memory:") as store:
+        assert store.get("1") is None
+
+def test_reemitted_job_keeps_hash_and_parse_time() -> None:
+    with SeenJobStore(":memory:") as store:
+        store.stage_content_hash(JOB_URL, "abc")
+        store.save_jobs([make_job()])
+        first = store.get("84110000")
+
+        store.mark_reused()
+        store.save_jobs([make_job(title="Software Engineer II")])
+        second = store.get("84110000")
+
+    assert second.record["title"] == "Software Engineer II"
+    assert second.content_hash == "abc"
+    assert second.last_parsed == first.last_parsed
+    assert second.last_seen >= first.last_seen
+    assert store.stats() == {"reused": 1, "parsed": 1}
+
+def test_discard_pending_drops_hashes_of_unsaved_jobs() -> None:
+    with SeenJobStore(":memory:") as store:
+        store.stage_content_hash(JOB_URL, "abc")
+        store.stage_content_hash("https://www.seek.com.au/job/84110001", "def")
+        store.save_jobs([make_job()])
+
+        store.discard_pending([JOB_URL, "https://www.seek.com.au/job/84110001"])
+
+        assert store.pending_hashes == {}
+        assert store.get("84110001") is None
+
+def test_is_fresh_respects_refresh_window() -> None:
+    with SeenJobStore(":memory:", refresh_days=1) as store:
+        store.stage_content_hash(JOB_URL, "abc")
+        store.save_jobs([make_job()])
+        stored_job = store.get("84110000")
+
+        assert store.is_fresh(stored_job)
+        stored_job.last_parsed -= 2 * SECONDS_PER_DAY
+        assert not store.is_fresh(stored_job)
+
+def test_jobs_persist_and_stale_jobs_are_pruned(tmp_path: Path) -> None:
+    path = str(tmp_path / "store" / "seen_jobs.sqlite3")
+    with SeenJobStore(path) as store:
+        store.stage_content_hash(JOB_URL, "abc")
+        store.stage_content_hash("https://www.seek.com.au/job/1", "def")
+        store.save_jobs([make_job(), {"job_url": "https://www.seek.com.au/job/1", "title": "Old"}])
+        last_seen = time.time() - 60 * SECONDS_PER_DAY
+        store.conn.execute("UPDATE seen_jobs SET last_seen = ? WHERE job_id = '1'", (last_seen,))
+        store.conn.commit()
+
+    with SeenJobStore(path, retention_days=30) as store:
+        assert store.get("84110000") is not None
+        assert store.get("1") is None
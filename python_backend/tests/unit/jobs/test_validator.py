@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from unittest.mock import AsyncMock, patch
 
@@ -319,3 +320,111 @@ async def test_validate_job_unspecified_salary() -> None:
 
 
 
+
+@pytest.mark.asyncio
+@patch("jobs.validator.infer_work_model_and_experience_level", new_callable=AsyncMock)
+@patch("jobs.validator.infer_work_model", new_callable=AsyncMock)
+@patch("jobs.validator.infer_experience_level", new_callable=AsyncMock)
+async def test_validate_job_infers_both_fields_in_one_request(
+    mock_infer_exp: AsyncMock,
+    mock_infer_work_model: AsyncMock,
+    mock_infer_both: AsyncMock
+) -> None:
+    job = {
+        "title": "Software Engineer",
+        "description": "Build our platform.",
+        "responsibilities": ["Write code"],
+        "requirements": ["Python"],
+        "work_model": "Flexible",
+        "job_url": "https://www.seek.com.au/job/12345678",
+    }
+    mock_infer_both.return_value = {"work_model": "Hybrid", "experience_level": "junior"}
+
+    job_result = await validate_job(job)
+
+    assert job_result["work_model"] == "Hybrid"
+    assert job_result["experience_level"] == "junior"
+    mock_infer_both.assert_awaited_once_with(
+        "Software Engineer", "Build our platform.\nWrite code\nPython"
+    )
+    mock_infer_work_model.assert_not_awaited()
+    mock_infer_exp.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("jobs.validator.infer_work_model_and_experience_level", new_callable=AsyncMock)
+async def test_validate_job_combined_inference_falls_back(mock_infer_both: AsyncMock) -> None:
+    job = {"title": "Engineer", "job_url": "https://www.seek.com.au/job/12345678"}
+    mock_infer_both.return_value = {"work_model": None, "experience_level": None}
+
+    job_result = await validate_job(job)
+
+    assert job_result["work_model"] == "On-site"
+    assert job_result["experience_level"] == "mid_or_senior"
+
+@pytest.mark.asyncio
+@patch("jobs.validator.infer_work_model_and_experience_level", new_callable=AsyncMock)
+@patch("jobs.validator.infer_work_model", new_callable=AsyncMock)
+@patch("jobs.validator.infer_experience_level", new_callable=AsyncMock)
+async def test_validate_job_rules_skip_llm_when_confident(
+    mock_infer_exp: AsyncMock,
+    mock_infer_work_model: AsyncMock,
+    mock_infer_both: AsyncMock
+) -> None:
+    job = {
+        "title": "Graduate Engineer",
+        "description": "Join our graduate program. This is a hybrid role with 2 days in the office.",
+        "job_url": "https://www.seek.com.au/job/12345678",
+    }
+
+    job_result = await validate_job(job)
+
+    assert job_result["work_model"] == "Hybrid"
+    assert job_result["experience_level"] == "junior"
+    mock_infer_both.assert_not_awaited()
+    mock_infer_work_model.assert_not_awaited()
+    mock_infer_exp.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("jobs.validator.infer_work_model_and_experience_level", new_callable=AsyncMock)
+@patch("jobs.validator.infer_work_model", new_callable=AsyncMock)
+async def test_validate_job_rules_leave_uncertain_field_to_llm(
+    mock_infer_work_model: AsyncMock,
+    mock_infer_both: AsyncMock
+) -> None:
+    job = {
+        "title": "Junior Developer",
+        "description": "Build our platform.",
+        "job_url": "https://www.seek.com.au/job/12345678",
+    }
+    mock_infer_work_model.return_value = "Remote"
+
+    job_result = await validate_job(job)
+
+    assert job_result["work_model"] == "Remote"
+    assert job_result["experience_level"] == "junior"
+    mock_infer_work_model.assert_awaited_once()
+    mock_infer_both.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("jobs.validator.validate_job", new_callable=AsyncMock)
+async def test_validate_jobs_runs_concurrently_under_limit(mock_validate_job: AsyncMock) -> None:
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_validate(job: dict) -> dict:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {**job, "validated": True}
+
+    mock_validate_job.side_effect = slow_validate
+    page_job_data = [{"title": f"Dev {i}"} for i in range(10)]
+
+    with patch("jobs.validator.VALIDATE_JOBS_CONCURRENCY", 3):
+        job_result = await validate_jobs(page_job_data)
+
+    assert [job["title"] for job in job_result] == [job["title"] for job in page_job_data]
+    assert all(job["validated"] for job in job_result)
+    assert max_in_flight == 3 # noqa: PLR2004
@@ -0,0 +1,58 @@
+import itertools
+from pathlib import Path
+from unittest.mock import patch
+
+from llm.cache import SECONDS_PER_DAY, LLMResponseCache, make_cache_key
+
+MESSAGES = [{"role": "user", "content": "Job Posting Text:\n## Engineer"}]
+
+
+def test_cache_round_trip_counts_hits_and_misses() -> None:
+    cache = LLMResponseCache(":memory:")
+    key = make_cache_key("1", "llama3-8b-8192", MESSAGES)
+
+    assert cache.get(key) is None
+    cache.set(key, '{"description": ""}')
+
+    assert cache.get(key) == '{"description": ""}'
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+def test_cache_key_covers_prompt_version_model_and_messages() -> None:
+    key = make_cache_key("1", "llama3-8b-8192", MESSAGES)
+
+    assert key == make_cache_key("1", "llama3-8b-8192", [dict(message) for message in MESSAGES])
+    assert key != make_cache_key("2", "llama3-8b-8192", MESSAGES)
+    assert key != make_cache_key("1", "llama3-70b-8192", MESSAGES)
+    assert key != make_cache_key("1", "llama3-8b-8192", [{"role": "user", "content": "## Engineer II"}])
+
+def test_expired_entries_are_misses() -> None:
+    cache = LLMResponseCache(":memory:", ttl_days=1)
+    cache.set("key", "Remote")
+
+    with patch("llm.cache.time.time", return_value=cache.connect().execute(
+        "SELECT created_at FROM llm_responses"
+    ).fetchone()[0] + 2 * SECONDS_PER_DAY):
+        assert cache.get("key") is None
+
+    assert cache.connect().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] == 0
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    cache = LLMResponseCache(":memory:", max_entries=2)
+    with patch("llm.cache.time.time", side_effect=itertools.count(1.0)):
+        cache.set("first", "a")
+        cache.set("second", "b")
+        assert cache.get("first") == "a"
+        cache.set("third", "c")
+
+    with patch("llm.cache.time.time", return_value=100.0):
+        assert cache.get("second") is None
+        assert cache.get("first") == "a"
+        assert cache.get("third") == "c"
+
+def test_cache_survives_restart(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache" / "llm_cache.sqlite3")
+    cache = LLMResponseCache(path)
+    cache.set("key", "Hybrid")
+    cache.close()
+
+    assert LLMResponseCache(path).get("key") == "Hybrid"
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+from groq import APITimeoutError
+from llm.client import LLMClient
+from tests.stubs.llm_stub_server import LLMStubServer
+
+STUB_DELAY = 0.3
+CONCURRENT_CALLS = 3
+
+
+def make_messages(text: str) -> list:
+    return [{"role": "user", "content": text}]
+
+@pytest.mark.asyncio
+async def test_chat_completion_round_trip() -> None:
+    with LLMStubServer(reply=lambda body: body["messages"][0]["content"].upper()) as stub:
+        client = LLMClient(api_key="test", base_url=stub.base_url)
+        try:
+            completion = await client.chat_completion(make_messages("remote"), model="llama3-8b-8192")
+        finally:
+            await client.aclose()
+
+    assert completion.choices[0].message.content == "REMOTE"
+    assert stub.requests[0]["model"] == "llama3-8b-8192"
+
+@pytest.mark.asyncio
+async def test_chat_completions_overlap_up_to_in_flight_limit() -> None:
+    with LLMStubServer(delay=STUB_DELAY) as stub:
+        client = LLMClient(api_key="test", base_url=stub.base_url, max_in_flight=CONCURRENT_CALLS)
+        try:
+            started = time.perf_counter()
+            await asyncio.gather(*[
+                client.chat_completion(make_messages(f"job {i}"), model="llama3-8b-8192")
+                for i in range(CONCURRENT_CALLS)
+            ])
+            elapsed = time.perf_counter() - started
+        finally:
+            await client.aclose()
+
+    assert stub.max_in_flight == CONCURRENT_CALLS
+    assert elapsed < STUB_DELAY * CONCURRENT_CALLS
+
+@pytest.mark.asyncio
+async def test_in_flight_limit_is_enforced() -> None:
+    with LLMStubServer(delay=0.05) as stub:
+        client = LLMClient(api_key="test", base_url=stub.base_url, max_in_flight=1)
+        try:
+            await asyncio.gather(*[
+                client.chat_completion(make_messages(f"job {i}"), model="llama3-8b-8192")
+                for i in range(CONCURRENT_CALLS)
+            ])
+        finally:
+            await client.aclose()
+
+    assert stub.max_in_flight == 1
+    assert len(stub.requests) == CONCURRENT_CALLS
+
+@pytest.mark.asyncio
+async def test_connections_are_reused() -> None:
+    with LLMStubServer() as stub:
+        client = LLMClient(api_key="test", base_url=stub.base_url, max_in_flight=1)
+        try:
+            for i in range(CONCURRENT_CALLS):
+                await client.chat_completion(make_messages(f"job {i}"), model="llama3-8b-8192")
+        finally:
+            await client.aclose()
+
+    assert len(stub.connections) == 1
+
+@pytest.mark.asyncio
+async def test_per_call_timeout() -> None:
+    with LLMStubServer(delay=1.0) as stub:
+        client = LLMClient(api_key="test", base_url=stub.base_url, max_retries=0)
+        try:
+            with pytest.raises(APITimeoutError):
+                await client.chat_completion(make_messages("slow"), model="llama3-8b-8192", timeout=0.1)
+        finally:
+            await client.aclose()
@@ -1,12 +1,46 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
-from llm.parser import infer_experience_level, infer_work_model, parse_job_posting
+from groq import BadRequestError
+from llm.cache import LLMResponseCache
+from llm.parser import (
+    build_parse_job_prompt,
+    close_llm_client,
+    get_llm_client,
+    infer_experience_level,
+    infer_work_model,
+    infer_work_model_and_experience_level,
+    parse_job_posting,
+)
+from utils.constants import INFERENCE_MODELS, PARSE_JOB_MODELS
+
+
+@pytest.fixture(autouse=True)
+def llm_cache() -> LLMResponseCache:
+    cache = LLMResponseCache(":memory:")
+    with patch("llm.parser.llm_cache", cache):
+        yield cache
+    cache.close()
+
+def make_bad_request(body: dict) -> BadRequestError:
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    return BadRequestError("Bad request", response=httpx.Response(400, request=request), body=body)
+
+VALID_JOB_POSTING = (
+    '{"description":"Build stuff.","responsibilities":["Code"],"requirements":["Python"],'
+    '"experience_level":"mid_or_senior","work_model":"Remote","other":["Free breakfast"]}'
+)
+
+def make_completion(content: str) -> MagicMock:
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content=content))]
+    return mock_response
 
 
 @pytest.mark.asyncio
-@patch("llm.parser.client.chat.completions.create")
-async def test_parse_job_posting(mock_groq_create: MagicMock) -> None:
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting(mock_groq_create: AsyncMock) -> None:
     mock_json = (
         '{"description":"Build stuff.","responsibilities":["Code"],"requirements":["Python"],'
         '"experience_level":"mid_or_senior","work_model":"Remote","other":["Free breakfast"]}'
@@ -16,39 +50,25 @@ async def test_parse_job_posting(mock_groq_create: MagicMock) -> None:
     mock_groq_create.return_value = mock_response
 
     markdown = "## About the Role\nYou're going to build amazing products.\n\n### Requirements\n- Python\n"
-    result = await parse_job_posting(markdown, count=1)
+    result = await parse_job_posting(markdown)
 
     assert result == mock_json
-    mock_groq_create.assert_called_once()
+    mock_groq_create.assert_awaited_once()
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize(("count", "expected_model"), [
-    (0, "llama-3.1-8b-instant"),
-    (1, "llama3-70b-8192"),
-    (2, "llama3-8b-8192"),
-    (3, "llama-3.1-8b-instant"),
-    (4, "llama3-70b-8192"),
-])
-@patch("llm.parser.client.chat.completions.create")
-async def test_model_selection_based_on_count(mock_groq_create: MagicMock, count: int, expected_model: str) -> None:
-    mock_json = (
-        '{"description":"",'
-        '"responsibilities":[]',
-        '"requirements":[],'
-        '"experience_level":"mid_or_senior",'
-        '"work_model":"Remote",'
-        '"other":[]}'
-        )
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock(message=MagicMock(content=mock_json))]
-    mock_groq_create.return_value = mock_response
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_requests_are_routed_across_model_pools(mock_groq_create: AsyncMock) -> None:
+    mock_groq_create.return_value = make_completion("Remote")
 
-    await parse_job_posting("dummy markdown", count)
-    assert mock_groq_create.call_args.kwargs["model"] == expected_model
+    await parse_job_posting("dummy markdown")
+    assert mock_groq_create.call_args.kwargs["models"] == PARSE_JOB_MODELS
+
+    await infer_work_model("dummy text")
+    assert mock_groq_create.call_args.kwargs["models"] == INFERENCE_MODELS
 
 @pytest.mark.asyncio
-@patch("llm.parser.client.chat.completions.create")
-async def test_infer_work_model(mock_groq_create: MagicMock) -> None:
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_infer_work_model(mock_groq_create: AsyncMock) -> None:
     mock_response = MagicMock()
     mock_response.choices = [MagicMock(message=MagicMock(content="Remote"))]
     mock_groq_create.return_value = mock_response
@@ -57,12 +77,12 @@ async def test_infer_work_model(mock_groq_create: MagicMock) -> None:
     result = await infer_work_model(job_text)
 
     assert result == "Remote"
-    mock_groq_create.assert_called_once()
+    mock_groq_create.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-@patch("llm.parser.client.chat.completions.create")
-async def test_infer_experience_level(mock_groq_create: MagicMock) -> None:
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_infer_experience_level(mock_groq_create: AsyncMock) -> None:
     mock_response = MagicMock()
     mock_response.choices = [MagicMock(message=MagicMock(content="mid_or_senior"))]
     mock_groq_create.return_value = mock_response
@@ -72,11 +92,11 @@ async def test_infer_experience_level(mock_groq_create: MagicMock) -> None:
         job_text="We're looking for someone with 5+ years of backend experience."
     )
     assert result == "mid_or_senior"
-    mock_groq_create.assert_called_once()
+    mock_groq_create.assert_awaited_once()
 
 @pytest.mark.asyncio
-@patch("llm.parser.client.chat.completions.create")
-async def test_extract_missing_experience_level_invalid_output(mock_groq_create: MagicMock) -> None:
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_extract_missing_experience_level_invalid_output(mock_groq_create: AsyncMock) -> None:
     mock_response = MagicMock()
     mock_response.choices = [MagicMock(message=MagicMock(content="expert"))]
     mock_groq_create.return_value = mock_response
@@ -87,4 +107,241 @@ async def test_extract_missing_experience_level_invalid_output(mock_groq_create:
     )
 
     assert result is None
-    mock_groq_create.assert_called_once()
+    mock_groq_create.assert_awaited_once()
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_reuses_cached_response(
+    mock_groq_create: AsyncMock,
+    llm_cache: LLMResponseCache
+) -> None:
+    mock_groq_create.return_value = make_completion(VALID_JOB_POSTING)
+
+    first = await parse_job_posting("## Same markdown")
+    second = await parse_job_posting("## Same markdown")
+
+    assert first == second == VALID_JOB_POSTING
+    mock_groq_create.assert_awaited_once()
+    assert llm_cache.stats() == {"hits": 1, "misses": 1}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content", ['{"description": "Build stuff."}', "Sure! Here is the JSON you asked for"])
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_does_not_cache_invalid_responses(
+    mock_groq_create: AsyncMock,
+    content: str,
+    llm_cache: LLMResponseCache
+) -> None:
+    mock_groq_create.return_value = make_completion(content)
+
+    await parse_job_posting("## Same markdown")
+    await parse_job_posting("## Same markdown")
+
+    assert mock_groq_create.await_count == 2  # noqa: PLR2004
+    assert llm_cache.stats() == {"hits": 0, "misses": 2}
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_uses_the_callers_cache_check(
+    mock_groq_create: AsyncMock,
+    llm_cache: LLMResponseCache
+) -> None:
+    mock_groq_create.return_value = make_completion("anything")
+
+    await parse_job_posting("## Same markdown", is_cacheable=lambda response: response == "anything")
+    await parse_job_posting("## Same markdown", is_cacheable=lambda response: response == "anything")
+
+    mock_groq_create.assert_awaited_once()
+    assert llm_cache.stats() == {"hits": 1, "misses": 1}
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_cache_is_keyed_by_model_pool_and_markdown(
+    mock_groq_create: AsyncMock,
+    llm_cache: LLMResponseCache
+) -> None:
+    mock_groq_create.return_value = make_completion('{"description": ""}')
+
+    await parse_job_posting("## Markdown")
+    with patch("llm.parser.PARSE_JOB_MODELS", ["llama3-70b-8192"]):
+        await parse_job_posting("## Markdown")
+    await parse_job_posting("## Other markdown")
+
+    assert mock_groq_create.await_count == 3 # noqa: PLR2004
+    assert llm_cache.stats() == {"hits": 0, "misses": 3}
+
+@pytest.mark.asyncio
+@patch("llm.parser.LLM_PROMPT_VERSIONS", {"infer_work_model": "1"})
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_prompt_version_change_invalidates_cache(mock_groq_create: AsyncMock) -> None:
+    mock_groq_create.return_value = make_completion("Hybrid")
+
+    await infer_work_model("Three days in the office")
+    with patch("llm.parser.LLM_PROMPT_VERSIONS", {"infer_work_model": "2"}):
+        await infer_work_model("Three days in the office")
+
+    assert mock_groq_create.await_count == 2 # noqa: PLR2004
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_invalid_inference_is_not_cached(mock_groq_create: AsyncMock, llm_cache: LLMResponseCache) -> None:
+    mock_groq_create.side_effect = [make_completion("Unsure"), make_completion("Remote")]
+
+    assert await infer_work_model("Work from anywhere") is None
+    assert await infer_work_model("Work from anywhere") == "Remote"
+    assert await infer_work_model("Work from anywhere") == "Remote"
+
+    assert mock_groq_create.await_count == 2 # noqa: PLR2004
+    assert llm_cache.stats() == {"hits": 1, "misses": 2}
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_infer_work_model_and_experience_level(mock_groq_create: AsyncMock) -> None:
+    mock_groq_create.return_value = make_completion('{"work_model": "Remote", "experience_level": "Junior"}')
+
+    result = await infer_work_model_and_experience_level("Junior Developer", "Fully remote role for graduates.")
+
+    assert result == {"work_model": "Remote", "experience_level": "junior"}
+    mock_groq_create.assert_awaited_once()
+    assert mock_groq_create.call_args.kwargs["models"] == INFERENCE_MODELS
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("content", "expected"), [
+    ('{"work_model": "Flexible", "experience_level": "mid_or_senior"}',
+     {"work_model": None, "experience_level": "mid_or_senior"}),
+    ("Hybrid, junior", {"work_model": None, "experience_level": None}),
+    ('["Hybrid", "junior"]', {"work_model": None, "experience_level": None}),
+])
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_infer_work_model_and_experience_level_rejects_invalid_output(
+    mock_groq_create: AsyncMock,
+    content: str,
+    expected: dict,
+    llm_cache: LLMResponseCache
+) -> None:
+    mock_groq_create.return_value = make_completion(content)
+
+    assert await infer_work_model_and_experience_level("Engineer", "text") == expected
+    assert llm_cache.connect().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] == 0
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_infer_work_model_and_experience_level_requests_json_mode(mock_groq_create: AsyncMock) -> None:
+    mock_groq_create.return_value = make_completion('{"work_model": "Hybrid", "experience_level": "lead+"}')
+
+    await infer_work_model_and_experience_level("Engineering Manager", "Two days a week in the office.")
+
+    assert mock_groq_create.await_args.kwargs["response_format"] == {"type": "json_object"}
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_infer_work_model_and_experience_level_reads_failed_generation(mock_groq_create: AsyncMock) -> None:
+    mock_groq_create.side_effect = make_bad_request(
+        {"error": {"code": "json_validate_failed", "failed_generation": '{"work_model": "Remote"}'}}
+    )
+
+    result = await infer_work_model_and_experience_level("Engineer", "Fully remote.")
+
+    assert result == {"work_model": "Remote", "experience_level": None}
+    mock_groq_create.assert_awaited_once()
+
+@pytest.mark.asyncio
+@patch("llm.parser.structured_output_unsupported", new_callable=set)
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_infer_work_model_and_experience_level_falls_back_when_json_mode_unsupported(
+    mock_groq_create: AsyncMock, mock_unsupported: set
+) -> None:
+    mock_groq_create.side_effect = [
+        make_bad_request({"error": {"message": "response_format is not supported"}}),
+        make_completion('{"work_model": "On-site", "experience_level": "junior"}'),
+    ]
+
+    result = await infer_work_model_and_experience_level("Graduate Engineer", "Based in our Sydney office.")
+
+    assert result == {"work_model": "On-site", "experience_level": "junior"}
+    assert mock_unsupported == {"|".join(INFERENCE_MODELS)}
+    assert "response_format" not in mock_groq_create.await_args_list[1].kwargs
+
+def test_build_parse_job_prompt_asks_only_for_missing_lists() -> None:
+    full_prompt = build_parse_job_prompt("MD", ["responsibilities", "requirements", "other"])
+    prompt = build_parse_job_prompt("MD", ["other"])
+
+    assert "exactly the following six keys" in full_prompt
+    assert "'responsibilities', 'requirements', and 'other' must be arrays of strings." in full_prompt
+    assert "exactly the following four keys" in prompt
+    assert "- description\n- experience_level\n- work_model\n- other\n" in prompt
+    assert "- 'responsibilities':" not in prompt
+    assert "- 'requirements':" not in prompt
+    assert "'other' must be an array of strings." in prompt
+    assert prompt.endswith("Job Posting Text:\nMD")
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_requests_json_mode(mock_groq_create: AsyncMock) -> None:
+    mock_groq_create.return_value = make_completion('{"description": ""}')
+
+    await parse_job_posting("## Role", ["other"])
+
+    assert mock_groq_create.await_args.kwargs["response_format"] == {"type": "json_object"}
+
+@pytest.mark.asyncio
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_returns_failed_generation_for_repair(mock_groq_create: AsyncMock) -> None:
+    mock_groq_create.side_effect = make_bad_request(
+        {"error": {"code": "json_validate_failed", "failed_generation": '{"description": "x",}'}}
+    )
+
+    result = await parse_job_posting("## Role")
+
+    assert result == '{"description": "x",}'
+    mock_groq_create.assert_awaited_once()
+
+@pytest.mark.asyncio
+@patch("llm.parser.structured_output_unsupported", new_callable=set)
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_falls_back_when_json_mode_unsupported(
+    mock_groq_create: AsyncMock, mock_unsupported: set
+) -> None:
+    mock_groq_create.side_effect = [
+        make_bad_request({"error": {"message": "response_format is not supported"}}),
+        make_completion('{"description": "x"}'),
+        make_completion('{"description": "y"}'),
+    ]
+
+    first = await parse_job_posting("## Role")
+    second = await parse_job_posting("## Another role")
+
+    assert (first, second) == ('{"description": "x"}', '{"description": "y"}')
+    assert mock_unsupported == {"|".join(PARSE_JOB_MODELS)}
+    assert "response_format" not in mock_groq_create.await_args_list[1].kwargs
+    assert "response_format" not in mock_groq_create.await_args_list[2].kwargs
+
+@pytest.mark.asyncio
+@patch("llm.parser.sentry_sdk")
+@patch("llm.parser.structured_output_unsupported", new_callable=set)
+@patch("llm.parser.scheduler.chat_completion", new_callable=AsyncMock)
+async def test_parse_job_posting_keeps_structured_output_after_other_bad_requests(
+    mock_groq_create: AsyncMock, mock_unsupported: set, mock_sentry: MagicMock
+) -> None:
+    mock_groq_create.side_effect = make_bad_request(
+        {"error": {"code": "context_length_exceeded", "message": "Please reduce the length of the messages"}}
+    )
+
+    result = await parse_job_posting("## Role")
+
+    assert result is None
+    assert mock_unsupported == set()
+    mock_groq_create.assert_awaited_once()
+    mock_sentry.capture_exception.assert_called_once()
+
+@pytest.mark.asyncio
+@patch("llm.parser._shared_client", None)
+async def test_llm_client_is_created_on_first_use_and_closed() -> None:
+    client = get_llm_client()
+
+    assert get_llm_client() is client
+    with patch.object(client, "aclose", new_callable=AsyncMock) as mock_aclose:
+        await close_llm_client()
+    mock_aclose.assert_awaited_once()
+    assert get_llm_client() is not client
+    await close_llm_client()
@@ -0,0 +1,174 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from groq import RateLimitError
+from llm.client import LLMClient
+from llm.scheduler import LLMScheduler, TokenBucket, estimate_tokens, parse_reset_duration
+from tests.stubs.llm_stub_server import LLMStubServer
+
+MESSAGES = [{"role": "user", "content": "Job Posting Text:\n## Engineer"}]
+FAST_MODEL = "llama-3.1-8b-instant"
+LARGE_MODEL = "llama3-70b-8192"
+CONCURRENT_CALLS = 3
+
+
+@pytest.mark.parametrize(("value", "expected"), [
+    ("2m59.56s", 179.56),
+    ("7.66s", 7.66),
+    ("120ms", 0.12),
+    ("1h2m3s", 3723.0),
+    ("30", 30.0),
+    ("", None),
+    ("soon", None),
+])
+def test_parse_reset_duration(value: str, expected: float | None) -> None:
+    assert parse_reset_duration(value) == (pytest.approx(expected) if expected is not None else None)
+
+def test_token_bucket_waits_for_refill() -> None:
+    bucket = TokenBucket(capacity=100, refill_per_second=10, updated_at=0.0)
+
+    assert bucket.wait_time(60, now=0.0) == 0.0
+    bucket.consume(60, now=0.0)
+    assert bucket.wait_time(60, now=0.0) == pytest.approx(2.0)
+    assert bucket.wait_time(60, now=2.0) == 0.0
+
+def test_token_bucket_syncs_to_response_headers() -> None:
+    bucket = TokenBucket(capacity=6000, refill_per_second=100, updated_at=0.0)
+
+    bucket.sync(remaining=0, now=0.0, limit=12000)
+
+    assert bucket.capacity == 12000 # noqa: PLR2004
+    assert bucket.wait_time(400, now=0.0) == pytest.approx(2.0)
+
+def test_estimate_tokens_includes_completion_budget() -> None:
+    assert estimate_tokens([{"role": "user", "content": "x" * 400}]) == 100 + 1024
+
+def test_record_response_pauses_model_when_daily_requests_run_out() -> None:
+    scheduler = LLMScheduler(get_client=MagicMock(), model_limits={FAST_MODEL: {"rpm": 30, "tpm": 6000}})
+
+    scheduler.record_response(FAST_MODEL, httpx.Headers({
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "1m",
+    }))
+
+    _model, wait = scheduler.soonest_model([FAST_MODEL], 10, now=scheduler.models[FAST_MODEL].tokens.updated_at)
+    assert wait == pytest.approx(60.0, abs=0.5)
+
+@pytest.mark.asyncio
+async def test_routes_to_model_with_remaining_token_budget() -> None:
+    with LLMStubServer() as stub:
+        # After each response the serving model reports an empty token bucket that refills in about a second
+        stub.headers = {"x-ratelimit-limit-tokens": 60000, "x-ratelimit-remaining-tokens": 0}
+        client = LLMClient(api_key="test", base_url=stub.base_url)
+        scheduler = LLMScheduler(lambda: client, model_limits={
+            FAST_MODEL: {"rpm": 30, "tpm": 60000},
+            LARGE_MODEL: {"rpm": 30, "tpm": 60000},
+        })
+        try:
+            for _ in range(2):
+                await scheduler.chat_completion(MESSAGES, models=[FAST_MODEL, LARGE_MODEL])
+        finally:
+            await client.aclose()
+
+    assert [body["model"] for body in stub.requests] == [FAST_MODEL, LARGE_MODEL]
+    assert scheduler.stats()["routed"] == {FAST_MODEL: 1, LARGE_MODEL: 1}
+
+@pytest.mark.asyncio
+async def test_rate_limited_request_is_rerouted() -> None:
+    with LLMStubServer() as stub:
+        stub.status_by_model = {FAST_MODEL: 429}
+        stub.headers = {"retry-after": "30"}
+        client = LLMClient(api_key="test", base_url=stub.base_url)
+        scheduler = LLMScheduler(lambda: client, model_limits={
+            FAST_MODEL: {"rpm": 30, "tpm": 60000},
+            LARGE_MODEL: {"rpm": 30, "tpm": 60000},
+        })
+        try:
+            completion = await scheduler.chat_completion(MESSAGES, models=[FAST_MODEL, LARGE_MODEL])
+            # The 429'd model stays cooled down, so the next request goes straight to the other one
+            await scheduler.chat_completion(MESSAGES, models=[FAST_MODEL, LARGE_MODEL])
+        finally:
+            await client.aclose()
+
+    assert completion.model == LARGE_MODEL
+    assert [body["model"] for body in stub.requests] == [FAST_MODEL, LARGE_MODEL, LARGE_MODEL]
+    assert scheduler.stats()["rate_limited"] == 1
+
+@pytest.mark.asyncio
+async def test_rate_limit_error_raised_after_retries() -> None:
+    with LLMStubServer() as stub:
+        stub.status_code = 429
+        stub.headers = {"retry-after": "0.01"}
+        client = LLMClient(api_key="test", base_url=stub.base_url)
+        scheduler = LLMScheduler(lambda: client, model_limits={FAST_MODEL: {"rpm": 30, "tpm": 60000}}, max_retries=1)
+        try:
+            with pytest.raises(RateLimitError):
+                await scheduler.chat_completion(MESSAGES, models=[FAST_MODEL])
+        finally:
+            await client.aclose()
+
+    assert len(stub.requests) == 2 # noqa: PLR2004
+    assert scheduler.stats()["rate_limited"] == 2 # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_cancelled_request_is_aborted_and_counted() -> None:
+    request_started = asyncio.Event()
+
+    async def hang(**_kwargs: object) -> None:
+        request_started.set()
+        await asyncio.Event().wait()
+
+    client = MagicMock(chat_completion_with_headers=hang)
+    scheduler = LLMScheduler(lambda: client, model_limits={FAST_MODEL: {"rpm": 30, "tpm": 60000}})
+    task = asyncio.create_task(scheduler.chat_completion(MESSAGES, models=[FAST_MODEL]))
+    await request_started.wait()
+
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert scheduler.counters()["cancelled"] == 1
+
+@pytest.mark.asyncio
+@patch("llm.scheduler.LLM_MAX_SCHEDULER_SLEEP", 0.05)
+async def test_requests_queue_when_all_models_are_saturated() -> None:
+    with LLMStubServer() as stub:
+        # Enough configured budget for one request; headers then report a bucket refilling ~10k tokens/s
+        stub.headers = {"x-ratelimit-limit-tokens": 600000, "x-ratelimit-remaining-tokens": 0}
+        client = LLMClient(api_key="test", base_url=stub.base_url)
+        scheduler = LLMScheduler(lambda: client, model_limits={FAST_MODEL: {"rpm": 1000, "tpm": 1100}})
+        try:
+            await asyncio.gather(*[
+                scheduler.chat_completion(MESSAGES, models=[FAST_MODEL]) for _ in range(CONCURRENT_CALLS)
+            ])
+        finally:
+            await client.aclose()
+
+    stats = scheduler.stats()
+    assert len(stub.requests) == CONCURRENT_CALLS
+    assert stats["queue_depth"] == 0
+    # The first request is routed straight away; the other two queue behind the empty token bucket
+    assert stats["max_queue_depth"] == CONCURRENT_CALLS - 1
+    assert stats["total_wait_seconds"] > 0
+    assert stats["max_wait_seconds"] <= stats["total_wait_seconds"]
+
+@pytest.mark.asyncio
+async def test_saturated_pool_does_not_block_other_pools() -> None:
+    scheduler = LLMScheduler(MagicMock, model_limits={
+        FAST_MODEL: {"rpm": 1, "tpm": 60000},
+        LARGE_MODEL: {"rpm": 30, "tpm": 60000},
+    })
+    await scheduler.acquire([FAST_MODEL], 10)
+
+    # The fast model's request bucket now needs about a minute to refill, so this waiter holds its pool's lock
+    waiting = asyncio.create_task(scheduler.acquire([FAST_MODEL], 10))
+    await asyncio.sleep(0)
+    model = await asyncio.wait_for(scheduler.acquire([LARGE_MODEL], 10), timeout=1)
+
+    assert model == LARGE_MODEL
+    assert scheduler.stats()["queue_depth"] == 1
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
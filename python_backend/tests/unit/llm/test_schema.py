@@ -0,0 +1,45 @@
+import pytest
+from llm.schema import build_job_posting_schema, build_response_format, validate_job_posting
+
+FIELDS = ["description", "responsibilities", "experience_level", "work_model"]
+
+
+def test_build_job_posting_schema_types_fields_from_constants() -> None:
+    schema = build_job_posting_schema(FIELDS)
+
+    assert schema["required"] == FIELDS
+    assert schema["additionalProperties"] is False
+    assert schema["properties"]["description"] == {"type": "string"}
+    assert schema["properties"]["responsibilities"] == {"type": "array", "items": {"type": "string"}}
+    assert schema["properties"]["work_model"]["enum"] == ["Hybrid", "On-site", "Remote"]
+    assert schema["properties"]["experience_level"]["enum"] == ["intern", "junior", "mid_or_senior", "lead+"]
+
+def test_build_job_posting_schema_rejects_unknown_fields() -> None:
+    with pytest.raises(ValueError, match="Unknown job field 'salary_band'"):
+        build_job_posting_schema(["salary_band"])
+
+def test_validate_job_posting() -> None:
+    schema = build_job_posting_schema(FIELDS)
+    valid = {"description": "", "responsibilities": ["Code"], "experience_level": "junior", "work_model": "Remote"}
+
+    assert validate_job_posting(valid, schema) == []
+    assert validate_job_posting([], schema) == ["response is not a JSON object"]
+    assert validate_job_posting(
+        {**valid, "responsibilities": "Code", "work_model": "Flexible", "extra": 1}, schema
+    ) == [
+        "'responsibilities' is not a list of strings",
+        "'work_model' is not one of ['Hybrid', 'On-site', 'Remote']",
+        "unexpected 'extra'",
+    ]
+    assert validate_job_posting({"description": ""}, schema) == [
+        "missing 'responsibilities'", "missing 'experience_level'", "missing 'work_model'"
+    ]
+
+def test_build_response_format_uses_schema_only_when_every_model_supports_it() -> None:
+    schema = build_job_posting_schema(FIELDS)
+
+    assert build_response_format(["llama-3.1-8b-instant"], schema) == {"type": "json_object"}
+    assert build_response_format(["openai/gpt-oss-20b", "llama-3.1-8b-instant"], schema) == {"type": "json_object"}
+    assert build_response_format(["openai/gpt-oss-20b"], schema) == {
+        "type": "json_schema", "json_schema": {"name": "job_posting", "schema": schema}
+    }
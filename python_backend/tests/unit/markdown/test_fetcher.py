@@ -1,32 +1,22 @@
-from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from markdown.fetcher import fetch_job_markdown, fetch_page_markdown
+from markdown.fetcher import (
+    build_job_markdown_config,
+    fetch_job_page_over_http,
+    fetch_page_content,
+    fetch_page_content_over_http,
+    html_to_markdown,
+    render_job_markdown,
+)
+from utils.constants import JOB_PAGE_MARKER
 
 
-@pytest.mark.asyncio
-@patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
-@patch("markdown.fetcher.backoff_if_high_cpu", new_callable=AsyncMock)
-async def test_fetch_page_markdown_success(mock_backoff: AsyncMock, mock_pause: AsyncMock) -> None:
-    mock_crawler = MagicMock()
-    mock_crawler.arun = AsyncMock(return_value=MagicMock(
-        success=True,
-        markdown="## Job Listings",
-        status_code=200
-    ))
-
-    result = await fetch_page_markdown("https://seek.com.au", mock_crawler, page_num=1)
-    assert result == "## Job Listings"
-    mock_crawler.arun.assert_awaited_once()
-    mock_pause.assert_awaited_once()
-    mock_backoff.assert_awaited_once()
-
 @pytest.mark.asyncio
 @patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
 @patch("sentry_sdk.capture_exception")
 @patch("sentry_sdk.push_scope")
-async def test_fetch_page_markdown_arun_exception(
+async def test_fetch_page_content_arun_exception(
     mock_push_scope: MagicMock,
     mock_capture_exception: MagicMock,
     mock_pause: AsyncMock, # noqa: ARG001
@@ -37,7 +27,7 @@ async def test_fetch_page_markdown_arun_exception(
     scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = scope
 
-    result = await fetch_page_markdown("https://seek.com.au", mock_crawler, page_num=2)
+    result = await fetch_page_content("https://seek.com.au", mock_crawler, page_num=2)
     assert result is None
 
     mock_capture_exception.assert_called_once()
@@ -49,7 +39,7 @@ async def test_fetch_page_markdown_arun_exception(
 @patch("markdown.fetcher.backoff_if_high_cpu", new_callable=AsyncMock)
 @patch("sentry_sdk.capture_message")
 @patch("sentry_sdk.push_scope")
-async def test_fetch_page_markdown_failed_result(
+async def test_fetch_page_content_failed_result(
     mock_push_scope: MagicMock,
     mock_capture_message: MagicMock,
     mock_backoff: AsyncMock, # noqa: ARG001
@@ -66,7 +56,7 @@ async def test_fetch_page_markdown_failed_result(
     scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = scope
 
-    result = await fetch_page_markdown("https://seek.com.au", mock_crawler, page_num=3)
+    result = await fetch_page_content("https://seek.com.au", mock_crawler, page_num=3)
     assert result is None
     mock_capture_message.assert_called_once()
     assert "Crawl failed" in mock_capture_message.call_args[0][0]
@@ -76,7 +66,7 @@ async def test_fetch_page_markdown_failed_result(
 @patch("markdown.fetcher.backoff_if_high_cpu", new_callable=AsyncMock)
 @patch("sentry_sdk.capture_message")
 @patch("sentry_sdk.push_scope")
-async def test_fetch_page_markdown_no_markdown(
+async def test_fetch_page_content_no_markdown(
     mock_push_scope: MagicMock,
     mock_capture_message: MagicMock,
     mock_backoff: AsyncMock, # noqa: ARG001
@@ -92,65 +82,110 @@ async def test_fetch_page_markdown_no_markdown(
     scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = scope
 
-    result = await fetch_page_markdown("https://seek.com.au", mock_crawler, page_num=4)
+    result = await fetch_page_content("https://seek.com.au", mock_crawler, page_num=4)
     assert result is None
     mock_capture_message.assert_called_once()
     assert "No markdown found" in mock_capture_message.call_args[0][0]
 
 @pytest.mark.asyncio
-@patch("markdown.fetcher.retry_with_backoff", new_callable=AsyncMock)
-async def test_fetch_job_markdown_success(mock_retry_with_backoff: AsyncMock) -> None:
-    mock_markdown = "## This is a job posting"
-    mock_retry_with_backoff.return_value = mock_markdown
+@patch("markdown.fetcher.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_render_job_markdown_uses_raw_html(mock_backoff: AsyncMock) -> None:  # noqa: ARG001
+    mock_crawler = MagicMock()
+    mock_crawler.arun = AsyncMock(return_value=MagicMock(
+        success=True,
+        markdown=MagicMock(fit_markdown="## Pruned job posting")
+    ))
 
-    crawler = MagicMock()
-    result = await fetch_job_markdown("https://seek.com/job/123", crawler)
+    result = await render_job_markdown("https://seek.com/job/123", "<html><p>Job</p></html>", mock_crawler)
 
-    assert result == mock_markdown
-    mock_retry_with_backoff.assert_awaited_once()
+    assert result == "## Pruned job posting"
+    assert mock_crawler.arun.call_args.args[0] == "raw:<html><p>Job</p></html>"
 
 @pytest.mark.asyncio
-@patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
 @patch("markdown.fetcher.backoff_if_high_cpu", new_callable=AsyncMock)
 @patch("sentry_sdk.capture_message")
 @patch("sentry_sdk.push_scope")
-@patch("markdown.fetcher.retry_with_backoff")
-async def test_fetch_job_markdown_arun_failure(
-    mock_retry_with_backoff: AsyncMock,
+async def test_render_job_markdown_failure(
     mock_push_scope: MagicMock,
     mock_capture_message: MagicMock,
-    mock_backoff: AsyncMock, # noqa: ARG001
-    mock_pause: AsyncMock # noqa: ARG001
+    mock_backoff: AsyncMock # noqa: ARG001
 ) -> None:
-    async def mock_retry(crawl: AsyncMock, **kwargs: Any): # noqa: ARG001
-        mock_result = MagicMock()
-        mock_result.success = False
-        mock_result.error_message = "Timeout"
-        crawler = MagicMock()
-        crawler.arun = AsyncMock(return_value=mock_result)
-        return await crawl()
-
-    mock_retry_with_backoff.side_effect = mock_retry
-
     scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = scope
 
     mock_crawler = MagicMock()
-    mock_crawler.arun = AsyncMock(return_value=MagicMock(success=False, error_message="Timeout"))
+    mock_crawler.arun = AsyncMock(return_value=MagicMock(success=False, error_message="Parse error"))
 
-    result = await fetch_job_markdown("https://seek.com/job/456", mock_crawler)
-    assert result is None
+    result = await render_job_markdown("https://seek.com/job/456", "<html></html>", mock_crawler)
 
+    assert result is None
+    scope.set_tag.assert_called_with("component", "render_job_markdown")
     mock_capture_message.assert_called_once()
-    assert "Crawler failed" in mock_capture_message.call_args[0][0]
+
+JOB_PAGE_HTML = (
+    f"<html><body><nav><a href='/'>Home</a></nav><h1 {JOB_PAGE_MARKER}>Junior Engineer</h1>"
+    + "<p>We are hiring a junior software engineer to build great things with Python across our platform.</p>" * 20
+    + "</body></html>"
+)
+LISTING_HTML = (
+    "<html><body><h1>66 jobs listed</h1>"
+    + "<p>Browse the latest software engineering roles in Sydney and apply today.</p>" * 20
+    + "<a href='https://www.seek.com.au/job/81234567?type=standard&origin=cardTitle'>Junior Engineer</a>"
+    + "</body></html>"
+)
+
+def test_html_to_markdown_prunes_like_the_crawler() -> None:
+    result = html_to_markdown("https://www.seek.com.au/job/1", JOB_PAGE_HTML, build_job_markdown_config())
+
+    assert result.fit_markdown.startswith("# Junior Engineer")
+    assert "Home" not in result.fit_markdown
 
 @pytest.mark.asyncio
-@patch("markdown.fetcher.retry_with_backoff", new_callable=AsyncMock)
-async def test_fetch_job_markdown_retries_exhausted(mock_retry_with_backoff: AsyncMock) -> None:
-    mock_retry_with_backoff.return_value = None
+@patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
+@patch("markdown.fetcher.fetch_html", new_callable=AsyncMock)
+async def test_fetch_job_page_over_http(mock_fetch_html: AsyncMock, mock_pause: AsyncMock) -> None:  # noqa: ARG001
+    mock_fetch_html.return_value = JOB_PAGE_HTML
 
-    crawler = MagicMock()
-    result = await fetch_job_markdown("https://seek.com/job/789", crawler)
+    markdown, html = await fetch_job_page_over_http("https://www.seek.com.au/job/1", MagicMock())
 
-    assert result is None
-    mock_retry_with_backoff.assert_awaited_once()
+    assert markdown.startswith("# Junior Engineer")
+    assert html == JOB_PAGE_HTML
+    assert mock_fetch_html.await_args.kwargs == {"required_marker": JOB_PAGE_MARKER}
+
+@pytest.mark.asyncio
+@patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
+@patch("markdown.fetcher.fetch_html", new_callable=AsyncMock)
+async def test_fetch_job_page_over_http_blocked(mock_fetch_html: AsyncMock, mock_pause: AsyncMock) -> None:  # noqa: ARG001
+    mock_fetch_html.return_value = None
+
+    assert await fetch_job_page_over_http("https://www.seek.com.au/job/1", MagicMock()) is None
+
+@pytest.mark.asyncio
+@patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
+@patch("markdown.fetcher.fetch_html", new_callable=AsyncMock)
+async def test_fetch_page_content_over_http(mock_fetch_html: AsyncMock, mock_pause: AsyncMock) -> None:  # noqa: ARG001
+    mock_fetch_html.return_value = LISTING_HTML
+
+    markdown, html = await fetch_page_content_over_http("https://www.seek.com.au/jobs?keywords=dev", MagicMock(), 2)
+
+    assert "66 jobs listed" in markdown
+    assert "https://www.seek.com.au/job/81234567?type=standard&origin=cardTitle" in markdown
+    assert html == LISTING_HTML
+    assert mock_fetch_html.await_args.args[0] == "https://www.seek.com.au/jobs?keywords=dev&page=2"
+
+@pytest.mark.asyncio
+@patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
+@patch("markdown.fetcher.fetch_html", new_callable=AsyncMock)
+async def test_fetch_page_content_over_http_blocked(mock_fetch_html: AsyncMock, mock_pause: AsyncMock) -> None:  # noqa: ARG001
+    mock_fetch_html.return_value = None
+
+    assert await fetch_page_content_over_http("https://www.seek.com.au/jobs?keywords=dev", MagicMock(), 1) is None
+
+@pytest.mark.asyncio
+@patch("markdown.fetcher.pause_briefly", new_callable=AsyncMock)
+@patch("markdown.fetcher.backoff_if_high_cpu", new_callable=AsyncMock)
+async def test_fetch_page_content_returns_markdown_and_html(mock_backoff: AsyncMock, mock_pause: AsyncMock) -> None:  # noqa: ARG001
+    crawler = AsyncMock()
+    crawler.arun.return_value = MagicMock(success=True, markdown="# Jobs", html="<html></html>")
+
+    assert await fetch_page_content("https://seek.com.au/jobs", crawler, 1) == ("# Jobs", "<html></html>")
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import yaml
+from markdown.sections import classify_heading, clean_bullet, extract_list_fields
+
+FIXTURE_PATH = Path(__file__).parent.parent.parent / "data" / "test_groq_job_data.yaml"
+
+
+def load_labelled_jobs() -> list:
+    with FIXTURE_PATH.open(encoding="utf-8") as f:
+        return yaml.safe_load(f)["tests"]
+
+def test_classify_heading() -> None:
+    assert classify_heading("Key Responsibilities") == "responsibilities"
+    assert classify_heading("Skills & Experience") == "requirements"
+    assert classify_heading("Why Join") == "other"
+    assert classify_heading("What You\u2019ll Do and Need") is None
+    assert classify_heading("About Us") == "other"
+    assert classify_heading("Personal Attributes") is None
+
+def test_clean_bullet_strips_markers_and_emphasis() -> None:
+    assert clean_bullet("  * **Node.js:** Familiarity with Node.js. ") == "Node.js: Familiarity with Node.js."
+    assert clean_bullet("• Write snake_case code") == "Write snake_case code"
+
+def test_extract_list_fields_reads_bullets_under_headings() -> None:
+    markdown = (
+        "# Engineer\n"
+        "About Us:\n"
+        "  * We are a bank.\n"
+        "  * We lend money.\n"
+        "**Responsibilities:**\n"
+        "  * Build APIs.\n"
+        "  * Review code.\n"
+        "## **Minimum qualifications:**\n"
+        "  * Python.\n"
+        "## **Preferred qualifications:**\n"
+        "  * Go.\n"
+        "## Benefits\n"
+        "  * Free lunch.\n"
+    )
+
+    assert extract_list_fields(markdown) == {
+        "responsibilities": ["Build APIs.", "Review code."],
+        "requirements": ["Python.", "Go."],
+    }
+
+def test_extract_list_fields_leaves_requirements_to_the_llm_when_a_list_is_unplaced() -> None:
+    markdown = (
+        "## Responsibilities\n  * Build APIs.\n  * Review code.\n"
+        "## Requirements\n  * Python.\n  * Go.\n"
+        "## Bonus\n  * Kafka.\n  * Rust.\n"
+    )
+
+    assert extract_list_fields(markdown) == {"responsibilities": ["Build APIs.", "Review code."]}
+
+def test_extract_list_fields_ignores_job_board_lists_and_never_fills_other() -> None:
+    markdown = (
+        "## Requirements\n  * Python.\n  * Go.\n"
+        "## Benefits\n  * Free lunch.\n  * Gym.\n"
+        "## Your application will include the following questions\n  * Do you have a visa?\n"
+    )
+
+    assert extract_list_fields(markdown) == {"requirements": ["Python.", "Go."]}
+
+def test_extracted_lists_match_labelled_jobs() -> None:
+    exact = 0
+    extracted_count = 0
+    for case in load_labelled_jobs():
+        expected = case["expected"]
+        for field, bullets in extract_list_fields(case["markdown"]).items():
+            if field == "other":
+                continue
+            expected_bullets = expected.get(field) or []
+            extracted_count += 1
+            exact += bullets == expected_bullets
+            # Labelled lists may be a subset (e.g. preferred qualifications left out), never different text
+            assert set(expected_bullets) <= set(bullets) or bullets[:-1] == expected_bullets[:-1], field
+
+    # Jobs with lists under unrecognised headings leave requirements to the LLM, so not every job contributes
+    assert extracted_count >= 10  # noqa: PLR2004
+    assert exact / extracted_count >= 0.8  # noqa: PLR2004
@@ -0,0 +1,80 @@
+import re
+from pathlib import Path
+
+import pytest
+import yaml
+from markdown.trimmer import MarkdownTrimStats, estimate_markdown_tokens, trim_job_markdown
+
+FIXTURE_PATH = Path(__file__).parent.parent.parent / "data" / "test_groq_job_data.yaml"
+
+
+def load_labelled_jobs() -> list:
+    with FIXTURE_PATH.open(encoding="utf-8") as f:
+        return yaml.safe_load(f)["tests"]
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[*_]", "", text)).lower()
+
+def test_short_markdown_is_unchanged() -> None:
+    markdown = "# Engineer\nBuild and run our payments platform."
+
+    result = trim_job_markdown(markdown)
+
+    assert result.markdown == markdown
+    assert result.tokens_saved == 0
+
+def test_job_board_footer_is_always_dropped() -> None:
+    markdown = (
+        "# Engineer\nBuild things.\n"
+        "## How do your skills match this job?\nSign in.\n"
+        "### Company profile\nWe are big.\n"
+        "## Report this job advert\nBe careful\nCareer Advice"
+    )
+
+    result = trim_job_markdown(markdown)
+
+    assert result.markdown == "# Engineer\nBuild things."
+    assert result.tokens_saved == estimate_markdown_tokens(markdown) - estimate_markdown_tokens(result.markdown)
+
+def test_over_budget_drops_boilerplate_before_protected_sections() -> None:
+    filler = "We encourage applications from diverse candidates, please apply via the link. " * 4
+    markdown = (
+        "# Engineer\n"
+        "Our team builds the lending platform used by thousands of brokers every day.\n"
+        "## Responsibilities\n"
+        "  * Build APIs.\n"
+        "## Requirements\n"
+        "  * 3+ years of Python.\n"
+        f"## How to apply\n{filler}\n{filler}"
+    )
+
+    result = trim_job_markdown(markdown, token_budget=60, leading_paragraphs=1)
+
+    assert filler not in result.markdown
+    assert "## How to apply" not in result.markdown
+    assert "  * Build APIs." in result.markdown
+    assert "  * 3+ years of Python." in result.markdown
+    assert "Our team builds the lending platform" in result.markdown
+
+@pytest.mark.parametrize("token_budget", [1500, 300])
+def test_trimming_keeps_expected_fields_of_labelled_jobs(token_budget: int) -> None:
+    # Offline parity check against the LLM integration fixtures: everything the parser is expected to
+    # extract verbatim must survive trimming
+    for case in load_labelled_jobs():
+        expected = case["expected"]
+        original = normalize(case["markdown"])
+        trimmed = normalize(trim_job_markdown(case["markdown"], token_budget=token_budget).markdown)
+
+        sentences = re.split(r"(?<=\.)\s+", expected.get("description") or "")
+        for item in [*expected.get("responsibilities", []), *expected.get("requirements", []), *sentences]:
+            if item.strip() and normalize(item) in original:
+                assert normalize(item) in trimmed, (expected.get("title"), item)
+
+def test_markdown_trim_stats_totals_results() -> None:
+    stats = MarkdownTrimStats()
+    for case in load_labelled_jobs():
+        stats.record(trim_job_markdown(case["markdown"]))
+
+    counters = stats.counters()
+    assert counters["jobs"] == len(load_labelled_jobs())
+    assert 0 < counters["tokens_saved"] < counters["tokens_in"]
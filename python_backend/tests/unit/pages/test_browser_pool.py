@@ -0,0 +1,161 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pages.browser_pool import BrowserFallback, BrowserPool, BrowserResources
+
+
+def make_resources(*, navigations: int = 0) -> BrowserResources:
+    crawler = AsyncMock()
+    crawler.ready = True
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    page = MagicMock()
+    page.is_closed.return_value = False
+    page_pool = MagicMock(all_pages=[page], acquisitions=navigations)
+    return BrowserResources(crawler, MagicMock(), browser, page_pool)
+
+@pytest.fixture
+def mock_open() -> AsyncMock:
+    with patch("pages.browser_pool.open_browser_resources", new_callable=AsyncMock) as mock_open:
+        mock_open.side_effect = lambda: make_resources()
+        yield mock_open
+
+@pytest.fixture
+def mock_close() -> AsyncMock:
+    with patch("pages.browser_pool.close_browser_resources", new_callable=AsyncMock) as mock_close:
+        yield mock_close
+
+@pytest.fixture(autouse=True)
+def low_rss() -> MagicMock:
+    with patch("pages.browser_pool.process_tree_rss_mb", return_value=100.0) as mock_rss:
+        yield mock_rss
+
+@pytest.mark.asyncio
+async def test_lease_reuses_warm_resources(mock_open: AsyncMock, mock_close: AsyncMock) -> None:
+    pool = BrowserPool()
+    await pool.start()
+
+    async with pool.lease() as first:
+        pass
+    async with pool.lease() as second:
+        pass
+
+    assert first is second
+    assert second.leases == 2  # noqa: PLR2004
+    mock_open.assert_awaited_once()
+    mock_close.assert_not_awaited()
+    assert pool.counters() == {"warm_leases": 2, "cold_leases": 0, "recycles": 0, "health_failures": 0}
+
+@pytest.mark.asyncio
+async def test_lease_without_start_launches_and_closes_throwaway_set(
+    mock_open: AsyncMock, mock_close: AsyncMock
+) -> None:
+    pool = BrowserPool()
+
+    async with pool.lease() as resources:
+        pass
+
+    mock_open.assert_awaited_once()
+    mock_close.assert_awaited_once_with(resources)
+    assert pool.counters()["cold_leases"] == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_lease_falls_back_to_cold_set(mock_open: AsyncMock, mock_close: AsyncMock) -> None:
+    pool = BrowserPool()
+    await pool.start()
+
+    async with pool.lease() as warm, pool.lease() as cold:
+        assert warm is not cold
+
+    mock_close.assert_awaited_once_with(cold)
+    assert mock_open.await_count == 2  # noqa: PLR2004
+    assert pool.resources is warm
+
+@pytest.mark.asyncio
+async def test_recycles_after_navigation_limit(mock_open: AsyncMock, mock_close: AsyncMock) -> None:
+    pool = BrowserPool(max_navigations=10)
+    await pool.start()
+
+    async with pool.lease() as first:
+        first.page_pool.acquisitions = 10
+    async with pool.lease() as second:
+        pass
+
+    assert first is not second
+    mock_close.assert_awaited_once_with(first)
+    assert mock_open.await_count == 2  # noqa: PLR2004
+    assert pool.counters()["recycles"] == 1
+
+@pytest.mark.asyncio
+async def test_recycles_above_rss_limit(mock_open: AsyncMock, mock_close: AsyncMock, low_rss: MagicMock) -> None:
+    pool = BrowserPool(rss_limit_mb=500)
+    await pool.start()
+    low_rss.return_value = 650.0
+
+    async with pool.lease() as first:
+        pass
+    await pool.warming
+
+    mock_close.assert_awaited_once_with(first)
+    assert pool.resources is not first
+    assert mock_open.await_count == 2  # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_unhealthy_warm_set_is_replaced_before_lease(
+    mock_open: AsyncMock,  # noqa: ARG001
+    mock_close: AsyncMock,
+) -> None:
+    pool = BrowserPool()
+    await pool.start()
+    await pool.warming
+    crashed = pool.resources
+    crashed.browser.is_connected.return_value = False
+
+    async with pool.lease() as resources:
+        assert resources is not crashed
+
+    mock_close.assert_awaited_once_with(crashed)
+    assert pool.counters()["health_failures"] == 1
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_is_retried_on_lease(mock_open: AsyncMock) -> None:
+    mock_open.side_effect = [RuntimeError("chromium failed to launch"), make_resources()]
+    pool = BrowserPool()
+
+    with patch("sentry_sdk.capture_exception"):
+        await pool.start()
+        async with pool.lease() as resources:
+            pass
+
+    assert pool.resources is resources
+    assert pool.counters()["warm_leases"] == 1
+
+@pytest.mark.asyncio
+async def test_close_releases_warm_resources(mock_open: AsyncMock, mock_close: AsyncMock) -> None:  # noqa: ARG001
+    pool = BrowserPool()
+    await pool.start()
+    await asyncio.sleep(0)
+
+    await pool.close()
+
+    mock_close.assert_awaited_once()
+    assert pool.resources is None
+    async with pool.lease():
+        pass
+    assert pool.counters()["cold_leases"] == 1
+
+@pytest.mark.asyncio
+async def test_browser_fallback_leases_once_and_only_when_needed(mock_open: AsyncMock, mock_close: AsyncMock) -> None:
+    fallback = BrowserFallback(BrowserPool())
+
+    await fallback.close()
+    mock_open.assert_not_awaited()
+
+    fallback = BrowserFallback(BrowserPool())
+    first, second = await asyncio.gather(fallback.lease(), fallback.lease())
+    assert first is second
+    mock_open.assert_awaited_once()
+
+    await fallback.close()
+    mock_close.assert_awaited_once_with(first)
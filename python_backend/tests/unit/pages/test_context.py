@@ -3,8 +3,13 @@ from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from pages.context import setup_scraping_context, teardown_scraping_context
-from utils.constants import CONCURRENT_JOBS_NUM
+from pages.context import (
+    create_sharded_page_pool,
+    launch_browser,
+    setup_scraping_context,
+    teardown_scraping_context,
+)
+from utils.constants import CONCURRENT_JOBS_NUM, PAGE_POOL_MIN_PAGES
 
 
 @pytest.mark.asyncio
@@ -32,7 +37,9 @@ async def test_setup_scraping_context_success(
     result = await setup_scraping_context()
 
     mock_retry_with_backoff.assert_awaited()
-    mock_page_pool_cls.assert_called_once_with(mock_context, max_pages=CONCURRENT_JOBS_NUM)
+    mock_page_pool_cls.assert_called_once_with(
+        mock_context, max_pages=CONCURRENT_JOBS_NUM, min_pages=PAGE_POOL_MIN_PAGES
+    )
     mock_page_pool.init_pages.assert_awaited_once()
 
     assert result == (mock_playwright, mock_browser, mock_page_pool)
@@ -105,3 +112,77 @@ async def test_teardown_scraping_context_playwright_error(mock_capture_exception
     mock_capture_exception.assert_called_once()
     args, _ = mock_capture_exception.call_args
     assert "Playwright stop error" in str(args[0])
+
+@pytest.mark.asyncio
+@patch.dict("os.environ", {"BROWSER_SHARDS": "2", "CONTEXTS_PER_BROWSER": "2"})
+@patch("pages.context.create_context", new_callable=AsyncMock)
+@patch("pages.context.launch_browser", new_callable=AsyncMock)
+@patch("pages.context.async_playwright")
+async def test_setup_scraping_context_sharded(
+    mock_async_playwright: MagicMock,
+    mock_launch_browser: AsyncMock,
+    mock_create_context: AsyncMock
+) -> None:
+    mock_async_playwright.return_value.start = AsyncMock()
+    browsers = [MagicMock(name="Browser0"), MagicMock(name="Browser1")]
+    mock_launch_browser.side_effect = browsers
+    contexts = [AsyncMock(name=f"Context{i}") for i in range(4)]
+    mock_create_context.side_effect = contexts
+
+    _, browser, page_pool = await setup_scraping_context()
+
+    assert browser.browsers == browsers
+    # 2 x 2 shards are capped at one page each, so the contexts alternate between the browsers
+    shard_count = min(4, CONCURRENT_JOBS_NUM)
+    assert [call.args[0] for call in mock_create_context.await_args_list] == [*browsers, *browsers][:shard_count]
+    assert [shard.context for shard in page_pool.shards] == contexts[:shard_count]
+    assert page_pool.max_pages == CONCURRENT_JOBS_NUM
+    # Browsers shared by several contexts run multi-process so the contexts do not share one renderer
+    assert all(call.kwargs == {"single_process": False} for call in mock_launch_browser.await_args_list)
+
+@pytest.mark.asyncio
+@patch("pages.context.create_context", new_callable=AsyncMock)
+@patch("pages.context.launch_browser", new_callable=AsyncMock)
+@patch("pages.context.async_playwright")
+async def test_create_sharded_page_pool_keeps_one_context_browsers_single_process(
+    mock_async_playwright: MagicMock,
+    mock_launch_browser: AsyncMock,
+    mock_create_context: AsyncMock
+) -> None:
+    mock_async_playwright.return_value.start = AsyncMock()
+    mock_launch_browser.side_effect = [MagicMock(name="Browser0"), MagicMock(name="Browser1")]
+    mock_create_context.side_effect = [AsyncMock(name="Context0"), AsyncMock(name="Context1")]
+
+    await create_sharded_page_pool(2, 1)
+
+    assert [call.kwargs for call in mock_launch_browser.await_args_list] == [{"single_process": True}] * 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("single_process", [True, False])
+async def test_launch_browser_single_process_flags(single_process: bool) -> None:
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock()
+
+    await launch_browser(playwright, single_process=single_process)
+
+    args = playwright.chromium.launch.await_args.kwargs["args"]
+    assert ("--single-process" in args) is single_process
+    assert ("--no-zygote" in args) is single_process
+
+@pytest.mark.asyncio
+@patch("pages.context.launch_browser", new_callable=AsyncMock)
+@patch("pages.context.async_playwright")
+async def test_create_sharded_page_pool_cleans_up_on_launch_failure(
+    mock_async_playwright: MagicMock,
+    mock_launch_browser: AsyncMock
+) -> None:
+    playwright = AsyncMock()
+    mock_async_playwright.return_value.start = AsyncMock(return_value=playwright)
+    launched = AsyncMock()
+    mock_launch_browser.side_effect = [launched, RuntimeError("no chromium")]
+
+    with pytest.raises(RuntimeError, match="no chromium"):
+        await create_sharded_page_pool(2, 1)
+
+    launched.close.assert_awaited()
+    playwright.stop.assert_awaited_once()
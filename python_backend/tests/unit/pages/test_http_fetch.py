@@ -0,0 +1,91 @@
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from pages.http_fetch import HttpFetchStats, blocked_reason, fetch_html, get_fetch_mode
+from utils.constants import FETCH_MODE_BROWSER, FETCH_MODE_HTTP, JOB_PAGE_MARKER
+
+JOB_URL = "https://www.seek.com.au/job/81234567"
+JOB_HTML = f"<html><body><h1 {JOB_PAGE_MARKER}>Junior Engineer</h1>{'<p>Build things.</p>' * 100}</body></html>"
+
+
+@pytest.fixture(autouse=True)
+def stats() -> HttpFetchStats:
+    with patch("pages.http_fetch.http_fetch_stats", HttpFetchStats()) as stats:
+        yield stats
+
+def make_client(status_code: int = 200, text: str = JOB_HTML, content_type: str = "text/html") -> httpx.AsyncClient:
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code, text=text, headers={"content-type": content_type})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+def test_get_fetch_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("FETCH_MODE", raising=False)
+    assert get_fetch_mode() == FETCH_MODE_BROWSER
+    assert get_fetch_mode("HTTP") == FETCH_MODE_HTTP
+
+    monkeypatch.setenv("FETCH_MODE", FETCH_MODE_HTTP)
+    assert get_fetch_mode() == FETCH_MODE_HTTP
+
+    with pytest.raises(ValueError, match="Unknown fetch mode"):
+        get_fetch_mode("curl")
+
+@pytest.mark.parametrize(
+    ("status_code", "text", "content_type", "expected"),
+    [
+        (200, JOB_HTML, "text/html; charset=utf-8", None),
+        (403, JOB_HTML, "text/html", "status 403"),
+        (200, "{}", "application/json", "content type 'application/json'"),
+        (200, "<html></html>", "text/html", "13 byte body"),
+        (200, JOB_HTML.replace("<body>", "<body><div id='px-captcha'></div>"), "text/html", "challenge marker"),
+    ],
+)
+def test_blocked_reason(status_code: int, text: str, content_type: str, expected: str | None) -> None:
+    response = httpx.Response(status_code, text=text, headers={"content-type": content_type})
+
+    reason = blocked_reason(response)
+
+    if expected is None:
+        assert reason is None
+    else:
+        assert reason.startswith(expected)
+
+@pytest.mark.asyncio
+async def test_fetch_html_success(stats: HttpFetchStats) -> None:
+    async with make_client() as client:
+        html = await fetch_html(JOB_URL, client, required_marker=JOB_PAGE_MARKER)
+
+    assert html == JOB_HTML
+    assert stats.fetched == 1
+    assert stats.bytes == len(JOB_HTML)
+
+@pytest.mark.asyncio
+@patch("pages.http_fetch.sentry_sdk.capture_message")
+async def test_fetch_html_blocked(mock_capture_message: MagicMock, stats: HttpFetchStats) -> None:
+    async with make_client(status_code=429) as client:
+        html = await fetch_html(JOB_URL, client)
+
+    assert html is None
+    assert stats.blocked == 1
+    mock_capture_message.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_fetch_html_missing_marker_is_incomplete(stats: HttpFetchStats) -> None:
+    async with make_client(text=JOB_HTML.replace(JOB_PAGE_MARKER, "")) as client:
+        html = await fetch_html(JOB_URL, client, required_marker=JOB_PAGE_MARKER)
+
+    assert html is None
+    assert stats.incomplete == 1
+
+@pytest.mark.asyncio
+async def test_fetch_html_network_error(stats: HttpFetchStats) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        msg = "connection refused"
+        raise httpx.ConnectError(msg, request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        html = await fetch_html(JOB_URL, client)
+
+    assert html is None
+    assert stats.errors == 1
+    assert stats.fetched == 0
@@ -1,31 +1,70 @@
 import asyncio
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from pages.listing_handler import extract_job_urls_from_markdown, process_job_listing_page, scrape_pages
-from utils.context import ScrapeContext
+from jobs.store import SeenJobStore
+from pages.http_fetch import HttpFetchStats
+from pages.listing_handler import fetch_listing_page, process_job_listing_page, scrape_pages, select_listing_jobs
+from pages.listing_parser import LISTING_SOURCE_EMBEDDED, ListingJob, ListingPage, ListingParseStats
+from utils.context import JobClaims, ScrapeContext
 
 EXPECTED_PAGES_PROCESSED = 2
+TOTAL_PAGES = 3
+
+
+def make_ctx(**overrides: object) -> ScrapeContext:
+    return ScrapeContext(**{
+        "crawler": AsyncMock(),
+        "page_pool": AsyncMock(),
+        "location_search": "Sydney",
+        "terminate_event": asyncio.Event(),
+        "semaphore": asyncio.Semaphore(1),
+        "day_range_limit": 3,
+        **overrides,
+    })
+
+def make_job(job_id: str, days_ago: int | None = 0, *, promoted: bool = False) -> ListingJob:
+    listing_date = datetime.now(UTC) - timedelta(days=days_ago) if days_ago is not None else None
+    return ListingJob(
+        job_id=job_id,
+        job_url=f"https://www.seek.com.au/job/{job_id}?origin=cardTitle",
+        listing_date=listing_date,
+        promoted=promoted,
+    )
 
-@patch("pages.listing_handler.extract_job_urls")
-def test_extract_job_urls_success(mock_extract_job_urls: MagicMock) -> None:
-    markdown = "some markdown with links"
-    job_urls = ["https://seek.com.au/job/123", "https://seek.com.au/job/456"]
-    mock_extract_job_urls.return_value = job_urls
-
-    result = extract_job_urls_from_markdown(markdown)
+def make_listing(*jobs: ListingJob) -> ListingPage:
+    return ListingPage(list(jobs), total_count=len(jobs), source=LISTING_SOURCE_EMBEDDED, markdown="## Job Markdown")
+
+@pytest.fixture(autouse=True)
+def fresh_listing_parse_stats() -> ListingParseStats:
+    with patch("pages.listing_handler.listing_parse_stats", ListingParseStats()) as stats:
+        yield stats
+
+def test_select_listing_jobs_skips_stale_and_claimed_jobs(fresh_listing_parse_stats: ListingParseStats) -> None:
+    job_claims = JobClaims()
+    job_claims.claim("https://www.seek.com.au/job/2?origin=jobCard")
+    listing = make_listing(
+        make_job("1"),
+        make_job("2"),
+        make_job("3", days_ago=None),
+        make_job("4", days_ago=10),
+    )
 
-    assert result == job_urls
+    job_urls, reached_stale = select_listing_jobs(listing, make_ctx(job_claims=job_claims))
 
-@patch("pages.listing_handler.extract_job_urls")
-def test_extract_job_urls_empty(mock_extract_job_urls: MagicMock) -> None:
-    markdown = "markdown with no job links"
-    mock_extract_job_urls.return_value = []
+    assert job_urls == [listing.jobs[0].job_url, listing.jobs[2].job_url]
+    assert reached_stale
+    assert fresh_listing_parse_stats.counters()["stale_skipped"] == 1
+    assert fresh_listing_parse_stats.counters()["duplicates_skipped"] == 1
 
-    result = extract_job_urls_from_markdown(markdown)
+def test_select_listing_jobs_promoted_stale_job_does_not_end_search() -> None:
+    listing = make_listing(make_job("1", days_ago=30, promoted=True), make_job("2"))
 
-    assert result is None
+    job_urls, reached_stale = select_listing_jobs(listing, make_ctx())
 
+    assert job_urls == [listing.jobs[1].job_url]
+    assert not reached_stale
 
 @pytest.mark.asyncio
 @patch("pages.listing_handler.backoff_if_high_cpu", new_callable=AsyncMock)
@@ -33,103 +72,90 @@ def test_extract_job_urls_empty(mock_extract_job_urls: MagicMock) -> None:
 @patch("pages.listing_handler.insert_jobs_into_database", new_callable=AsyncMock)
 @patch("pages.listing_handler.validate_jobs", new_callable=AsyncMock)
 @patch("pages.listing_handler.process_jobs_concurrently", new_callable=AsyncMock)
-@patch("pages.listing_handler.extract_job_urls_from_markdown")
-@patch("pages.listing_handler.fetch_page_markdown", new_callable=AsyncMock)
 async def test_process_job_listing_page_success(
-    mock_fetch_markdown: AsyncMock,
-    mock_extract_urls: MagicMock,
     mock_process_jobs: AsyncMock,
     mock_validate_jobs: AsyncMock,
     mock_insert_jobs: AsyncMock,
     mock_pause_briefly: AsyncMock, # noqa: ARG001
     mock_backoff_if_high_cpu: AsyncMock, # noqa: ARG001
 ) -> None:
-    mock_fetch_markdown.return_value = "## Job Markdown"
-    mock_extract_urls.return_value = ["https://seek.com.au/job/123"]
     mock_process_jobs.return_value = ([{"title": "Software Engineer"}], False)
     mock_validate_jobs.return_value = [{"title": "Software Engineer"}]
-    mock_insert_jobs.return_value = 11
-
-    ctx = ScrapeContext(
-        crawler=AsyncMock(),
-        page_pool=AsyncMock(),
-        location_search="Sydney",
-        terminate_event=asyncio.Event(),
-        semaphore=asyncio.Semaphore(1),
-        day_range_limit=3
-    )
+    mock_insert_jobs.return_value = 1
+    ctx = make_ctx()
+    listing = make_listing(make_job("123"))
 
     result = await process_job_listing_page(
         base_url="https://seek.com.au/jobs",
         ctx=ctx,
         page_num=1,
-        job_count=10,
+        listing=listing,
     )
 
-    assert result == {"job_count": 11, "terminated_early": False}
-    mock_fetch_markdown.assert_awaited_once()
-    mock_extract_urls.assert_called_once()
-    mock_process_jobs.assert_awaited_once()
+    assert result == {"job_count": 1, "terminated_early": False}
+    mock_process_jobs.assert_awaited_once_with([listing.jobs[0].job_url], ctx, 1)
     mock_validate_jobs.assert_awaited_once()
-    mock_insert_jobs.assert_awaited_once()
+    mock_insert_jobs.assert_awaited_once_with([{"title": "Software Engineer"}], 1, 0)
 
 @pytest.mark.asyncio
-@patch("pages.listing_handler.fetch_page_markdown", new_callable=AsyncMock)
-async def test_process_job_listing_page_empty_markdown(mock_fetch_markdown: AsyncMock) -> None:
-    mock_fetch_markdown.return_value = ""
+@patch("pages.listing_handler.backoff_if_high_cpu", new_callable=AsyncMock)
+@patch("pages.listing_handler.pause_briefly", new_callable=AsyncMock)
+@patch("pages.listing_handler.insert_jobs_into_database", new_callable=AsyncMock)
+@patch("pages.listing_handler.validate_jobs", new_callable=AsyncMock)
+@patch("pages.listing_handler.process_jobs_concurrently", new_callable=AsyncMock)
+async def test_process_job_listing_page_discards_hashes_of_unsaved_jobs(
+    mock_process_jobs: AsyncMock,
+    mock_validate_jobs: AsyncMock,
+    mock_insert_jobs: AsyncMock,
+    mock_pause_briefly: AsyncMock, # noqa: ARG001
+    mock_backoff_if_high_cpu: AsyncMock, # noqa: ARG001
+) -> None:
+    listing = make_listing(make_job("123"), make_job("456"), make_job("789"))
+    saved_job = {"job_url": listing.jobs[0].job_url, "title": "Software Engineer"}
+    # Jobs 456 (dropped by validation) and 789 (failed parsing) also had their content hashes staged
+    mock_process_jobs.return_value = ([saved_job, {"job_url": listing.jobs[1].job_url}], False)
+    mock_validate_jobs.return_value = [saved_job]
+    mock_insert_jobs.return_value = 1
 
-    ctx = ScrapeContext(
-        crawler=AsyncMock(),
-        page_pool=AsyncMock(),
-        location_search="Sydney",
-        terminate_event=asyncio.Event(),
-        semaphore=asyncio.Semaphore(1),
-        day_range_limit=3
-    )
+    with SeenJobStore(":memory:") as job_store:
+        for job in listing.jobs:
+            job_store.stage_content_hash(job.job_url, f"hash-{job.job_id}")
+
+        await process_job_listing_page("https://seek.com.au/jobs", make_ctx(job_store=job_store), 1, listing)
 
+        assert job_store.pending_hashes == {}
+        assert job_store.get("123").content_hash == "hash-123"
+        assert job_store.get("456") is None
+
+@pytest.mark.asyncio
+async def test_process_job_listing_page_missing_listing() -> None:
     result = await process_job_listing_page(
         base_url="https://seek.com.au/jobs",
-        ctx=ctx,
+        ctx=make_ctx(),
         page_num=1,
-        job_count=5,
+        listing=None,
     )
 
-    assert result == {"job_count": 5, "terminated_early": False}
+    assert result == {"job_count": 0, "terminated_early": False}
 
 @pytest.mark.asyncio
 @patch("pages.listing_handler.sentry_sdk.capture_message")
 @patch("pages.listing_handler.sentry_sdk.push_scope")
-@patch("pages.listing_handler.extract_job_urls_from_markdown")
-@patch("pages.listing_handler.fetch_page_markdown", new_callable=AsyncMock)
 async def test_process_job_listing_page_no_urls_found(
-    mock_fetch_markdown: AsyncMock,
-    mock_extract_urls: MagicMock,
     mock_push_scope: MagicMock,
     mock_capture_message: MagicMock
 ) -> None:
-    mock_fetch_markdown.return_value = "some markdown but no urls"
-    mock_extract_urls.return_value = []
-
     scope = MagicMock()
     mock_push_scope.return_value.__enter__.return_value = scope
 
-    ctx = ScrapeContext(
-        crawler=AsyncMock(),
-        page_pool=AsyncMock(),
-        location_search="Sydney",
-        terminate_event=asyncio.Event(),
-        semaphore=asyncio.Semaphore(1),
-        day_range_limit=3
-    )
-
     result = await process_job_listing_page(
         base_url="https://seek.com.au/jobs",
-        ctx=ctx,
+        ctx=make_ctx(),
         page_num=2,
-        job_count=7,
+        listing=make_listing(),
     )
 
-    assert result == {"job_count": 7, "terminated_early": False}
+    assert result == {"job_count": 0, "terminated_early": False}
     mock_capture_message.assert_called_once_with(
         "No job urls found in markdown on page 2", level="warning"
     )
@@ -138,44 +164,66 @@ async def test_process_job_listing_page_no_urls_found(
 
 @pytest.mark.asyncio
 @patch("pages.listing_handler.process_jobs_concurrently", new_callable=AsyncMock)
-@patch("pages.listing_handler.extract_job_urls_from_markdown")
-@patch("pages.listing_handler.fetch_page_markdown", new_callable=AsyncMock)
-async def test_process_job_listing_page_terminated_early(
-    mock_fetch_markdown: AsyncMock,
-    mock_extract_urls: MagicMock,
-    mock_process_jobs: AsyncMock,
-) -> None:
-    mock_fetch_markdown.return_value = "## markdown content"
-    mock_extract_urls.return_value = ["https://seek.com.au/job/456"]
+async def test_process_job_listing_page_terminated_early(mock_process_jobs: AsyncMock) -> None:
     mock_process_jobs.return_value = (None, True)
 
-    ctx = ScrapeContext(
-        crawler=AsyncMock(),
-        page_pool=AsyncMock(),
-        location_search="Sydney",
-        terminate_event=asyncio.Event(),
-        semaphore=asyncio.Semaphore(1),
-        day_range_limit=3
-    )
-
     result = await process_job_listing_page(
         base_url="https://seek.com.au/jobs",
-        ctx=ctx,
+        ctx=make_ctx(),
         page_num=3,
-        job_count=4,
+        listing=make_listing(make_job("456")),
     )
 
-    assert result == {"job_count": 4, "terminated_early": True}
-    mock_fetch_markdown.assert_awaited_once()
-    mock_extract_urls.assert_called_once()
+    assert result == {"job_count": 0, "terminated_early": True}
     mock_process_jobs.assert_awaited_once()
 
 @pytest.mark.asyncio
+@patch("pages.listing_handler.process_jobs_concurrently", new_callable=AsyncMock)
+async def test_process_job_listing_page_all_stale_opens_no_job_pages(mock_process_jobs: AsyncMock) -> None:
+    result = await process_job_listing_page(
+        base_url="https://seek.com.au/jobs",
+        ctx=make_ctx(),
+        page_num=4,
+        listing=make_listing(make_job("789", days_ago=5)),
+    )
+
+    assert result == {"job_count": 0, "terminated_early": True}
+    mock_process_jobs.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("pages.listing_handler.fetch_page_content", new_callable=AsyncMock)
+@patch("pages.listing_handler.fetch_page_content_over_http", new_callable=AsyncMock)
+async def test_fetch_listing_page_falls_back_when_http_listing_has_no_jobs(
+    mock_fetch_over_http: AsyncMock,
+    mock_fetch_content: AsyncMock,
+) -> None:
+    markdown = "# 1 job\n[Dev](https://www.seek.com.au/job/42?type=standard&origin=cardTitle)"
+    mock_fetch_over_http.return_value = ("# 1 job", "<html></html>")
+    mock_fetch_content.return_value = (markdown, None)
+    resources = MagicMock()
+    ctx = make_ctx(
+        crawler=None,
+        page_pool=None,
+        http_client=MagicMock(),
+        browser_fallback=MagicMock(lease=AsyncMock(return_value=resources)),
+    )
+
+    with patch("pages.listing_handler.http_fetch_stats", HttpFetchStats()) as stats:
+        listing = await fetch_listing_page("https://seek.com.au/jobs?keywords=dev", ctx, 1)
+
+    assert [job.job_id for job in listing.jobs] == ["42"]
+    mock_fetch_content.assert_awaited_once_with("https://seek.com.au/jobs?keywords=dev", resources.crawler, 1)
+    assert stats.incomplete == 1
+    assert stats.fallbacks == 1
+
+@pytest.mark.asyncio
+@patch("pages.listing_handler.fetch_listing_page", new_callable=AsyncMock)
 @patch("pages.listing_handler.process_job_listing_page", new_callable=AsyncMock)
-async def test_scrape_pages_normal_completion(mock_process_page: AsyncMock) -> None:
+async def test_scrape_pages_normal_completion(mock_process_page: AsyncMock, mock_fetch_listing: AsyncMock) -> None:
+    mock_fetch_listing.return_value = make_listing()
     mock_process_page.side_effect = [
         {"job_count": 3, "terminated_early": False},
-        {"job_count": 6, "terminated_early": False},
+        {"job_count": 3, "terminated_early": False},
     ]
 
     ctx = ScrapeContext(
@@ -199,14 +247,23 @@ async def test_scrape_pages_normal_completion(mock_process_page: AsyncMock) -> N
     }
 
     assert mock_process_page.await_count == EXPECTED_PAGES_PROCESSED
+    assert mock_fetch_listing.await_count == EXPECTED_PAGES_PROCESSED
 
 @pytest.mark.asyncio
+@patch("pages.listing_handler.fetch_listing_page", new_callable=AsyncMock)
 @patch("pages.listing_handler.process_job_listing_page", new_callable=AsyncMock)
-async def test_scrape_pages_early_termination(mock_process_page: AsyncMock) -> None:
-    mock_process_page.side_effect = [
-        {"job_count": 2, "terminated_early": False},
-        {"job_count": 2, "terminated_early": True},
-    ]
+async def test_scrape_pages_early_termination(mock_process_page: AsyncMock, mock_fetch_listing: AsyncMock) -> None:
+    mock_fetch_listing.return_value = make_listing()
+    processed_pages = []
+
+    async def fake_process_page(_base_url: str, ctx: ScrapeContext, page_num: int, _listing: str) -> dict:
+        processed_pages.append(page_num)
+        if page_num == EXPECTED_PAGES_PROCESSED:
+            ctx.terminate(page_num, 0)
+            return {"job_count": 0, "terminated_early": True}
+        return {"job_count": 2, "terminated_early": False}
+
+    mock_process_page.side_effect = fake_process_page
 
     ctx = ScrapeContext(
         crawler=AsyncMock(),
@@ -231,7 +288,43 @@ async def test_scrape_pages_early_termination(mock_process_page: AsyncMock) -> N
         "terminated_early": True
     }
 
-    assert mock_process_page.await_count == EXPECTED_PAGES_PROCESSED
+    assert processed_pages == [1, 2]
+
+@pytest.mark.asyncio
+@patch("pages.listing_handler.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.listing_handler.process_job_listing_page", new_callable=AsyncMock)
+async def test_scrape_pages_prefetches_next_listing_while_processing(
+    mock_process_page: AsyncMock,
+    mock_fetch_listing: AsyncMock
+) -> None:
+    events = []
 
+    async def fake_fetch(_base_url: str, _ctx: ScrapeContext, page_num: int) -> str:
+        events.append(f"fetch {page_num}")
+        return f"listing {page_num}"
+
+    async def fake_process_page(_base_url: str, _ctx: ScrapeContext, page_num: int, listing: str) -> dict:
+        assert listing == f"listing {page_num}"
+        events.append(f"start {page_num}")
+        await asyncio.sleep(0.01)
+        events.append(f"end {page_num}")
+        return {"job_count": 1, "terminated_early": False}
+
+    mock_fetch_listing.side_effect = fake_fetch
+    mock_process_page.side_effect = fake_process_page
+
+    ctx = ScrapeContext(
+        crawler=AsyncMock(),
+        page_pool=AsyncMock(),
+        location_search="Sydney",
+        terminate_event=asyncio.Event(),
+        semaphore=asyncio.Semaphore(1),
+        day_range_limit=3
+    )
 
+    result = await scrape_pages(base_url="https://seek.com.au/jobs", ctx=ctx, total_pages=3)
 
+    assert result == {"message": "Scraped and inserted 3 jobs.", "terminated_early": False}
+    assert events.index("fetch 2") < events.index("end 1")
+    assert events.index("start 2") < events.index("end 1")
+    assert mock_fetch_listing.await_count == TOTAL_PAGES
@@ -0,0 +1,163 @@
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pages.listing_parser import (
+    LISTING_SOURCE_EMBEDDED,
+    LISTING_SOURCE_MARKDOWN,
+    ListingJob,
+    ListingParseStats,
+    extract_search_state,
+    is_recent_listing,
+    parse_listing_page,
+    parse_search_state,
+)
+from utils.constants import LISTING_STATE_MARKER
+from utils.utils import extract_job_urls
+
+DATA_PATH = Path(__file__).parent.parent.parent / "data"
+LISTING_HTML = (DATA_PATH / "sample_first_page.html").read_text(encoding="utf-8")
+LISTING_MARKDOWN = (DATA_PATH / "sample_first_page_markdown.md").read_text(encoding="utf-8")
+STATE_LINE = next(line for line in LISTING_HTML.splitlines(keepends=True) if line.startswith(LISTING_STATE_MARKER))
+LISTED_JOBS = 22
+TOTAL_COUNT = 758
+
+
+@pytest.fixture(autouse=True)
+def stats() -> ListingParseStats:
+    with patch("pages.listing_parser.listing_parse_stats", ListingParseStats()) as stats:
+        yield stats
+
+def make_state_html(jobs: list, total_count: int = 2) -> str:
+    state = {"results": {"results": {"jobs": jobs, "totalCount": total_count}}}
+    return f"<script>{LISTING_STATE_MARKER} = {json.dumps(state)};\nwindow.OTHER = {{}};</script>"
+
+def replace_state_line(html: str, replacement: str) -> str:
+    # Keeps the rest of the listing page (job cards, the other window globals) as it is
+    lines = html.splitlines(keepends=True)
+    return "".join(replacement if line.startswith(LISTING_STATE_MARKER) else line for line in lines)
+
+def test_parse_listing_page_reads_embedded_state(stats: ListingParseStats) -> None:
+    listing = parse_listing_page(LISTING_HTML, LISTING_MARKDOWN)
+
+    assert listing.source == LISTING_SOURCE_EMBEDDED
+    assert len(listing.jobs) == LISTED_JOBS
+    assert listing.total_count == TOTAL_COUNT
+    first = listing.jobs[0]
+    assert first.job_id == "84088921"
+    assert first.title == "Lead Developer"
+    assert first.advertiser == "Talent International"
+    assert first.listing_date == datetime(2025, 5, 20, 6, 30, tzinfo=UTC)
+    assert not first.promoted
+    assert stats.counters() == {
+        "embedded": 1,
+        "markdown": 0,
+        "state_missing": 0,
+        "state_misses": 0,
+        "jobs_unparsed": 0,
+        "jobs_listed": LISTED_JOBS,
+        "stale_skipped": 0,
+        "duplicates_skipped": 0,
+    }
+
+def test_embedded_job_urls_match_markdown_links() -> None:
+    listing = parse_listing_page(LISTING_HTML, LISTING_MARKDOWN)
+
+    assert [job.job_url for job in listing.jobs] == extract_job_urls(LISTING_MARKDOWN)
+
+def test_embedded_empty_salary_is_none() -> None:
+    listing = parse_listing_page(LISTING_HTML, LISTING_MARKDOWN)
+
+    assert any(job.salary is None for job in listing.jobs)
+    assert all(job.salary != "" for job in listing.jobs)
+
+@pytest.mark.parametrize(
+    ("html", "missing", "misses"),
+    [
+        (None, 0, 0),
+        ("<html><body>No state here</body></html>", 1, 0),
+        (f"<script>{LISTING_STATE_MARKER} = {{not json}};</script>", 1, 0),
+        (make_state_html([]), 0, 1),
+        (make_state_html([{"id": "not-a-job"}]), 0, 1),
+        (f'<script>{LISTING_STATE_MARKER} = {{"search": {{}}}};</script>', 0, 1),
+    ],
+)
+def test_parse_listing_page_falls_back_to_markdown(
+    html: str | None, missing: int, misses: int, stats: ListingParseStats
+) -> None:
+    listing = parse_listing_page(html, LISTING_MARKDOWN)
+
+    assert listing.source == LISTING_SOURCE_MARKDOWN
+    assert len(listing.jobs) == LISTED_JOBS
+    assert listing.total_count == TOTAL_COUNT
+    assert listing.jobs[0].job_id == "84088921"
+    assert (stats.markdown, stats.state_missing, stats.state_misses) == (1, missing, misses)
+
+@pytest.mark.parametrize(
+    ("replacement", "missing", "misses"),
+    [
+        ("", 1, 0),
+        (STATE_LINE[: len(STATE_LINE) // 2] + "\n", 1, 0),
+        (STATE_LINE.replace('"jobs":', '"items":', 1), 0, 1),
+        (STATE_LINE.replace('"results": {"isLoading"', '"searchResults": {"isLoading"', 1), 0, 1),
+    ],
+    ids=["state_removed", "state_truncated", "jobs_key_renamed", "results_key_renamed"],
+)
+def test_listing_page_without_usable_state_falls_back_to_the_same_jobs(
+    replacement: str, missing: int, misses: int, stats: ListingParseStats
+) -> None:
+    embedded = parse_listing_page(LISTING_HTML, LISTING_MARKDOWN)
+
+    listing = parse_listing_page(replace_state_line(LISTING_HTML, replacement), LISTING_MARKDOWN)
+
+    assert listing.source == LISTING_SOURCE_MARKDOWN
+    assert [job.job_id for job in listing.jobs] == [job.job_id for job in embedded.jobs]
+    assert listing.total_count == embedded.total_count
+    assert (stats.embedded, stats.markdown, stats.state_missing, stats.state_misses) == (1, 1, missing, misses)
+
+def test_extract_search_state_stops_at_the_state_object() -> None:
+    state = extract_search_state(make_state_html([{"id": 1}], total_count=5))
+
+    assert state == {"results": {"results": {"jobs": [{"id": 1}], "totalCount": 5}}}
+
+def test_parse_search_state_dedupes_and_reads_newer_shape(stats: ListingParseStats) -> None:
+    raw_jobs = [
+        {
+            "id": "111",
+            "title": "Backend Engineer",
+            "companyName": "Acme",
+            "locations": [{"label": "Parramatta NSW"}],
+            "salaryLabel": "$120k",
+            "listingDate": "2025-05-19T00:00:00Z",
+            "displayType": "promoted",
+        },
+        {"id": "111", "title": "Backend Engineer"},
+        {"id": "not-a-job"},
+        "garbage",
+    ]
+
+    jobs, total_count = parse_search_state({"results": {"results": {"jobs": raw_jobs, "totalCount": 2}}})
+
+    assert total_count == 2  # noqa: PLR2004
+    assert jobs == [
+        ListingJob(
+            job_id="111",
+            job_url="https://www.seek.com.au/job/111?type=promoted&ref=search-standalone&origin=cardTitle",
+            title="Backend Engineer",
+            advertiser="Acme",
+            listing_date=datetime(2025, 5, 19, tzinfo=UTC),
+            location="Parramatta NSW",
+            salary="$120k",
+            promoted=True,
+        ),
+    ]
+    assert stats.jobs_unparsed == 2  # noqa: PLR2004
+
+def test_is_recent_listing() -> None:
+    now = datetime(2025, 5, 20, 12, tzinfo=UTC)
+
+    assert is_recent_listing(ListingJob("1", "url", listing_date=datetime(2025, 5, 19, 12, tzinfo=UTC)), 3, now)
+    assert not is_recent_listing(ListingJob("2", "url", listing_date=datetime(2025, 5, 1, tzinfo=UTC)), 3, now)
+    assert is_recent_listing(ListingJob("3", "url"), 3, now)
@@ -1,14 +1,25 @@
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from pages.pool import PagePool
+from pages.pool import PagePool, PagePoolStats, page_pool_averages
 
 MAX_PAGES = 3
 
+def make_page(name: str = "Page") -> AsyncMock:
+    page = AsyncMock(name=name)
+    page.is_closed = MagicMock(return_value=False)
+    return page
+
+@pytest.fixture(autouse=True)
+def fresh_page_pool_stats() -> PagePoolStats:
+    with patch("pages.pool.page_pool_stats", PagePoolStats()) as stats:
+        yield stats
+
 @pytest.mark.asyncio
 async def test_init_pages() -> None:
     mock_context = AsyncMock()
-    fake_page = AsyncMock()
+    fake_page = make_page()
     mock_context.new_page.return_value = fake_page
 
     pool = PagePool(mock_context, max_pages=MAX_PAGES)
@@ -20,7 +31,7 @@ async def test_init_pages() -> None:
 @pytest.mark.asyncio
 async def test_acquire_and_release() -> None:
     mock_context = AsyncMock()
-    fake_pages = [AsyncMock(name=f"Page{i}") for i in range(MAX_PAGES)]
+    fake_pages = [make_page(f"Page{i}") for i in range(MAX_PAGES)]
     mock_context.new_page.side_effect = fake_pages
 
     pool = PagePool(mock_context, max_pages=MAX_PAGES)
@@ -42,7 +53,7 @@ async def test_acquire_and_release() -> None:
 @pytest.mark.asyncio
 async def test_close_all_pages() -> None:
     mock_context = AsyncMock()
-    fake_pages = [AsyncMock(name=f"Page{i}") for i in range(MAX_PAGES)]
+    fake_pages = [make_page(f"Page{i}") for i in range(MAX_PAGES)]
     mock_context.new_page.side_effect = fake_pages
 
     pool = PagePool(mock_context, max_pages=MAX_PAGES)
@@ -58,7 +69,7 @@ async def test_close_all_pages() -> None:
 @pytest.mark.asyncio
 async def test_acquire_release_full_flow() -> None:
     mock_context = AsyncMock()
-    page = AsyncMock()
+    page = make_page()
     mock_context.new_page.return_value = page
 
     pool = PagePool(mock_context, max_pages=1)
@@ -70,3 +81,163 @@ async def test_acquire_release_full_flow() -> None:
     second_acquire = await pool.acquire()
     assert second_acquire == page
 
+@pytest.mark.asyncio
+async def test_release_resets_page_to_blank() -> None:
+    mock_context = AsyncMock()
+    page = make_page()
+    mock_context.new_page.return_value = page
+    pool = PagePool(mock_context, max_pages=1)
+    await pool.init_pages()
+
+    await pool.release(await pool.acquire())
+
+    page.goto.assert_awaited_once_with("about:blank")
+    assert pool.pages.qsize() == 1
+
+@pytest.mark.asyncio
+async def test_release_replaces_crashed_and_hung_pages(fresh_page_pool_stats: PagePoolStats) -> None:
+    mock_context = AsyncMock()
+    crashed, hung, replacement_1, replacement_2 = (make_page(f"Page{i}") for i in range(4))
+    hung.goto.side_effect = TimeoutError("navigation stuck")
+    mock_context.new_page.side_effect = [crashed, hung, replacement_1, replacement_2]
+    pool = PagePool(mock_context, max_pages=2)
+    await pool.init_pages()
+
+    first, second = await pool.acquire(), await pool.acquire()
+    crashed.is_closed.return_value = True
+    await pool.release(first)
+    await pool.release(second)
+
+    assert pool.all_pages == [replacement_1, replacement_2]
+    assert {await pool.acquire(), await pool.acquire()} == {replacement_1, replacement_2}
+    hung.close.assert_awaited_once()
+    assert fresh_page_pool_stats.replaced == 2  # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_acquire_skips_page_that_died_while_idle() -> None:
+    mock_context = AsyncMock()
+    dead, alive = make_page("dead"), make_page("alive")
+    mock_context.new_page.side_effect = [dead, alive]
+    pool = PagePool(mock_context, max_pages=1)
+    await pool.init_pages()
+    dead.is_closed.return_value = True
+
+    assert await pool.acquire() is alive
+    assert pool.all_pages == [alive]
+
+@pytest.mark.asyncio
+async def test_pool_grows_to_max_then_waits(fresh_page_pool_stats: PagePoolStats) -> None:
+    mock_context = AsyncMock()
+    mock_context.new_page.side_effect = [make_page(f"Page{i}") for i in range(MAX_PAGES)]
+    pool = PagePool(mock_context, max_pages=MAX_PAGES, min_pages=1)
+    await pool.init_pages()
+    assert len(pool.all_pages) == 1
+
+    pages = [await pool.acquire() for _ in range(MAX_PAGES)]
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await pool.release(pages[0])
+
+    assert await waiter is pages[0]
+    assert mock_context.new_page.await_count == MAX_PAGES
+    assert fresh_page_pool_stats.grown == MAX_PAGES - 1
+    assert fresh_page_pool_stats.waited == 1
+
+@pytest.mark.asyncio
+async def test_pool_shrinks_idle_pages_to_min(fresh_page_pool_stats: PagePoolStats) -> None:
+    mock_context = AsyncMock()
+    mock_context.new_page.side_effect = [make_page(f"Page{i}") for i in range(MAX_PAGES)]
+    pool = PagePool(mock_context, max_pages=MAX_PAGES, min_pages=1, idle_seconds=0)
+    await pool.init_pages()
+    pages = [await pool.acquire() for _ in range(MAX_PAGES)]
+
+    for page in pages:
+        await pool.release(page)
+
+    assert pool.all_pages == [pages[-1]]
+    assert pool.pages.qsize() == 1
+    assert fresh_page_pool_stats.shrunk == MAX_PAGES - 1
+
+@pytest.mark.asyncio
+async def test_close_all_closes_checked_out_pages() -> None:
+    mock_context = AsyncMock()
+    fake_pages = [make_page(f"Page{i}") for i in range(MAX_PAGES)]
+    mock_context.new_page.side_effect = fake_pages
+    pool = PagePool(mock_context, max_pages=MAX_PAGES)
+    await pool.init_pages()
+    checked_out = await pool.acquire()
+
+    await pool.close_all()
+    await pool.release(checked_out)
+
+    for page in fake_pages:
+        page.close.assert_awaited()
+    checked_out.goto.assert_not_awaited()
+    assert pool.pages.qsize() == 0
+    assert pool.all_pages == []
+
+@pytest.mark.asyncio
+@patch("pages.pool.sentry_sdk")
+async def test_failed_replacement_hands_the_free_slot_to_a_waiter(mock_sentry: MagicMock) -> None:
+    mock_context = AsyncMock()
+    hung, fresh = make_page("Hung"), make_page("Fresh")
+    hung.goto.side_effect = TimeoutError
+    mock_context.new_page.side_effect = [hung, RuntimeError("context busy"), fresh]
+    pool = PagePool(mock_context, max_pages=1)
+    await pool.init_pages()
+    page = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+
+    await pool.release(page)
+
+    assert await asyncio.wait_for(waiter, timeout=1) is fresh
+    assert pool.all_pages == [fresh]
+    mock_sentry.capture_exception.assert_called_once()
+
+@pytest.mark.asyncio
+@patch("pages.pool.PAGE_OPEN_RETRY_DELAY", 0)
+@patch("pages.pool.sentry_sdk")
+async def test_waiter_retries_opening_a_replacement_page(mock_sentry: MagicMock) -> None:
+    mock_context = AsyncMock()
+    crashed, fresh = make_page("Crashed"), make_page("Fresh")
+    mock_context.new_page.side_effect = [crashed, RuntimeError("context busy"), fresh]
+    pool = PagePool(mock_context, max_pages=1)
+    await pool.init_pages()
+    page = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+
+    # Crashed while checked out: it is queued as is, and the waiter replaces it
+    pool.checked_out.pop(page)
+    await pool.put_idle(page)
+    crashed.is_closed.return_value = True
+
+    assert await asyncio.wait_for(waiter, timeout=1) is fresh
+    assert pool.size == 1
+    mock_sentry.capture_exception.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_close_all_wakes_waiters() -> None:
+    mock_context = AsyncMock()
+    mock_context.new_page.side_effect = [make_page()]
+    pool = PagePool(mock_context, max_pages=1)
+    await pool.init_pages()
+    await pool.acquire()
+    waiters = [asyncio.create_task(pool.acquire()) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    await pool.close_all()
+
+    for waiter in waiters:
+        with pytest.raises(RuntimeError, match="closed"):
+            await asyncio.wait_for(waiter, timeout=1)
+
+def test_page_pool_averages() -> None:
+    counters = {"acquisitions": 4, "wait_seconds": 0.2, "hold_seconds": 8.0}
+
+    assert page_pool_averages(counters) == {"avg_wait_ms": 50.0, "avg_hold_ms": 2000.0}
+    assert page_pool_averages({}) == {"avg_wait_ms": 0.0, "avg_hold_ms": 0.0}
+
@@ -0,0 +1,107 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pages.request_filter import (
+    BLOCKED_HOST,
+    BLOCKED_PATTERN,
+    BLOCKED_RESOURCE_TYPE,
+    BLOCKED_THIRD_PARTY,
+    RequestFilter,
+    RequestFilterStats,
+    get_request_filter,
+    request_filter_averages,
+)
+
+JOB_URL = "https://www.seek.com.au/job/81234567"
+
+
+@pytest.fixture
+def request_filter() -> RequestFilter:
+    with patch("pages.request_filter.request_filter_stats", RequestFilterStats()):
+        yield RequestFilter(
+            blocked_resource_types={"image", "font"},
+            third_party_resource_types={"script", "xhr"},
+            allowed_hosts={"seek.com.au"},
+            blocked_hosts={"google-analytics.com"},
+            blocked_url_patterns=[r"/pixel(?:[/?.]|$)"],
+        )
+
+def make_route(url: str, resource_type: str) -> AsyncMock:
+    route = AsyncMock()
+    route.request = MagicMock(url=url, resource_type=resource_type)
+    return route
+
+@pytest.mark.parametrize(
+    ("url", "resource_type", "expected"),
+    [
+        (JOB_URL, "document", None),
+        ("https://www.seek.com.au/static/app.js", "script", None),
+        ("https://www.seek.com.au/logo.png", "image", BLOCKED_RESOURCE_TYPE),
+        ("https://ssl.google-analytics.com/collect", "document", BLOCKED_HOST),
+        ("https://ads.example.com/pixel?id=1", "document", BLOCKED_PATTERN),
+        ("https://www.seek.com.au/pixel?id=1", "document", None),
+        ("https://cdn.example.com/widget.js", "script", BLOCKED_THIRD_PARTY),
+        ("https://api.example.com/v1", "xhr", BLOCKED_THIRD_PARTY),
+        ("https://cdn.example.com/page", "document", None),
+        ("data:text/plain,hello", "other", None),
+    ],
+)
+def test_block_reason(request_filter: RequestFilter, url: str, resource_type: str, expected: str | None) -> None:
+    assert request_filter.block_reason(url, resource_type) == expected
+
+def test_allowed_host_does_not_match_lookalike(request_filter: RequestFilter) -> None:
+    assert request_filter.block_reason("https://notseek.com.au/app.js", "script") == BLOCKED_THIRD_PARTY
+
+@pytest.mark.asyncio
+async def test_handle_aborts_or_continues_and_counts(request_filter: RequestFilter) -> None:
+    allowed = make_route(JOB_URL, "document")
+    blocked = make_route("https://www.seek.com.au/logo.png", "image")
+
+    await request_filter.handle(allowed)
+    await request_filter.handle(blocked)
+
+    allowed.continue_.assert_awaited_once()
+    allowed.abort.assert_not_awaited()
+    blocked.abort.assert_awaited_once_with("blockedbyclient")
+    counters = request_filter.stats.counters()
+    assert counters["allowed"] == 1
+    assert counters["navigations"] == 1
+    assert counters["blocked"] == 1
+    assert counters["blocked_resource_type"] == 1
+
+@pytest.mark.asyncio
+async def test_attach_routes_context_and_counts_response_bytes(request_filter: RequestFilter) -> None:
+    context = MagicMock(route=AsyncMock())
+    chunked = MagicMock(headers={})
+    chunked.request.sizes = AsyncMock(return_value={"responseBodySize": 1024, "responseHeadersSize": 300})
+    closed = MagicMock(headers={})
+    closed.request.sizes = AsyncMock(side_effect=RuntimeError("Target page, context or browser has been closed"))
+
+    await request_filter.attach(context)
+
+    context.route.assert_awaited_once_with("**/*", request_filter.handle)
+    record_response = context.on.call_args.args[1]
+    await record_response(MagicMock(headers={"content-length": "2048"}))
+    await record_response(chunked)
+    await record_response(closed)
+    assert request_filter.stats.counters()["allowed_bytes"] == 3072  # noqa: PLR2004
+
+def test_request_filter_averages() -> None:
+    counters = {"allowed": 10, "blocked": 30, "allowed_bytes": 40960, "navigations": 4}
+
+    assert request_filter_averages(counters) == {
+        "allowed_per_page": 2.5,
+        "blocked_per_page": 7.5,
+        "kb_per_page": 10.0,
+    }
+    assert request_filter_averages({**counters, "navigations": 0})["kb_per_page"] == 0.0
+
+@patch.dict("os.environ", {
+    "REQUEST_FILTER_ALLOWED_HOSTS": "Seek.com.au, example.org",
+    "REQUEST_FILTER_BLOCKED_HOSTS": "",
+})
+def test_get_request_filter_reads_env_overrides() -> None:
+    request_filter = get_request_filter()
+
+    assert request_filter.allowed_hosts == {"seek.com.au", "example.org"}
+    assert request_filter.blocked_hosts == set()
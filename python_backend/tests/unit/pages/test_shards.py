@@ -0,0 +1,104 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pages.pool import PagePool, PagePoolStats
+from pages.shards import BrowserGroup, ShardedPagePool, split_evenly
+from utils.constants import PAGE_ASSIGNMENT_LEAST_LOAD, PAGE_ASSIGNMENT_ROUND_ROBIN
+
+
+def make_page(name: str = "Page") -> AsyncMock:
+    page = AsyncMock(name=name)
+    page.is_closed = MagicMock(return_value=False)
+    return page
+
+def make_shard(max_pages: int) -> PagePool:
+    context = AsyncMock()
+    context.new_page.side_effect = lambda: make_page()
+    return PagePool(context, max_pages=max_pages, min_pages=0)
+
+@pytest.fixture(autouse=True)
+def fresh_page_pool_stats() -> PagePoolStats:
+    with patch("pages.pool.page_pool_stats", PagePoolStats()) as stats:
+        yield stats
+
+def test_split_evenly() -> None:
+    assert split_evenly(10, 3) == [4, 3, 3]
+    assert split_evenly(2, 4) == [1, 1, 0, 0]
+
+def test_unknown_assignment_raises() -> None:
+    with pytest.raises(ValueError, match="Unknown page assignment"):
+        ShardedPagePool([make_shard(1)], assignment="random")
+
+@pytest.mark.asyncio
+async def test_round_robin_rotates_shards() -> None:
+    shards = [make_shard(2), make_shard(2)]
+    pool = ShardedPagePool(shards, assignment=PAGE_ASSIGNMENT_ROUND_ROBIN)
+
+    pages = [await pool.acquire() for _ in range(4)]
+
+    assert [pool.owners[page] for page in pages] == [shards[0], shards[1], shards[0], shards[1]]
+    assert pool.max_pages == 4  # noqa: PLR2004
+    assert pool.acquisitions == 4  # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_least_load_prefers_emptier_shard() -> None:
+    small, large = make_shard(1), make_shard(3)
+    pool = ShardedPagePool([small, large], assignment=PAGE_ASSIGNMENT_LEAST_LOAD)
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+    third = await pool.acquire()
+
+    assert pool.owners[first] is small
+    assert pool.owners[second] is large
+    assert pool.owners[third] is large
+    assert small.in_use == 1
+    assert large.in_use == 2  # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_round_robin_skips_full_shard() -> None:
+    shards = [make_shard(1), make_shard(3)]
+    pool = ShardedPagePool(shards, assignment=PAGE_ASSIGNMENT_ROUND_ROBIN)
+
+    pages = [await pool.acquire() for _ in range(3)]
+
+    assert [pool.owners[page] for page in pages] == [shards[0], shards[1], shards[1]]
+
+@pytest.mark.asyncio
+async def test_release_returns_page_to_owning_shard() -> None:
+    shards = [make_shard(1), make_shard(1)]
+    pool = ShardedPagePool(shards, assignment=PAGE_ASSIGNMENT_ROUND_ROBIN)
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+    await pool.release(second)
+
+    assert shards[1].pages.qsize() == 1
+    assert shards[0].pages.qsize() == 0
+    assert pool.owners == {first: shards[0]}
+    assert len(pool.all_pages) == 2  # noqa: PLR2004
+
+@pytest.mark.asyncio
+async def test_init_and_close_all_cover_every_shard() -> None:
+    shards = [AsyncMock(), AsyncMock()]
+    pool = ShardedPagePool(shards)
+
+    await pool.init_pages()
+    await pool.close_all()
+
+    for shard in shards:
+        shard.init_pages.assert_awaited_once()
+        shard.close_all.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_browser_group_closes_every_browser() -> None:
+    healthy, broken = AsyncMock(), AsyncMock()
+    healthy.is_connected = MagicMock(return_value=True)
+    broken.is_connected = MagicMock(return_value=False)
+    broken.close.side_effect = RuntimeError("already gone")
+    group = BrowserGroup([healthy, broken])
+
+    assert not group.is_connected()
+    with pytest.raises(RuntimeError, match="already gone"):
+        await group.close()
+    healthy.close.assert_awaited_once()
@@ -1,8 +1,15 @@
-
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from app.main import scrape_job_listing
+from app.main import scrape_job_listing, scrape_job_listings
+from pages.listing_parser import parse_listing_markdown
+from utils.context import ScrapeContext, ScrapeQuery
+
+
+@pytest.fixture(autouse=True)
+def in_memory_job_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("JOB_STORE_PATH", ":memory:")
 
 
 @pytest.mark.asyncio
@@ -10,15 +17,15 @@ from app.main import scrape_job_listing
 @patch("sentry_sdk.capture_message")
 @patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
 @patch("app.main.scrape_pages", new_callable=AsyncMock)
-@patch("app.main.fetch_page_markdown", new_callable=AsyncMock)
-@patch("app.main.AsyncWebCrawler")
-@patch("app.main.setup_scraping_context", new_callable=AsyncMock)
-@patch("app.main.teardown_scraping_context", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler")
+@patch("pages.browser_pool.setup_scraping_context", new_callable=AsyncMock)
+@patch("pages.browser_pool.teardown_scraping_context", new_callable=AsyncMock)
 async def test_scrape_job_listing_happy_path(
     mock_teardown: AsyncMock,
     mock_setup: AsyncMock,
     mock_crawler_class: MagicMock,
-    mock_fetch_markdown: AsyncMock,
+    mock_fetch_listing: AsyncMock,
     mock_scrape_pages: AsyncMock,
     mock_send_summary: AsyncMock,
     mock_capture_message: MagicMock, # noqa: ARG001
@@ -26,8 +33,8 @@ async def test_scrape_job_listing_happy_path(
 ) -> None:
     mock_setup.return_value = ("playwright", "browser", "page_pool")
     mock_crawler_instance = AsyncMock()
-    mock_crawler_class.return_value.__aenter__.return_value = mock_crawler_instance
-    mock_fetch_markdown.return_value = "# 22 jobs listed"
+    mock_crawler_class.return_value = mock_crawler_instance
+    mock_fetch_listing.return_value = parse_listing_markdown("# 22 jobs listed")
     mock_scrape_pages.return_value = {
         "message": "Scraped and inserted 22 jobs.",
         "terminated_early": False,
@@ -37,6 +44,74 @@ async def test_scrape_job_listing_happy_path(
     assert result == {
         "message": "Scraped and inserted 22 jobs.",
         "terminated_early": False,
+        "job_store": {"reused": 0, "parsed": 0},
+        "llm_cache": {"hits": 0, "misses": 0},
+        "llm_scheduler": {"requests": 0, "rate_limited": 0, "cancelled": 0, "total_wait_seconds": 0},
+        "markdown_trimmer": {"jobs": 0, "tokens_in": 0, "tokens_saved": 0},
+        "rule_engine": {
+            "work_model_hits": 0,
+            "experience_level_hits": 0,
+            "work_model_misses": 0,
+            "experience_level_misses": 0,
+            "hit_rate": 0.0
+        },
+        "browser_pool": {"warm_leases": 0, "cold_leases": 1, "recycles": 0, "health_failures": 0},
+        "page_pool": {
+            "acquisitions": 0,
+            "waited": 0,
+            "wait_seconds": 0,
+            "hold_seconds": 0,
+            "replaced": 0,
+            "grown": 0,
+            "shrunk": 0,
+            "avg_wait_ms": 0.0,
+            "avg_hold_ms": 0.0,
+        },
+        "request_filter": {
+            "allowed": 0,
+            "blocked": 0,
+            "allowed_bytes": 0,
+            "navigations": 0,
+            "blocked_resource_type": 0,
+            "blocked_host": 0,
+            "blocked_pattern": 0,
+            "blocked_third_party": 0,
+            "allowed_per_page": 0.0,
+            "blocked_per_page": 0.0,
+            "kb_per_page": 0.0,
+        },
+        "http_fetch": {
+            "fetched": 0,
+            "bytes": 0,
+            "seconds": 0,
+            "blocked": 0,
+            "incomplete": 0,
+            "errors": 0,
+            "fallbacks": 0,
+        },
+        "listing_parser": {
+            "embedded": 0,
+            "markdown": 0,
+            "state_missing": 0,
+            "state_misses": 0,
+            "jobs_unparsed": 0,
+            "jobs_listed": 0,
+            "stale_skipped": 0,
+            "duplicates_skipped": 0,
+        },
+        "json_blocks": {
+            "structured": 0,
+            "decoded": 0,
+            "repaired": 0,
+            "failed": 0,
+        },
+        "early_termination": {
+            "jobs_not_started": 0,
+            "jobs_dropped_queued": 0,
+            "jobs_cancelled_in_flight": 0,
+            "jobs_avoided": 0,
+        },
+        "fetch_mode": "browser",
     }
     mock_send_summary.assert_awaited_once()
     mock_teardown.assert_awaited_once()
@@ -45,23 +120,23 @@ async def test_scrape_job_listing_happy_path(
 @patch("sentry_sdk.capture_exception")
 @patch("sentry_sdk.capture_message")
 @patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
-@patch("app.main.fetch_page_markdown", new_callable=AsyncMock)
-@patch("app.main.AsyncWebCrawler")
-@patch("app.main.setup_scraping_context", new_callable=AsyncMock)
-@patch("app.main.teardown_scraping_context", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler")
+@patch("pages.browser_pool.setup_scraping_context", new_callable=AsyncMock)
+@patch("pages.browser_pool.teardown_scraping_context", new_callable=AsyncMock)
 async def test_scrape_job_listing_empty_markdown(
     mock_teardown: AsyncMock,
     mock_setup: AsyncMock,
     mock_crawler_class: MagicMock,
-    mock_fetch_markdown: AsyncMock,
+    mock_fetch_listing: AsyncMock,
     mock_send_summary: AsyncMock,
     mock_capture_message: MagicMock, # noqa: ARG001
     mock_capture_exception: MagicMock, # noqa: ARG001
 ) -> None:
     mock_setup.return_value = ("playwright", "browser", "page_pool")
     mock_crawler_instance = AsyncMock()
-    mock_crawler_class.return_value.__aenter__.return_value = mock_crawler_instance
-    mock_fetch_markdown.return_value = None
+    mock_crawler_class.return_value = mock_crawler_instance
+    mock_fetch_listing.return_value = None
 
     result = await scrape_job_listing("https://seek.com.au", location_search="sydney")
 
@@ -69,7 +144,7 @@ async def test_scrape_job_listing_empty_markdown(
         "message": "No job search markdown found. Scraped 0 jobs.",
         "terminated_early": False,
     }
-    mock_fetch_markdown.assert_awaited_once()
+    mock_fetch_listing.assert_awaited_once()
     mock_send_summary.assert_awaited_once_with(result)
     mock_teardown.assert_awaited_once()
 
@@ -77,23 +152,23 @@ async def test_scrape_job_listing_empty_markdown(
 @patch("sentry_sdk.capture_exception")
 @patch("sentry_sdk.capture_message")
 @patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
-@patch("app.main.fetch_page_markdown", new_callable=AsyncMock)
-@patch("app.main.AsyncWebCrawler")
-@patch("app.main.setup_scraping_context", new_callable=AsyncMock)
-@patch("app.main.teardown_scraping_context", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler")
+@patch("pages.browser_pool.setup_scraping_context", new_callable=AsyncMock)
+@patch("pages.browser_pool.teardown_scraping_context", new_callable=AsyncMock)
 async def test_scrape_job_listing_zero_jobs(
     mock_teardown: AsyncMock,
     mock_setup: AsyncMock,
     mock_crawler_class: MagicMock,
-    mock_fetch_markdown: AsyncMock,
+    mock_fetch_listing: AsyncMock,
     mock_send_summary: AsyncMock,
     mock_capture_message: MagicMock,
     mock_capture_exception: MagicMock,
 ) -> None:
     mock_setup.return_value = ("playwright", "browser", "page_pool")
     mock_crawler_instance = AsyncMock()
-    mock_crawler_class.return_value.__aenter__.return_value = mock_crawler_instance
-    mock_fetch_markdown.return_value = "# 0 jobs listed"
+    mock_crawler_class.return_value = mock_crawler_instance
+    mock_fetch_listing.return_value = parse_listing_markdown("# 0 jobs listed")
 
     result = await scrape_job_listing("https://seek.com.au", location_search="sydney")
 
@@ -101,7 +176,7 @@ async def test_scrape_job_listing_zero_jobs(
         "message": "No jobs found. Scraped 0 jobs.",
         "terminated_early": False,
     }
-    mock_fetch_markdown.assert_awaited_once()
+    mock_fetch_listing.assert_awaited_once()
     mock_send_summary.assert_awaited_once_with(result)
     mock_capture_message.assert_not_called()
     mock_capture_exception.assert_not_called()
@@ -112,18 +187,19 @@ async def test_scrape_job_listing_zero_jobs(
 @patch("sentry_sdk.capture_exception")
 @patch("sentry_sdk.capture_message")
 @patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
-@patch("app.main.AsyncWebCrawler")
+@patch("pages.browser_pool.AsyncWebCrawler")
 async def test_scrape_job_listing_crawler_init_fails(
     mock_crawler_class: MagicMock,
     mock_send_summary: AsyncMock,
     mock_capture_message: AsyncMock,
     mock_capture_exception: AsyncMock
 ) -> None:
-    mock_crawler_class.return_value.__aenter__.side_effect = RuntimeError("crawler init failed")
+    mock_crawler_class.return_value.start.side_effect = RuntimeError("crawler init failed")
 
     result = await scrape_job_listing("https://seek.com.au", location_search="sydney")
 
     assert "Fatal error during job scrape" in result["message"]
+    assert result["error"] == "RuntimeError: crawler init failed"
     mock_capture_exception.assert_called()
     mock_capture_message.assert_called_with("Failed initializing AsyncWebCrawler")
     mock_send_summary.assert_awaited_once_with(result)
@@ -131,22 +207,22 @@ async def test_scrape_job_listing_crawler_init_fails(
 @pytest.mark.asyncio
 @patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
 @patch("app.main.scrape_pages", new_callable=AsyncMock)
-@patch("app.main.fetch_page_markdown", new_callable=AsyncMock)
-@patch("app.main.AsyncWebCrawler")
-@patch("app.main.setup_scraping_context", new_callable=AsyncMock)
-@patch("app.main.teardown_scraping_context", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler")
+@patch("pages.browser_pool.setup_scraping_context", new_callable=AsyncMock)
+@patch("pages.browser_pool.teardown_scraping_context", new_callable=AsyncMock)
 async def test_scrape_job_listing_multiple_pages_no_early_exit(
     mock_teardown: AsyncMock,
     mock_setup: AsyncMock,
     mock_crawler_class: MagicMock,
-    mock_fetch_markdown: AsyncMock,
+    mock_fetch_listing: AsyncMock,
     mock_scrape_pages: AsyncMock,
     mock_send_summary: AsyncMock,
 ) -> None:
     mock_crawler_instance = AsyncMock()
-    mock_crawler_class.return_value.__aenter__.return_value = mock_crawler_instance
+    mock_crawler_class.return_value = mock_crawler_instance
     mock_setup.return_value = ("playwright", "browser", "page_pool")
-    mock_fetch_markdown.return_value = "## 66 jobs listed"
+    mock_fetch_listing.return_value = parse_listing_markdown("# 66 jobs listed")
     mock_scrape_pages.return_value = {
         "message": "Scraped and inserted 66 jobs.",
         "terminated_early": False
@@ -155,7 +231,75 @@ async def test_scrape_job_listing_multiple_pages_no_early_exit(
 
     assert result == {
         "message": "Scraped and inserted 66 jobs.",
-        "terminated_early": False
+        "terminated_early": False,
+        "job_store": {"reused": 0, "parsed": 0},
+        "llm_cache": {"hits": 0, "misses": 0},
+        "llm_scheduler": {"requests": 0, "rate_limited": 0, "cancelled": 0, "total_wait_seconds": 0},
+        "markdown_trimmer": {"jobs": 0, "tokens_in": 0, "tokens_saved": 0},
+        "rule_engine": {
+            "work_model_hits": 0,
+            "experience_level_hits": 0,
+            "work_model_misses": 0,
+            "experience_level_misses": 0,
+            "hit_rate": 0.0
+        },
+        "browser_pool": {"warm_leases": 0, "cold_leases": 1, "recycles": 0, "health_failures": 0},
+        "page_pool": {
+            "acquisitions": 0,
+            "waited": 0,
+            "wait_seconds": 0,
+            "hold_seconds": 0,
+            "replaced": 0,
+            "grown": 0,
+            "shrunk": 0,
+            "avg_wait_ms": 0.0,
+            "avg_hold_ms": 0.0,
+        },
+        "request_filter": {
+            "allowed": 0,
+            "blocked": 0,
+            "allowed_bytes": 0,
+            "navigations": 0,
+            "blocked_resource_type": 0,
+            "blocked_host": 0,
+            "blocked_pattern": 0,
+            "blocked_third_party": 0,
+            "allowed_per_page": 0.0,
+            "blocked_per_page": 0.0,
+            "kb_per_page": 0.0,
+        },
+        "http_fetch": {
+            "fetched": 0,
+            "bytes": 0,
+            "seconds": 0,
+            "blocked": 0,
+            "incomplete": 0,
+            "errors": 0,
+            "fallbacks": 0,
+        },
+        "listing_parser": {
+            "embedded": 0,
+            "markdown": 0,
+            "state_missing": 0,
+            "state_misses": 0,
+            "jobs_unparsed": 0,
+            "jobs_listed": 0,
+            "stale_skipped": 0,
+            "duplicates_skipped": 0,
+        },
+        "json_blocks": {
+            "structured": 0,
+            "decoded": 0,
+            "repaired": 0,
+            "failed": 0,
+        },
+        "early_termination": {
+            "jobs_not_started": 0,
+            "jobs_dropped_queued": 0,
+            "jobs_cancelled_in_flight": 0,
+            "jobs_avoided": 0,
+        },
+        "fetch_mode": "browser",
     }
     assert mock_scrape_pages.await_count == 1
     mock_send_summary.assert_awaited_once_with(result)
@@ -165,22 +309,22 @@ async def test_scrape_job_listing_multiple_pages_no_early_exit(
 @pytest.mark.asyncio
 @patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
 @patch("app.main.scrape_pages", new_callable=AsyncMock)
-@patch("app.main.fetch_page_markdown", new_callable=AsyncMock)
-@patch("app.main.AsyncWebCrawler")
-@patch("app.main.setup_scraping_context", new_callable=AsyncMock)
-@patch("app.main.teardown_scraping_context", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler")
+@patch("pages.browser_pool.setup_scraping_context", new_callable=AsyncMock)
+@patch("pages.browser_pool.teardown_scraping_context", new_callable=AsyncMock)
 async def test_scrape_job_listing_multiple_pages_with_early_exit(
     mock_teardown: AsyncMock,
     mock_setup: AsyncMock,
     mock_crawler_class: MagicMock,
-    mock_fetch_markdown: AsyncMock,
+    mock_fetch_listing: AsyncMock,
     mock_scrape_pages: AsyncMock,
     mock_send_summary: AsyncMock,
 ) -> None:
     mock_crawler_instance = AsyncMock()
-    mock_crawler_class.return_value.__aenter__.return_value = mock_crawler_instance
+    mock_crawler_class.return_value = mock_crawler_instance
     mock_setup.return_value = ("playwright", "browser", "page_pool")
-    mock_fetch_markdown.return_value = "## 66 jobs listed"
+    mock_fetch_listing.return_value = parse_listing_markdown("# 66 jobs listed")
     mock_scrape_pages.return_value = {
          "message": (
             "Scraped and inserted 57 jobs. Early termination triggered on page 3 "
@@ -196,10 +340,213 @@ async def test_scrape_job_listing_multiple_pages_with_early_exit(
             "Scraped and inserted 57 jobs. Early termination triggered on page 3 due to "
             "day range limit of 7 days."
         ),
-        "terminated_early": True
+        "terminated_early": True,
+        "job_store": {"reused": 0, "parsed": 0},
+        "llm_cache": {"hits": 0, "misses": 0},
+        "llm_scheduler": {"requests": 0, "rate_limited": 0, "cancelled": 0, "total_wait_seconds": 0},
+        "markdown_trimmer": {"jobs": 0, "tokens_in": 0, "tokens_saved": 0},
+        "rule_engine": {
+            "work_model_hits": 0,
+            "experience_level_hits": 0,
+            "work_model_misses": 0,
+            "experience_level_misses": 0,
+            "hit_rate": 0.0
+        },
+        "browser_pool": {"warm_leases": 0, "cold_leases": 1, "recycles": 0, "health_failures": 0},
+        "page_pool": {
+            "acquisitions": 0,
+            "waited": 0,
+            "wait_seconds": 0,
+            "hold_seconds": 0,
+            "replaced": 0,
+            "grown": 0,
+            "shrunk": 0,
+            "avg_wait_ms": 0.0,
+            "avg_hold_ms": 0.0,
+        },
+        "request_filter": {
+            "allowed": 0,
+            "blocked": 0,
+            "allowed_bytes": 0,
+            "navigations": 0,
+            "blocked_resource_type": 0,
+            "blocked_host": 0,
+            "blocked_pattern": 0,
+            "blocked_third_party": 0,
+            "allowed_per_page": 0.0,
+            "blocked_per_page": 0.0,
+            "kb_per_page": 0.0,
+        },
+        "http_fetch": {
+            "fetched": 0,
+            "bytes": 0,
+            "seconds": 0,
+            "blocked": 0,
+            "incomplete": 0,
+            "errors": 0,
+            "fallbacks": 0,
+        },
+        "listing_parser": {
+            "embedded": 0,
+            "markdown": 0,
+            "state_missing": 0,
+            "state_misses": 0,
+            "jobs_unparsed": 0,
+            "jobs_listed": 0,
+            "stale_skipped": 0,
+            "duplicates_skipped": 0,
+        },
+        "json_blocks": {
+            "structured": 0,
+            "decoded": 0,
+            "repaired": 0,
+            "failed": 0,
+        },
+        "early_termination": {
+            "jobs_not_started": 0,
+            "jobs_dropped_queued": 0,
+            "jobs_cancelled_in_flight": 0,
+            "jobs_avoided": 0,
+        },
+        "fetch_mode": "browser",
     }
     assert mock_scrape_pages.await_count == 1
     mock_send_summary.assert_awaited_once_with(result)
     mock_teardown.assert_awaited_once()
 
+@pytest.mark.asyncio
+@patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
+@patch("app.main.scrape_pages", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler")
+@patch("pages.browser_pool.setup_scraping_context", new_callable=AsyncMock)
+@patch("pages.browser_pool.teardown_scraping_context", new_callable=AsyncMock)
+async def test_scrape_job_listings_shares_browser_and_worker_pool(
+    mock_teardown: AsyncMock,
+    mock_setup: AsyncMock,
+    mock_crawler_class: MagicMock,
+    mock_fetch_listing: AsyncMock,
+    mock_scrape_pages: AsyncMock,
+    mock_send_summary: AsyncMock,
+) -> None:
+    mock_crawler_instance = AsyncMock()
+    mock_crawler_class.return_value = mock_crawler_instance
+    mock_setup.return_value = ("playwright", "browser", "page_pool")
+    mock_fetch_listing.return_value = parse_listing_markdown("# 22 jobs listed")
+    contexts = []
+
+    async def mock_scrape_pages_func(_base_url: str, ctx: ScrapeContext, _total_pages: int) -> dict:
+        contexts.append(ctx)
+        ctx.job_claims.claim("https://www.seek.com.au/job/1")
+        return {"message": "Scraped and inserted 1 jobs.", "terminated_early": ctx.location_search == "melbourne"}
+
+    mock_scrape_pages.side_effect = mock_scrape_pages_func
+
+    result = await scrape_job_listings([
+        ScrapeQuery("software engineer", "sydney"),
+        ScrapeQuery("data engineer", "melbourne", max_pages=1, day_range_limit=3),
+    ])
+
+    assert result["message"] == "Scraped 2 queries, skipping 1 duplicate jobs."
+    assert result["terminated_early"] is True
+    assert result["queries"] == [
+        {"job_title": "software engineer", "location": "sydney",
+         "message": "Scraped and inserted 1 jobs.", "terminated_early": False},
+        {"job_title": "data engineer", "location": "melbourne",
+         "message": "Scraped and inserted 1 jobs.", "terminated_early": True},
+    ]
+    assert result["job_claims"] == {"claimed": 1, "duplicates": 1}
+    assert result["rule_engine"]["hit_rate"] == 0.0
+    sydney_ctx, melbourne_ctx = sorted(contexts, key=lambda ctx: ctx.day_range_limit, reverse=True)
+    assert (sydney_ctx.day_range_limit, melbourne_ctx.day_range_limit) == (7, 3)
+    assert sydney_ctx.semaphore is melbourne_ctx.semaphore
+    assert sydney_ctx.job_claims is melbourne_ctx.job_claims
+    assert sydney_ctx.terminate_event is not melbourne_ctx.terminate_event
+    assert mock_crawler_class.call_count == 1
+    mock_setup.assert_awaited_once()
+    mock_send_summary.assert_awaited_once_with(result)
+    mock_teardown.assert_awaited_once()
+
+@pytest.mark.asyncio
+@patch("sentry_sdk.capture_exception")
+@patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
+@patch("app.main.scrape_pages", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.AsyncWebCrawler")
+@patch("pages.browser_pool.setup_scraping_context", new_callable=AsyncMock)
+@patch("pages.browser_pool.teardown_scraping_context", new_callable=AsyncMock)
+async def test_scrape_job_listings_failed_query_does_not_stop_batch(
+    mock_teardown: AsyncMock,
+    mock_setup: AsyncMock,
+    mock_crawler_class: MagicMock,
+    mock_fetch_listing: AsyncMock,
+    mock_scrape_pages: AsyncMock,
+    mock_send_summary: AsyncMock, # noqa: ARG001
+    mock_capture_exception: MagicMock,
+) -> None:
+    mock_crawler_class.return_value = AsyncMock()
+    mock_setup.return_value = ("playwright", "browser", "page_pool")
+    mock_fetch_listing.side_effect = [RuntimeError("listing timed out"), parse_listing_markdown("# 22 jobs listed")]
+    mock_scrape_pages.return_value = {"message": "Scraped and inserted 22 jobs.", "terminated_early": False}
+
+    result = await scrape_job_listings([ScrapeQuery("software engineer", "sydney"), ScrapeQuery("tester", "perth")])
+
+    assert [query["message"] for query in result["queries"]] == [
+        "Query failed: RuntimeError: listing timed out",
+        "Scraped and inserted 22 jobs.",
+    ]
+    mock_capture_exception.assert_called_once()
+    mock_teardown.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
+@patch("app.main.scrape_pages", new_callable=AsyncMock)
+@patch("app.main.fetch_listing_page", new_callable=AsyncMock)
+@patch("pages.browser_pool.open_browser_resources", new_callable=AsyncMock)
+async def test_scrape_job_listing_http_mode_never_launches_browser(
+    mock_open_browser: AsyncMock,
+    mock_fetch_listing: AsyncMock,
+    mock_scrape_pages: AsyncMock,
+    mock_send_summary: AsyncMock,  # noqa: ARG001
+) -> None:
+    mock_fetch_listing.return_value = parse_listing_markdown("# 22 jobs listed")
+    contexts = []
+
+    async def mock_scrape_pages_func(_base_url: str, ctx: ScrapeContext, _total_pages: int) -> dict:
+        contexts.append(ctx)
+        return {"message": "Scraped and inserted 22 jobs.", "terminated_early": False}
+    mock_scrape_pages.side_effect = mock_scrape_pages_func
+
+    result = await scrape_job_listing("https://seek.com.au", location_search="sydney", fetch_mode="http")
+
+    assert result["fetch_mode"] == "http"
+    assert contexts[0].crawler is None
+    assert contexts[0].http_client is not None
+    assert contexts[0].http_client.is_closed
+    mock_open_browser.assert_not_awaited()
+
+@pytest.mark.asyncio
+@patch("app.main.send_scrape_summary_to_node", new_callable=AsyncMock)
+@patch("app.main.scrape_search", new_callable=AsyncMock)
+async def test_runs_in_one_process_take_turns(mock_scrape_search: AsyncMock, mock_send_summary: AsyncMock) -> None:  # noqa: ARG001
+    running = 0
+    overlapped = False
+
+    async def scrape(*_args: object) -> tuple[dict, bool]:
+        nonlocal running, overlapped
+        running += 1
+        overlapped = overlapped or running > 1
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"message": "No jobs found. Scraped 0 jobs.", "terminated_early": False}, False
+
+    mock_scrape_search.side_effect = scrape
+
+    await asyncio.gather(
+        scrape_job_listing("https://seek.com.au", location_search="sydney", fetch_mode="http"),
+        scrape_job_listings([ScrapeQuery("tester", "perth", fetch_mode="http")]),
+    )
 
+    assert mock_scrape_search.await_count == 2  # noqa: PLR2004
+    assert not overlapped
@@ -0,0 +1,180 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.workers import ScrapeWorkerSupervisor, run_claimed_task, run_scrape_task, worker_loop
+from concurrency.scrape_queue import DONE, FAILED, RUNNING, ScrapeQueue
+from utils.context import ScrapeQuery
+
+
+@pytest.fixture
+def scrape_queue() -> ScrapeQueue:
+    with ScrapeQueue(":memory:") as scrape_queue:
+        yield scrape_queue
+
+def make_process(*, alive: bool = True) -> MagicMock:
+    process = MagicMock()
+    process.is_alive.return_value = alive
+    return process
+
+@pytest.fixture
+def supervisor() -> ScrapeWorkerSupervisor:
+    supervisor = ScrapeWorkerSupervisor(":memory:", worker_count=2)
+    supervisor.mp = MagicMock()
+    supervisor.mp.Process.side_effect = lambda **_kwargs: make_process()
+    supervisor.mp.Event.side_effect = MagicMock
+    return supervisor
+
+@pytest.mark.asyncio
+@patch("app.workers.scrape_job_listings", new_callable=AsyncMock)
+@patch("app.workers.scrape_job_listing", new_callable=AsyncMock)
+async def test_run_scrape_task_dispatches_single_and_batch(
+    mock_scrape_job_listing: AsyncMock,
+    mock_scrape_job_listings: AsyncMock,
+    scrape_queue: ScrapeQueue,
+) -> None:
+    query = ScrapeQuery("software engineer", "sydney", max_pages=2, day_range_limit=3)
+    scrape_queue.enqueue([query])
+    scrape_queue.enqueue([query, ScrapeQuery("tester", "perth")])
+
+    await run_scrape_task(scrape_queue.claim("worker-1"))
+    await run_scrape_task(scrape_queue.claim("worker-1"))
+
+    mock_scrape_job_listing.assert_awaited_once_with(
+        query.base_url, "sydney", max_pages=2, day_range_limit=3, fetch_mode=None
+    )
+    mock_scrape_job_listings.assert_awaited_once_with([query, ScrapeQuery("tester", "perth")])
+
+@pytest.mark.asyncio
+@patch("sentry_sdk.capture_exception")
+@patch("app.workers.run_scrape_task", new_callable=AsyncMock)
+async def test_run_claimed_task_records_summary_or_error(
+    mock_run_scrape_task: AsyncMock,
+    mock_capture_exception: MagicMock,
+    scrape_queue: ScrapeQueue,
+) -> None:
+    mock_run_scrape_task.side_effect = [
+        {"message": "Scraped and inserted 1 jobs."},
+        RuntimeError("browser crashed"),
+        {"message": "Fatal error during job scrape: ValueError: bad", "error": "ValueError: bad"},
+    ]
+    done_id = scrape_queue.enqueue([ScrapeQuery("software engineer", "sydney")])
+    failed_id = scrape_queue.enqueue([ScrapeQuery("software engineer", "sydney")])
+    reported_id = scrape_queue.enqueue([ScrapeQuery("software engineer", "sydney")])
+
+    for _ in range(3):
+        await run_claimed_task(scrape_queue, scrape_queue.claim("worker-1"), "worker-1")
+
+    assert scrape_queue.get(done_id).status == DONE
+    assert scrape_queue.get(done_id).summary == {"message": "Scraped and inserted 1 jobs."}
+    assert scrape_queue.get(failed_id).status == FAILED
+    assert scrape_queue.get(failed_id).error == "RuntimeError: browser crashed"
+    assert scrape_queue.get(reported_id).status == FAILED
+    assert scrape_queue.get(reported_id).error == "ValueError: bad"
+    mock_capture_exception.assert_called_once()
+
+@pytest.mark.asyncio
+@patch("app.workers.run_scrape_task", new_callable=AsyncMock)
+async def test_run_claimed_task_stops_when_the_lease_is_lost(
+    mock_run_scrape_task: AsyncMock,
+    tmp_path: pytest.TempPathFactory,
+) -> None:
+    cancelled = asyncio.Event()
+
+    async def scrape_forever(_task: object) -> dict:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    mock_run_scrape_task.side_effect = scrape_forever
+    with ScrapeQueue(str(tmp_path / "scrape_queue.sqlite3"), lease_seconds=0.03) as scrape_queue:
+        task_id = scrape_queue.enqueue([ScrapeQuery("software engineer", "sydney")])
+        task = scrape_queue.claim("worker-1")
+        # Another worker takes the task over before the first heartbeat
+        scrape_queue.conn.execute("UPDATE scrape_tasks SET worker_id = ? WHERE task_id = ?", ("worker-2", task_id))
+
+        await asyncio.wait_for(run_claimed_task(scrape_queue, task, "worker-1"), timeout=5)
+
+        assert cancelled.is_set()
+        assert scrape_queue.get(task_id).status == RUNNING
+        assert scrape_queue.get(task_id).worker_id == "worker-2"
+
+@pytest.mark.asyncio
+@patch("app.workers.browser_pool")
+@patch("app.workers.close_llm_client", new_callable=AsyncMock)
+@patch("app.workers.open_llm_client", new_callable=AsyncMock)
+@patch("app.workers.close_node_client", new_callable=AsyncMock)
+@patch("app.workers.open_node_client", new_callable=AsyncMock)
+@patch("app.workers.run_scrape_task", new_callable=AsyncMock)
+async def test_worker_loop_drains_queue_until_stopped(
+    mock_run_scrape_task: AsyncMock,
+    mock_open_node_client: AsyncMock,
+    mock_close_node_client: AsyncMock,
+    mock_open_llm_client: AsyncMock,
+    mock_close_llm_client: AsyncMock,
+    mock_browser_pool: MagicMock,
+    tmp_path: pytest.TempPathFactory,
+) -> None:
+    mock_browser_pool.start = AsyncMock()
+    mock_browser_pool.close = AsyncMock()
+    queue_path = str(tmp_path / "scrape_queue.sqlite3")
+    with ScrapeQueue(queue_path) as scrape_queue:
+        task_ids = [scrape_queue.enqueue([ScrapeQuery("software engineer", "sydney")]) for _ in range(2)]
+    stop_event = asyncio.Event()
+
+    async def run_then_stop(_task: object) -> dict:
+        if mock_run_scrape_task.await_count == len(task_ids):
+            stop_event.set()
+        return {"message": "ok"}
+
+    mock_run_scrape_task.side_effect = run_then_stop
+
+    await asyncio.wait_for(worker_loop("worker-1", queue_path, stop_event, poll_interval=0.01), timeout=5)
+
+    with ScrapeQueue(queue_path) as scrape_queue:
+        assert [scrape_queue.get(task_id).status for task_id in task_ids] == [DONE, DONE]
+    mock_open_node_client.assert_awaited_once()
+    mock_close_node_client.assert_awaited_once()
+    mock_open_llm_client.assert_awaited_once()
+    mock_close_llm_client.assert_awaited_once()
+    mock_browser_pool.start.assert_awaited_once()
+    mock_browser_pool.close.assert_awaited_once()
+
+def test_supervisor_scales_up_and_retires_newest_workers(supervisor: ScrapeWorkerSupervisor) -> None:
+    supervisor.start()
+    supervisor.scale(3)
+    newest = supervisor.workers["worker-3"]
+
+    supervisor.scale(1)
+
+    assert list(supervisor.workers) == ["worker-1"]
+    assert set(supervisor.retiring) == {"worker-2", "worker-3"}
+    newest.stop_event.set.assert_called_once()
+    assert supervisor.status()["target"] == 1
+    assert len(supervisor.status()["workers"]) == 3  # noqa: PLR2004
+
+def test_supervisor_restarts_crashed_workers_only(supervisor: ScrapeWorkerSupervisor) -> None:
+    supervisor.start()
+    supervisor.scale(1)
+    supervisor.workers["worker-1"].process.is_alive.return_value = False
+    supervisor.retiring["worker-2"].process.is_alive.return_value = False
+
+    assert supervisor.reap() == 1
+
+    assert list(supervisor.workers) == ["worker-3"]
+    assert supervisor.retiring == {}
+    assert supervisor.restarts == 1
+
+def test_supervisor_stop_terminates_stragglers(supervisor: ScrapeWorkerSupervisor) -> None:
+    supervisor.start()
+    processes = [handle.process for handle in supervisor.workers.values()]
+    processes[1].is_alive.return_value = True
+    processes[0].is_alive.return_value = False
+
+    supervisor.stop(timeout=0)
+
+    processes[0].terminate.assert_not_called()
+    processes[1].terminate.assert_called_once()
+    assert supervisor.workers == {}
@@ -0,0 +1,61 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from utils.load_sampler import BYTES_PER_MB, LoadSampler, current_load, load_sampler
+
+SMOOTHED_CPU = 55.0
+
+
+@patch("utils.load_sampler.psutil.cpu_percent", side_effect=[40.0, 70.0])
+def test_sample_applies_exponential_smoothing(mock_cpu_percent: MagicMock) -> None:
+    sampler = LoadSampler(interval=0.01, smoothing=0.5)
+    sampler._process = MagicMock()  # noqa: SLF001
+    sampler._process.memory_info.return_value.rss = 200 * BYTES_PER_MB  # noqa: SLF001
+
+    first = sampler.sample()
+    second = sampler.sample()
+
+    assert first.cpu_percent == 40.0  # noqa: PLR2004
+    assert second.cpu_percent == SMOOTHED_CPU
+    assert second.rss_mb == 200.0  # noqa: PLR2004
+    assert second.sampled_at is not None
+    for call in mock_cpu_percent.call_args_list:
+        assert call.kwargs == {"interval": None}
+
+@pytest.mark.asyncio
+@patch("utils.load_sampler.psutil.cpu_percent", return_value=80.0)
+async def test_start_publishes_samples_in_background(mock_cpu_percent: MagicMock) -> None:  # noqa: ARG001
+    sampler = LoadSampler(interval=0.01, smoothing=1.0)
+
+    sampler.start()
+    sampler.start()
+    await asyncio.sleep(0.05)
+
+    assert sampler.running
+    assert sampler.snapshot.cpu_percent == 80.0  # noqa: PLR2004
+
+    await sampler.stop()
+    assert not sampler.running
+
+@pytest.mark.asyncio
+@patch("utils.load_sampler.psutil.cpu_percent", return_value=12.0)
+async def test_current_load_without_sampler_is_non_blocking(mock_cpu_percent: MagicMock) -> None:
+    await load_sampler.stop()
+
+    snapshot = current_load()
+
+    assert snapshot.cpu_percent == 12.0  # noqa: PLR2004
+    mock_cpu_percent.assert_called_once_with(interval=None)
+
+@pytest.mark.asyncio
+@patch("utils.load_sampler.psutil.cpu_percent", return_value=30.0)
+async def test_shared_sampler_stops_after_last_user(mock_cpu_percent: MagicMock) -> None:  # noqa: ARG001
+    sampler = LoadSampler(interval=0.01)
+
+    async with sampler:
+        async with sampler:
+            assert sampler.running
+        assert sampler.running
+
+    assert not sampler.running
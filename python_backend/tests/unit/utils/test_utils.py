@@ -6,6 +6,7 @@ import pytest
 from freezegun import freeze_time
 from tzlocal import get_localzone
 from utils.constants import TOTAL_JOBS_PER_PAGE
+from utils.load_sampler import LoadSnapshot
 from utils.utils import (
     backoff_if_high_cpu,
     clean_string,
@@ -18,35 +19,41 @@ from utils.utils import (
     is_recent_job,
     normalize_keys,
     pause_briefly,
-    try_fix_missing_closing_brace,
 )
 
 
 @pytest.mark.asyncio
-@patch("utils.utils.psutil.cpu_percent", return_value=95)
+@patch("utils.utils.current_load", return_value=LoadSnapshot(cpu_percent=95))
 @patch("utils.utils.pause_briefly", new_callable=AsyncMock)
-async def test_backoff_if_high_cpu_hard(mock_pause: AsyncMock, mock_cpu_percent: int) -> None:  # noqa: ARG001
+async def test_backoff_if_high_cpu_hard(mock_pause: AsyncMock, mock_current_load: MagicMock) -> None:  # noqa: ARG001
     await backoff_if_high_cpu()
     mock_pause.assert_awaited_once_with(1.0, 3.0)
 
 @pytest.mark.asyncio
-@patch("utils.utils.psutil.cpu_percent", return_value=75)
+@patch("utils.utils.current_load", return_value=LoadSnapshot(cpu_percent=75))
 @patch("utils.utils.pause_briefly", new_callable=AsyncMock)
-async def test_backoff_if_high_cpu_soft(mock_pause: AsyncMock, mock_cpu_percent: int) -> None:  # noqa: ARG001
+async def test_backoff_if_high_cpu_soft(mock_pause: AsyncMock, mock_current_load: MagicMock) -> None:  # noqa: ARG001
     await backoff_if_high_cpu()
     mock_pause.assert_awaited_once_with(0.25, 0.75)
 
 @pytest.mark.asyncio
-@patch("utils.utils.psutil.cpu_percent", return_value=50)
+@patch("utils.utils.current_load", return_value=LoadSnapshot(cpu_percent=50))
 @patch("utils.utils.pause_briefly", new_callable=AsyncMock)
-async def test_backoff_if_high_cpu_normal(mock_pause: AsyncMock, mock_cpu_percent: int) -> None:  # noqa: ARG001
+async def test_backoff_if_high_cpu_normal(mock_pause: AsyncMock, mock_current_load: MagicMock) -> None:  # noqa: ARG001
     await backoff_if_high_cpu()
     mock_pause.assert_not_awaited()
 
+@pytest.mark.asyncio
+@patch("utils.utils.current_load", return_value=LoadSnapshot(cpu_percent=20, rss_mb=900))
+@patch("utils.utils.pause_briefly", new_callable=AsyncMock)
+async def test_backoff_if_high_memory(mock_pause: AsyncMock, mock_current_load: MagicMock) -> None:  # noqa: ARG001
+    await backoff_if_high_cpu(rss_limit_mb=800)
+    mock_pause.assert_awaited_once_with(0.25, 0.75)
+
 @pytest.mark.asyncio
 @patch("utils.utils.sentry_sdk.capture_exception")
 @patch("utils.utils.sentry_sdk.push_scope")
-@patch("utils.utils.psutil.cpu_percent", side_effect=RuntimeError("test error"))
+@patch("utils.utils.current_load", side_effect=RuntimeError("test error"))
 @patch("utils.utils.pause_briefly", new_callable=AsyncMock)
 async def test_backoff_if_high_cpu_exception(
     mock_pause: AsyncMock,
@@ -219,18 +226,3 @@ def test_flatten_field_with_empty() -> None:
 def test_normalize_keys(input_dict: dict, expected_output: dict) -> None:
     result = normalize_keys(input_dict)
     assert result == expected_output
-
-@pytest.mark.parametrize(("input_str", "expected_output"), [
-    (
-        '{"key": "value"',
-        '{"key": "value"}'
-    ),
-    (
-        '{"key": "value"}',
-        '{"key": "value"}'
-    ),
-])
-def test_try_fix_missing_closing_brace(input_str: str, expected_output: str) -> None:
-    assert try_fix_missing_closing_brace(input_str) == expected_output
-
-
@@ -2,8 +2,149 @@ DAY_RANGE_LIMIT = 7
 TOTAL_JOBS_PER_PAGE = 22
 MAX_RETRIES = 3
 CONCURRENT_JOBS_NUM = 3
+# The page pool grows from PAGE_POOL_MIN_PAGES up to CONCURRENT_JOBS_NUM pages and closes pages idle this long
+PAGE_POOL_MIN_PAGES = 1
+PAGE_POOL_IDLE_SECONDS = 60.0
+PAGE_RESET_TIMEOUT = 5.0
+# A waiter handed a free slot retries opening its page this many times, with a growing delay, before giving up
+PAGE_OPEN_ATTEMPTS = 3
+PAGE_OPEN_RETRY_DELAY = 0.5
+# Chromium browsers and contexts per browser the page pool is spread over. The 1 x 1 default is the unsharded pool,
+# so sharding stays off until BROWSER_SHARDS or CONTEXTS_PER_BROWSER is set in the environment. Browsers with more
+# than one context are launched without --single-process so each context gets its own renderer processes
+BROWSER_SHARDS = 1
+CONTEXTS_PER_BROWSER = 1
+PAGE_ASSIGNMENT_LEAST_LOAD = "least_load"
+PAGE_ASSIGNMENT_ROUND_ROBIN = "round_robin"
+PAGE_ASSIGNMENT = PAGE_ASSIGNMENT_LEAST_LOAD
+# Requests the job page contexts never load; allowed hosts (and their subdomains) are exempt from the host, pattern
+# and third-party rules, and are the only hosts scripts, XHR and fetches may come from
+REQUEST_FILTER_BLOCKED_RESOURCE_TYPES = {
+    "image",
+    "media",
+    "font",
+    "stylesheet",
+    "texttrack",
+    "manifest",
+    "ping",
+    "prefetch",
+    "eventsource",
+    "websocket",
+    "cspviolationreport",
+}
+REQUEST_FILTER_THIRD_PARTY_RESOURCE_TYPES = {"script", "xhr", "fetch"}
+REQUEST_FILTER_ALLOWED_HOSTS = {"seek.com.au", "seekcdn.com"}
+REQUEST_FILTER_BLOCKED_HOSTS = {
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "nr-data.net",
+    "newrelic.com",
+    "clarity.ms",
+    "bing.com",
+    "tiqcdn.com",
+    "demdex.net",
+    "omtrdc.net",
+    "adobedtm.com",
+    "optimizely.com",
+    "braze.com",
+    "sentry.io",
+}
+REQUEST_FILTER_BLOCKED_URL_PATTERNS = [
+    r"/(?:collect|beacon|pixel|track|analytics)(?:[/?.]|$)",
+    r"\.(?:png|jpe?g|gif|webp|avif|svg|ico|woff2?|ttf|otf|mp4|webm|css)(?:\?|$)",
+]
+PAGE_PREFETCH_WINDOW = 2
+MAX_PAGES_IN_FLIGHT = 2
+MAX_QUERIES_IN_FLIGHT = 2
+LOAD_SAMPLE_INTERVAL = 0.5
+LOAD_SMOOTHING_FACTOR = 0.3
+RSS_SOFT_LIMIT_MB = 768
+LLM_MAX_IN_FLIGHT = 4
+LLM_MAX_CONNECTIONS = 8
+LLM_MAX_RETRIES = 2
+LLM_REQUEST_TIMEOUT = 30.0
+# Free-tier limits; x-ratelimit-* response headers refine the token budgets at runtime
+LLM_MODEL_LIMITS = {
+    "llama-3.1-8b-instant": {"rpm": 30, "tpm": 6000},
+    "llama3-70b-8192": {"rpm": 30, "tpm": 6000},
+    "llama3-8b-8192": {"rpm": 30, "tpm": 6000},
+    "llama-3.3-70b-versatile": {"rpm": 30, "tpm": 12000},
+}
+PARSE_JOB_MODELS = ["llama-3.1-8b-instant", "llama3-70b-8192", "llama3-8b-8192"]
+INFERENCE_MODELS = ["llama-3.3-70b-versatile"]
+# Groq models that enforce a JSON schema; every other model gets plain JSON object mode
+LLM_JSON_SCHEMA_MODELS = {
+    "openai/gpt-oss-20b",
+    "openai/gpt-oss-120b",
+    "meta-llama/llama-4-maverick-17b-128e-instruct",
+    "meta-llama/llama-4-scout-17b-16e-instruct",
+    "moonshotai/kimi-k2-instruct",
+}
+# Parts of a 400 error (code, param or message) that mean the backend rejected structured output itself
+LLM_STRUCTURED_OUTPUT_ERROR_MARKERS = ("response_format", "json_schema", "json_object", "json mode")
+LLM_CHARS_PER_TOKEN = 4
+LLM_COMPLETION_TOKEN_ESTIMATE = 1024
+LLM_DEFAULT_RATE_LIMIT_COOLDOWN = 5.0
+LLM_MAX_SCHEDULER_SLEEP = 1.0
+LLM_LATENCY_SMOOTHING_FACTOR = 0.3
+STATIC_HTML_METADATA = True
+NODE_MAX_CONNECTIONS = 10
+NODE_MAX_KEEPALIVE_CONNECTIONS = 10
+NODE_KEEPALIVE_EXPIRY = 30.0
+NODE_REQUEST_TIMEOUT = 15.0
+JOB_STORE_REFRESH_DAYS = 7
+JOB_STORE_RETENTION_DAYS = 30
+LLM_CACHE_MAX_ENTRIES = 5000
+LLM_CACHE_TTL_DAYS = 14
+# Bump a prompt's version whenever its wording or expected output changes to invalidate cached responses
+LLM_PROMPT_VERSIONS = {
+    "parse_job_posting": "2",
+    "infer_work_model": "1",
+    "infer_experience_level": "1",
+    "infer_work_model_and_experience_level": "1",
+}
+VALIDATE_JOBS_CONCURRENCY = 4
+# 0 keeps scrapes in the API process as background tasks; each worker process runs its own Chromium
+SCRAPE_WORKERS = 0
+SCRAPE_QUEUE_LEASE_SECONDS = 120.0
+SCRAPE_QUEUE_MAX_ATTEMPTS = 3
+SCRAPE_QUEUE_POLL_INTERVAL = 2.0
+SCRAPE_WORKER_MONITOR_INTERVAL = 5.0
+SCRAPE_WORKER_STOP_TIMEOUT = 30.0
+# Keep a browser and crawler warm between scrapes; recycled after this many job pages or this much process-tree RSS
+WARM_BROWSER_POOL = True
+BROWSER_RECYCLE_NAVIGATIONS = 500
+BROWSER_RECYCLE_RSS_MB = 700
+# "http" fetches pages with a plain HTTP client and falls back to the browser when a response looks blocked
+FETCH_MODE_BROWSER = "browser"
+FETCH_MODE_HTTP = "http"
+FETCH_MODE = FETCH_MODE_BROWSER
+HTTP_FETCH_MAX_CONNECTIONS = 10
+HTTP_FETCH_TIMEOUT = 20.0
+HTTP_FETCH_MIN_HTML_BYTES = 1024
+HTTP_FETCH_BLOCKED_MARKERS = [
+    "cf-chl-",
+    "px-captcha",
+    "g-recaptcha",
+    "<title>Access Denied</title>",
+    "<title>Just a moment...</title>",
+    "Attention Required! | Cloudflare",
+]
+JOB_PAGE_MARKER = 'data-automation="job-detail-title"'
+# Listing pages embed the search results (ids, titles, advertisers, listing dates) as JSON in this assignment
+LISTING_STATE_MARKER = "window.SEEK_REDUX_DATA"
+HTTP_STATUS_OK = 200
 HTTP_STATUS_ACCEPTED = 202
+HTTP_STATUS_BAD_REQUEST = 400
 HTTP_STATUS_UNAUTHORIZED = 401
+HTTP_STATUS_NOT_FOUND = 404
 SUCCESS = "success"
 TERMINATE = "terminate"
 SKIPPED = "skipped"
@@ -42,6 +183,12 @@ NO_MATCHING_TEXT = "__NO_MATCHING_TEXT__"
 INTERN_TITLES = ["intern", "internship"]
 JUNIOR_TITLES = ["junior", "graduate", "entry"]
 LEAD_TITLES = ["lead", "manager", "principal", "head", "director", "vp", "chief"]
+MID_OR_SENIOR_TITLES = ["senior", "snr", "sr.", "intermediate", "mid-level", "experienced"]
+RULE_CONFIDENCE_THRESHOLD = 0.75
+
+MARKDOWN_TOKEN_BUDGET = 1500
+MARKDOWN_LEADING_PARAGRAPHS = 3
+MIN_SECTION_BULLETS = 2
 
 
 
@@ -1,15 +1,87 @@
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+import httpx
 from crawl4ai import AsyncWebCrawler
+from jobs.store import SeenJobStore
+from pages.browser_pool import BrowserFallback
 from pages.pool import PagePool
+from utils.constants import DAY_RANGE_LIMIT
+from utils.utils import extract_job_id
+
+
+class JobClaims:
+    def __init__(self) -> None:
+        """Initialize a JobClaims instance shared by every query in a batch so each job is fetched once."""
+        self.job_ids: set = set()
+        self.duplicates = 0
+
+    def is_claimed(self, job_url: str) -> bool:
+        return (extract_job_id(job_url) or job_url) in self.job_ids
+
+    def claim(self, job_url: str) -> bool:
+        job_id = extract_job_id(job_url) or job_url
+        if job_id in self.job_ids:
+            self.duplicates += 1
+            return False
+        self.job_ids.add(job_id)
+        return True
+
+    def release(self, job_url: str) -> None:
+        self.job_ids.discard(extract_job_id(job_url) or job_url)
+
+    def counters(self) -> dict:
+        return {"claimed": len(self.job_ids), "duplicates": self.duplicates}
+
+
+@dataclass(frozen=True)
+class ScrapeQuery:
+    job_title: str
+    location: str
+    max_pages: int | None = None
+    day_range_limit: int = DAY_RANGE_LIMIT
+    fetch_mode: str | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"https://www.seek.com.au/jobs?keywords={self.job_title}&where={self.location}&sortmode=ListedDate"
 
 
 @dataclass
 class ScrapeContext:
-    crawler: AsyncWebCrawler
-    page_pool: PagePool
+    crawler: AsyncWebCrawler | None
+    page_pool: PagePool | None
     location_search: str
     terminate_event: asyncio.Event
     semaphore: asyncio.Semaphore
     day_range_limit: int
+    job_store: SeenJobStore | None = None
+    job_claims: JobClaims | None = None
+    http_client: httpx.AsyncClient | None = None
+    browser_fallback: BrowserFallback | None = None
+    terminated_at: tuple | None = None
+    job_tasks: dict = field(default_factory=dict)
+
+    def terminate(self, page_num: int, index: int) -> None:
+        # Listings are sorted newest first, so the earliest stale job bounds what is still in range
+        position = (page_num, index)
+        if self.terminated_at is None or position < self.terminated_at:
+            self.terminated_at = position
+            # Jobs listed before the stale one, on this page or an earlier one, are left to finish
+            for task_position, task in self.job_tasks.items():
+                if task_position > position:
+                    task.cancel()
+        self.terminate_event.set()
+
+    def is_terminated(self, page_num: int, index: int = -1) -> bool:
+        """Whether the job at index on page_num, or the whole page when no index is given, is past a stale job."""
+        if not self.terminate_event.is_set():
+            return False
+        return self.terminated_at is None or (page_num, index) > self.terminated_at
+
+    async def browser(self) -> tuple[AsyncWebCrawler, PagePool]:
+        # In HTTP fetch mode the crawler and pages only exist once a fetch has fallen back to the browser
+        if self.crawler is None and self.browser_fallback is not None:
+            resources = await self.browser_fallback.lease()
+            return resources.crawler, resources.page_pool
+        return self.crawler, self.page_pool
@@ -0,0 +1,119 @@
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+
+import psutil
+import sentry_sdk
+from utils.constants import LOAD_SAMPLE_INTERVAL, LOAD_SMOOTHING_FACTOR
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_MB = 1024 * 1024
+
+
+@dataclass
+class LoadSnapshot:
+    cpu_percent: float = 0.0
+    rss_mb: float = 0.0
+    sampled_at: float | None = None
+
+
+class LoadSampler:
+    def __init__(self, interval: float = LOAD_SAMPLE_INTERVAL, smoothing: float = LOAD_SMOOTHING_FACTOR) -> None:
+        """Initialize a LoadSampler instance.
+
+        Args:
+            interval (float): Seconds between samples taken by the background task.
+            smoothing (float): Weight given to the newest sample in the exponential moving average.
+
+        """
+        self.interval = interval
+        self.smoothing = smoothing
+        self.snapshot = LoadSnapshot()
+        self._process = psutil.Process()
+        self._task: asyncio.Task | None = None
+        self._users = 0
+
+    @property
+    def running(self) -> bool:
+        if self._task is None or self._task.done():
+            return False
+        try:
+            return self._task.get_loop() is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    def start(self) -> None:
+        if self.running:
+            return
+        # Prime psutil so the first non-blocking reading measures from now rather than returning 0.0
+        psutil.cpu_percent(interval=None)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def __aenter__(self) -> "LoadSampler":
+        """Start sampling for one user; overlapping scrapes share the same sampler task."""
+        self._users += 1
+        self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Release one user and stop sampling once the last user has finished."""
+        self._users = max(self._users - 1, 0)
+        if self._users == 0:
+            await self.stop()
+
+    def sample(self) -> LoadSnapshot:
+        cpu = psutil.cpu_percent(interval=None)
+        rss_mb = self._process.memory_info().rss / BYTES_PER_MB
+
+        if self.snapshot.sampled_at is None:
+            smoothed_cpu, smoothed_rss = cpu, rss_mb
+        else:
+            smoothed_cpu = self.smoothing * cpu + (1 - self.smoothing) * self.snapshot.cpu_percent
+            smoothed_rss = self.smoothing * rss_mb + (1 - self.smoothing) * self.snapshot.rss_mb
+
+        self.snapshot = LoadSnapshot(cpu_percent=smoothed_cpu, rss_mb=smoothed_rss, sampled_at=time.monotonic())
+        return self.snapshot
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as e:
+                logger.exception("Failed to sample system load")
+                with sentry_sdk.push_scope() as scope:
+                    scope.set_tag("component", "load_sampler")
+                    sentry_sdk.capture_exception(e)
+
+
+load_sampler = LoadSampler()
+
+def process_tree_rss_mb() -> float:
+    # Chromium runs in child processes, so its memory never shows up in this process's own RSS
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        with contextlib.suppress(psutil.Error):
+            total += child.memory_info().rss
+    return total / BYTES_PER_MB
+
+def current_load() -> LoadSnapshot:
+    if load_sampler.running:
+        return load_sampler.snapshot
+    # No sampler on this loop (e.g. a one-off call); a non-blocking reading still never stalls the loop
+    return LoadSnapshot(
+        cpu_percent=psutil.cpu_percent(interval=None),
+        rss_mb=load_sampler.snapshot.rss_mb,
+        sampled_at=load_sampler.snapshot.sampled_at,
+    )
@@ -5,21 +5,30 @@ import random
 import re
 from datetime import datetime, timedelta
 
-import psutil
 import sentry_sdk
 from tzlocal import get_localzone
+from utils.constants import RSS_SOFT_LIMIT_MB
+from utils.load_sampler import current_load
 
 logger = logging.getLogger(__name__)
 
-async def backoff_if_high_cpu(soft_limit: int = 70, hard_limit: int = 90) -> None:
+async def backoff_if_high_cpu(
+    soft_limit: int = 70,
+    hard_limit: int = 90,
+    rss_limit_mb: float = RSS_SOFT_LIMIT_MB
+) -> None:
     try:
-        cpu = psutil.cpu_percent(interval=0.1)
+        load = current_load()
+        cpu = load.cpu_percent
         if cpu >= hard_limit:
             logger.warning("CPU usage at %s%%. Hard backoff...", cpu)
             await pause_briefly(1.0, 3.0)
         elif cpu >= soft_limit:
             logger.warning("CPU usage at %s%%. Soft backoff...", cpu)
             await pause_briefly(0.25, 0.75)
+        elif load.rss_mb >= rss_limit_mb:
+            logger.warning("Memory usage at %.0f MB. Soft backoff...", load.rss_mb)
+            await pause_briefly(0.25, 0.75)
     except Exception as e:
         logger.exception("Failed to measure CPU usage")
         with sentry_sdk.push_scope() as scope:
@@ -48,6 +57,10 @@ def get_total_job_count(markdown: str) -> int:
 def extract_job_urls(markdown: str) -> list:
     return re.findall(r"https://www\.seek\.com\.au/job/\d+\?[^)\s]*origin=cardTitle", markdown)
 
+def extract_job_id(job_url: str) -> str | None:
+    match = re.search(r"/job/(\d+)", job_url)
+    return match.group(1) if match else None
+
 def get_job_urls(job_url: str) -> list:
     job_url = re.search(r"https:\/\/www\.seek\.com\.au\/job\/\d+", job_url).group()
     quick_apply_url = job_url + "/apply"
@@ -98,16 +111,3 @@ def normalize_keys(d: dict) -> dict:
         normalized_dict[new_key] = v
 
     return normalized_dict
-
-def try_fix_missing_closing_brace(response: str) -> str:
-    open_count = response.count("{")
-    close_count = response.count("}")
-    if open_count > close_count:
-        return response + "}"
-    return response
-
-
-
-
-
-